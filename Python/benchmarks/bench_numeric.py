@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: per-cell apply(clean_numeric/limpar_valor) vs vectorized converter_serie_numerica.
+
+Usage (from the Python/ folder):
+    python benchmarks/bench_numeric.py
+    python benchmarks/bench_numeric.py --linhas 10000 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from core.cleaner import ADCLogic
+from core.numeric import converter_serie_numerica
+
+
+CENARIOS = ("texto", "misto", "numerico")
+
+
+def gerar_coluna(linhas, cenario="misto", seed=42):
+    """
+    Build a column like the Z/AA columns of a marketplace export.
+
+    Scenarios:
+        texto: every cell is BR-formatted text ("R$ 1.234,56")
+        misto: ~20% plain numbers, ~2% empty, ~1% invalid text ("-"), rest BR text
+        numerico: float64 column (cells stored as numbers in Excel)
+    """
+    rng = np.random.default_rng(seed)
+    valores = rng.uniform(0, 5000, linhas).round(2)
+    if cenario == "numerico":
+        return pd.Series(valores)
+
+    textos = np.array([f"R$ {v:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".") for v in valores], dtype=object)
+    if cenario == "texto":
+        return pd.Series(textos, dtype=object)
+
+    coluna = textos.copy()
+    sorteio = rng.random(linhas)
+    coluna[sorteio < 0.20] = valores[sorteio < 0.20]
+    coluna[(sorteio >= 0.20) & (sorteio < 0.22)] = np.nan
+    coluna[(sorteio >= 0.22) & (sorteio < 0.23)] = "-"
+    return pd.Series(coluna, dtype=object)
+
+
+def medir(func, repeticoes=3):
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = func()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do parser numerico vetorizado")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--cenarios", nargs="+", choices=CENARIOS, default=list(CENARIOS))
+    args = parser.parse_args()
+
+    print(f"{'cenario':<9} | {'linhas':>10} | {'funcao':<13} | {'apply (s)':>10} | {'vetorizado (s)':>14} | {'speedup':>8}")
+    print("-" * 80)
+    for cenario, linhas in [(c, n) for c in args.cenarios for n in args.linhas]:
+        coluna = gerar_coluna(linhas, cenario)
+        casos = [
+            ("clean_numeric", lambda: coluna.apply(ADCLogic.clean_numeric).to_numpy(dtype=float),
+             lambda: converter_serie_numerica(coluna)),
+            ("limpar_valor", lambda: coluna.apply(ADCLogic.limpar_valor).to_numpy(dtype=float),
+             lambda: converter_serie_numerica(coluna, preservar_nan=True)),
+        ]
+        for nome, escalar, vetorizado in casos:
+            t_escalar, esperado = medir(escalar)
+            t_vetor, obtido = medir(vetorizado)
+            if not np.array_equal(esperado, obtido, equal_nan=True):
+                raise AssertionError(f"Resultado divergente em {nome} com {linhas} linhas")
+            print(f"{cenario:<9} | {linhas:>10} | {nome:<13} | {t_escalar:>10.3f} | {t_vetor:>14.3f} | {t_escalar / t_vetor:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark: value filter with a full df.copy() (previous implementation) vs mask-only
+filtro_por_valor.
+
+Usage (from the Python/ folder):
+    python benchmarks/bench_valor.py
+    python benchmarks/bench_valor.py --linhas 100000 --colunas 20 60
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from core.cleaner import ADCLogic
+from core.numeric import converter_serie_numerica
+from bench_numeric import gerar_coluna
+
+
+def gerar_planilha(linhas, colunas, seed=42):
+    """
+    Wide sheet like a marketplace export: text, float and integer columns in equal parts,
+    plus a BR-formatted price column ("preco") at the end.
+    """
+    rng = np.random.default_rng(seed)
+    dados = {}
+    for i in range(colunas - 1):
+        if i % 3 == 0:
+            dados[f"texto_{i}"] = rng.choice(["SKU-A", "SKU-B", "Produto C", None], linhas)
+        elif i % 3 == 1:
+            dados[f"valor_{i}"] = rng.uniform(0, 1000, linhas)
+        else:
+            dados[f"qtd_{i}"] = rng.integers(0, 100, linhas)
+    dados["preco"] = gerar_coluna(linhas, "misto", seed)
+    return pd.DataFrame(dados)
+
+
+def filtro_com_copia(df, valor_min, coluna_filtro):
+    """Implementation before the mask-only filter (copies the whole frame)."""
+    df_temp = df.copy()
+    df_temp[coluna_filtro] = converter_serie_numerica(df_temp[coluna_filtro], preservar_nan=True)
+    return df[df_temp[coluna_filtro] >= valor_min]
+
+
+def medir(func, repeticoes=5):
+    """Best wall time of ``repeticoes`` runs, then the peak of Python/numpy allocations of one run."""
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        func()
+        melhor = min(melhor, time.perf_counter() - inicio)
+
+    # tracemalloc em uma execucao separada: deixa o codigo mais lento, mas mede o pico exato
+    tracemalloc.start()
+    func()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return melhor, pico / (1024 * 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do filtro de valor (copia vs mascara)")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[100_000, 500_000])
+    parser.add_argument("--colunas", type=int, nargs="+", default=[10, 60])
+    args = parser.parse_args()
+
+    logic = ADCLogic(limite_cache_mb=0)
+    print(f"{'linhas':>9} | {'colunas':>7} | {'copia (s)':>9} | {'copia (MB)':>10} | {'mascara (s)':>11} | {'mascara (MB)':>12}")
+    print("-" * 75)
+    for linhas, colunas in [(n, c) for n in args.linhas for c in args.colunas]:
+        df = gerar_planilha(linhas, colunas)
+        esperado = filtro_com_copia(df, 2500, "preco")
+        obtido = logic.filtro_por_valor(df, "preco", minimo=2500)
+        if not esperado.equals(obtido):
+            raise AssertionError(f"Resultado divergente com {linhas} linhas x {colunas} colunas")
+        del esperado, obtido
+
+        t_copia, mb_copia = medir(lambda: filtro_com_copia(df, 2500, "preco"))
+        t_mascara, mb_mascara = medir(lambda: logic.filtro_por_valor(df, "preco", minimo=2500))
+        print(f"{linhas:>9} | {colunas:>7} | {t_copia:>9.3f} | {mb_copia:>10.1f} | {t_mascara:>11.3f} | {mb_mascara:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
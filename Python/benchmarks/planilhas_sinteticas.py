@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+"""
+Synthetic "Itens Mais Vendidos" workbooks for benchmarks.
+
+Same shape as the marketplace export the presets were written for: 40 columns (A-AN),
+one row per order item, order ID in B repeated for orders with several items, SKU in F,
+quantity in Z and BR-formatted unit price ("R$ 1.234,56") in AA. A few rows are exact
+duplicates (export glitch) or empty, and some Z/AA cells are stored as numbers, as in
+real files. Everything comes from a seeded generator, so the same arguments always give
+the same workbook.
+
+Usage (from the Python/ folder):
+    python benchmarks/planilhas_sinteticas.py --linhas 100000 --formato xlsx --saida benchmarks/dados
+    python benchmarks/planilhas_sinteticas.py --linhas 20000 --formato xls
+
+.xls files need xlwt (and are limited to 65535 data rows); .xlsx uses openpyxl write-only.
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+from core.escrita import escrever_xlsx
+
+FORMATOS = ("xlsx", "xls")
+LIMITE_XLS = 65_535
+
+# Cabecalho da exportacao (A..AN); B, F, Z e AA sao as colunas usadas pelo resumo
+COLUNAS = [
+    "Data da Venda", "Nº do Pedido", "Status", "Marketplace", "Loja", "SKU", "Título do Anúncio",
+    "Variação", "Categoria", "Marca", "Código de Barras", "Comprador", "CPF/CNPJ", "Cidade", "UF",
+    "CEP", "Forma de Envio", "Rastreio", "Data de Envio", "Previsão de Entrega", "Nota Fiscal",
+    "Forma de Pagamento", "Parcelas", "Cupom", "Observações", "Quantidade", "Preço Unitário",
+    "Desconto", "Frete", "Tarifa de Venda", "Custo do Produto", "Lucro", "Margem (%)", "Peso (kg)",
+    "Altura (cm)", "Largura (cm)", "Comprimento (cm)", "Estoque", "Depósito", "Atualizado em",
+]
+COL_PEDIDO, COL_SKU, COL_QTD, COL_PRECO = 1, 5, 25, 26
+
+_MARKETPLACES = ["Mercado Livre", "Shopee", "Amazon", "Magalu", "Americanas"]
+_STATUS = ["Pago", "Enviado", "Entregue", "Cancelado", "Aguardando pagamento"]
+_UFS = ["SP", "RJ", "MG", "PR", "RS", "SC", "BA", "PE", "GO", "DF"]
+_ENVIOS = ["Full", "Flex", "Coleta", "Correios"]
+_PAGAMENTOS = ["Pix", "Cartão de crédito", "Boleto"]
+
+
+def formatar_br(valores, prefixo="R$ "):
+    """'R$ 1.234,56' for each value (vectorized over a float array)."""
+    inteiros = np.floor(valores).astype(np.int64)
+    centavos = np.rint((valores - inteiros) * 100).astype(np.int64)
+    inteiros += centavos // 100
+    centavos %= 100
+    milhares = [f"{v:,}".replace(",", ".") for v in inteiros.tolist()]
+    return np.array([f"{prefixo}{m},{c:02d}" for m, c in zip(milhares, centavos.tolist())], dtype=object)
+
+
+def gerar_itens_mais_vendidos(linhas, seed=42, skus=2_000, taxa_duplicadas=0.02, taxa_vazias=0.005):
+    """
+    Build the DataFrame of a synthetic export.
+
+    Args:
+        linhas (int): Rows (order items, including duplicates and empty rows)
+        seed (int): Random seed
+        skus (int): Distinct SKUs (popularity follows a Zipf-like curve)
+        taxa_duplicadas (float): Fraction of rows that repeat an earlier row exactly
+        taxa_vazias (float): Fraction of fully empty rows
+
+    Returns:
+        tuple: (pd.DataFrame with the 40 COLUNAS, dict of expected totals from
+               totais_esperados)
+    """
+    rng = np.random.default_rng(seed)
+
+    # Pedidos com 1-4 itens: o ID em B se repete nas linhas do mesmo pedido
+    itens_por_pedido = np.minimum(rng.geometric(0.6, linhas), 4)
+    pedidos = np.repeat(np.arange(linhas) + 2_000_000_000, itens_por_pedido)[:linhas]
+
+    popularidade = 1.0 / np.arange(1, skus + 1) ** 1.1
+    sku_idx = rng.choice(skus, linhas, p=popularidade / popularidade.sum())
+    quantidade = np.minimum(rng.geometric(0.55, linhas), 20)
+    preco = np.round(rng.lognormal(4.0, 1.0, linhas), 2)
+
+    dias = rng.integers(0, 365, linhas)
+    datas = (np.datetime64("2025-01-01") + dias).astype(str)
+
+    dados = {nome: np.full(linhas, None, dtype=object) for nome in COLUNAS}
+    dados[COLUNAS[0]] = datas.astype(object)
+    dados[COLUNAS[COL_PEDIDO]] = pedidos
+    dados[COLUNAS[2]] = rng.choice(_STATUS, linhas, p=[0.35, 0.25, 0.3, 0.07, 0.03]).astype(object)
+    dados[COLUNAS[3]] = rng.choice(_MARKETPLACES, linhas).astype(object)
+    dados[COLUNAS[4]] = np.array([f"Loja {v}" for v in rng.integers(1, 6, linhas)], dtype=object)
+    dados[COLUNAS[COL_SKU]] = np.array([f"SKU-{v:05d}" for v in sku_idx], dtype=object)
+    dados[COLUNAS[6]] = np.array([f"Produto {v} - Kit com {v % 5 + 1} unidades" for v in sku_idx], dtype=object)
+    dados[COLUNAS[7]] = rng.choice(["P", "M", "G", "GG", None], linhas).astype(object)
+    dados[COLUNAS[8]] = np.array([f"Categoria {v % 40}" for v in sku_idx], dtype=object)
+    dados[COLUNAS[9]] = np.array([f"Marca {v % 120}" for v in sku_idx], dtype=object)
+    dados[COLUNAS[10]] = (7_890_000_000_000 + sku_idx).astype(np.int64)
+    dados[COLUNAS[11]] = np.array([f"Cliente {v}" for v in rng.integers(1, linhas // 2 + 2, linhas)], dtype=object)
+    dados[COLUNAS[14]] = rng.choice(_UFS, linhas).astype(object)
+    dados[COLUNAS[15]] = np.array([f"{v:05d}-000" for v in rng.integers(1000, 99999, linhas)], dtype=object)
+    dados[COLUNAS[16]] = rng.choice(_ENVIOS, linhas).astype(object)
+    dados[COLUNAS[21]] = rng.choice(_PAGAMENTOS, linhas).astype(object)
+    dados[COLUNAS[22]] = rng.integers(1, 13, linhas)
+
+    # Z e AA como texto BR; ~15% das celulas gravadas como numero (exportacoes mistas)
+    qtd_celulas = quantidade.astype(str).astype(object)
+    preco_celulas = formatar_br(preco)
+    numericas = rng.random(linhas) < 0.15
+    qtd_celulas[numericas] = quantidade[numericas]
+    preco_celulas[numericas] = preco[numericas]
+    dados[COLUNAS[COL_QTD]] = qtd_celulas
+    dados[COLUNAS[COL_PRECO]] = preco_celulas
+
+    dados[COLUNAS[27]] = formatar_br(np.round(preco * rng.uniform(0, 0.15, linhas), 2))
+    dados[COLUNAS[28]] = formatar_br(np.round(rng.uniform(0, 40, linhas), 2))
+    dados[COLUNAS[29]] = formatar_br(np.round(preco * 0.16, 2))
+    dados[COLUNAS[33]] = np.round(rng.uniform(0.1, 15, linhas), 3)
+    dados[COLUNAS[37]] = rng.integers(0, 500, linhas)
+
+    # object: linhas vazias (None) cabem em qualquer coluna, como nas celulas do Excel
+    df = pd.DataFrame(dados).astype(object)
+
+    # Duplicatas exatas copiam uma linha anterior; vazias zeram a linha inteira
+    sorteio = rng.random(linhas)
+    duplicadas = np.flatnonzero((sorteio < taxa_duplicadas) & (np.arange(linhas) > 0))
+    origem = (duplicadas * rng.random(len(duplicadas))).astype(np.int64)
+    df.iloc[duplicadas] = df.iloc[origem].to_numpy()
+    vazias = np.flatnonzero((sorteio >= taxa_duplicadas) & (sorteio < taxa_duplicadas + taxa_vazias))
+    df.iloc[vazias] = None
+
+    return df, totais_esperados(df)
+
+
+def totais_esperados(df):
+    """
+    Totals gerar_resumo must report for ``df`` (computed here without the ADC parser).
+
+    Returns:
+        dict: {'total_pedidos', 'total_itens', 'valor_total', 'linhas_unicas'}
+    """
+    def numero(celula):
+        if celula is None or (isinstance(celula, float) and np.isnan(celula)):
+            return np.nan
+        if isinstance(celula, str):
+            return float(celula.replace("R$", "").replace(".", "").replace(",", ".").strip())
+        return float(celula)
+
+    qtd = np.array([numero(c) for c in df.iloc[:, COL_QTD]])
+    preco = np.array([numero(c) for c in df.iloc[:, COL_PRECO]])
+    return {
+        "total_pedidos": int(df.iloc[:, COL_PEDIDO].dropna().nunique()),
+        "total_itens": int(np.nansum(qtd)),
+        "valor_total": float(np.nansum(qtd * preco)),
+        "linhas_unicas": int(len(df.dropna(how="all").drop_duplicates())),
+    }
+
+
+def _escrever_xls(df, caminho):
+    try:
+        import xlwt
+    except ImportError:
+        raise ImportError("Gerar .xls requer o pacote xlwt (pip install xlwt)")
+    if len(df) > LIMITE_XLS:
+        raise ValueError(f"O formato .xls comporta no maximo {LIMITE_XLS} linhas de dados")
+    wb = xlwt.Workbook()
+    ws = wb.add_sheet("Itens Mais Vendidos")
+    for j, nome in enumerate(df.columns):
+        ws.write(0, j, nome)
+    for i, linha in enumerate(df.itertuples(index=False), 1):
+        for j, valor in enumerate(linha):
+            if valor is None or (isinstance(valor, float) and np.isnan(valor)):
+                continue
+            ws.write(i, j, valor.item() if isinstance(valor, np.generic) else valor)
+    wb.save(caminho)
+
+
+def salvar_planilha_sintetica(df, caminho):
+    """Write ``df`` as .xlsx (openpyxl write-only) or .xls (xlwt), by extension."""
+    if caminho.lower().endswith(".xls"):
+        _escrever_xls(df, caminho)
+    else:
+        escrever_xlsx(df, caminho, aba="Itens Mais Vendidos")
+    return caminho
+
+
+def planilha_sintetica(diretorio, linhas, formato="xlsx", seed=42):
+    """
+    Path of a synthetic workbook, generated only when it does not exist yet.
+
+    Files are named by their parameters (itens_<linhas>_s<seed>.<formato>), so benchmark
+    runs reuse them instead of paying the generation every time.
+
+    Returns:
+        str: Workbook path
+    """
+    os.makedirs(diretorio, exist_ok=True)
+    caminho = os.path.join(diretorio, f"itens_{linhas}_s{seed}.{formato}")
+    if not os.path.exists(caminho):
+        df, _ = gerar_itens_mais_vendidos(linhas, seed)
+        temporario = caminho + ".tmp." + formato
+        salvar_planilha_sintetica(df, temporario)
+        os.replace(temporario, caminho)
+    return caminho
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera planilhas sinteticas de Itens Mais Vendidos")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10_000])
+    parser.add_argument("--formato", choices=FORMATOS, default="xlsx")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--saida", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "dados"))
+    args = parser.parse_args()
+    for linhas in args.linhas:
+        print(planilha_sintetica(args.saida, linhas, args.formato, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark suite: load, clean per preset, summary, multi-file dashboard and save on
+synthetic "Itens Mais Vendidos" workbooks, compared against a JSON baseline.
+
+Each case is timed (best of --repeticoes) with its peak memory growth (Medicao) on a
+fresh ADCLogic with both caches off, so every run parses the workbook. The summary is
+checked against the totals known from the generator, so a fast but wrong run fails.
+Workbooks are generated once into benchmarks/dados and reused.
+
+Usage (from the Python/ folder):
+    python benchmarks/suite.py                                   # 10k and 50k rows, .xlsx
+    python benchmarks/suite.py --linhas 100000 --formatos xlsx xls --arquivos 8
+    python benchmarks/suite.py --salvar-baseline                 # on the reference machine
+    python benchmarks/suite.py --saida hoje.json --tolerancia 0.15
+
+Results are compared with --baseline (default benchmarks/baseline.json) when it exists:
+cases slower than the baseline by more than --tolerancia are listed and the exit code is 1.
+Timings only compare on the same machine; the baseline records Python/pandas versions,
+platform and CPU count.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(os.path.dirname(AQUI), 'src'))
+from core.cleaner import ADCLogic
+from core.lote import indices_do_preset, opcoes_do_preset
+from core.medicao import Medicao
+from core.sidecar import SidecarCache
+from planilhas_sinteticas import FORMATOS, LIMITE_XLS, gerar_itens_mais_vendidos, planilha_sintetica
+
+VERSAO = 1
+BASELINE_PADRAO = os.path.join(AQUI, "baseline.json")
+DADOS_PADRAO = os.path.join(AQUI, "dados")
+
+
+def nova_logica():
+    """ADCLogic with no memory or disk cache: every case parses the workbook."""
+    logic = ADCLogic(limite_cache_mb=0)
+    logic.cache_disco = SidecarCache(ativo=False)
+    return logic
+
+
+def medir(func, repeticoes):
+    """Best time of ``repeticoes`` runs, with the peak memory of that run and its result."""
+    melhor = None
+    for _ in range(repeticoes):
+        with Medicao() as medicao:
+            resultado = func()
+        if melhor is None or medicao.segundos < melhor[0].segundos:
+            melhor = (medicao, resultado)
+    return melhor
+
+
+def _linhas(resultado):
+    if isinstance(resultado, pd.DataFrame):
+        return len(resultado)
+    if isinstance(resultado, dict):
+        return resultado.get("total_pedidos")
+    return None
+
+
+def casos(caminho, formato, linhas, presets, arquivos_dashboard, diretorio_saida):
+    """
+    Cases of one workbook: (name, function) pairs; each function builds its own ADCLogic.
+
+    Args:
+        caminho (str): Workbook
+        formato (str): "xlsx" or "xls"
+        linhas (int): Rows of the workbook
+        presets (list): Cleaning presets from settings.json
+        arquivos_dashboard (list): Workbooks of the multi-file dashboard (same size, other seeds)
+        diretorio_saida (str): Where save cases write
+    """
+    lista = [("carregar", lambda: nova_logica().carregar_planilha(caminho, ""))]
+    for preset in presets:
+        indices = indices_do_preset(preset)
+        opcoes = opcoes_do_preset(preset)
+        lista.append((f"limpeza:{preset['nome']}",
+                      lambda i=indices, o=opcoes: nova_logica().processar_limpeza(caminho, "", i, o)))
+    lista.append(("resumo", lambda: nova_logica().gerar_resumo(caminho, "")))
+    if arquivos_dashboard:
+        lista.append((f"dashboard:{len(arquivos_dashboard)}",
+                      lambda: nova_logica().gerar_resumo_multi(arquivos_dashboard, incremental=False)))
+    df = None
+    for destino in ("xlsx", "csv"):
+        def salvar(destino=destino):
+            nonlocal df
+            if df is None:
+                df = nova_logica().carregar_planilha(caminho, "")  # leitura fora da medicao
+            return nova_logica().salvar_planilha(df, os.path.join(diretorio_saida, f"saida_{formato}_{linhas}.{destino}"))
+        lista.append((f"salvar:{destino}", salvar))
+    return lista
+
+
+def executar(args):
+    logic = nova_logica()
+    presets = [p for p in logic.presets if p.get("tipo") != "resumo"
+               and (not args.presets or p["nome"] in args.presets)]
+    resultados = []
+    saida_temporaria = tempfile.mkdtemp(prefix="adc_bench_")
+    try:
+        for formato in args.formatos:
+            for linhas in args.linhas:
+                if formato == "xls" and linhas > LIMITE_XLS:
+                    print(f"[WARNING] xls com {linhas} linhas ignorado (limite {LIMITE_XLS})", file=sys.stderr)
+                    continue
+                try:
+                    caminho = planilha_sintetica(args.dados, linhas, formato, args.seed)
+                except ImportError as e:
+                    print(f"[WARNING] {formato} ignorado: {e}", file=sys.stderr)
+                    continue
+                _, esperado = gerar_itens_mais_vendidos(linhas, args.seed)
+                # Dashboard: mesmo tamanho e formato, seeds diferentes (como exportacoes de meses distintos)
+                dashboard = [planilha_sintetica(args.dados, linhas, formato, args.seed + k)
+                             for k in range(args.arquivos)] if args.arquivos else []
+                for nome, func in casos(caminho, formato, linhas, presets, dashboard, saida_temporaria):
+                    medicao, resultado = medir(func, args.repeticoes)
+                    if nome == "resumo":
+                        _conferir_resumo(resultado, esperado)
+                    registro = {"caso": nome, "formato": formato, "linhas": linhas,
+                                "segundos": round(medicao.segundos, 4),
+                                "pico_mb": None if medicao.pico_mb is None else round(medicao.pico_mb, 1),
+                                "linhas_saida": _linhas(resultado)}
+                    resultados.append(registro)
+                    print(f"{formato:<5} {linhas:>8} {nome:<36} {registro['segundos']:>9.3f}s "
+                          f"{'-' if registro['pico_mb'] is None else '+%.1f MB' % registro['pico_mb']:>11}",
+                          file=sys.stderr)
+    finally:
+        for nome in os.listdir(saida_temporaria):
+            os.remove(os.path.join(saida_temporaria, nome))
+        os.rmdir(saida_temporaria)
+    return resultados
+
+
+def _conferir_resumo(resultado, esperado):
+    for chave in ("total_pedidos", "total_itens"):
+        if resultado[chave] != esperado[chave]:
+            raise AssertionError(f"Resumo divergente em {chave}: {resultado[chave]} != {esperado[chave]}")
+    if not np.isclose(resultado["valor_total"], esperado["valor_total"], rtol=1e-9):
+        raise AssertionError(f"Resumo divergente no valor: {resultado['valor_total']} != {esperado['valor_total']}")
+
+
+def ambiente():
+    """Versions and machine the timings belong to."""
+    return {"python": platform.python_version(), "pandas": pd.__version__, "numpy": np.__version__,
+            "plataforma": platform.platform(), "cpus": os.cpu_count()}
+
+
+def comparar(resultados, baseline, tolerancia):
+    """
+    Compare results with a baseline run.
+
+    Args:
+        resultados (list): Cases of this run
+        baseline (dict): Previous report (same layout as montar_relatorio)
+        tolerancia (float): Allowed slowdown (0.2 = 20%)
+
+    Returns:
+        list: [{'caso', 'formato', 'linhas', 'segundos', 'baseline', 'razao', 'regressao'}]
+              for cases present in both runs
+    """
+    anteriores = {(r["caso"], r["formato"], r["linhas"]): r for r in baseline.get("resultados", [])}
+    comparacao = []
+    for r in resultados:
+        anterior = anteriores.get((r["caso"], r["formato"], r["linhas"]))
+        if not anterior or not anterior["segundos"]:
+            continue
+        razao = r["segundos"] / anterior["segundos"]
+        comparacao.append({"caso": r["caso"], "formato": r["formato"], "linhas": r["linhas"],
+                           "segundos": r["segundos"], "baseline": anterior["segundos"],
+                           "razao": round(razao, 3), "regressao": razao > 1 + tolerancia})
+    return comparacao
+
+
+def montar_relatorio(resultados, args):
+    return {"versao": VERSAO, "data": datetime.now().isoformat(timespec="seconds"), "ambiente": ambiente(),
+            "parametros": {"linhas": args.linhas, "formatos": args.formatos, "arquivos": args.arquivos,
+                           "repeticoes": args.repeticoes, "seed": args.seed},
+            "resultados": resultados}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suite de benchmarks do ADC")
+    parser.add_argument("--linhas", type=int, nargs="+", default=[10_000, 50_000])
+    parser.add_argument("--formatos", nargs="+", choices=FORMATOS, default=["xlsx"])
+    parser.add_argument("--presets", nargs="*", default=None, help="Preset names (default: every cleaning preset)")
+    parser.add_argument("--arquivos", type=int, default=4, help="Files in the dashboard case (0 = skip)")
+    parser.add_argument("--repeticoes", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--dados", default=DADOS_PADRAO, help="Directory of the generated workbooks")
+    parser.add_argument("--baseline", default=BASELINE_PADRAO)
+    parser.add_argument("--tolerancia", type=float, default=0.2, help="Allowed slowdown vs baseline (0.2 = 20%%)")
+    parser.add_argument("--saida", default=None, help="Also write this run's JSON here")
+    parser.add_argument("--salvar-baseline", action="store_true", help="Write this run as the new baseline")
+    args = parser.parse_args(argv)
+
+    relatorio = montar_relatorio(executar(args), args)
+    codigo = 0
+    if os.path.exists(args.baseline) and not args.salvar_baseline:
+        with open(args.baseline, encoding="utf-8") as arquivo:
+            baseline = json.load(arquivo)
+        if baseline.get("ambiente", {}).get("plataforma") != relatorio["ambiente"]["plataforma"]:
+            print("[WARNING] Baseline gravado em outra plataforma: compare com cautela", file=sys.stderr)
+        comparacao = comparar(relatorio["resultados"], baseline, args.tolerancia)
+        relatorio["comparacao"] = {"baseline": args.baseline, "tolerancia": args.tolerancia, "casos": comparacao}
+        print(f"\n{'caso':<36} {'formato':<7} {'linhas':>8} {'baseline':>10} {'atual':>10} {'razao':>7}")
+        for c in comparacao:
+            marca = "  << REGRESSAO" if c["regressao"] else ""
+            print(f"{c['caso']:<36} {c['formato']:<7} {c['linhas']:>8} {c['baseline']:>9.3f}s "
+                  f"{c['segundos']:>9.3f}s {c['razao']:>6.2f}x{marca}")
+        if any(c["regressao"] for c in comparacao):
+            codigo = 1
+
+    texto = json.dumps(relatorio, ensure_ascii=False, indent=2)
+    if args.salvar_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto)
+        print(f"[OK] Baseline salvo em {args.baseline}", file=sys.stderr)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto)
+        print(f"[OK] Resultados salvos em {args.saida}", file=sys.stderr)
+    return codigo
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""
+ADC command line: run a preset over many files without the GUI.
+
+Examples:
+    python src/cli.py --preset "SKU - Mais Vendidos" "exports/*.xlsx" --saida limpos --workers 4
+    python src/cli.py --preset "Resumo de Pedidos" exports/ --relatorio resumo.json
+    python src/cli.py --preset "SKU - Mais Vendidos" grande.xlsx --perfil perfil.json --cprofile run.prof
+
+Progress goes to stderr; the JSON run report goes to stdout or to --relatorio. Exit code is
+0 when every file succeeded, 1 when some file failed and 2 for usage/configuration errors.
+Only core modules are imported (no tkinter/matplotlib), so startup stays fast.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.cleaner import ADCLogic
+from core.escrita import FORMATOS_SAIDA
+from core.lote import (MODOS, caminho_saida, encontrar_preset, executar_lote, expandir_arquivos,
+                       indices_do_preset, montar_relatorio, opcoes_do_preset)
+from core.sidecar import SidecarCache
+
+
+def _argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Run an ADC preset over many workbooks (no GUI).")
+    parser.add_argument("arquivos", nargs="+", help="Glob patterns (** allowed), files or directories")
+    parser.add_argument("--preset", required=True, help="Preset name from config/settings.json")
+    parser.add_argument("--modo", choices=MODOS,
+                        help="limpeza or resumo (default: the preset's 'tipo', else limpeza)")
+    parser.add_argument("--aba", default="", help="Sheet name (default: first sheet)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes (default: min(files, CPUs); 1 = sequential)")
+    parser.add_argument("--saida", default=None, help="Output directory (default: next to each input)")
+    parser.add_argument("--formato", choices=FORMATOS_SAIDA, default="xlsx", help="Output format")
+    parser.add_argument("--sufixo", default="_limpo", help="Appended to output file names")
+    parser.add_argument("--manter-duplicadas", action="store_true", help="Do not remove duplicate rows")
+    parser.add_argument("--manter-vazias", action="store_true", help="Do not remove empty rows")
+    parser.add_argument("--sem-cache", action="store_true", help="Do not read/write the disk cache")
+    parser.add_argument("--relatorio", default=None, help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--perfil", default=None, metavar="ARQUIVO",
+                        help="Per-stage timing report (table on stderr; saved here, JSON if .json). "
+                             "Runs sequentially so every stage is measured")
+    parser.add_argument("--cprofile", default=None, metavar="ARQUIVO",
+                        help="Also record the run with cProfile and dump the stats here (implies --perfil)")
+    return parser.parse_args(argv)
+
+
+def _erro(mensagem):
+    print(f"[ERROR] {mensagem}", file=sys.stderr)
+    return 2
+
+
+def main(argv=None):
+    args = _argumentos(argv)
+
+    # Sem cache em memoria: cada arquivo e lido uma unica vez
+    logic = ADCLogic(limite_cache_mb=0)
+    if args.sem_cache:
+        logic.cache_disco = SidecarCache(ativo=False)
+
+    try:
+        preset = encontrar_preset(logic.presets, args.preset)
+        indices = indices_do_preset(preset)
+        opcoes = opcoes_do_preset(preset, not args.manter_duplicadas, not args.manter_vazias)
+    except Exception as e:
+        return _erro(e)
+
+    modo = args.modo or ("resumo" if preset.get("tipo") == "resumo" else "limpeza")
+    tarefa = {
+        "modo": modo,
+        "aba": args.aba,
+        "indices_deletar": indices,
+        "opcoes": opcoes,
+        "diretorio_saida": os.path.abspath(args.saida) if args.saida else None,
+        "formato": args.formato,
+        "sufixo": args.sufixo,
+    }
+
+    caminhos = expandir_arquivos(args.arquivos)
+    ignorados = []
+    if modo == "limpeza":
+        # Saidas de uma execucao anterior casam com o mesmo glob: nao limpa de novo
+        saidas = {caminho_saida(c, tarefa["diretorio_saida"], args.formato, args.sufixo): c for c in caminhos}
+        ignorados = [c for c in caminhos if c in saidas and saidas[c] != c]
+        caminhos = [c for c in caminhos if c not in ignorados]
+        if len(saidas) < len(caminhos) + len(ignorados):
+            return _erro("Arquivos com o mesmo nome gravariam a mesma saida. Use --saida por pasta.")
+    if not caminhos:
+        return _erro(f"Nenhum arquivo encontrado em: {' '.join(args.arquivos)}")
+
+    if tarefa["diretorio_saida"]:
+        os.makedirs(tarefa["diretorio_saida"], exist_ok=True)
+
+    perfilar = args.perfil is not None or args.cprofile is not None
+    # Com perfil, tudo no processo atual: etapas dos workers nao seriam medidas
+    workers = 1 if perfilar else args.workers or min(len(caminhos), os.cpu_count() or 1)
+    print(f"[INFO] {len(caminhos)} arquivo(s), preset '{preset.get('nome')}', modo {modo}, {workers} worker(s)",
+          file=sys.stderr)
+
+    def progresso(concluidos, total, resultado):
+        nome = os.path.basename(resultado["arquivo"])
+        if resultado["status"] == "ok":
+            print(f"[OK] {concluidos}/{total} {nome} ({resultado['segundos']:.2f}s)", file=sys.stderr)
+        else:
+            print(f"[ERROR] {concluidos}/{total} {nome}: {resultado['erro']}", file=sys.stderr)
+
+    inicio = datetime.now()
+    t0 = time.perf_counter()
+    if perfilar:
+        with logic.perfilar(lambda texto: print(texto, file=sys.stderr), args.perfil, args.cprofile):
+            resultados = executar_lote(caminhos, tarefa, workers, progresso, logic)
+    else:
+        resultados = executar_lote(caminhos, tarefa, workers, progresso, logic)
+    relatorio = montar_relatorio(resultados, tarefa, preset.get("nome"), inicio,
+                                 time.perf_counter() - t0, workers, ignorados)
+
+    texto = json.dumps(relatorio, ensure_ascii=False, indent=2)
+    if args.relatorio:
+        with open(args.relatorio, "w", encoding="utf-8") as arquivo:
+            arquivo.write(texto)
+        print(f"[OK] Relatorio salvo em {args.relatorio}", file=sys.stderr)
+    else:
+        print(texto)
+
+    return 0 if relatorio["totais"]["erros"] == 0 else 1
+
+
+if __name__ == "__main__":
+    # Necessario para o pool de processos no executavel (PyInstaller)
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+ADC Workbook Cache Module
+
+In-memory LRU cache for parsed spreadsheets, used by ``ADCLogic.cache_excel``.
+
+Entries are keyed on (absolute path, mtime, size, sheet), so a file that is saved again
+(new mtime/size) is never served stale. Values are either parsed DataFrames (one per
+sheet) or the workbook's sheet-name list (stored under sheet ``None``).
+
+Classes:
+    WorkbookCache: Thread-safe LRU cache with a memory budget and hit/miss counters
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# Linhas usadas para estimar o tamanho das colunas de texto (memory_usage(deep=True) e lento)
+_AMOSTRA_ESTIMATIVA = 2000
+
+
+def estimar_bytes(valor):
+    """
+    Estimate the memory footprint of a cached value.
+
+    Object columns are measured on a sample and scaled, so large frames can be sized
+    without walking every Python object.
+
+    Args:
+        valor: pd.DataFrame or list of sheet names
+
+    Returns:
+        int: Estimated size in bytes
+    """
+    if not isinstance(valor, pd.DataFrame):
+        return sum(len(str(v)) for v in valor) + 64 * len(valor)
+
+    total = int(valor.memory_usage(index=True, deep=False).sum())
+    colunas_objeto = valor.select_dtypes(include=["object", "string"]).columns
+    if len(colunas_objeto) and len(valor):
+        amostra = valor[colunas_objeto].head(_AMOSTRA_ESTIMATIVA)
+        profundo = amostra.memory_usage(index=False, deep=True).sum()
+        raso = amostra.memory_usage(index=False, deep=False).sum()
+        total += int((profundo - raso) * len(valor) / len(amostra))
+    return total
+
+
+class WorkbookCache:
+    """
+    LRU cache of parsed workbooks with a memory budget.
+
+    Attributes:
+        limite_bytes (int): Memory budget; least recently used entries are evicted above it
+        bytes_usados (int): Estimated bytes currently held
+        hits (int): Lookups served from the cache
+        misses (int): Lookups that required parsing the file
+        evictions (int): Entries dropped to respect the budget
+    """
+
+    def __init__(self, limite_bytes=256 * 1024 * 1024):
+        """
+        Args:
+            limite_bytes (int): Memory budget in bytes (0 disables caching)
+        """
+        self.limite_bytes = limite_bytes
+        self.bytes_usados = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._itens = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def chave(caminho, aba):
+        """
+        Build the cache key for a file/sheet pair.
+
+        Args:
+            caminho (str): Path to the workbook
+            aba (str or None): Sheet name, or None for the sheet-name list
+
+        Returns:
+            tuple: (absolute path, mtime_ns, size, sheet)
+        """
+        info = os.stat(caminho)
+        return (os.path.abspath(caminho), info.st_mtime_ns, info.st_size, aba)
+
+    def obter(self, caminho, aba):
+        """
+        Look up a parsed sheet (or the sheet-name list when ``aba`` is None).
+
+        DataFrames are returned as copies so callers can add or drop columns freely.
+
+        Returns:
+            pd.DataFrame, list or None: Cached value, or None on a miss
+        """
+        try:
+            chave = self.chave(caminho, aba)
+        except OSError:
+            return None
+
+        with self._lock:
+            item = self._itens.get(chave)
+            if item is None:
+                self.misses += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.hits += 1
+            valor = item[0]
+
+        return valor.copy() if isinstance(valor, pd.DataFrame) else list(valor)
+
+    def guardar(self, caminho, aba, valor):
+        """
+        Store a parsed sheet (or sheet-name list) and evict LRU entries above the budget.
+
+        Entries for older versions of the same file are dropped. Values larger than the
+        whole budget are not cached.
+
+        Returns:
+            bool: True if the value was cached
+        """
+        try:
+            chave = self.chave(caminho, aba)
+        except OSError:
+            return False
+
+        tamanho = estimar_bytes(valor)
+        if tamanho > self.limite_bytes:
+            return False
+
+        if isinstance(valor, pd.DataFrame):
+            valor = valor.copy()
+        else:
+            valor = list(valor)
+
+        with self._lock:
+            # Versoes antigas do mesmo arquivo nunca mais serao consultadas
+            for antiga in [k for k in self._itens if k[0] == chave[0] and k[1:3] != chave[1:3]]:
+                self._remover(antiga)
+
+            if chave in self._itens:
+                self._remover(chave)
+            self._itens[chave] = (valor, tamanho)
+            self.bytes_usados += tamanho
+
+            while self.bytes_usados > self.limite_bytes and self._itens:
+                self._remover(next(iter(self._itens)))
+                self.evictions += 1
+        return True
+
+    def _remover(self, chave):
+        _, tamanho = self._itens.pop(chave)
+        self.bytes_usados -= tamanho
+
+    def limpar(self):
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._itens.clear()
+            self.bytes_usados = 0
+
+    def estatisticas(self):
+        """
+        Return cache counters.
+
+        Returns:
+            dict: entradas, bytes_usados, limite_bytes, hits, misses, evictions
+        """
+        with self._lock:
+            return {
+                "entradas": len(self._itens),
+                "bytes_usados": self.bytes_usados,
+                "limite_bytes": self.limite_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self):
+        return len(self._itens)
@@ -10,9 +10,38 @@ Classes:
     ADCLogic: Main class containing all data processing logic
 """
 import pandas as pd
+import numpy as np
 import os
 import json
+from contextlib import contextmanager
 from datetime import datetime
+from itertools import chain, count
+from core.numeric import converter_serie_numerica
+from core.cache import WorkbookCache
+from core.sidecar import SidecarCache
+from core.multi import executar_resumos, combinar_parciais
+from core.streaming import LeitorXlsxEmBlocos, DeduplicadorLinhas, fatiar_em_blocos, EXTENSOES_STREAMING
+from core.escrita import formato_saida, escrever_xlsx, escrever_csv, escrever_parquet
+from core.medicao import Medicao
+from core.texto import BuscaTexto
+from core.plano import PlanoLimpeza
+from core.filtros import regras_valor, descrever_regras, mascara_valor
+from core.ranking import RankingSKU, detectar_coluna_sku
+from core.perfil import PerfilExecucao, medir, perfilado
+from core.tipos import OtimizadorTipos, restaurar_categorias
+
+class _ColunasPorCabecalho:
+    """Column projection decided from the sheet header, remembered once resolved."""
+
+    def __init__(self, funcao):
+        self.funcao = funcao
+        self.indices = None
+
+    def __call__(self, colunas):
+        if self.indices is None:
+            self.indices = tuple(sorted(set(int(i) for i in self.funcao(list(colunas)))))
+        return self.indices
+
 
 class ADCLogic:
     """
@@ -26,13 +55,93 @@ class ADCLogic:
     
     Attributes:
         presets (list): List of cleaning preset configurations
-        cache_excel (dict): Cache for loaded Excel files
+        configuracoes (dict): Full contents of settings.json
+        cache_excel (WorkbookCache): LRU cache of parsed sheets and sheet-name lists
+        cache_disco (SidecarCache): Persistent Feather/Parquet cache ("cache_disco" in settings.json)
+        leitura_em_blocos (dict): Chunked-reading settings ("leitura_em_blocos" in settings.json):
+            ativo, linhas_por_bloco, tamanho_minimo_mb
+        dashboard (dict): Dashboard settings ("dashboard" in settings.json): pedidos_aproximados,
+            coluna_sku (name or letter; "" = header containing "SKU"), top_skus
+        registro (dict): Log panel settings ("registro" in settings.json): arquivo (mirror to a
+            rotating file), diretorio ("" = core.registro.diretorio_padrao), max_kb, backups,
+            max_linhas (lines kept in the widget), intervalo_ms (UI drain interval)
+        tipos (dict): Post-load dtype settings ("tipos" in settings.json): ativo,
+            max_categorias (distinct/filled ratio for category), minimo_linhas, inferir_numeros,
+            formato_numerico; presets add "tipos_colunas" hints (see core/tipos.py)
+        busca_texto (BuscaTexto): Cached lowercase views and inverted indexes used by filtro_por_texto
+        perfil (PerfilExecucao or None): Active stage profile (see perfilar); None = off
     """
     
-    def __init__(self):
-        """Initialize ADCLogic with presets loaded from configuration file."""
-        self.presets = self.carregar_presets()
-        self.cache_excel = {}
+    def __init__(self, limite_cache_mb=256):
+        """
+        Initialize ADCLogic with presets loaded from configuration file.
+        
+        Args:
+            limite_cache_mb (int): Memory budget of the workbook cache in MB (0 disables it)
+        """
+        self.configuracoes = self.carregar_configuracoes()
+        self.presets = self.configuracoes.get("presets", [])
+        self.cache_excel = WorkbookCache(limite_cache_mb * 1024 * 1024)
+        self.cache_disco = SidecarCache.de_configuracao(self.configuracoes.get("cache_disco"))
+        # Engine que funcionou / falhou por extensao (ex: {'.xls': 'openpyxl'})
+        self.engines_preferidos = {}
+        self.engines_falhos = {}
+        # Planilhas grandes sao lidas em blocos de linhas (memoria limitada)
+        self.leitura_em_blocos = {"ativo": True, "linhas_por_bloco": 50_000, "tamanho_minimo_mb": 40}
+        self.leitura_em_blocos.update(self.configuracoes.get("leitura_em_blocos") or {})
+        # Contagem de pedidos do Dashboard: exata ou estimada (HyperLogLog) para lotes enormes
+        self.dashboard = {"pedidos_aproximados": False, "coluna_sku": "", "top_skus": 10}
+        self.dashboard.update(self.configuracoes.get("dashboard") or {})
+        # Diario de atividades: lote de linhas a cada intervalo, espelhado em arquivo rotativo
+        self.registro = {"arquivo": True, "diretorio": "", "max_kb": 1024, "backups": 3,
+                         "max_linhas": 2000, "intervalo_ms": 100}
+        self.registro.update(self.configuracoes.get("registro") or {})
+        # Tipos compactos apos a leitura: categorias, inteiros menores, numeros das dicas do preset
+        self.tipos = {"ativo": True, "max_categorias": 0.5, "minimo_linhas": 1000,
+                      "inferir_numeros": False, "formato_numerico": "br"}
+        self.tipos.update(self.configuracoes.get("tipos") or {})
+        # Visao minuscula das colunas de texto, reaproveitada ao filtrar o mesmo DataFrame de novo
+        self.busca_texto = BuscaTexto()
+        # Perfil por etapa, so durante perfilar() (sem custo quando desligado)
+        self.perfil = None
+    
+    @contextmanager
+    def perfilar(self, log_callback=None, caminho=None, cprofile=None, memoria=True):
+        """
+        Profile the ADCLogic calls made inside a ``with`` block, stage by stage.
+        
+        Records calls, wall time, own time, rows in/out and peak memory of carregar_planilha
+        (whole sheet or per chunk), processar_limpeza, otimizar_tipos, the filter and
+        duplicate stages, aplicar_filtros_adicionais, gerar_resumo (numeric conversion, SKU
+        ranking) and salvar_planilha. Stages nest under the call that triggered them (e.g. chunks read
+        while salvar_planilha consumes processar_limpeza_em_blocos). Files summarized in
+        gerar_resumo_multi worker processes are not profiled.
+        
+        Example:
+            with logic.perfilar(log, caminho="perfil.json", cprofile="limpeza.prof"):
+                df = logic.processar_limpeza(entrada, aba, indices, opcoes, log)
+                logic.salvar_planilha(df, saida, log_callback=log)
+        
+        Args:
+            log_callback (callable, optional): Receives the report table at the end
+            caminho (str, optional): Save the report (JSON if it ends in .json, text otherwise)
+            cprofile (str, optional): Also record the block with cProfile and dump it here
+            memoria (bool): Sample peak memory of each stage
+            
+        Yields:
+            PerfilExecucao: The profile (relatorio(), texto(), salvar())
+        """
+        perfil = PerfilExecucao(memoria=memoria, cprofile=cprofile)
+        anterior, self.perfil = self.perfil, perfil
+        perfil.iniciar()
+        try:
+            yield perfil
+        finally:
+            perfil.parar()
+            self.perfil = anterior
+            if log_callback: log_callback(perfil.texto())
+            if caminho:
+                perfil.salvar(caminho)
     
     @staticmethod
     def limpar_valor(x):
@@ -49,6 +158,10 @@ class ADCLogic:
             
         Returns:
             float: Cleaned numeric value, or 0.0 if conversion fails
+            
+        Note:
+            For whole columns use core.numeric.converter_serie_numerica(serie, preservar_nan=True),
+            which returns the same values without a Python call per cell.
         """
         if isinstance(x, str):
             # Remove currency symbol, thousand separators (.), and replace decimal comma with dot
@@ -70,6 +183,9 @@ class ADCLogic:
             
         Returns:
             float: Cleaned numeric value, or 0.0 if conversion fails
+            
+        Note:
+            For whole columns use core.numeric.converter_serie_numerica(serie).
         """
         if pd.isna(val):
             return 0.0
@@ -87,13 +203,22 @@ class ADCLogic:
         """
         Load cleaning presets from config/settings.json file.
         
+        Returns:
+            list: List of preset dictionaries, empty list if file not found
+        """
+        return self.carregar_configuracoes().get("presets", [])
+
+    def carregar_configuracoes(self):
+        """
+        Load the whole config/settings.json file (presets and application settings).
+        
         Tries multiple paths to find the configuration file:
         1. Development path (relative to source file)
         2. Executable distribution path
         3. Fallback path
         
         Returns:
-            list: List of preset dictionaries, empty list if file not found
+            dict: Settings dictionary, empty dict if file not found
         """
         # Estrategia de busca de arquivo robusta
         caminhos_possiveis = [
@@ -109,11 +234,11 @@ class ADCLogic:
             if os.path.exists(caminho):
                 try:
                     with open(caminho, 'r', encoding='utf-8') as f:
-                        return json.load(f).get("presets", [])
+                        return json.load(f)
                 except Exception as e:
                     print(f"Erro ao ler config {caminho}: {e}")
                     continue
-        return []
+        return {}
 
     def salvar_presets(self, presets):
         """
@@ -126,6 +251,8 @@ class ADCLogic:
             tuple: (success: bool, message: str)
         """
         self.presets = presets
+        # Preserva as demais configuracoes (ex: cache_disco)
+        self.configuracoes["presets"] = presets
         
         # Tenta salvar no mesmo local que carregou ou no padrão dev
         caminho = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "config", "settings.json")
@@ -136,98 +263,438 @@ class ADCLogic:
         try:
             os.makedirs(os.path.dirname(caminho), exist_ok=True)
             with open(caminho, 'w', encoding='utf-8') as f:
-                json.dump({"presets": self.presets}, f, indent=4, ensure_ascii=False)
+                json.dump(self.configuracoes, f, indent=4, ensure_ascii=False)
             return True, "Presets salvos com sucesso."
         except Exception as e:
             return False, str(e)
 
-    def carregar_planilha(self, caminho, aba=None, log_callback=None):
+    def _ordem_engines(self, caminho):
+        """
+        Engines to try for a file, best candidate first.
+        
+        The engine that last worked for the file extension comes first and engines that
+        already failed for it go last, so repeated loads do not re-run known failures.
+        
+        Args:
+            caminho (str): Path to Excel file
+            
+        Returns:
+            list: Engine names (None = let pandas decide)
+        """
+        extensao = os.path.splitext(caminho)[1].lower()
+        padrao = ['xlrd', 'openpyxl', None] if extensao == '.xls' else ['openpyxl', 'xlrd', None]
+        
+        preferido = self.engines_preferidos.get(extensao)
+        if preferido in padrao:
+            padrao.remove(preferido)
+            padrao.insert(0, preferido)
+        
+        falhos = self.engines_falhos.get(extensao, set())
+        return [e for e in padrao if e not in falhos] + [e for e in padrao if e in falhos]
+
+    def _registrar_engine(self, caminho, engine, sucesso):
+        """Remember which engine worked (or failed) for the file extension."""
+        extensao = os.path.splitext(caminho)[1].lower()
+        if sucesso:
+            self.engines_preferidos[extensao] = engine
+            self.engines_falhos.get(extensao, set()).discard(engine)
+        elif self.engines_preferidos.get(extensao) != engine:
+            self.engines_falhos.setdefault(extensao, set()).add(engine)
+
+    def carregar_planilha(self, caminho, aba=None, log_callback=None, colunas=None, excluir_colunas=None,
+                          linhas_por_bloco=None, progress_callback=None):
         """
         Load Excel spreadsheet with robust error handling.
         
         Features:
         - Automatic engine selection (.xls vs .xlsx)
-        - Fallback to alternate engine on failure
+        - Fallback to alternate engine on failure, remembering the working engine per extension
         - Empty sheet name handling (loads first sheet)
+        - A single opened ExcelFile serves both sheet discovery and parsing
+        - Parsed sheets and sheet names are served from cache_excel while the file is unchanged
+        - Previously parsed sheets are memory-mapped from cache_disco (Feather/Parquet sidecar)
+        - Column projection: only the requested columns are parsed (``usecols``)
         
         Args:
             caminho (str): Path to Excel file
             aba (str, optional): Sheet name. None returns ExcelFile object, "" loads first sheet
             log_callback (callable, optional): Callback function for logging
+            colunas (list or callable, optional): 0-based indices of the only columns to
+                load; indices beyond the last column are ignored. A callable receives the
+                header's column names and returns the indices; the header is parsed from the
+                same opened workbook as the data (or taken from the cache)
+            excluir_colunas (list, optional): 0-based indices of columns to skip
+            linhas_por_bloco (int, optional): Stream the sheet and return an iterator of
+                DataFrame chunks with at most this many rows (.xlsx via openpyxl read-only)
+            progress_callback (callable, optional): With linhas_por_bloco, called as
+                (linhas_lidas, linhas_estimadas) before each chunk is yielded; linhas_estimadas
+                comes from the dimensions stored in the file and is None when unknown
             
         Returns:
-            pd.DataFrame or pd.ExcelFile: Loaded data or ExcelFile object
+            pd.DataFrame, iterator or pd.ExcelFile: Loaded data, chunk iterator (with
+            linhas_por_bloco) or ExcelFile object
             
         Raises:
             Exception: If file cannot be loaded with any engine
         """
         try:
             if log_callback and aba: log_callback(f"Tentando carregar aba: {aba}")
-            
-            # Determine engine usage
-            engine = 'xlrd' if caminho.lower().endswith('.xls') else 'openpyxl'
 
             if aba is None:
                 # Retorna apenas o objeto para listar abas
-                # Try multiple engines for better compatibility
-                for eng in [engine, 'openpyxl', 'xlrd', None]:
-                    try:
-                        return pd.ExcelFile(caminho, engine=eng)
-                    except:
-                        continue
-                raise Exception("Nao foi possivel abrir o arquivo com nenhum engine disponivel")
+                xl, _ = self._abrir_excel(caminho, log_callback)
+                return xl
             
             # FIX: Tratamento para aba vazia (string vazia)
             if aba == "":
                 if log_callback: log_callback("[WARNING] Nenhuma aba especificada. Carregando a primeira disponivel.")
-                # Try to get sheet names with fallback engines
-                xl_file = None
-                for eng in [engine, 'openpyxl', 'xlrd', None]:
-                    try:
-                        xl_file = pd.ExcelFile(caminho, engine=eng)
-                        aba = xl_file.sheet_names[0]
-                        if log_callback: log_callback(f"[OK] Primeira aba identificada: {aba} (engine: {eng})")
-                        break
-                    except:
-                        continue
-                
-                if xl_file is None or not aba:
-                    raise Exception("Nao foi possivel abrir o arquivo para listar abas")
+                abas = self.cache_excel.obter(caminho, None) or self.cache_disco.ler_abas(caminho)
+                if abas:
+                    aba = abas[0]
+                    if log_callback: log_callback(f"[OK] Primeira aba identificada: {aba} (cache)")
 
-            # Try primary engine first
-            try:
-                df = pd.read_excel(caminho, sheet_name=aba, engine=engine)
-                if log_callback: log_callback(f"[OK] Planilha carregada com engine {engine}")
-                return df
-            except Exception as e1:
-                if log_callback: log_callback(f"[WARNING] Engine {engine} falhou: {str(e1)[:100]}")
-                
-                # Try alternate engine
-                engine_alt = 'openpyxl' if engine == 'xlrd' else 'xlrd'
-                try:
-                    df = pd.read_excel(caminho, sheet_name=aba, engine=engine_alt)
-                    if log_callback: log_callback(f"[OK] Planilha carregada com engine alternativo {engine_alt}")
-                    return df
-                except Exception as e2:
-                    if log_callback: log_callback(f"[WARNING] Engine {engine_alt} tambem falhou: {str(e2)[:100]}")
-                    
-                    # Last resort: try without specifying engine (let pandas decide)
-                    try:
-                        df = pd.read_excel(caminho, sheet_name=aba)
-                        if log_callback: log_callback("[OK] Planilha carregada com engine automatico")
-                        return df
-                    except Exception as e3:
-                        # All methods failed, raise detailed error
-                        error_msg = f"Falha ao carregar planilha com todos os metodos:\n"
-                        error_msg += f"  - {engine}: {str(e1)[:80]}\n"
-                        error_msg += f"  - {engine_alt}: {str(e2)[:80]}\n"
-                        error_msg += f"  - Auto: {str(e3)[:80]}"
-                        raise Exception(error_msg)
+            projecao = self._resolver_projecao(caminho, aba, self._projecao(colunas, excluir_colunas))
+            if linhas_por_bloco:
+                return self._carregar_em_blocos(caminho, aba, linhas_por_bloco, projecao, log_callback,
+                                                progress_callback)
             
+            with medir(self.perfil, "carregar_planilha") as etapa:
+                df = self._buscar_cache(caminho, aba, projecao, log_callback) if aba else None
+                if df is None:
+                    aba, df = self._ler_aba(caminho, aba, log_callback, projecao)
+                    chave = self._chave_aba(aba, self._resolver_projecao(caminho, aba, projecao))
+                    self.cache_excel.guardar(caminho, chave, df)
+                    self._gravar_cache_disco(caminho, chave, df, log_callback)
+                etapa.linhas_saida = len(df)
             return df
         except Exception as e:
             raise Exception(f"Erro ao carregar planilha: {e}")
 
+    def _carregar_em_blocos(self, caminho, aba, linhas_por_bloco, projecao=None, log_callback=None,
+                            progress_callback=None):
+        """
+        Generator behind carregar_planilha(linhas_por_bloco=N).
+        
+        Cached sheets are sliced from memory; .xlsx files are streamed with openpyxl in
+        read-only mode; other formats (xlrd) are loaded whole and sliced.
+        """
+        def _fatiar(df):
+            lidas = 0
+            for bloco in fatiar_em_blocos(df, linhas_por_bloco):
+                lidas += len(bloco)
+                if progress_callback: progress_callback(lidas, len(df))
+                yield bloco
+
+        try:
+            if not aba:
+                abas = self.cache_excel.obter(caminho, None) or self.cache_disco.ler_abas(caminho)
+                if abas: aba = abas[0]
+            projecao = self._resolver_projecao(caminho, aba, projecao)
+            if aba:
+                df = self._buscar_cache(caminho, aba, projecao, log_callback)
+                if df is not None:
+                    yield from _fatiar(df)
+                    return
+            
+            if os.path.splitext(caminho)[1].lower() not in EXTENSOES_STREAMING:
+                # xlrd nao le em streaming: carrega a aba inteira e fatia
+                aba, df = self._ler_aba(caminho, aba, log_callback, projecao)
+                yield from _fatiar(df)
+                return
+            
+            if log_callback: log_callback(f"[INFO] Lendo planilha em blocos de {linhas_por_bloco} linhas...")
+            leitor = LeitorXlsxEmBlocos(caminho, aba, linhas_por_bloco, projecao)
+            blocos = iter(leitor)
+            for i in count():
+                # Cada bloco lido conta como uma chamada de carregar_planilha no perfil
+                with medir(self.perfil, "carregar_planilha") as etapa:
+                    bloco = next(blocos, None)
+                    etapa.linhas_saida = 0 if bloco is None else len(bloco)
+                if bloco is None:
+                    break
+                if i == 0:
+                    self._guardar_abas(caminho, leitor.abas)
+                    self._guardar_cabecalho(caminho, leitor.aba, leitor.cabecalho)
+                if progress_callback: progress_callback(leitor.linhas_lidas, leitor.linhas_estimadas)
+                yield bloco
+            if log_callback: log_callback(f"[OK] {leitor.linhas_lidas} linhas lidas em blocos ({leitor.aba})")
+        except Exception as e:
+            raise Exception(f"Erro ao carregar planilha: {e}")
+
+    def _blocos_para(self, caminho, linhas_por_bloco=None):
+        """
+        Rows per chunk for a job: the explicit value, or automatic by file size.
+        
+        Returns:
+            int: Rows per chunk, or 0 to load the whole sheet at once
+        """
+        if linhas_por_bloco is not None:
+            return int(linhas_por_bloco)
+        config = self.leitura_em_blocos
+        if not config.get("ativo") or os.path.splitext(caminho)[1].lower() not in EXTENSOES_STREAMING:
+            return 0
+        try:
+            tamanho_mb = os.path.getsize(caminho) / (1024 * 1024)
+        except OSError:
+            return 0
+        return int(config["linhas_por_bloco"]) if tamanho_mb >= config["tamanho_minimo_mb"] else 0
+
+    @staticmethod
+    def _projecao(colunas=None, excluir_colunas=None):
+        """
+        Normalize a column projection to None, ('usar', indices), ('excluir', indices) or
+        ('cabecalho', resolver) when the columns depend on the header (see _resolver_projecao).
+        """
+        if callable(colunas):
+            return ("cabecalho", colunas if isinstance(colunas, _ColunasPorCabecalho) else _ColunasPorCabecalho(colunas))
+        if colunas is not None:
+            return ("usar", tuple(sorted(set(int(i) for i in colunas))))
+        if excluir_colunas:
+            return ("excluir", tuple(sorted(set(int(i) for i in excluir_colunas))))
+        return None
+
+    def _resolver_projecao(self, caminho, aba, projecao):
+        """
+        Turn a ('cabecalho', resolver) projection into ('usar', indices) once the header is
+        known: resolved before, or cached (memory/disk header, or the full sheet in memory).
+        Otherwise it is returned unchanged and resolved by the parser that reads the header.
+        """
+        if projecao is None or projecao[0] != "cabecalho":
+            return projecao
+        resolver = projecao[1]
+        if resolver.indices is None and aba:
+            cabecalho = self._cabecalho_em_cache(caminho, aba)
+            if cabecalho is None:
+                inteira = self.cache_excel.obter(caminho, aba)
+                cabecalho = None if inteira is None else inteira.iloc[:0]
+            if cabecalho is not None:
+                resolver(cabecalho.columns)
+        return projecao if resolver.indices is None else ("usar", resolver.indices)
+
+    @staticmethod
+    def _chave_aba(aba, projecao):
+        """Cache key of a (possibly projected) sheet; full sheets keep the plain sheet name."""
+        return aba if projecao is None else (aba,) + projecao
+
+    @staticmethod
+    def _projetar(df, projecao):
+        """Apply a column projection to an already loaded sheet."""
+        modo, indices = projecao
+        if modo == "cabecalho":
+            modo, indices = "usar", indices(df.columns)
+        if modo == "usar":
+            posicoes = [i for i in indices if i < df.shape[1]]
+        else:
+            excluir = set(indices)
+            posicoes = [i for i in range(df.shape[1]) if i not in excluir]
+        return df.iloc[:, posicoes]
+
+    def _buscar_cache(self, caminho, aba, projecao=None, log_callback=None):
+        """
+        Look up a sheet in the memory and disk caches.
+        
+        A projected load is served from a cached projection with the same columns or,
+        failing that, by projecting the cached full sheet.
+        
+        Returns:
+            pd.DataFrame or None: Cached frame, or None on a miss
+        """
+        # Projecao ainda sem cabecalho: so a aba inteira em cache serve
+        resolvida = projecao is None or projecao[0] != "cabecalho"
+        chave = self._chave_aba(aba, projecao) if resolvida else None
+        
+        # Cache: mesmo arquivo (path, mtime, tamanho) e mesma aba ja foram lidos
+        df = self.cache_excel.obter(caminho, chave) if resolvida else None
+        if df is None and projecao:
+            df = self.cache_excel.obter(caminho, aba)
+            if df is not None: df = self._projetar(df, projecao)
+        if df is not None:
+            if log_callback: log_callback(f"[OK] Planilha carregada do cache ({aba})")
+            return df
+        
+        # Cache em disco: mesmo conteudo (hash) ja foi lido em outra sessao
+        df = self.cache_disco.ler(caminho, chave) if resolvida else None
+        if df is None and projecao:
+            df = self.cache_disco.ler(caminho, aba)
+            if df is not None: df = self._projetar(df, projecao)
+        if df is not None:
+            if log_callback: log_callback(f"[OK] Planilha carregada do cache em disco ({aba})")
+            self.cache_excel.guardar(caminho, self._chave_aba(aba, self._resolver_projecao(caminho, aba, projecao)), df)
+            return df
+        return None
+
+    def _guardar_cabecalho(self, caminho, aba, cabecalho):
+        """Store the sheet header (zero-row DataFrame) in the memory and disk caches."""
+        chave = (aba, "cabecalho")
+        self.cache_excel.guardar(caminho, chave, cabecalho)
+        try:
+            self.cache_disco.gravar(caminho, chave, cabecalho)
+        except Exception:
+            pass
+
+    def ler_cabecalho(self, caminho, aba, log_callback=None):
+        """
+        Read only the header row of a sheet.
+        
+        Served from cache when the sheet was already loaded; otherwise the workbook is
+        opened once and parsed with ``nrows=0`` (the first sheet of that same handle when
+        ``aba`` is empty and the sheet names are not cached).
+        
+        Args:
+            caminho (str): Path to Excel file
+            aba (str): Sheet name ("" = first sheet)
+            log_callback (callable, optional): Callback function for logging
+            
+        Returns:
+            pd.DataFrame: Zero-row DataFrame with the sheet's columns
+        """
+        if not aba:
+            abas = self.cache_excel.obter(caminho, None) or self.cache_disco.ler_abas(caminho)
+            aba = abas[0] if abas else aba
+        
+        cabecalho = self._cabecalho_em_cache(caminho, aba) if aba else None
+        if cabecalho is not None:
+            return cabecalho
+        
+        xl, _ = self._abrir_excel(caminho, log_callback)
+        with xl:
+            if not aba and xl.sheet_names:
+                aba = xl.sheet_names[0]
+            cabecalho = xl.parse(aba, nrows=0)
+        self._guardar_cabecalho(caminho, aba, cabecalho)
+        return cabecalho
+
+    def _cabecalho_em_cache(self, caminho, aba):
+        """Header of a sheet from the memory or disk cache, or None."""
+        chave = (aba, "cabecalho")
+        cabecalho = self.cache_excel.obter(caminho, chave)
+        if cabecalho is None:
+            cabecalho = self.cache_disco.ler(caminho, chave)
+            if cabecalho is not None:
+                self.cache_excel.guardar(caminho, chave, cabecalho)
+        return cabecalho
+
+    def _guardar_abas(self, caminho, abas):
+        """Store the sheet-name list in the memory and disk caches."""
+        self.cache_excel.guardar(caminho, None, abas)
+        try:
+            self.cache_disco.gravar_abas(caminho, abas)
+        except OSError:
+            pass
+
+    def _gravar_cache_disco(self, caminho, aba, df, log_callback=None):
+        """Write the parsed sheet to the disk cache; failures only produce a warning."""
+        if not self.cache_disco.ativo:
+            return
+        try:
+            if self.cache_disco.gravar(caminho, aba, df):
+                if log_callback: log_callback("[OK] Planilha gravada no cache em disco")
+            elif log_callback:
+                log_callback("[INFO] Planilha com tipos nao suportados pelo cache em disco")
+        except Exception as e:
+            if log_callback: log_callback(f"[WARNING] Cache em disco indisponivel: {str(e)[:100]}")
+
+    def _abrir_excel(self, caminho, log_callback=None):
+        """
+        Open an ExcelFile handle, trying engines in _ordem_engines order.
+        
+        Args:
+            caminho (str): Path to Excel file
+            log_callback (callable, optional): Callback function for logging
+            
+        Returns:
+            tuple: (pd.ExcelFile, engine)
+            
+        Raises:
+            Exception: If no engine can open the file
+        """
+        falhas = []
+        for eng in self._ordem_engines(caminho):
+            try:
+                xl = pd.ExcelFile(caminho, engine=eng)
+                self._registrar_engine(caminho, eng, True)
+                self._guardar_abas(caminho, xl.sheet_names)
+                return xl, eng
+            except Exception as e:
+                self._registrar_engine(caminho, eng, False)
+                falhas.append(f"  - {eng or 'Auto'}: {str(e)[:80]}")
+        raise Exception("Nao foi possivel abrir o arquivo com nenhum engine disponivel:\n" + "\n".join(falhas))
+
+    def _ler_aba(self, caminho, aba, log_callback=None, projecao=None):
+        """
+        Open the workbook once and parse one sheet from the same handle.
+        
+        If ``aba`` is empty the first sheet of the opened handle is used. When an engine
+        opens the file but fails to parse the sheet, the next engine is tried.
+        
+        Args:
+            caminho (str): Path to Excel file
+            aba (str): Sheet name ("" = first sheet)
+            log_callback (callable, optional): Callback function for logging
+            projecao (tuple, optional): Column projection from _projecao
+            
+        Returns:
+            tuple: (sheet name, pd.DataFrame)
+            
+        Raises:
+            Exception: If every engine fails
+        """
+        falhas = []
+        for eng in self._ordem_engines(caminho):
+            try:
+                with pd.ExcelFile(caminho, engine=eng) as xl:
+                    self._guardar_abas(caminho, xl.sheet_names)
+                    if not aba:
+                        if not xl.sheet_names:
+                            raise Exception("Nao foi possivel abrir o arquivo para listar abas")
+                        aba = xl.sheet_names[0]
+                        if log_callback: log_callback(f"[OK] Primeira aba identificada: {aba} (engine: {eng})")
+                    df, cabecalho = self._parse_projetado(xl, aba, projecao)
+                self._registrar_engine(caminho, eng, True)
+                if cabecalho is not None:
+                    self._guardar_cabecalho(caminho, aba, cabecalho)
+                if log_callback: log_callback(f"[OK] Planilha carregada com engine {eng or 'automatico'}")
+                return aba, df
+            except Exception as e:
+                self._registrar_engine(caminho, eng, False)
+                if log_callback: log_callback(f"[WARNING] Engine {eng or 'automatico'} falhou: {str(e)[:100]}")
+                falhas.append(f"  - {eng or 'Auto'}: {str(e)[:80]}")
+        
+        # All methods failed, raise detailed error
+        raise Exception("Falha ao carregar planilha com todos os metodos:\n" + "\n".join(falhas))
+
+    @staticmethod
+    def _parse_projetado(xl, aba, projecao):
+        """
+        Parse a sheet passing the column projection down to the parser as ``usecols``.
+        
+        Returns:
+            tuple: (pd.DataFrame, header as zero-row DataFrame or None if not known)
+        """
+        if projecao is None:
+            return xl.parse(aba), None
+        
+        modo, indices = projecao
+        if modo == "cabecalho":
+            # Colunas decididas pelo cabecalho, lido do mesmo handle que os dados
+            cabecalho = xl.parse(aba, nrows=0)
+            df, _ = ADCLogic._parse_projetado(xl, aba, ("usar", indices(cabecalho.columns)))
+            return df, cabecalho
+        if modo == "excluir":
+            # usecols por posicao nao aceita "todas menos": exclui pelos nomes do cabecalho
+            # (os mesmos nomes desduplicados/"Unnamed: N" que o parse completo geraria)
+            cabecalho = xl.parse(aba, nrows=0)
+            nomes = list(cabecalho.columns)
+            excluir = {nomes[i] if i < len(nomes) else f"Unnamed: {i}" for i in indices}
+            return xl.parse(aba, usecols=lambda nome: nome not in excluir), cabecalho
+        
+        try:
+            return xl.parse(aba, usecols=list(indices)), None
+        except pd.errors.ParserError:
+            # Planilha mais estreita que a projecao: le tudo e mantem as colunas existentes
+            df = xl.parse(aba)
+            return ADCLogic._projetar(df, projecao), df.iloc[:0]
+
     def listar_abas(self, caminho, log_callback=None):
         """
         List all sheet names in an Excel file.
@@ -243,13 +710,13 @@ class ADCLogic:
             Exception: If file cannot be read
         """
         try:
-            xl = self.carregar_planilha(caminho) # Retorna ExcelFile neste caso
-            if isinstance(xl, pd.ExcelFile):
-                 return xl.sheet_names
-            # Fallback
-            engine = 'xlrd' if caminho.lower().endswith('.xls') else 'openpyxl'
-            xl = pd.ExcelFile(caminho, engine=engine)
-            return xl.sheet_names
+            abas = self.cache_excel.obter(caminho, None) or self.cache_disco.ler_abas(caminho)
+            if abas:
+                return abas
+            
+            xl, _ = self._abrir_excel(caminho, log_callback)
+            with xl:
+                return xl.sheet_names
         except Exception as e:
              if log_callback: log_callback(f"Erro ao listar abas: {e}")
              raise e
@@ -302,16 +769,19 @@ class ADCLogic:
         if log_callback: log_callback(f"[OK] Indices validados: {indices}")
         return True
 
-    def processar_limpeza(self, caminho_entrada, aba, indices_deletar, opcoes_filtros=None, log_callback=None):
+    @perfilado("processar_limpeza", linhas_saida=len)
+    def processar_limpeza(self, caminho_entrada, aba, indices_deletar, opcoes_filtros=None, log_callback=None,
+                          linhas_por_bloco=None, progress_callback=None):
         """
         Main data cleaning pipeline.
         
         Process flow:
         1. Validate input file
-        2. Load spreadsheet
-        3. Validate column indices
-        4. Delete specified columns
-        5. Apply additional filters (if provided)
+        2. Load spreadsheet without the columns to delete (they are never parsed)
+        3. Validate column indices against the sheet header
+        4. Log deleted columns
+        5. Compact column dtypes (otimizar_tipos)
+        6. Apply the row filters as one lazy plan (planejar_limpeza), materialized once
         
         Args:
             caminho_entrada (str): Path to input Excel file
@@ -319,70 +789,244 @@ class ADCLogic:
             indices_deletar (list): List of column indices to delete (0-based)
             opcoes_filtros (dict, optional): Filter options with keys:
                 - remover_duplicadas (bool): Remove duplicate rows
+                - chave_duplicadas (list or str): Key columns (names or Excel letters) that
+                  identify a duplicate, e.g. "B, Z" (default: whole row)
+                - modo_duplicadas (str): 'linha' (compare values) or 'hash' (64-bit row
+                  digests, lower memory; see core/duplicadas.py)
                 - remover_vazias (bool): Remove empty rows
-                - filtro_valor (dict): {'ativo': bool, 'minimo': float, 'coluna': str}
-                - filtro_texto (dict): {'ativo': bool, 'texto': str}
+                - filtro_valor (dict): {'ativo': bool, 'coluna': str, 'minimo': float, 'maximo': float}
+                  'coluna' is a name or Excel letter; 'colunas' takes several (see core/filtros.py)
+                - filtro_texto (dict): {'ativo': bool, 'texto': str, 'prefixo': bool, 'indexado': bool}
+                - tipos_colunas (dict): Column name or Excel letter -> "categoria", "texto",
+                  "inteiro" or "decimal" (see core/tipos.py)
             log_callback (callable, optional): Callback function for logging
+            linhas_por_bloco (int, optional): Process the sheet in chunks of this many rows
+                (default: automatic by file size, see leitura_em_blocos; 0 = whole sheet)
+            progress_callback (callable, optional): Called as (percentual, mensagem) between
+                stages and after each chunk (percentual is None when the row total is unknown);
+                an exception raised by it (e.g. TarefaCancelada) stops the pipeline there
             
         Returns:
             pd.DataFrame: Cleaned DataFrame
         """
+        progresso = progress_callback or (lambda percentual, mensagem=None: None)
+        blocos = self._blocos_para(caminho_entrada, linhas_por_bloco)
+        if blocos:
+            partes = list(self.processar_limpeza_em_blocos(caminho_entrada, aba, indices_deletar, opcoes_filtros, log_callback,
+                                                           blocos, progress_callback))
+            progresso(97, "Juntando blocos...")
+            return partes[0] if len(partes) == 1 else restaurar_categorias(pd.concat(partes), partes[0])
+        
         # 1. Validar Arquivo
+        progresso(2, "Validando arquivo...")
         self.validar_arquivo_entrada(caminho_entrada, log_callback)
 
-        # 2. Carregar
-        df = self.carregar_planilha(caminho_entrada, aba, log_callback)
+        # 2. Carregar apenas as colunas mantidas (projecao passada ao parser)
+        progresso(5, "Lendo planilha...")
+        df_limpo = self.carregar_planilha(caminho_entrada, aba, log_callback, excluir_colunas=indices_deletar)
         
-        # 3. Validar Índices
-        self.validar_indices_colunas(df, indices_deletar, log_callback)
+        # 3. Validar Índices (cabecalho ja esta em cache apos o carregamento)
+        progresso(75, "Validando colunas...")
+        cabecalho = self.ler_cabecalho(caminho_entrada, aba, log_callback)
+        self.validar_indices_colunas(cabecalho, indices_deletar, log_callback)
 
         # 4. Deletar Colunas
         if log_callback: log_callback("Removendo colunas selecionadas...")
-        validador_indices = [i for i in indices_deletar if i < len(df.columns)]
-        colunas_deletar = [df.columns[i] for i in validador_indices]
+        validador_indices = [i for i in indices_deletar if i < len(cabecalho.columns)]
+        colunas_deletar = [cabecalho.columns[i] for i in validador_indices]
         if log_callback: log_callback(f"[OK] Deletando colunas: {colunas_deletar}")
         
-        df_limpo = df.drop(df.columns[validador_indices], axis=1)
+        # 5. Tipos compactos antes dos filtros (memoria menor em todas as etapas seguintes)
+        progresso(78, "Otimizando tipos...")
+        df_limpo = self.otimizar_tipos(df_limpo, (opcoes_filtros or {}).get("tipos_colunas"), log_callback,
+                                       list(cabecalho.columns))
         
-        # 5. Filtros Extras
-        if opcoes_filtros:
-             return self.aplicar_filtros_adicionais(df_limpo, opcoes_filtros, log_callback)
-        
-        # Default behavior if no options passed (backward compatibility)
-        if log_callback: log_callback("Removendo duplicatas e vazios (padrão)...")
-        df_limpo = df_limpo.drop_duplicates()
-        df_limpo = df_limpo.dropna(how='all') 
+        # 6. Filtros de linhas: plano unico, materializado uma vez
+        if not opcoes_filtros:
+            # Default behavior if no options passed (backward compatibility)
+            if log_callback: log_callback("Removendo duplicatas e vazios (padrão)...")
+        progresso(80, "Aplicando filtros...")
+        plano = self.planejar_limpeza(opcoes_filtros, indices_deletar, list(cabecalho.columns))
+        df_limpo = plano.executar(df_limpo, log_callback, perfil=self.perfil)
+        if log_callback: log_callback(plano.explicar())
         
         return df_limpo
 
-    def aplicar_filtros_adicionais(self, df, opcoes, log_callback=None):
-        linhas_iniciais = len(df)
+    def processar_limpeza_em_blocos(self, caminho_entrada, aba, indices_deletar, opcoes_filtros=None,
+                                    log_callback=None, linhas_por_bloco=None, progress_callback=None):
+        """
+        Chunked cleaning pipeline: same steps as processar_limpeza, one chunk at a time.
+        
+        Only one chunk of the input is held in memory. Duplicate removal spans chunks
+        through a set of row (or key) digests (DeduplicadorLinhas).
+        
+        Args:
+            caminho_entrada (str): Path to input Excel file
+            aba (str): Sheet name to process
+            indices_deletar (list): List of column indices to delete (0-based)
+            opcoes_filtros (dict, optional): Same options as processar_limpeza
+            log_callback (callable, optional): Callback function for logging
+            linhas_por_bloco (int, optional): Rows per chunk (default: leitura_em_blocos)
+            progress_callback (callable, optional): Called as (percentual, mensagem) before
+                reading and after each chunk is read (see processar_limpeza)
+            
+        Yields:
+            pd.DataFrame: Cleaned chunks, in sheet order
+        """
+        if progress_callback: progress_callback(2, "Validando arquivo...")
+        self.validar_arquivo_entrada(caminho_entrada, log_callback)
+        linhas_por_bloco = linhas_por_bloco or int(self.leitura_em_blocos["linhas_por_bloco"])
+        
+        def _linhas(lidas, estimadas):
+            # Leitura + filtros de cada bloco ocupam 5-95%; sem estimativa so a contagem avanca
+            percentual = 5 + 90 * min(lidas / estimadas, 1.0) if estimadas else None
+            progress_callback(percentual, f"{lidas} linhas processadas...")
+        
+        if progress_callback: progress_callback(5, "Lendo planilha em blocos...")
+        fonte = self.carregar_planilha(caminho_entrada, aba, log_callback, excluir_colunas=indices_deletar,
+                                       linhas_por_bloco=linhas_por_bloco,
+                                       progress_callback=_linhas if progress_callback else None)
+        try:
+            primeiro = next(fonte)
+            
+            # Cabecalho ja esta em cache apos o primeiro bloco
+            cabecalho = self.ler_cabecalho(caminho_entrada, aba, log_callback)
+            self.validar_indices_colunas(cabecalho, indices_deletar, log_callback)
+            colunas_deletar = [cabecalho.columns[i] for i in indices_deletar if i < len(cabecalho.columns)]
+            if log_callback: log_callback(f"[OK] Deletando colunas: {colunas_deletar}")
+            
+            # Plano compilado uma vez; as contagens somam todos os blocos
+            plano = self.planejar_limpeza(opcoes_filtros, indices_deletar, list(cabecalho.columns))
+            deduplicador = DeduplicadorLinhas(plano.modo_duplicadas)
+            otimizador = OtimizadorTipos.de_configuracao(self.tipos, (opcoes_filtros or {}).get("tipos_colunas"),
+                                                         list(cabecalho.columns))
+            for bloco in chain([primeiro], fonte):
+                if otimizador is not None:
+                    with medir(self.perfil, "otimizar_tipos", len(bloco)):
+                        bloco = otimizador.otimizar(bloco)
+                yield plano.executar(bloco, deduplicador=deduplicador, perfil=self.perfil)
+            
+            self._registrar_tipos(otimizador, log_callback)
+            if log_callback:
+                if plano.remover_duplicadas:
+                    log_callback(plano.mensagem_duplicatas(deduplicador.removidas))
+                log_callback(f"[OK] {plano.linhas_lidas} linhas lidas em blocos, {plano.linhas_mantidas} mantidas apos filtros")
+                log_callback(plano.explicar())
+        finally:
+            fonte.close()
+
+    def otimizar_tipos(self, df, dicas=None, log_callback=None, cabecalho=None):
+        """
+        Return ``df`` with compact dtypes and log the memory saved (see core/tipos.py).
         
-        # Filtro 1: Remover linhas duplicadas
-        if opcoes.get('remover_duplicadas'):
-            df = df.drop_duplicates()
-            if log_callback: log_callback(f"  🔄 Duplicatas removidas: {linhas_iniciais - len(df)}")
+        Text columns with few distinct values become category, integer columns are
+        downcast, and columns hinted "inteiro"/"decimal" are parsed (BR/US rules) into
+        integer or float32 storage. ``df`` itself is not modified, so a cached sheet keeps
+        its original dtypes. Does nothing when the "tipos" setting has "ativo": false.
         
-        # Filtro 2: Remover linhas vazias/incompletas
-        if opcoes.get('remover_vazias'):
-            linhas_antes = len(df)
-            df = df.dropna(how='all')
-            # Limpeza agressiva apenas se muitos nas
-            # df = df.dropna(thresh=len(df.columns) // 2)
-            if log_callback: log_callback(f"  🗑️ Vazias removidas: {linhas_antes - len(df)}")
+        Args:
+            df (pd.DataFrame): Loaded sheet
+            dicas (dict, optional): Column name or Excel letter -> "categoria", "texto",
+                "inteiro" or "decimal" (a preset's "tipos_colunas")
+            log_callback (callable, optional): Callback function for logging
+            cabecalho (list, optional): Original sheet header, for Excel letters
+            
+        Returns:
+            pd.DataFrame: Optimized frame (``df`` when no column changed)
+            
+        Raises:
+            ValueError: If a hint is not one of core.tipos.TIPOS_COLUNA
+        """
+        otimizador = OtimizadorTipos.de_configuracao(self.tipos, dicas, cabecalho)
+        if otimizador is None:
+            return df
+        with medir(self.perfil, "otimizar_tipos", len(df)):
+            df = otimizador.otimizar(df)
+        self._registrar_tipos(otimizador, log_callback)
+        return df
+
+    @staticmethod
+    def _registrar_tipos(otimizador, log_callback):
+        if otimizador is None or not log_callback:
+            return
+        for coluna, motivo in otimizador.ignoradas.items():
+            log_callback(f"[WARNING] Tipo da coluna '{coluna}' mantido: {motivo}")
+        for coluna, alvo in otimizador.alargadas.items():
+            log_callback(f"[INFO] Coluna '{coluna}': blocos que nao cabem em {alvo} ficaram com tipo mais largo")
+        log_callback(otimizador.resumo())
 
-        # Filtro 3: Filtrar por valor mínimo
-        filtro_val = opcoes.get('filtro_valor', {})
-        if filtro_val.get('ativo'):
-            df = self.filtro_por_valor_minimo(df, filtro_val.get('minimo', 0), filtro_val.get('coluna'), log_callback)
+    def planejar_limpeza(self, opcoes_filtros=None, indices_deletar=(), cabecalho=None):
+        """
+        Compile filter options into a lazy cleaning plan (see core/plano.py).
+        
+        Row-wise filters run cheapest first over the rows still alive, duplicates are
+        removed last and the result is materialized once. ``plano.explicar()`` shows the
+        stages and the rows each one removed.
+        
+        Args:
+            opcoes_filtros (dict, optional): Same options as processar_limpeza (default:
+                remove duplicates and empty rows)
+            indices_deletar (iterable): Column indices excluded at load time (for explicar)
+            cabecalho (list, optional): Original sheet header (Excel letters in filtro_valor)
+            
+        Returns:
+            PlanoLimpeza: Compiled plan
+        """
+        opcoes = opcoes_filtros or {"remover_duplicadas": True, "remover_vazias": True}
+        return PlanoLimpeza.compilar(opcoes, self.busca_texto, indices_deletar, cabecalho)
 
-        # Filtro 4: Filtrar por texto
-        filtro_txt = opcoes.get('filtro_texto', {})
-        if filtro_txt.get('ativo'):
-            df = self.filtro_por_texto(df, filtro_txt.get('texto', ''), log_callback)
+    def aplicar_filtros_adicionais(self, df, opcoes, log_callback=None, deduplicador=None):
+        """
+        Apply the row filters in ``opcoes`` with a single fused selection.
+        
+        Args:
+            df (pd.DataFrame): DataFrame to filter
+            opcoes (dict): Filter options (see processar_limpeza)
+            log_callback (callable, optional): Callback function for logging
+            deduplicador (DeduplicadorLinhas, optional): Cross-chunk duplicate tracker
             
+        Returns:
+            pd.DataFrame: Filtered DataFrame
+        """
+        with medir(self.perfil, "aplicar_filtros_adicionais", len(df)) as etapa:
+            df = PlanoLimpeza.compilar(opcoes, self.busca_texto).executar(df, log_callback, deduplicador, self.perfil)
+            etapa.linhas_saida = len(df)
         return df
 
+    def filtro_por_valor(self, df, colunas, minimo=None, maximo=None, log_callback=None, cabecalho=None):
+        """
+        Keep rows whose values fall inside [minimo, maximo] in every given column.
+        
+        Only the filtered columns are parsed (vectorized, BR/US formats) and the rows are
+        selected with a boolean mask; the DataFrame is never copied as a whole. Empty or
+        non-numeric cells are removed.
+        
+        Args:
+            df (pd.DataFrame): DataFrame to filter
+            colunas (str or list): Column name or Excel letter ("Z"), a list of them, or
+                rule dicts {'coluna', 'minimo', 'maximo'} (see core/filtros.py)
+            minimo (float or str, optional): Inclusive lower bound (None = no bound)
+            maximo (float or str, optional): Inclusive upper bound (None = no bound)
+            log_callback (callable, optional): Callback function for logging
+            cabecalho (list, optional): Original sheet header, for Excel letters
+            
+        Returns:
+            pd.DataFrame: Filtered DataFrame (unchanged if a column is missing)
+        """
+        try:
+            filtro = {"colunas": colunas if isinstance(colunas, list) else [colunas],
+                      "minimo": minimo, "maximo": maximo}
+            regras = regras_valor(filtro)
+            mascara = mascara_valor(df, regras, cabecalho=cabecalho)
+        except Exception as e:
+            if log_callback: log_callback(f"  [WARNING] Filtro de valor ignorado: {e}")
+            return df
+        
+        removidas = len(df) - int(mascara.sum())
+        if log_callback and removidas > 0:
+            log_callback(f"  [INFO] Removidas {removidas} linhas fora de {descrever_regras(regras)}")
+        return df if removidas == 0 else df[mascara]
+
     def filtro_por_valor_minimo(self, df, valor_min, coluna_filtro, log_callback=None):
         """
         Filter DataFrame rows by minimum value in specified column.
@@ -390,42 +1034,41 @@ class ADCLogic:
         Args:
             df (pd.DataFrame): DataFrame to filter
             valor_min (float): Minimum value threshold
-            coluna_filtro (str): Column name to apply filter on
+            coluna_filtro (str): Column name (or Excel letter) to apply filter on
             log_callback (callable, optional): Callback function for logging
             
         Returns:
             pd.DataFrame: Filtered DataFrame
         """
-        try:
-            if not coluna_filtro or coluna_filtro not in df.columns:
-                if log_callback: log_callback(f"  [WARNING] Coluna '{coluna_filtro}' nao disponivel para filtro de valor")
-                return df
-            
-            # Use the static method instead of inline function
-            df_temp = df.copy()
-            df_temp[coluna_filtro] = df_temp[coluna_filtro].apply(self.limpar_valor)
-            
-            df_filtrado = df[df_temp[coluna_filtro] >= valor_min]
-            removidas = len(df) - len(df_filtrado)
-            
-            if log_callback and removidas > 0:
-                log_callback(f"  [INFO] Removidas {removidas} linhas com {coluna_filtro} < {valor_min}")
-            
-            return df_filtrado
-        except Exception as e:
-            if log_callback: log_callback(f"  [WARNING] Erro no filtro de valor: {e}")
-            return df
+        return self.filtro_por_valor(df, coluna_filtro, minimo=valor_min, log_callback=log_callback)
 
-    def filtro_por_texto(self, df, texto, log_callback=None):
+    def filtro_por_texto(self, df, texto, log_callback=None, prefixo=False, indexado=False):
+        """
+        Keep rows where any text column contains ``texto``.
+        
+        Literal, case-insensitive match (regex characters have no special meaning) done in
+        a single pass over a cached lowercase view of all text columns (see core/texto.py).
+        Empty cells never match.
+        
+        With ``indexado`` (or ``prefixo``) the query is answered by an inverted index of the
+        distinct cell texts, built on the first such query and reused while the DataFrame is
+        unchanged: repeated searches on a loaded sheet take milliseconds.
+        
+        Args:
+            df (pd.DataFrame): DataFrame to filter
+            texto (str): Substring to search for
+            log_callback (callable, optional): Callback function for logging
+            prefixo (bool): Keep rows with a cell starting with ``texto``
+            indexado (bool): Use the inverted index instead of scanning
+            
+        Returns:
+            pd.DataFrame: Filtered DataFrame
+        """
         texto = str(texto).strip()
         if not texto: return df
         
-        colunas_texto = df.select_dtypes(include=['object']).columns
-        if len(colunas_texto) == 0: return df
-
-        mascara = pd.Series(False, index=df.index)
-        for col in colunas_texto:
-            mascara |= df[col].astype(str).str.contains(texto, case=False, na=False)
+        mascara = self.busca_texto.mascara(df, texto, prefixo=prefixo, indexado=indexado)
+        if mascara is None: return df
         
         df_filtrado = df[mascara]
         removidas = len(df) - len(df_filtrado)
@@ -433,13 +1076,51 @@ class ADCLogic:
         if log_callback: log_callback(f"  🔍 Filtro texto '{texto}': {removidas} removidas")
         return df_filtrado
 
-    def salvar_planilha(self, df, caminho_saida):
-        if not caminho_saida.endswith('.xlsx'):
-            caminho_saida += '.xlsx'
-        df.to_excel(caminho_saida, index=False)
+    def salvar_planilha(self, df, caminho_saida, formato=None, log_callback=None, streaming=True):
+        """
+        Save cleaned data to .xlsx, CSV or Parquet, logging save time and peak memory.
+        
+        Args:
+            df (pd.DataFrame or iterable): Data, or chunks from processar_limpeza_em_blocos
+            caminho_saida (str): Output path (the format's extension is appended if missing)
+            formato (str, optional): "xlsx", "csv" or "parquet" (default: from the extension)
+            log_callback (callable, optional): Callback function for logging
+            streaming (bool): Write .xlsx with openpyxl write-only mode; False uses
+                df.to_excel (whole workbook built in memory)
+            
+        Returns:
+            str: Path actually written
+        """
+        formato, caminho_saida = formato_saida(caminho_saida, formato)
+        
+        with medir(self.perfil, "salvar_planilha") as etapa, Medicao() as medicao:
+            if formato == "csv":
+                linhas = escrever_csv(df, caminho_saida)
+            elif formato == "parquet":
+                linhas = escrever_parquet(df, caminho_saida)
+            elif streaming:
+                linhas = escrever_xlsx(df, caminho_saida)
+            else:
+                if not isinstance(df, pd.DataFrame):
+                    df = pd.concat(list(df))
+                df.to_excel(caminho_saida, index=False)
+                linhas = len(df)
+            etapa.linhas_saida = linhas
+        
+        if log_callback:
+            log_callback(f"[OK] {linhas} linhas salvas em {formato.upper()} ({medicao.resumo()})")
         return caminho_saida
 
-    def gerar_resumo(self, caminho_entrada, aba, log_callback=None):
+    def _coluna_sku(self, colunas, log_callback=None):
+        """Position of the SKU column among the header's ``colunas`` (dashboard "coluna_sku" or header with "SKU"), or None."""
+        indice = detectar_coluna_sku(colunas, self.dashboard.get("coluna_sku"))
+        if indice is None and log_callback:
+            log_callback("[INFO] Coluna de SKU nao encontrada: ranking de SKUs ignorado")
+        return indice
+
+    @perfilado("gerar_resumo", linhas_saida=lambda resultado: resultado["total_pedidos"])
+    def gerar_resumo(self, caminho_entrada, aba, log_callback=None, manter_df=False, linhas_por_bloco=None,
+                     ranking=True):
         """
         Generate statistical summary from Excel spreadsheet.
         
@@ -447,65 +1128,133 @@ class ADCLogic:
         - Total unique orders
         - Total items quantity
         - Total sales value
+        - Per-SKU order frequency, quantity and revenue (when the sheet has a SKU column)
         
         Args:
             caminho_entrada (str): Path to Excel file
             aba (str): Sheet name to process
             log_callback (callable, optional): Callback function for logging
+            manter_df (bool): Also return the loaded DataFrame (with the 'qty_clean',
+                'price_clean' and 'valor_linha' columns) under 'df'. By default the
+                aggregates are computed on temporary arrays and the frame is released.
+            linhas_por_bloco (int, optional): Read the sheet in chunks of this many rows
+                (default: automatic by file size, see leitura_em_blocos; 0 = whole sheet).
+                Ignored with manter_df=True.
+            ranking (bool): Also aggregate by SKU (column from the "coluna_sku" dashboard
+                setting, or the first header containing "SKU")
             
         Returns:
-            dict: Summary with keys 'total_itens', 'total_pedidos', 'valor_total', 'df'
-                  or 'erro' key if processing fails
+            dict: Summary with keys 'total_itens', 'total_pedidos', 'valor_total',
+                  'pedidos' (np.ndarray of unique non-null order IDs), 'ranking' (per-SKU
+                  table from core/ranking.py, or None without a SKU column) and, with
+                  manter_df=True, 'df'; or 'erro' key if processing fails
         """
-        # Carregar
-        df = self.carregar_planilha(caminho_entrada, aba, log_callback)
+        # --- Configuracao de Colunas ---
+        # Conforme especificacao do usuario:
+        # Coluna B (indice 1) -> ID do Pedido (contar unicos)
+        # Coluna Z (indice 25) -> Quantidade de Itens (somar)
+        # Coluna AA (indice 26) -> Preco Unitario
+        # Formula: Valor Total = SOMA(Z * AA) para cada linha
+        
+        COL_PEDIDOS_IDX = 1   # Coluna B
+        COL_QTD_IDX = 25      # Coluna Z
+        COL_PRECO_IDX = 26    # Coluna AA
+        colunas_resumo = [COL_PEDIDOS_IDX, COL_QTD_IDX, COL_PRECO_IDX]
+        # Coluna do SKU (ranking): achada no cabecalho, lido na mesma abertura que os dados
+        sku = {}
+        
+        def _colunas_lidas(cabecalho):
+            sku["indice"] = self._coluna_sku(cabecalho, log_callback) if ranking else None
+            return set(colunas_resumo) | ({sku["indice"]} - {None})
+        
+        # Carregar (sem manter_df, apenas as colunas B, Z, AA e do SKU sao lidas)
+        blocos = 0 if manter_df else self._blocos_para(caminho_entrada, linhas_por_bloco)
+        if blocos:
+            fonte = self.carregar_planilha(caminho_entrada, aba, log_callback, colunas=_colunas_lidas, linhas_por_bloco=blocos)
+            df = next(fonte)  # Primeiro bloco (validacao de colunas)
+        else:
+            fonte = iter(())
+            df = self.carregar_planilha(caminho_entrada, aba, log_callback, colunas=None if manter_df else _colunas_lidas)
+        if manter_df and ranking:
+            _colunas_lidas(df.columns)
+        COL_SKU_IDX = sku.get("indice")
+        colunas_lidas = sorted(set(colunas_resumo) | ({COL_SKU_IDX} - {None}))
         
         resultado = {
             "total_itens": 0,
             "total_pedidos": 0,
             "valor_total": 0.0,
-            "df": None # Para dashboard
+            "pedidos": np.array([], dtype=object),
+            "ranking": None
         }
+        if manter_df:
+            resultado["df"] = None
         
         try:
-            # --- Configuracao de Colunas ---
-            # Conforme especificacao do usuario:
-            # Coluna B (indice 1) -> ID do Pedido (contar unicos)
-            # Coluna Z (indice 25) -> Quantidade de Itens (somar)
-            # Coluna AA (indice 26) -> Preco Unitario
-            # Formula: Valor Total = SOMA(Z * AA) para cada linha
-            
-            COL_PEDIDOS_IDX = 1   # Coluna B
-            COL_QTD_IDX = 25      # Coluna Z
-            COL_PRECO_IDX = 26    # Coluna AA
-            
             # Validacao de limites
-            max_idx = max(COL_PEDIDOS_IDX, COL_QTD_IDX, COL_PRECO_IDX)
-            if df.shape[1] <= max_idx:
-                 msg = f"[WARNING] A planilha tem apenas {df.shape[1]} colunas, mas o resumo exige ate a coluna indice {max_idx} (AA)."
+            max_idx = max(colunas_resumo)
+            if manter_df:
+                largura = df.shape[1]
+            elif df.shape[1] < len(colunas_lidas):
+                # Projecao incompleta: a largura real vem do cabecalho
+                largura = len(self.ler_cabecalho(caminho_entrada, aba, log_callback).columns)
+            else:
+                largura = max_idx + 1
+                # Na projecao as colunas lidas passam a ser as posicoes 0, 1, 2 (e 3), em ordem
+                posicoes = {coluna: i for i, coluna in enumerate(colunas_lidas)}
+                COL_PEDIDOS_IDX, COL_QTD_IDX, COL_PRECO_IDX = (posicoes[c] for c in colunas_resumo)
+                if COL_SKU_IDX is not None:
+                    COL_SKU_IDX = posicoes[COL_SKU_IDX]
+            
+            if largura <= max_idx:
+                 msg = f"[WARNING] A planilha tem apenas {largura} colunas, mas o resumo exige ate a coluna indice {max_idx} (AA)."
                  if log_callback: log_callback(msg)
                  # Retorna zerado mas com aviso, nao crasha
                  resultado["erro"] = msg
                  return resultado
             
-            # 1. PEDIDOS UNICOS - Coluna B (contar apenas numeros diferentes)
-            resultado["total_pedidos"] = df.iloc[:, COL_PEDIDOS_IDX].nunique()
-            
-            # 2. TOTAL DE ITENS - Soma da Coluna Z
-            df['qty_clean'] = df.iloc[:, COL_QTD_IDX].apply(self.clean_numeric)
-            resultado["total_itens"] = int(df['qty_clean'].sum())
-            
-            # 3. VALOR TOTAL - Formula: SOMA(Z * AA)
-            # Limpar coluna AA (preco unitario)
-            df['price_clean'] = df.iloc[:, COL_PRECO_IDX].apply(self.clean_numeric)
-            
-            # Multiplicar quantidade (Z) * preco unitario (AA) para cada linha
-            df['valor_linha'] = df['qty_clean'] * df['price_clean']
+            pedidos = []
+            total_itens = 0.0
+            total_valor = 0.0
+            ranking_sku = RankingSKU() if COL_SKU_IDX is not None else None
+            for bloco in chain([df], fonte):
+                # 1. PEDIDOS UNICOS - Coluna B (contar apenas numeros diferentes)
+                # Apenas os IDs unicos saem daqui; o DataFrame pode ser liberado pelo chamador
+                pedidos.append(np.asarray(bloco.iloc[:, COL_PEDIDOS_IDX].dropna().unique()))
+                
+                # 2. TOTAL DE ITENS - Soma da Coluna Z
+                # Conversao vetorizada equivalente a apply(self.clean_numeric)
+                with medir(self.perfil, "conversao_numerica", len(bloco)):
+                    qtd = converter_serie_numerica(bloco.iloc[:, COL_QTD_IDX])
+                    # Limpar coluna AA (preco unitario)
+                    preco = converter_serie_numerica(bloco.iloc[:, COL_PRECO_IDX])
+                # nansum = mesma soma (pairwise, ignorando NaN) de Series.sum()
+                total_itens += np.nansum(qtd)
+                
+                # 3. VALOR TOTAL - Formula: SOMA(Z * AA)
+                
+                # Multiplicar quantidade (Z) * preco unitario (AA) para cada linha
+                valor_linha = qtd * preco
+                total_valor += np.nansum(valor_linha)
+                
+                # 4. RANKING DE SKUS - agregado por SKU normalizado, bloco a bloco
+                if ranking_sku is not None:
+                    with medir(self.perfil, "ranking_sku", len(bloco)):
+                        ranking_sku.adicionar(bloco.iloc[:, COL_SKU_IDX], bloco.iloc[:, COL_PEDIDOS_IDX], qtd, valor_linha)
             
-            # Somar todos os valores
-            resultado["valor_total"] = df['valor_linha'].sum()
+            # IDs repetidos entre blocos contam uma vez
+            resultado["pedidos"] = pedidos[0] if len(pedidos) == 1 else pd.unique(np.concatenate(pedidos))
+            resultado["total_pedidos"] = len(resultado["pedidos"])
+            resultado["total_itens"] = int(total_itens)
+            resultado["valor_total"] = float(total_valor)
+            if ranking_sku is not None:
+                resultado["ranking"] = ranking_sku.tabela()
             
-            resultado["df"] = df
+            if manter_df:
+                df['qty_clean'] = qtd
+                df['price_clean'] = preco
+                df['valor_linha'] = valor_linha
+                resultado["df"] = df
             
             if log_callback:
                 log_callback(f"[OK] Resumo calculado: {resultado['total_pedidos']} pedidos, {resultado['total_itens']} itens, R$ {resultado['valor_total']:.2f}")
@@ -514,3 +1263,53 @@ class ADCLogic:
             
         except Exception as e:
             raise Exception(f"Erro ao calcular resumo: {e}")
+        finally:
+            if blocos: fonte.close()
+
+    def gerar_resumo_multi(self, caminhos, workers=None, aba="", progress_callback=None, log_callback=None,
+                           incremental=True, aproximado=None, top_n=None):
+        """
+        Generate the combined summary of several Excel files in a process pool.
+
+        Each worker parses one file and returns only a compact partial (order IDs, item sum,
+        value sum). Partials are merged in input order, so totals match calling gerar_resumo
+        on each file one after another.
+
+        Partials are kept in cache_disco by file content hash: on the next run only new or
+        changed files are parsed and the others are read back from disk.
+
+        Args:
+            caminhos (list): Paths to Excel files
+            workers (int, optional): Worker processes (default: min(files, CPUs)); 1 = sequential
+            aba (str): Sheet name used for every file ("" = first sheet)
+            progress_callback (callable, optional): Called as (concluidos, total, parcial)
+                each time a file finishes
+            log_callback (callable, optional): Callback function for logging
+            incremental (bool): Reuse and store per-file partials in cache_disco
+            aproximado (bool, optional): Estimate distinct orders with HyperLogLog (~1% error,
+                fixed memory); default: "pedidos_aproximados" of the dashboard settings
+            top_n (int, optional): SKUs in the ranking; default: "top_skus" of the dashboard settings
+
+        Returns:
+            dict: {'total_itens', 'total_pedidos', 'valor_total', 'pedidos', 'ranking', 'erros',
+                   'arquivos_ok', 'parciais', 'reaproveitados'}
+        """
+        cache = self.cache_disco if incremental else None
+        parciais = executar_resumos(caminhos, workers, aba, progress_callback, logic=self, cache=cache)
+        if aproximado is None:
+            aproximado = bool(self.dashboard.get("pedidos_aproximados"))
+        if top_n is None:
+            top_n = int(self.dashboard.get("top_skus") or 10)
+        resultado = combinar_parciais(parciais, aproximado, top_n)
+        resultado["parciais"] = parciais
+        resultado["reaproveitados"] = sum(1 for p in parciais if p.get("em_cache"))
+
+        if log_callback:
+            if resultado["reaproveitados"]:
+                log_callback(f"[INFO] {resultado['reaproveitados']}/{len(parciais)} arquivo(s) sem alteracao: resumo lido do cache")
+            prefixo = "~" if aproximado else ""
+            log_callback(f"[OK] Resumo de {resultado['arquivos_ok']}/{len(parciais)} arquivo(s): {prefixo}{resultado['total_pedidos']} pedidos, {resultado['total_itens']} itens, R$ {resultado['valor_total']:.2f}")
+            for erro in resultado["erros"]:
+                log_callback(f"[WARNING] {erro}")
+
+        return resultado
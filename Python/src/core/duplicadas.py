@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+"""
+ADC Duplicate Detection Module
+
+Duplicate rows by key columns and/or by 64-bit row digests.
+
+``drop_duplicates`` on a wide sheet compares every column of mixed dtypes. Two options make
+it cheaper:
+
+- Key columns (``chave_duplicadas``): only the columns that identify a row are compared,
+  e.g. order ID + SKU. Columns are referenced by name or Excel letter, like filtro_valor.
+- Hash mode (``modo_duplicadas='hash'``): each row (or key) is reduced to a 64-bit digest
+  with ``pd.util.hash_pandas_object`` and only the digests are compared. Peak memory drops
+  to about a third on wide sheets; two different rows with the same digest would be
+  treated as duplicates, which is vanishingly unlikely for spreadsheet-sized inputs.
+
+Both options can be set in a preset (``"chave_duplicadas": "B, Z"``,
+``"modo_duplicadas": "hash"``) and are passed along with the filter options.
+
+Functions:
+    opcoes_duplicadas: Key references and mode from the filter options
+    normalizar_numeros: Numeric columns in one dtype per kind, so chunks digest alike
+    digerir_hash: 64-bit digest per row with pandas' hashing utilities
+    marcar_duplicadas: Mask of the rows that repeat an earlier row (or key)
+    contar_por_chave: Most repeated keys among the duplicates, for logs
+"""
+import numpy as np
+import pandas as pd
+
+from core.numeric import ampliar_float32
+
+MODOS_DUPLICADAS = ("linha", "hash")
+
+# Inteiros exatos em float64
+_LIMITE_INTEIRO_FLOAT64 = 2 ** 53
+
+
+def opcoes_duplicadas(opcoes):
+    """
+    Read the duplicate key and mode from filter options (or a preset).
+
+    Args:
+        opcoes (dict): Options with optional 'chave_duplicadas' (list, or names/letters
+            separated by commas) and 'modo_duplicadas' ('linha' or 'hash')
+
+    Returns:
+        tuple: (list of column references, mode)
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    chave = opcoes.get('chave_duplicadas') or []
+    if isinstance(chave, str):
+        chave = [c.strip() for c in chave.split(",") if c.strip()]
+    modo = str(opcoes.get('modo_duplicadas') or "linha").strip().lower()
+    if modo not in MODOS_DUPLICADAS:
+        raise ValueError(f"Modo de duplicatas invalido: {modo} (use {', '.join(MODOS_DUPLICADAS)})")
+    return list(chave), modo
+
+
+def normalizar_numeros(df):
+    """
+    Numeric columns as float64 (float32 widened through its decimal text, integers when exact).
+
+    Chunks of one sheet may store the same column as int8, float32 or float64 (core/tipos.py
+    falls back to a wider dtype when a chunk does not fit); digests are taken on these
+    normalized values so a duplicate whose copies land in different chunks still matches.
+    Integer columns beyond 2**53 stay int64.
+
+    Args:
+        df (pd.DataFrame): Rows to digest
+
+    Returns:
+        pd.DataFrame: ``df``, or a shallow copy with the converted columns
+    """
+    novos = {}
+    for posicao, dtype in enumerate(df.dtypes):
+        if not isinstance(dtype, np.dtype):
+            continue  # categorias e textos ja digerem pelo valor
+        if dtype == np.float32:
+            novos[posicao] = ampliar_float32(df.iloc[:, posicao].to_numpy())
+        elif dtype.kind in "iu":
+            valores = df.iloc[:, posicao].to_numpy()
+            if len(valores) == 0 or np.abs(valores.astype(np.float64)).max() < _LIMITE_INTEIRO_FLOAT64:
+                novos[posicao] = valores.astype(np.float64)
+            elif dtype != np.int64:
+                novos[posicao] = valores.astype(np.int64)
+    if not novos:
+        return df
+    df = df.copy(deep=False)
+    for posicao, valores in novos.items():
+        df.isetitem(posicao, valores)
+    return df
+
+
+def digerir_hash(df):
+    """
+    Compute a 64-bit digest per row with ``pd.util.hash_pandas_object``.
+
+    Unlike ``streaming.digerir_linhas`` this is fully vectorized, but values are hashed per
+    column dtype: within an object column 5 and 5.0 get different digests. Numeric columns
+    are normalized first (normalizar_numeros), so int8 5 and float32 5.0 columns agree.
+
+    Args:
+        df (pd.DataFrame): Rows to digest
+
+    Returns:
+        np.ndarray: uint64 digests aligned with ``df``
+    """
+    if df.shape[1] == 0:
+        return np.zeros(len(df), dtype=np.uint64)
+    return pd.util.hash_pandas_object(normalizar_numeros(df), index=False).to_numpy()
+
+
+def marcar_duplicadas(df, colunas=None, modo="linha"):
+    """
+    Mark rows that repeat an earlier row, keeping the first occurrence.
+
+    Args:
+        df (pd.DataFrame): Rows to check
+        colunas (list, optional): Key column labels (default: whole row)
+        modo (str): 'linha' compares values (drop_duplicates), 'hash' compares digests
+
+    Returns:
+        np.ndarray: Boolean mask, True for the duplicates
+    """
+    chave = df[colunas] if colunas else df
+    if modo == "hash":
+        return pd.Series(digerir_hash(chave)).duplicated().to_numpy()
+    return chave.duplicated().to_numpy()
+
+
+def contar_por_chave(df, colunas, duplicadas, limite=5):
+    """
+    Most repeated key values among the duplicates.
+
+    Args:
+        df (pd.DataFrame): Rows that were checked
+        colunas (list): Key column labels
+        duplicadas (np.ndarray): Mask from marcar_duplicadas
+        limite (int): Number of keys to return
+
+    Returns:
+        list: (description like "Pedido=123, SKU=AB", extra copies) pairs
+    """
+    if not colunas or not duplicadas.any():
+        return []
+    contagem = df.loc[duplicadas, colunas].value_counts(dropna=False).head(limite)
+    resultado = []
+    for valores, extras in contagem.items():
+        valores = valores if isinstance(valores, tuple) else (valores,)
+        resultado.append((", ".join(f"{c}={v}" for c, v in zip(colunas, valores)), int(extras)))
+    return resultado
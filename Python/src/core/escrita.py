@@ -0,0 +1,246 @@
+# -*- coding: utf-8 -*-
+"""
+ADC Output Module
+
+Writers used by ``ADCLogic.salvar_planilha``.
+
+``df.to_excel`` builds the whole openpyxl object model (one Cell object per value) before
+saving. The .xlsx writer here uses openpyxl's write-only mode: rows are appended in
+batches and streamed to disk, so memory does not grow with the number of rows. Write-only
+sheets carry no ``<dimension>`` element, which makes every read-only open (pandas,
+``listar_abas``, ``LeitorXlsxEmBlocos``) scan the whole sheet XML; a placeholder is
+written up front and overwritten in place with the real range once the rows are known. Every
+writer accepts a DataFrame or an iterable of DataFrame chunks (e.g. from
+``processar_limpeza_em_blocos``) and writes to a temporary file that is renamed on success.
+
+Functions:
+    formato_saida: Resolve the output format and final path
+    escrever_xlsx: Streaming .xlsx writer (openpyxl write-only)
+    escrever_csv: CSV writer (";" separator, "," decimal, UTF-8 with BOM for Excel)
+    escrever_parquet: Parquet writer (pyarrow)
+"""
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from core.numeric import ampliar_float32
+from core.streaming import fatiar_em_blocos
+
+FORMATOS_SAIDA = ("xlsx", "csv", "parquet")
+
+LIMITE_LINHAS_EXCEL = 1_048_576
+
+# Linhas convertidas por vez (limita os objetos Python vivos durante a escrita)
+_LINHAS_POR_LOTE = 10_000
+
+# Maior intervalo possivel: o real (mais curto) cabe no lugar, completado com espacos
+_DIMENSAO_RESERVADA = "A1:XFD1048576"
+_TAG_DIMENSAO = re.compile(rb'<dimension ref="' + _DIMENSAO_RESERVADA.encode() + rb'"\s*/>')
+
+
+def formato_saida(caminho_saida, formato=None):
+    """
+    Resolve the output format and the final path.
+
+    Without ``formato`` the extension decides (unknown extensions get ".xlsx" appended, as
+    salvar_planilha always did). With ``formato`` the matching extension is enforced.
+
+    Args:
+        caminho_saida (str): Requested output path
+        formato (str, optional): "xlsx", "csv" or "parquet"
+
+    Returns:
+        tuple: (formato, caminho)
+
+    Raises:
+        ValueError: If ``formato`` is not supported
+    """
+    extensao = os.path.splitext(caminho_saida)[1].lower().lstrip(".")
+    if formato is None:
+        formato = extensao if extensao in FORMATOS_SAIDA else "xlsx"
+    formato = formato.lower()
+    if formato not in FORMATOS_SAIDA:
+        raise ValueError(f"Formato de saida nao suportado: {formato} (use {', '.join(FORMATOS_SAIDA)})")
+    if extensao != formato:
+        caminho_saida += f".{formato}"
+    return formato, caminho_saida
+
+
+def _blocos(dados):
+    """Yield row batches from a DataFrame or an iterable of DataFrames."""
+    fontes = [dados] if isinstance(dados, pd.DataFrame) else dados
+    for df in fontes:
+        yield from fatiar_em_blocos(df, _LINHAS_POR_LOTE)
+
+
+def _conferir_colunas(colunas, bloco):
+    if list(bloco.columns) != colunas:
+        novas = [c for c in bloco.columns if c not in colunas]
+        if novas:
+            raise Exception(f"Colunas novas apos o cabecalho ja escrito: {novas}")
+        bloco = bloco.reindex(columns=colunas)
+    return bloco
+
+
+def _ampliar_float32(bloco):
+    """float32 columns (core/tipos.py) as the float64 of their decimal text: 1234.56, not 1234.5600586."""
+    posicoes = [i for i, dtype in enumerate(bloco.dtypes) if dtype == np.float32]
+    if not posicoes:
+        return bloco
+    bloco = bloco.copy(deep=False)
+    for i in posicoes:
+        bloco.isetitem(i, ampliar_float32(bloco.iloc[:, i].to_numpy()))
+    return bloco
+
+
+def _escrever_atomico(caminho, escrever):
+    """Run ``escrever(temporario)`` and move the result over ``caminho`` only on success."""
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    try:
+        linhas = escrever(temporario)
+        os.replace(temporario, caminho)
+        return linhas
+    finally:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+
+def escrever_xlsx(dados, caminho, aba="Sheet1"):
+    """
+    Write rows to .xlsx with openpyxl in write-only mode.
+
+    Same layout as ``df.to_excel(caminho, index=False)``: one header row with the column
+    names, missing values as empty cells.
+
+    Args:
+        dados (pd.DataFrame or iterable): Frame or chunks with the same columns
+        caminho (str): Output path
+        aba (str): Sheet name
+
+    Returns:
+        int: Data rows written
+
+    Raises:
+        Exception: If the data exceeds Excel's row limit or a chunk adds columns
+    """
+    from openpyxl import Workbook
+
+    def escrever(temporario):
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet(aba)
+        ws.calculate_dimension = lambda: _DIMENSAO_RESERVADA  # lido pelo writer antes das linhas
+        colunas = None
+        linhas = 0
+        for bloco in _blocos(dados):
+            if colunas is None:
+                colunas = list(bloco.columns)
+                ws.append([c if isinstance(c, (str, int, float)) else str(c) for c in colunas])
+            else:
+                bloco = _conferir_colunas(colunas, bloco)
+
+            linhas += len(bloco)
+            if linhas + 1 > LIMITE_LINHAS_EXCEL:
+                raise Exception(f"A planilha excede o limite do Excel ({LIMITE_LINHAS_EXCEL:,} linhas). Salve em CSV ou Parquet.")
+
+            # Valores nativos do Python, com None nas celulas vazias
+            bloco = _ampliar_float32(bloco)
+            objetos = bloco.astype(object).where(bloco.notna(), None)
+            for linha in objetos.itertuples(index=False, name=None):
+                ws.append(linha)
+        ws.close()
+        _gravar_dimensao(ws._writer.out, len(colunas or ()), linhas + 1)
+        wb.save(temporario)
+        return linhas
+
+    return _escrever_atomico(caminho, escrever)
+
+
+def _gravar_dimensao(arquivo, colunas, linhas):
+    """Overwrite the placeholder <dimension> of a closed write-only sheet XML with A1:<col><row>."""
+    from openpyxl.utils import get_column_letter
+
+    ref = f"A1:{get_column_letter(colunas)}{linhas}" if colunas else "A1"
+    with open(arquivo, "r+b") as f:
+        inicio = f.read(4096)  # a dimensao vem antes de sheetViews e sheetData
+        achado = _TAG_DIMENSAO.search(inicio)
+        if achado is None:
+            return
+        tag = f'<dimension ref="{ref}"/>'.encode().ljust(achado.end() - achado.start())
+        f.seek(achado.start())
+        f.write(tag)
+
+
+def escrever_csv(dados, caminho):
+    """
+    Write rows to CSV in the format Excel (pt-BR) opens directly: ";" separator,
+    "," decimal and UTF-8 with BOM.
+
+    Args:
+        dados (pd.DataFrame or iterable): Frame or chunks with the same columns
+        caminho (str): Output path
+
+    Returns:
+        int: Data rows written
+    """
+    def escrever(temporario):
+        colunas = None
+        linhas = 0
+        with open(temporario, "w", encoding="utf-8-sig", newline="") as arquivo:
+            for bloco in _blocos(dados):
+                if colunas is not None:
+                    bloco = _conferir_colunas(colunas, bloco)
+                bloco.to_csv(arquivo, index=False, header=colunas is None, sep=";", decimal=",")
+                colunas = colunas or list(bloco.columns)
+                linhas += len(bloco)
+        return linhas
+
+    return _escrever_atomico(caminho, escrever)
+
+
+def _para_parquet(df):
+    """Columns mixing types (e.g. numbers and text) are stored as text, which Arrow requires."""
+    if any(not isinstance(c, str) for c in df.columns):
+        df = df.set_axis([str(c) for c in df.columns], axis=1)
+    mistas = [i for i, c in enumerate(df.columns) if df.iloc[:, i].dtype == object
+              and pd.api.types.infer_dtype(df.iloc[:, i], skipna=True) in ("mixed", "mixed-integer")]
+    if mistas:
+        df = df.copy()
+        for i in mistas:
+            df.isetitem(i, df.iloc[:, i].astype("str"))
+    return df
+
+
+def escrever_parquet(dados, caminho):
+    """
+    Write rows to Parquet with pyarrow.
+
+    A chunk iterable is concatenated first: a column may be typed differently in
+    different chunks and a Parquet file needs a single schema.
+
+    Args:
+        dados (pd.DataFrame or iterable): Frame or chunks
+        caminho (str): Output path
+
+    Returns:
+        int: Data rows written
+
+    Raises:
+        Exception: If pyarrow is not installed
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise Exception("Salvar em Parquet requer o pacote pyarrow (pip install pyarrow)")
+
+    if not isinstance(dados, pd.DataFrame):
+        partes = list(dados)
+        dados = partes[0] if len(partes) == 1 else pd.concat(partes) if partes else pd.DataFrame()
+    df = _para_parquet(dados)
+
+    def escrever(temporario):
+        df.to_parquet(temporario, index=False, engine="pyarrow")
+        return len(df)
+
+    return _escrever_atomico(caminho, escrever)
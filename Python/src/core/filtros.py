@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+ADC Value Filter Module
+
+Numeric range filters computed as row masks over the filtered columns only.
+
+The old value filter copied the whole DataFrame to overwrite one column with parsed
+numbers. Here only the referenced columns are parsed (for the rows still alive), and the
+result is a boolean mask, so memory does not grow with the width of the sheet.
+
+A filter is a list of rules (coluna, minimo, maximo). Both bounds are inclusive and
+optional. A row is kept when every rule holds. Cells are parsed like limpar_valor: empty
+float cells never pass, other non-numeric text counts as 0.
+Columns are referenced by name or by Excel letter ("Z", "AA").
+
+Functions:
+    letra_para_indice: 0-based position of an Excel column letter
+    resolver_coluna: Label of a column given its name or Excel letter
+    regras_valor: Normalize a "filtro_valor" option into rules
+    descrever_regras: Short text of the rules for logs
+    mascara_valor: Rows whose parsed values fall inside every rule's range
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+from core.numeric import converter_serie_numerica
+
+_LETRAS = re.compile(r"^[A-Za-z]{1,3}$")
+
+
+def letra_para_indice(letra):
+    """
+    Convert an Excel column letter to a 0-based position ("A" -> 0, "Z" -> 25, "AA" -> 26).
+
+    Raises:
+        ValueError: If ``letra`` is not 1-3 letters
+    """
+    if not isinstance(letra, str) or not _LETRAS.match(letra.strip()):
+        raise ValueError(f"Letra de coluna invalida: {letra}")
+    indice = 0
+    for caractere in letra.strip().upper():
+        indice = indice * 26 + (ord(caractere) - ord("A") + 1)
+    return indice - 1
+
+
+def resolver_coluna(df, referencia, cabecalho=None):
+    """
+    Resolve a column reference to a label of ``df``.
+
+    A label present in ``df`` wins; otherwise 1-3 letters are read as an Excel column.
+    Letters count positions of the original sheet when ``cabecalho`` is given (columns
+    deleted at load time do not shift them), else positions of ``df``.
+
+    Args:
+        df (pd.DataFrame): Frame being filtered
+        referencia (str): Column name or Excel letter
+        cabecalho (list, optional): Column labels of the original sheet
+
+    Returns:
+        Column label of ``df``
+
+    Raises:
+        ValueError: If the column does not exist or was deleted
+    """
+    if referencia in df.columns:
+        return referencia
+    if isinstance(referencia, str) and _LETRAS.match(referencia.strip()):
+        indice = letra_para_indice(referencia)
+        colunas = list(cabecalho) if cabecalho is not None else list(df.columns)
+        if indice < len(colunas):
+            rotulo = colunas[indice]
+            if rotulo in df.columns:
+                return rotulo
+            raise ValueError(f"Coluna {referencia.upper()} ('{rotulo}') foi excluida da planilha")
+    raise ValueError(f"Coluna '{referencia}' nao disponivel para filtro de valor")
+
+
+def _limite(valor):
+    """Parse a bound typed as number or text ("10", "1.200,50", "R$ 5"); None/"" = no bound."""
+    if valor is None or (isinstance(valor, str) and not valor.strip()):
+        return None
+    if isinstance(valor, (int, float, np.number)) and not isinstance(valor, bool):
+        return float(valor)
+    convertido = converter_serie_numerica(pd.Series([valor], dtype=object), preservar_nan=True)[0]
+    if np.isnan(convertido):
+        raise ValueError(f"Limite invalido no filtro de valor: {valor}")
+    return float(convertido)
+
+
+def regras_valor(filtro):
+    """
+    Normalize a "filtro_valor" option into rules.
+
+    Accepted forms:
+        {'coluna': 'Preço', 'minimo': 10}                   (original form)
+        {'coluna': 'Z', 'minimo': 10, 'maximo': 500}        (range, Excel letter)
+        {'colunas': ['Z', 'AA'], 'minimo': 0}               (same range on several columns)
+        {'colunas': [{'coluna': 'Z', 'maximo': 5}, {'coluna': 'AA', 'minimo': 1}]}
+
+    Without 'minimo' and 'maximo' the minimum defaults to 0, as before.
+
+    Args:
+        filtro (dict): The option
+
+    Returns:
+        list: (coluna, minimo, maximo) tuples with float or None bounds
+
+    Raises:
+        ValueError: If a bound cannot be parsed
+    """
+    def regra(coluna, minimo, maximo):
+        if minimo is None and maximo is None:
+            minimo = 0
+        return (coluna, _limite(minimo), _limite(maximo))
+
+    colunas = filtro.get('colunas')
+    if colunas is None:
+        colunas = [filtro.get('coluna')]
+    elif isinstance(colunas, str):
+        colunas = [c.strip() for c in colunas.split(",") if c.strip()]
+
+    regras = []
+    for coluna in colunas:
+        if isinstance(coluna, dict):
+            regras.append(regra(coluna.get('coluna'), coluna.get('minimo'), coluna.get('maximo')))
+        else:
+            regras.append(regra(coluna, filtro.get('minimo'), filtro.get('maximo')))
+    return regras
+
+
+def descrever_regras(regras):
+    """Short description such as "Preço >= 10 e 0 <= Z <= 5"."""
+    partes = []
+    for coluna, minimo, maximo in regras:
+        if minimo is not None and maximo is not None:
+            partes.append(f"{minimo:g} <= {coluna} <= {maximo:g}")
+        elif maximo is not None:
+            partes.append(f"{coluna} <= {maximo:g}")
+        else:
+            partes.append(f"{coluna} >= {minimo:g}")
+    return " e ".join(partes)
+
+
+def mascara_valor(df, regras, linhas=None, cabecalho=None):
+    """
+    Rows whose parsed values satisfy every rule.
+
+    Only the referenced columns are parsed, and each rule after the first only parses the
+    rows that passed the previous ones.
+
+    Args:
+        df (pd.DataFrame): Frame to filter
+        regras (list): Rules from regras_valor
+        linhas (np.ndarray, optional): Positions to test (default: all rows)
+        cabecalho (list, optional): Original sheet header, for Excel letters
+
+    Returns:
+        np.ndarray: Boolean mask aligned with ``linhas`` (or with ``df``)
+
+    Raises:
+        ValueError: If a column does not exist
+    """
+    rotulos = [resolver_coluna(df, coluna, cabecalho) for coluna, _, _ in regras]
+    posicoes = np.arange(len(df)) if linhas is None else np.asarray(linhas)
+    manter = np.ones(len(posicoes), dtype=bool)
+    vivas = np.arange(len(posicoes))  # indices em ``posicoes`` ainda aprovados
+
+    for rotulo, (_, minimo, maximo) in zip(rotulos, regras):
+        serie = df[rotulo]
+        if isinstance(serie, pd.DataFrame):
+            serie = serie.iloc[:, 0]  # rotulo repetido: primeira coluna
+        if len(vivas) < len(df):
+            serie = serie.iloc[posicoes[vivas]]
+        valores = converter_serie_numerica(serie, preservar_nan=True)
+        aprovado = ~np.isnan(valores)
+        if minimo is not None:
+            aprovado &= valores >= minimo
+        if maximo is not None:
+            aprovado &= valores <= maximo
+        manter[vivas[~aprovado]] = False
+        vivas = vivas[aprovado]
+    return manter
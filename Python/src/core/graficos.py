@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""
+ADC Dashboard Charts Module
+
+Dashboard charts rendered off the UI thread and cached as PNG images.
+
+Drawing a matplotlib figure takes tens to hundreds of milliseconds, which freezes Tk when
+done in the main loop. Here each chart set is drawn on a plain ``Figure`` with the Agg
+canvas (no pyplot, no GUI backend), so it can run in a worker thread; Tk only receives the
+finished PNG bytes. Images are cached by a fingerprint of the plotted data, the size and
+the theme, so switching pages or toggling fullscreen redraws from the cache instead of
+plotting again.
+
+matplotlib is an optional dependency imported on first render: the CLI and core modules
+never load it. Without it ``disponivel()`` is False.
+
+Functions:
+    disponivel: True when matplotlib is installed
+    dados_graficos: Plot data (top SKUs, value per file) from a gerar_resumo_multi result
+    impressao_digital: Cache key of a chart image
+    renderizar_png: Draw the dashboard charts with Agg and return PNG bytes
+
+Classes:
+    CacheGraficos: Thread-safe LRU of rendered images
+    RenderizadorGraficos: Single worker thread that draws only the latest requested chart
+"""
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+
+# Tamanho da imagem (polegadas a 100 dpi) por modo da janela
+TAMANHOS = {"normal": (9.0, 3.2), "tela_cheia": (16.0, 6.0)}
+DPI = 100
+_MAX_ROTULO = 18
+_MAX_ARQUIVOS = 12  # acima disso so os maiores valores (rotulos legiveis)
+
+# Figure/Agg por figura e seguro entre threads, mas o cache de fontes do matplotlib e global
+_TRAVA_RENDER = threading.Lock()
+
+
+def disponivel():
+    """True when matplotlib is installed."""
+    try:
+        import matplotlib  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _rotulo(texto):
+    texto = str(texto)
+    return texto if len(texto) <= _MAX_ROTULO else texto[:_MAX_ROTULO - 1] + "…"
+
+
+def dados_graficos(resultado):
+    """
+    Extract what the charts plot from a gerar_resumo_multi result.
+
+    Args:
+        resultado (dict): Combined summary ('ranking' and 'parciais')
+
+    Returns:
+        dict: {'top_skus': [(sku, pedidos)], 'arquivos': [(nome, valor_total)]}, only
+              plain values (JSON-serializable); beyond 12 files, the 12 largest values
+    """
+    top = [(str(item["sku"]), int(item["pedidos"])) for item in resultado.get("ranking") or []]
+    arquivos = [(os.path.basename(p["arquivo"]), float(p["valor_total"]))
+                for p in resultado.get("parciais") or [] if "erro" not in p]
+    if len(arquivos) > _MAX_ARQUIVOS:
+        arquivos = sorted(arquivos, key=lambda par: par[1], reverse=True)[:_MAX_ARQUIVOS]
+    return {"top_skus": top, "arquivos": arquivos}
+
+
+def impressao_digital(dados, modo="normal", tema=None):
+    """
+    Cache key of a chart image: hash of the plotted data, the size mode and the colors.
+
+    Args:
+        dados (dict): Result of dados_graficos
+        modo (str): Key of TAMANHOS
+        tema (dict, optional): Colors used to draw
+
+    Returns:
+        str: Hex digest
+    """
+    conteudo = json.dumps([dados, modo, tema or {}], sort_keys=True, ensure_ascii=False)
+    return hashlib.blake2b(conteudo.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def renderizar_png(dados, modo="normal", tema=None):
+    """
+    Draw the dashboard charts (top SKUs by orders, value per file) with the Agg canvas.
+
+    Safe to call from a worker thread: no pyplot state and no GUI backend are used.
+
+    Args:
+        dados (dict): Result of dados_graficos
+        modo (str): Key of TAMANHOS
+        tema (dict, optional): Colors ('base', 'text', 'subtext', 'mauve', 'blue', 'surface1')
+
+    Returns:
+        bytes: PNG image
+
+    Raises:
+        ImportError: If matplotlib is not installed
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    tema = tema or {}
+    fundo = tema.get("base", "#1e1e2e")
+    texto = tema.get("text", "#cdd6f4")
+    secundario = tema.get("subtext", "#a6adc8")
+    grade = tema.get("surface1", "#45475a")
+
+    with _TRAVA_RENDER:
+        figura = Figure(figsize=TAMANHOS[modo], dpi=DPI, facecolor=fundo)
+        FigureCanvasAgg(figura)
+        eixos = figura.subplots(1, 2)
+        paineis = (
+            (eixos[0], "Top SKUs (pedidos)", dados["top_skus"][::-1], tema.get("mauve", "#cba6f7")),
+            (eixos[1], "Valor por arquivo (R$)", dados["arquivos"][::-1], tema.get("blue", "#89b4fa")),
+        )
+        for eixo, titulo, pares, cor in paineis:
+            eixo.set_facecolor(fundo)
+            eixo.set_title(titulo, color=texto, fontsize=10, loc="left")
+            eixo.tick_params(colors=secundario, labelsize=8)
+            for lado in eixo.spines.values():
+                lado.set_color(grade)
+            if not pares:
+                eixo.text(0.5, 0.5, "Sem dados", color=secundario, ha="center", va="center",
+                          transform=eixo.transAxes)
+                eixo.set_xticks([])
+                eixo.set_yticks([])
+                continue
+            rotulos = [_rotulo(r) for r, _ in pares]
+            eixo.barh(range(len(pares)), [v for _, v in pares], color=cor)
+            eixo.set_yticks(range(len(pares)), rotulos)
+            eixo.grid(axis="x", color=grade, linewidth=0.5)
+            eixo.set_axisbelow(True)
+        figura.tight_layout()
+
+        saida = io.BytesIO()
+        figura.savefig(saida, format="png", facecolor=fundo)
+    return saida.getvalue()
+
+
+class CacheGraficos:
+    """
+    Thread-safe LRU of rendered chart images keyed by impressao_digital.
+
+    Example:
+        cache = CacheGraficos()
+        png = cache.obter_ou_renderizar(chave, lambda: renderizar_png(dados, modo, tema))
+
+    Attributes:
+        limite (int): Maximum number of images kept
+        renderizados (int): Images actually drawn (cache misses)
+    """
+
+    def __init__(self, limite=16):
+        self.limite = limite
+        self.renderizados = 0
+        self._imagens = OrderedDict()
+        self._trava = threading.Lock()
+
+    def __contains__(self, chave):
+        with self._trava:
+            return chave in self._imagens
+
+    def __len__(self):
+        with self._trava:
+            return len(self._imagens)
+
+    def obter(self, chave):
+        """Cached image, or None (marks it as recently used)."""
+        with self._trava:
+            if chave not in self._imagens:
+                return None
+            self._imagens.move_to_end(chave)
+            return self._imagens[chave]
+
+    def guardar(self, chave, imagem):
+        """Store an image, evicting the least recently used beyond the limit."""
+        with self._trava:
+            self._imagens[chave] = imagem
+            self._imagens.move_to_end(chave)
+            while len(self._imagens) > self.limite:
+                self._imagens.popitem(last=False)
+
+    def obter_ou_renderizar(self, chave, renderizar):
+        """
+        Cached image for ``chave``, drawing it with ``renderizar()`` on a miss.
+
+        Args:
+            chave (str): Result of impressao_digital
+            renderizar (callable): Returns the image (e.g. renderizar_png)
+
+        Returns:
+            bytes: Image
+        """
+        imagem = self.obter(chave)
+        if imagem is None:
+            imagem = renderizar()
+            with self._trava:
+                self.renderizados += 1
+            self.guardar(chave, imagem)
+        return imagem
+
+    def limpar(self):
+        """Drop every cached image."""
+        with self._trava:
+            self._imagens.clear()
+
+
+class RenderizadorGraficos:
+    """
+    Single worker thread that draws chart images into a CacheGraficos.
+
+    Only one request waits at a time: a request made while another is still waiting
+    replaces it, so charts the user already moved away from (old data, the other window
+    mode) are never drawn. The request being drawn is not interrupted, but its warm-up
+    images are skipped as soon as a newer request arrives.
+
+    Example:
+        renderizador = RenderizadorGraficos(cache)
+        renderizador.pedir(chave, lambda: renderizar_png(dados, modo, tema),
+                           ao_concluir=lambda png: widget.after(0, mostrar, png))
+
+    Attributes:
+        cache (CacheGraficos): Where the images go; cached keys are not drawn again
+        descartados (int): Requests replaced before they started
+    """
+
+    def __init__(self, cache):
+        self.cache = cache
+        self.descartados = 0
+        self._pendente = None
+        self._ocupado = False
+        self._thread = None
+        self._condicao = threading.Condition()
+
+    def pedir(self, chave, renderizar, ao_concluir=None, ao_falhar=None, aquecer=()):
+        """
+        Queue a chart, replacing the request still waiting (if any).
+
+        Callbacks run on the worker thread; GUI code must hand them to its own loop.
+
+        Args:
+            chave (str): Result of impressao_digital
+            renderizar (callable): Returns the image (e.g. renderizar_png)
+            ao_concluir (callable, optional): Receives the image
+            ao_falhar (callable, optional): Receives the exception raised by ``renderizar``
+            aquecer (iterable): (chave, renderizar) pairs drawn afterwards into the cache,
+                unless a newer request arrives first
+        """
+        with self._condicao:
+            if self._pendente is not None:
+                self.descartados += 1
+            self._pendente = (chave, renderizar, ao_concluir, ao_falhar, tuple(aquecer))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._laco, name="adc-graficos", daemon=True)
+                self._thread.start()
+            self._condicao.notify_all()
+
+    def aguardar(self, timeout=None):
+        """
+        Wait until no request is waiting or being drawn.
+
+        Returns:
+            bool: False if the timeout expired first
+        """
+        with self._condicao:
+            return self._condicao.wait_for(lambda: self._pendente is None and not self._ocupado, timeout)
+
+    def _superado(self):
+        with self._condicao:
+            return self._pendente is not None
+
+    def _laco(self):
+        while True:
+            with self._condicao:
+                self._ocupado = False
+                self._condicao.notify_all()
+                self._condicao.wait_for(lambda: self._pendente is not None)
+                (chave, renderizar, ao_concluir, ao_falhar, aquecer), self._pendente = self._pendente, None
+                self._ocupado = True
+            try:
+                imagem = self.cache.obter_ou_renderizar(chave, renderizar)
+            except Exception as e:
+                if ao_falhar: ao_falhar(e)
+                continue
+            if ao_concluir: ao_concluir(imagem)
+            for chave_extra, renderizar_extra in aquecer:
+                if self._superado():
+                    break
+                try:
+                    self.cache.obter_ou_renderizar(chave_extra, renderizar_extra)
+                except Exception:
+                    break  # o pedido em si ja foi mostrado; o aquecimento e so um extra
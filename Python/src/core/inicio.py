@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+ADC Startup Timing Module
+
+Where the seconds before the window appears go, for ``main.py --tempo-inicio``.
+
+``python -X importtime`` is not available in the PyInstaller executable, so imports are
+timed by wrapping ``builtins.__import__`` while the report is recording. Each first import
+of a module is timed, and its own time (minus the imports it triggered) is credited to its
+top-level package: the breakdown shows how much pandas, numpy, pyarrow, tkinter, gui and
+core cost on their own. Named stages (window visible, core loaded, first page) are marked
+with ``etapa``.
+
+Only the standard library is imported here, so timing can start before anything heavy.
+
+Classes:
+    TempoInicio: Records startup stages and per-package import time
+"""
+import builtins
+import json
+import sys
+import threading
+import time
+
+
+class TempoInicio:
+    """
+    Startup stages and import-time breakdown.
+
+    Example:
+        tempo = TempoInicio().instalar()
+        import pandas
+        tempo.etapa("pandas")
+        tempo.remover()
+        print(tempo.texto())
+
+    Attributes:
+        etapas (list): (stage name, seconds since start) in order
+        pacotes (dict): Top-level package -> own import seconds
+    """
+
+    def __init__(self):
+        self._inicio = time.perf_counter()
+        self.etapas = []
+        self.pacotes = {}
+        self._original = builtins.__import__
+        self._instalado = False
+        # Por thread: tempo dos imports filhos de cada import em andamento
+        self._local = threading.local()
+        self._trava = threading.Lock()
+
+    def instalar(self):
+        """Start timing imports (returns self)."""
+        if not self._instalado:
+            self._original = builtins.__import__
+            builtins.__import__ = self._importar
+            self._instalado = True
+        return self
+
+    def remover(self):
+        """Stop timing imports and restore the original ``__import__``."""
+        if self._instalado:
+            if builtins.__import__ == self._importar:
+                builtins.__import__ = self._original
+            self._instalado = False
+
+    def _importar(self, nome, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original
+        # So a primeira carga de um modulo absoluto conta (relativos entram no pai)
+        if level or not self._instalado or nome in sys.modules:
+            return original(nome, globals, locals, fromlist, level)
+        pilha = self._local.__dict__.setdefault("pilha", [])
+        pilha.append(0.0)
+        comeco = time.perf_counter()
+        try:
+            return original(nome, globals, locals, fromlist, level)
+        finally:
+            total = time.perf_counter() - comeco
+            filhos = pilha.pop()
+            if pilha:
+                pilha[-1] += total
+            pacote = nome.partition(".")[0]
+            with self._trava:
+                self.pacotes[pacote] = self.pacotes.get(pacote, 0.0) + total - filhos
+
+    def etapa(self, nome):
+        """Mark a stage as reached now."""
+        self.etapas.append((nome, time.perf_counter() - self._inicio))
+
+    @property
+    def total(self):
+        """Seconds until the last stage (or until now)."""
+        return self.etapas[-1][1] if self.etapas else time.perf_counter() - self._inicio
+
+    def relatorio(self, limite=15):
+        """
+        Build the JSON-serializable report.
+
+        Args:
+            limite (int): Number of packages listed (the slowest)
+
+        Returns:
+            dict: {'total', 'etapas': [{'etapa', 'segundos', 'acumulado'}],
+                   'imports': [{'pacote', 'segundos'}]}
+        """
+        etapas = []
+        anterior = 0.0
+        for nome, acumulado in self.etapas:
+            etapas.append({"etapa": nome, "segundos": round(acumulado - anterior, 3),
+                           "acumulado": round(acumulado, 3)})
+            anterior = acumulado
+        with self._trava:
+            pacotes = sorted(self.pacotes.items(), key=lambda item: item[1], reverse=True)[:limite]
+        return {
+            "total": round(self.total, 3),
+            "etapas": etapas,
+            "imports": [{"pacote": p, "segundos": round(s, 3)} for p, s in pacotes],
+        }
+
+    def texto(self, limite=15):
+        """Report as an aligned text table."""
+        dados = self.relatorio(limite)
+        linhas = [f"Tempo de inicio: {dados['total']:.3f}s", "", "Etapas:"]
+        linhas += [f"  {e['etapa']:<28} {e['segundos']:>8.3f}s  (acumulado {e['acumulado']:.3f}s)"
+                   for e in dados["etapas"]]
+        linhas += ["", "Imports (tempo proprio por pacote):"]
+        linhas += [f"  {i['pacote']:<28} {i['segundos']:>8.3f}s" for i in dados["imports"]]
+        return "\n".join(linhas)
+
+    def salvar(self, caminho, limite=15):
+        """Write the report: JSON when ``caminho`` ends in .json, text otherwise."""
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            if caminho.lower().endswith(".json"):
+                json.dump(self.relatorio(limite), arquivo, ensure_ascii=False, indent=2)
+            else:
+                arquivo.write(self.texto(limite) + "\n")
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""
+ADC Batch Module
+
+Headless runs of a preset over many files (used by ``src/cli.py``).
+
+Files are processed in a process pool, one ADCLogic per worker, like the multi-file
+dashboard. Cleaning streams each sheet through ``processar_limpeza_em_blocos`` straight
+into ``salvar_planilha``, so a worker never holds a whole cleaned sheet. Every file gets its
+own status, timing and warnings, and one failing file never stops the batch. Nothing here
+imports the GUI.
+
+Functions:
+    encontrar_preset: Look up a preset by name
+    indices_do_preset: 0-based column indices from a preset's "colunas_deletar"
+    opcoes_do_preset: Filter options (duplicate key and mode included) from a preset
+    expandir_arquivos: Resolve glob patterns and directories to a sorted list of workbooks
+    caminho_saida: Output path of a cleaned file
+    processar_arquivo: Run one file (runs inside a worker)
+    executar_lote: Run processar_arquivo over many files, in parallel or sequentially
+    montar_relatorio: JSON-serializable run report
+"""
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from core.duplicadas import opcoes_duplicadas
+from core.medicao import Medicao
+from core.multi import combinar_parciais, config_cache_disco, iniciar_worker, logica_worker
+
+MODOS = ("limpeza", "resumo")
+
+EXTENSOES_ENTRADA = (".xlsx", ".xlsm", ".xls")
+
+
+def encontrar_preset(presets, nome):
+    """
+    Look up a preset by name (case and surrounding spaces ignored).
+
+    Args:
+        presets (list): Presets from settings.json
+        nome (str): Preset name
+
+    Returns:
+        dict: The preset
+
+    Raises:
+        Exception: If no preset has that name (the message lists the available ones)
+    """
+    alvo = nome.strip().casefold()
+    for preset in presets:
+        if str(preset.get("nome", "")).strip().casefold() == alvo:
+            return preset
+    disponiveis = ", ".join(f"'{p.get('nome')}'" for p in presets) or "nenhum"
+    raise Exception(f"Preset '{nome}' nao encontrado. Disponiveis: {disponiveis}")
+
+
+def indices_do_preset(preset):
+    """
+    Convert a preset's "colunas_deletar" (1-based, as typed in the GUI) to 0-based indices.
+
+    Args:
+        preset (dict): Preset from settings.json
+
+    Returns:
+        list: 0-based column indices
+
+    Raises:
+        ValueError: If the field has something other than comma-separated numbers
+    """
+    texto = str(preset.get("colunas_deletar", "") or "")
+    try:
+        return [int(i.strip()) - 1 for i in texto.split(",") if i.strip()]
+    except ValueError:
+        raise ValueError(f"Indices invalidos no preset '{preset.get('nome')}': {texto}")
+
+
+def opcoes_do_preset(preset, remover_duplicadas=True, remover_vazias=True):
+    """
+    Filter options for processar_limpeza from a preset.
+
+    The preset may set the duplicate key ("chave_duplicadas": "B, Z") and the duplicate
+    mode ("modo_duplicadas": "hash"), see core/duplicadas.py, and column type hints
+    ("tipos_colunas": {"Z": "inteiro", "AA": "decimal"}), see core/tipos.py.
+
+    Args:
+        preset (dict): Preset from settings.json
+        remover_duplicadas (bool): Remove duplicate rows
+        remover_vazias (bool): Remove empty rows
+
+    Returns:
+        dict: Filter options
+
+    Raises:
+        ValueError: If the preset's duplicate mode is unknown
+    """
+    chave, modo = opcoes_duplicadas(preset)
+    return {"remover_duplicadas": remover_duplicadas, "remover_vazias": remover_vazias,
+            "chave_duplicadas": chave, "modo_duplicadas": modo,
+            "tipos_colunas": dict(preset.get("tipos_colunas") or {})}
+
+
+def expandir_arquivos(padroes):
+    """
+    Resolve glob patterns (``**`` included) and directories to workbook paths.
+
+    Directories contribute their .xlsx/.xlsm/.xls files (not recursively). Excel lock files
+    ("~$...") are skipped and each file appears once.
+
+    Args:
+        padroes (list): Glob patterns, file paths or directories
+
+    Returns:
+        list: Absolute paths, sorted
+    """
+    encontrados = set()
+    for padrao in padroes:
+        if os.path.isdir(padrao):
+            candidatos = [os.path.join(padrao, nome) for nome in os.listdir(padrao)]
+            candidatos = [c for c in candidatos if os.path.splitext(c)[1].lower() in EXTENSOES_ENTRADA]
+        else:
+            candidatos = glob.glob(padrao, recursive=True)
+        for caminho in candidatos:
+            if os.path.isfile(caminho) and not os.path.basename(caminho).startswith("~$"):
+                encontrados.add(os.path.abspath(caminho))
+    return sorted(encontrados)
+
+
+def caminho_saida(caminho, diretorio_saida=None, formato="xlsx", sufixo="_limpo"):
+    """
+    Output path of a cleaned file: "<nome><sufixo>.<formato>" next to the input or in
+    ``diretorio_saida``.
+    """
+    nome = os.path.splitext(os.path.basename(caminho))[0] + sufixo + "." + formato
+    return os.path.join(diretorio_saida or os.path.dirname(os.path.abspath(caminho)), nome)
+
+
+def _contar(blocos, contador):
+    for bloco in blocos:
+        contador[0] += len(bloco)
+        yield bloco
+
+
+def processar_arquivo(caminho, tarefa, logic=None):
+    """
+    Run the batch job on one file.
+
+    Args:
+        caminho (str): Path to Excel file
+        tarefa (dict): Job description with keys:
+            - modo (str): "limpeza" or "resumo"
+            - aba (str): Sheet name ("" = first sheet)
+            - indices_deletar (list): 0-based columns to delete (limpeza)
+            - opcoes (dict): Filter options for processar_limpeza (limpeza)
+            - diretorio_saida (str or None): Output directory (None = next to the input)
+            - formato (str): "xlsx", "csv" or "parquet" (limpeza)
+            - sufixo (str): Appended to the output file name (limpeza)
+        logic (ADCLogic, optional): Instance to use (default: one per worker process)
+
+    Returns:
+        dict: {'arquivo', 'status' ("ok"/"erro"), 'segundos', 'pico_mb', 'avisos'} plus
+              'saida' and 'linhas' (limpeza), 'pedidos', 'ranking', 'total_itens', 'total_pedidos'
+              and 'valor_total' (resumo), or 'erro' when the file failed
+    """
+    logic = logic or logica_worker()
+    avisos = []
+
+    def log(mensagem):
+        if "[WARNING]" in mensagem or "[ERROR]" in mensagem:
+            avisos.append(mensagem.strip())
+
+    resultado = {"arquivo": caminho, "status": "ok"}
+    try:
+        with Medicao() as medicao:
+            if tarefa["modo"] == "resumo":
+                res = logic.gerar_resumo(caminho, tarefa.get("aba", ""), log)
+                if 'erro' in res:
+                    raise Exception(res['erro'])
+                resultado.update({
+                    "pedidos": res['pedidos'],
+                    "ranking": res.get('ranking'),
+                    "total_itens": int(res.get('total_itens', 0)),
+                    "total_pedidos": int(res.get('total_pedidos', 0)),
+                    "valor_total": float(res.get('valor_total', 0.0)),
+                })
+            else:
+                saida = caminho_saida(caminho, tarefa.get("diretorio_saida"),
+                                      tarefa.get("formato", "xlsx"), tarefa.get("sufixo", "_limpo"))
+                linhas = [0]
+                blocos = logic.processar_limpeza_em_blocos(caminho, tarefa.get("aba", ""),
+                                                           tarefa.get("indices_deletar", []),
+                                                           tarefa.get("opcoes"), log)
+                try:
+                    saida = logic.salvar_planilha(_contar(blocos, linhas), saida, tarefa.get("formato"), log)
+                finally:
+                    blocos.close()
+                resultado.update({"saida": saida, "linhas": linhas[0]})
+    except Exception as e:
+        resultado.update({"status": "erro", "erro": str(e)})
+
+    resultado.update({"segundos": round(medicao.segundos, 3),
+                      "pico_mb": None if medicao.pico_mb is None else round(medicao.pico_mb, 1),
+                      "avisos": avisos})
+    return resultado
+
+
+def executar_lote(caminhos, tarefa, workers=None, progress_callback=None, logic=None):
+    """
+    Run processar_arquivo over many files.
+
+    Args:
+        caminhos (list): Paths to Excel files
+        tarefa (dict): Job description (see processar_arquivo)
+        workers (int, optional): Worker processes (default: min(files, CPUs)); 1 = sequential
+        progress_callback (callable, optional): Called as (concluidos, total, resultado)
+            each time a file finishes, in completion order
+        logic (ADCLogic, optional): Instance used when running sequentially; its disk-cache
+            settings are also passed to the worker processes
+
+    Returns:
+        list: Per-file results in the same order as ``caminhos``
+    """
+    caminhos = list(caminhos)
+    total = len(caminhos)
+    if workers is None:
+        workers = min(total, os.cpu_count() or 1)
+    workers = max(1, min(workers, total or 1))
+
+    resultados = [None] * total
+    if workers == 1:
+        for i, caminho in enumerate(caminhos):
+            resultados[i] = processar_arquivo(caminho, tarefa, logic)
+            if progress_callback: progress_callback(i + 1, total, resultados[i])
+        return resultados
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=iniciar_worker,
+                             initargs=(config_cache_disco(logic),)) as pool:
+        futuros = {pool.submit(processar_arquivo, caminho, tarefa): i for i, caminho in enumerate(caminhos)}
+        for concluidos, futuro in enumerate(as_completed(futuros), 1):
+            i = futuros[futuro]
+            try:
+                resultados[i] = futuro.result()
+            except Exception as e:
+                # Ex: worker morto por falta de memoria
+                resultados[i] = {"arquivo": caminhos[i], "status": "erro", "erro": str(e),
+                                 "segundos": None, "pico_mb": None, "avisos": []}
+            if progress_callback: progress_callback(concluidos, total, resultados[i])
+    return resultados
+
+
+def montar_relatorio(resultados, tarefa, preset, inicio, segundos, workers, ignorados=()):
+    """
+    Build the JSON-serializable run report.
+
+    Args:
+        resultados (list): Results of executar_lote
+        tarefa (dict): Job description
+        preset (str): Preset name
+        inicio (datetime): Start of the run
+        segundos (float): Wall time of the whole run
+        workers (int): Worker processes used
+        ignorados (iterable): Inputs skipped before the run (e.g. outputs of a previous run)
+
+    Returns:
+        dict: {'preset', 'modo', 'aba', 'inicio', 'segundos', 'workers', 'arquivos',
+               'ignorados', 'totais'} ('totais' of a resumo run includes 'top_skus')
+    """
+    # IDs e tabela por SKU ficam so nos totais (o relatorio e JSON)
+    arquivos = [{k: v for k, v in r.items() if k not in ("pedidos", "ranking")} for r in resultados]
+    ok = sum(1 for r in resultados if r["status"] == "ok")
+    totais = {"arquivos": len(resultados), "ok": ok, "erros": len(resultados) - ok}
+
+    if tarefa["modo"] == "resumo":
+        combinado = combinar_parciais(resultados)
+        totais.update({
+            "total_itens": int(combinado["total_itens"]),
+            "total_pedidos": combinado["total_pedidos"],
+            "valor_total": float(combinado["valor_total"]),
+            "top_skus": combinado["ranking"],
+        })
+    else:
+        totais["linhas"] = sum(r.get("linhas", 0) for r in resultados)
+
+    return {
+        "preset": preset,
+        "modo": tarefa["modo"],
+        "aba": tarefa.get("aba", ""),
+        "inicio": inicio.isoformat(timespec="seconds"),
+        "fim": datetime.now().isoformat(timespec="seconds"),
+        "segundos": round(segundos, 3),
+        "workers": workers,
+        "arquivos": arquivos,
+        "ignorados": list(ignorados),
+        "totais": totais,
+    }
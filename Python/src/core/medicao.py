@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+ADC Measurement Module
+
+Wall time and peak memory of a block of code, for the figures reported in the log.
+
+Peak memory is the highest resident set size (working set on Windows) sampled by a
+background thread while the block runs, minus the level at entry. Sampling costs almost
+nothing, unlike ``tracemalloc`` which slows allocation-heavy code (openpyxl) several times.
+
+Classes:
+    Medicao: Context manager recording elapsed seconds and peak memory growth in MB
+
+Functions:
+    memoria_residente: Current resident memory of the process in bytes
+"""
+import os
+import sys
+import threading
+import time
+
+
+def _memoria_windows():
+    import ctypes
+    from ctypes import wintypes
+
+    class _Contadores(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+
+    contadores = _Contadores()
+    contadores.cb = ctypes.sizeof(_Contadores)
+    processo = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(processo, ctypes.byref(contadores), contadores.cb):
+        return None
+    return contadores.WorkingSetSize
+
+
+def memoria_residente():
+    """
+    Return the current resident memory of the process.
+
+    Returns:
+        int or None: Bytes, or None where it cannot be read (e.g. macOS)
+    """
+    try:
+        if sys.platform == "win32":
+            return _memoria_windows()
+        with open("/proc/self/statm") as arquivo:
+            return int(arquivo.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class Medicao:
+    """
+    Measure elapsed time and peak memory growth of a ``with`` block.
+
+    Example:
+        with Medicao() as m:
+            escrever_xlsx(df, caminho)
+        log_callback(f"[OK] Salvo ({m.resumo()})")
+
+    Attributes:
+        segundos (float): Elapsed wall time
+        pico_mb (float or None): Peak resident memory above the entry level, in MB
+            (None when memory cannot be read on this platform or tracking is off)
+    """
+
+    def __init__(self, memoria=True, intervalo=0.05):
+        """
+        Args:
+            memoria (bool): Sample resident memory while the block runs
+            intervalo (float): Seconds between samples
+        """
+        self.memoria = memoria
+        self.intervalo = intervalo
+        self.segundos = 0.0
+        self.pico_mb = None
+        self._inicio = 0.0
+        self._base = None
+        self._pico = 0
+        self._parar = threading.Event()
+        self._amostrador = None
+
+    def _amostrar(self):
+        while not self._parar.wait(self.intervalo):
+            self._pico = max(self._pico, memoria_residente() or 0)
+
+    def __enter__(self):
+        self._base = memoria_residente() if self.memoria else None
+        if self._base is not None:
+            self._pico = self._base
+            self._amostrador = threading.Thread(target=self._amostrar, daemon=True)
+            self._amostrador.start()
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.segundos = time.perf_counter() - self._inicio
+        if self._amostrador is not None:
+            self._parar.set()
+            self._amostrador.join()
+            self._pico = max(self._pico, memoria_residente() or 0)
+            self.pico_mb = (self._pico - self._base) / (1024 * 1024)
+        return False
+
+    def resumo(self):
+        """Return a short description such as '3.21s, pico de memoria +45.2 MB'."""
+        texto = f"{self.segundos:.2f}s"
+        if self.pico_mb is not None:
+            texto += f", pico de memoria +{self.pico_mb:.1f} MB"
+        return texto
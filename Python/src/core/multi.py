@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""
+ADC Multi-file Aggregation Module
+
+Parallel computation of the dashboard summary over many workbooks.
+
+Excel parsing is CPU-bound and holds the GIL, so files are parsed in a process pool.
+Each worker returns only a compact partial (order IDs, item sum, value sum, per-SKU table) instead of
+the parsed DataFrame, and partials are merged in input order so the totals are exactly
+the ones produced by processing the files one after another.
+
+With a SidecarCache, partials are also persisted by file content hash: files that did not
+change since the last run are served from disk and only new or edited files are parsed.
+
+Functions:
+    resumo_parcial: Compute the partial summary of one file (runs inside a worker)
+    combinar_parciais: Merge partials into dashboard totals
+    executar_resumos: Run resumo_parcial over many files, in parallel or sequentially
+    encerrar_workers: Kill the worker processes of the pools still running
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from core.pedidos import AcumuladorPedidos
+from core.ranking import combinar_rankings, top_skus
+
+# ADCLogic reaproveitado por processo worker (evita reler settings.json a cada arquivo)
+_LOGICA_WORKER = None
+
+# Pools em uso (encerrar_workers): sem eles, a saida do Python espera os arquivos em leitura
+_POOLS_ATIVOS = set()
+_TRAVA_POOLS = threading.Lock()
+
+
+def config_cache_disco(logic):
+    """Disk-cache settings of ``logic``, so workers read/write the same sidecar cache."""
+    cache = getattr(logic, "cache_disco", None)
+    if cache is None:
+        return None
+    return {
+        "ativo": cache.ativo,
+        "diretorio": cache.diretorio,
+        "limite_mb": cache.limite_bytes / (1024 * 1024),
+        "formato": cache.formato,
+    }
+
+
+def iniciar_worker(config_cache=None):
+    """Pool initializer: build the worker's ADCLogic once per process."""
+    global _LOGICA_WORKER
+    from core.cleaner import ADCLogic
+    from core.sidecar import SidecarCache
+    # Sem cache em memoria: o worker nao volta a ler o mesmo arquivo
+    _LOGICA_WORKER = ADCLogic(limite_cache_mb=0)
+    if config_cache is not None:
+        _LOGICA_WORKER.cache_disco = SidecarCache(**config_cache)
+
+
+def logica_worker():
+    """ADCLogic of the current worker process (created on first use outside a pool)."""
+    if _LOGICA_WORKER is None:
+        iniciar_worker()
+    return _LOGICA_WORKER
+
+
+def resumo_parcial(caminho, aba="", logic=None):
+    """
+    Compute the compact partial summary of one workbook.
+
+    Args:
+        caminho (str): Path to Excel file
+        aba (str): Sheet name ("" = first sheet)
+        logic (ADCLogic, optional): Instance to use (default: one per worker process)
+
+    Returns:
+        dict: {'arquivo', 'pedidos' (array of unique order IDs), 'total_itens', 'valor_total',
+              'ranking' (per-SKU table or None)} or {'arquivo', 'erro'} if the file could not be summarized
+    """
+    logic = logic or logica_worker()
+    try:
+        res = logic.gerar_resumo(caminho, aba)
+    except Exception as e:
+        return {"arquivo": caminho, "erro": str(e)}
+
+    if 'erro' in res:
+        return {"arquivo": caminho, "erro": res['erro']}
+
+    return {
+        "arquivo": caminho,
+        "pedidos": res['pedidos'],
+        "total_itens": res.get('total_itens', 0),
+        "valor_total": res.get('valor_total', 0.0),
+        "ranking": res.get('ranking'),
+    }
+
+
+def combinar_parciais(parciais, aproximado=False, top_n=10):
+    """
+    Merge per-file partials into dashboard totals.
+
+    Partials are summed in the given order, so passing them in input order reproduces the
+    sequential float sum exactly. Order IDs are merged in an AcumuladorPedidos (compact
+    arrays, or a HyperLogLog estimate with ``aproximado=True``). Per-SKU tables are summed
+    whole before the top N is taken (see core/ranking.py).
+
+    Args:
+        parciais (list): Results of resumo_parcial
+        aproximado (bool): Estimate the distinct orders instead of counting them exactly
+        top_n (int): Number of SKUs in the ranking
+
+    Returns:
+        dict: {'total_itens', 'total_pedidos', 'valor_total', 'pedidos' (AcumuladorPedidos),
+               'ranking' (top SKUs by order frequency, list of dicts), 'erros', 'arquivos_ok'}
+    """
+    pedidos = AcumuladorPedidos(aproximado)
+    total_itens = 0
+    total_valor = 0.0
+    rankings = []
+    erros = []
+    arquivos_ok = 0
+
+    for parcial in parciais:
+        if 'erro' in parcial:
+            erros.append(f"{parcial['arquivo']}: {parcial['erro']}")
+            continue
+        pedidos.adicionar(parcial['pedidos'])
+        total_itens += parcial['total_itens']
+        total_valor += parcial['valor_total']
+        rankings.append(parcial.get('ranking'))
+        arquivos_ok += 1
+
+    return {
+        "total_itens": total_itens,
+        "total_pedidos": len(pedidos),
+        "valor_total": total_valor,
+        "pedidos": pedidos,
+        "ranking": top_skus(combinar_rankings(rankings), top_n),
+        "erros": erros,
+        "arquivos_ok": arquivos_ok,
+    }
+
+
+def executar_resumos(caminhos, workers=None, aba="", progress_callback=None, logic=None, cache=None):
+    """
+    Run resumo_parcial over many files.
+
+    Args:
+        caminhos (list): Paths to Excel files
+        workers (int, optional): Worker processes (default: min(files, CPUs)); 1 = sequential
+        aba (str): Sheet name used for every file ("" = first sheet)
+        progress_callback (callable, optional): Called as (concluidos, total, parcial)
+            each time a file finishes, in completion order; an exception raised by it (e.g.
+            TarefaCancelada) drops the files not started yet
+        logic (ADCLogic, optional): Instance used when running sequentially; its disk-cache
+            settings are also passed to the worker processes
+        cache (SidecarCache, optional): Store of partials by file hash; unchanged files are
+            read from it (marked 'em_cache') and new partials are written to it
+
+    Returns:
+        list: Partials in the same order as ``caminhos``
+    """
+    caminhos = list(caminhos)
+    if cache is None or not cache.ativo:
+        return _executar_resumos(caminhos, workers, aba, progress_callback, logic)
+    coluna_sku = (getattr(logic, "dashboard", None) or {}).get("coluna_sku", "")
+
+    total = len(caminhos)
+    parciais = [None] * total
+    pendentes = []
+    for i, caminho in enumerate(caminhos):
+        try:
+            parciais[i] = cache.ler_resumo(caminho, aba, coluna_sku)
+        except OSError:
+            parciais[i] = None  # arquivo sumiu: resumo_parcial reporta o erro
+        if parciais[i] is None:
+            pendentes.append(i)
+        else:
+            parciais[i]["em_cache"] = True
+            if progress_callback: progress_callback(i + 1 - len(pendentes), total, parciais[i])
+
+    reaproveitados = total - len(pendentes)
+
+    def _progresso(concluidos, _total, parcial):
+        if progress_callback: progress_callback(reaproveitados + concluidos, total, parcial)
+
+    novos = _executar_resumos([caminhos[i] for i in pendentes], workers, aba, _progresso, logic)
+    for i, parcial in zip(pendentes, novos):
+        parciais[i] = parcial
+        if 'erro' not in parcial:
+            try:
+                cache.gravar_resumo(caminhos[i], aba, parcial, coluna_sku)
+            except OSError:
+                pass  # cache e opcional: o resumo ja foi calculado
+    try:
+        cache.salvar_hashes()
+    except OSError:
+        pass
+    return parciais
+
+
+def _executar_resumos(caminhos, workers, aba, progress_callback, logic):
+    """Compute every partial, in a process pool when workers > 1."""
+    total = len(caminhos)
+    if total == 0:
+        return []
+    if workers is None:
+        workers = min(total, os.cpu_count() or 1)
+    workers = max(1, min(workers, total or 1))
+
+    parciais = [None] * total
+    if workers == 1:
+        for i, caminho in enumerate(caminhos):
+            parciais[i] = resumo_parcial(caminho, aba, logic)
+            if progress_callback: progress_callback(i + 1, total, parciais[i])
+        return parciais
+
+    pool = ProcessPoolExecutor(max_workers=workers, initializer=iniciar_worker,
+                               initargs=(config_cache_disco(logic),))
+    with _TRAVA_POOLS:
+        _POOLS_ATIVOS.add(pool)
+    try:
+        futuros = {pool.submit(resumo_parcial, caminho, aba): i for i, caminho in enumerate(caminhos)}
+        for concluidos, futuro in enumerate(as_completed(futuros), 1):
+            i = futuros[futuro]
+            try:
+                parciais[i] = futuro.result()
+            except Exception as e:
+                # Ex: worker morto por falta de memoria
+                parciais[i] = {"arquivo": caminhos[i], "erro": str(e)}
+            if progress_callback: progress_callback(concluidos, total, parciais[i])
+    except BaseException:
+        # Interrompido pelo callback (ex: tarefa cancelada): arquivos na fila nem comecam,
+        # e os que estao em leitura sao abandonados
+        _terminar(pool)
+        raise
+    finally:
+        with _TRAVA_POOLS:
+            _POOLS_ATIVOS.discard(pool)
+    pool.shutdown()
+    return parciais
+
+
+def _terminar(pool):
+    """Drop the queued files and kill the workers still reading one."""
+    # O executor nao tem API publica para isso antes do Python 3.14 (terminate_workers);
+    # a lista e lida antes do shutdown, que a descarta
+    processos = list((getattr(pool, "_processes", None) or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for processo in processos:
+        if processo.is_alive():
+            processo.terminate()
+
+
+def encerrar_workers():
+    """
+    Kill the worker processes of every pool still running (e.g. when the window closes).
+
+    Python's exit handler waits for the files being read by a process pool; after this,
+    it does not. The job that owned the pool gets an error for the files not finished.
+    """
+    with _TRAVA_POOLS:
+        pools = list(_POOLS_ATIVOS)
+    for pool in pools:
+        _terminar(pool)
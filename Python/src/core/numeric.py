@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+"""
+ADC Numeric Parsing Module
+
+Column-level (vectorized) conversion of currency/numeric spreadsheet columns to float.
+
+The scalar helpers ``ADCLogic.limpar_valor`` and ``ADCLogic.clean_numeric`` are applied
+cell by cell through ``Series.apply``, which dominates runtime on large exports. The
+functions in this module produce exactly the same values, but work on whole columns:
+text cells are turned into a matrix of Unicode code points and parsed with NumPy
+arithmetic, numeric cells are cast in one go.
+
+Exactness: a text cell is parsed on the fast path only when it is a plain number with at
+most 15 digits. The mantissa is then an exact integer below 2**53 and the result is a
+single IEEE division by an exact power of ten, which is the same correctly rounded value
+``float()`` returns. Anything else (exponents, "N/A", unusual whitespace...) falls back to
+the scalar conversion for that cell only.
+
+Functions:
+    converter_serie_numerica: Convert a whole column to a float64 NumPy array
+    ampliar_float32: Widen float32 values to the float64 of their shortest decimal text
+    detectar_formato_numerico: Detect BR ("1.200,50") or US ("1,200.50") formatting of a column
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.types import infer_dtype, is_bool_dtype, is_numeric_dtype
+
+FORMATOS_NUMERICOS = ("br", "us", "auto")
+
+# Separadores (milhar, decimal) por formato
+_SEPARADORES = {"br": (".", ","), "us": (",", ".")}
+
+# Tipos inferidos pelo pandas que nao contem nenhuma string
+_TIPOS_SEM_TEXTO = {"integer", "floating", "mixed-integer-float", "decimal", "boolean", "complex"}
+
+# Tipos que os helpers escalares convertem com float() direto (clean_numeric passa numpy por str())
+_TIPOS_FLOAT_DIRETO = (int, float, np.integer, np.floating, np.bool_)
+_TIPOS_FLOAT_VIA_STR = (int, float, np.integer)
+
+# Limites do caminho rapido
+_MAX_DIGITOS = 15          # 10**15 < 2**53: mantissa exata em float64
+_MAX_LARGURA = 32          # textos maiores vao para o caminho escalar
+_LINHAS_POR_BLOCO = 65536  # limita a memoria da matriz de code points
+
+_POTENCIAS_FLOAT = 10.0 ** np.arange(_MAX_DIGITOS + 1)
+
+
+def _float_ou_zero(valor):
+    """Scalar float() with the 0.0 fallback used by the original helpers."""
+    try:
+        return float(valor)
+    except (ValueError, TypeError):
+        return 0.0
+
+
+def _texto_para_float(texto, formato):
+    """Scalar reference: same string normalization as limpar_valor/clean_numeric."""
+    milhar, decimal = _SEPARADORES[formato]
+    texto = texto.replace("R$", "").replace(milhar, "")
+    if decimal != ".":
+        texto = texto.replace(decimal, ".")
+    return _float_ou_zero(texto.strip())
+
+
+def _converter_escalar(valor, formato, preservar_nan):
+    """Per-cell fallback reproducing limpar_valor/clean_numeric for unusual cell types."""
+    if isinstance(valor, str):
+        return _texto_para_float(valor, formato)
+    if preservar_nan or isinstance(valor, (int, float)):
+        # limpar_valor chama float() direto; clean_numeric tambem para int/float
+        return _float_ou_zero(valor)
+    # clean_numeric converte os demais tipos via str()
+    return _texto_para_float(str(valor), formato)
+
+
+def _converter_bloco(textos, tamanhos, formato):
+    """
+    Parse a block of short strings with NumPy arithmetic.
+
+    The block is laid out as a (largura x linhas) matrix of code points and scanned one
+    character position at a time; every step is a vector operation over all rows, so the
+    Python loop runs at most _MAX_LARGURA times per block.
+
+    Args:
+        textos (np.ndarray): Object array of str, each at most _MAX_LARGURA characters
+        tamanhos (np.ndarray): len() of each string
+        formato (str): "br" or "us"
+
+    Returns:
+        tuple: (valores float64 array, ok bool array). Rows with ok=False must be converted
+               by the scalar fallback.
+    """
+    n = len(textos)
+    matriz = textos.astype(str)
+    largura = matriz.dtype.itemsize // 4
+    if largura == 0:
+        return np.zeros(n), np.ones(n, dtype=bool)
+
+    colunas = np.ascontiguousarray(matriz.view(np.uint32).reshape(n, largura).T)
+    milhar, decimal = ord(_SEPARADORES[formato][0]), ord(_SEPARADORES[formato][1])
+
+    # Estado por linha: 0 = espacos iniciais, 1 = apos sinal, 2 = no numero, 3 = espacos finais
+    estado = np.zeros(n, dtype=np.int8)
+    falhou = np.zeros(n, dtype=bool)
+    tem_outro = np.zeros(n, dtype=bool)
+    negativo = np.zeros(n, dtype=bool)
+    mantissa = np.zeros(n, dtype=np.int64)
+    digitos = np.zeros(n, dtype=np.int32)
+    casas = np.zeros(n, dtype=np.int32)
+    pontos = np.zeros(n, dtype=np.int32)
+    caracteres = np.zeros(n, dtype=np.int64)
+    simbolo_anterior = np.zeros(n, dtype=bool)
+
+    for j in range(largura):
+        c = colunas[j]
+        caracteres += c != 0
+
+        # "R$" e separador de milhar sao removidos antes do float()
+        if j + 1 < largura:
+            simbolo = (c == ord("R")) & (colunas[j + 1] == ord("$"))
+        else:
+            simbolo = np.zeros(n, dtype=bool)
+        removido = (c == 0) | (c == milhar) | simbolo | simbolo_anterior
+        simbolo_anterior = simbolo
+
+        mantido = ~removido
+        digito = mantido & (c >= ord("0")) & (c <= ord("9"))
+        ponto = mantido & (c == decimal)
+        sinal = mantido & ((c == ord("-")) | (c == ord("+")))
+        espaco = mantido & ((c == 32) | (c == 160) | ((c >= 9) & (c <= 13)))
+        tem_outro |= mantido & ~(digito | ponto | sinal | espaco)
+
+        # Sinal so antes do numero; espaco so nas pontas; nada depois dos espacos finais
+        falhou |= sinal & (estado != 0)
+        falhou |= espaco & (estado == 1)
+        falhou |= (digito | ponto) & (estado == 3)
+        negativo |= sinal & (c == ord("-"))
+
+        pontos += ponto
+        mantissa = np.where(digito, mantissa * 10 + (c.astype(np.int64) - ord("0")), mantissa)
+        digitos += digito
+        casas += digito & (pontos > 0)
+
+        estado = np.where(sinal, 1, estado)
+        estado = np.where(digito | ponto, 2, estado)
+        estado = np.where(espaco & (estado == 2), 3, estado).astype(np.int8)
+
+    # Textos com NUL nao sobrevivem intactos ao dtype 'U'
+    legivel = ~tem_outro & (caracteres == tamanhos)
+
+    # Sem nenhum digito o float() sempre falha: o helper escalar devolve 0.0
+    sem_digitos = digitos == 0
+    ok = legivel & (sem_digitos | (~falhou & (pontos <= 1) & (digitos <= _MAX_DIGITOS)))
+
+    casas = np.clip(casas, 0, _MAX_DIGITOS)
+    valores = mantissa.astype(np.float64) / _POTENCIAS_FLOAT[casas]
+    valores = np.where(negativo, -valores, valores)
+    valores[sem_digitos] = 0.0
+    return valores, ok
+
+
+def _converter_textos(textos, formato):
+    """
+    Convert an object array of raw strings ("R$ 1.200,50") to float64.
+
+    Short plain numbers are parsed in blocks by ``_converter_bloco``; the remaining cells
+    use the scalar reference, so the result always matches the original helpers.
+    """
+    n = len(textos)
+    resultado = np.zeros(n, dtype=np.float64)
+    pendentes = np.ones(n, dtype=bool)
+
+    tamanhos = np.fromiter(map(len, textos), dtype=np.int64, count=n)
+    curtos = np.flatnonzero(tamanhos <= _MAX_LARGURA)
+    for inicio in range(0, len(curtos), _LINHAS_POR_BLOCO):
+        idx = curtos[inicio:inicio + _LINHAS_POR_BLOCO]
+        valores, ok = _converter_bloco(textos[idx], tamanhos[idx], formato)
+        resultado[idx[ok]] = valores[ok]
+        pendentes[idx[ok]] = False
+
+    for i in np.flatnonzero(pendentes):
+        resultado[i] = _texto_para_float(textos[i], formato)
+    return resultado
+
+
+def detectar_formato_numerico(serie):
+    """
+    Detect whether a column uses BR ("1.200,50") or US ("1,200.50") number formatting.
+
+    Looks only at string cells. A cell votes for BR when its last separator is a comma and
+    for US when its last separator is a dot followed by anything other than exactly three
+    digits (a lone "1.234" is ambiguous and does not vote).
+
+    Args:
+        serie (pd.Series): Column to inspect
+
+    Returns:
+        str: "br" or "us" ("br" when there is no evidence either way)
+    """
+    if serie.dtype == object:
+        textos = serie[[isinstance(v, str) for v in serie]]
+    else:
+        textos = serie.dropna().astype(str)
+    if len(textos) == 0:
+        return "br"
+
+    pos_virgula = textos.str.rfind(",")
+    pos_ponto = textos.str.rfind(".")
+    votos_br = int((pos_virgula > pos_ponto).sum())
+
+    depois_ponto = textos.str.len() - pos_ponto - 1
+    votos_us = int(((pos_ponto > pos_virgula) & ((depois_ponto != 3) | (pos_virgula >= 0))).sum())
+    return "us" if votos_us > votos_br else "br"
+
+
+def ampliar_float32(valores):
+    """
+    Widen float32 values to float64 through their shortest decimal text.
+
+    A plain cast turns the float32 nearest to 1234.56 into 1234.56005859375; going through
+    the text ("1234.56") gives back the float64 the cell was parsed from, as long as the
+    value survived the float32 round trip (core/tipos.py only stores those as float32).
+
+    Args:
+        valores (np.ndarray): float32 array
+
+    Returns:
+        np.ndarray: float64 array (NaN kept)
+    """
+    return np.asarray(valores, dtype=np.float32).astype(str).astype(np.float64)
+
+
+def converter_serie_numerica(serie, formato="br", preservar_nan=False):
+    """
+    Convert a spreadsheet column to float64 in one vectorized pass.
+
+    With the defaults the result is identical to ``serie.apply(ADCLogic.clean_numeric)``.
+    With ``preservar_nan=True`` it is identical to ``serie.apply(ADCLogic.limpar_valor)``,
+    which keeps float NaN cells as NaN (any other missing marker becomes 0.0).
+
+    Args:
+        serie (pd.Series): Column to convert (numeric, text or mixed object dtype)
+        formato (str): "br" (dot = thousands, comma = decimal), "us" (comma = thousands)
+                       or "auto" (detect per column with ``detectar_formato_numerico``)
+        preservar_nan (bool): Keep float NaN cells as NaN instead of 0.0
+
+    Returns:
+        np.ndarray: float64 array aligned with ``serie``
+
+    Raises:
+        ValueError: If ``formato`` is not one of FORMATOS_NUMERICOS
+    """
+    if formato not in FORMATOS_NUMERICOS:
+        raise ValueError(f"Formato numerico invalido: {formato}. Use um de {FORMATOS_NUMERICOS}")
+
+    # Caminho rapido: coluna ja numerica (caso comum quando o Excel guarda numeros)
+    if serie.dtype != object and (is_numeric_dtype(serie.dtype) or is_bool_dtype(serie.dtype)):
+        if serie.dtype == np.float32:
+            resultado = ampliar_float32(serie.to_numpy())
+        else:
+            resultado = serie.to_numpy(dtype=np.float64, na_value=np.nan)
+        if not preservar_nan:
+            resultado = np.where(np.isnan(resultado), 0.0, resultado)
+        return resultado
+
+    valores = serie.to_numpy(dtype=object)
+    n = len(valores)
+    resultado = np.zeros(n, dtype=np.float64)
+    ausentes = pd.isna(valores)
+
+    if preservar_nan and ausentes.any():
+        # limpar_valor faz float(x): NaN de ponto flutuante continua NaN, None/NaT/NA viram 0.0
+        idx_ausentes = np.flatnonzero(ausentes)
+        eh_float = np.array([isinstance(valores[i], float) for i in idx_ausentes], dtype=bool)
+        resultado[idx_ausentes[eh_float]] = np.nan
+
+    presentes = ~ausentes
+    if not presentes.any():
+        return resultado
+
+    tipo = infer_dtype(valores[presentes], skipna=False)
+    if tipo in _TIPOS_SEM_TEXTO:
+        eh_texto = np.zeros(n, dtype=bool)
+    else:
+        eh_texto = np.fromiter(map(type, valores), dtype=object, count=n) == str
+
+    if formato == "auto":
+        formato = detectar_formato_numerico(pd.Series(valores[eh_texto], dtype=object))
+
+    # 1. Celulas de texto: "R$ 1.200,50" -> 1200.5
+    if eh_texto.any():
+        resultado[eh_texto] = _converter_textos(valores[eh_texto], formato)
+
+    # 2. Celulas nao-texto (int, float, bool, datas...)
+    outros = np.flatnonzero(presentes & ~eh_texto)
+    if len(outros):
+        aceitos = _TIPOS_FLOAT_DIRETO if preservar_nan else _TIPOS_FLOAT_VIA_STR
+        tipos = set(map(type, valores[outros]))
+        if all(issubclass(t, aceitos) for t in tipos):
+            resultado[outros] = valores[outros].astype(np.float64)
+        else:
+            for i in outros:
+                resultado[i] = _converter_escalar(valores[i], formato, preservar_nan)
+
+    return resultado
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+ADC Unique Order Counting Module
+
+Compact accumulator of distinct order IDs across files.
+
+The dashboard used to merge every file's order IDs into a Python ``set``: tens of bytes of
+boxed objects per ID, filled one element at a time. ``AcumuladorPedidos`` keeps them in
+NumPy arrays instead:
+
+- Numeric IDs (ints, integral floats, bools) are stored as int64, so 123 and 123.0 are one
+  order, as they were in the set.
+- Any other ID (text, fractional numbers, dates) is stored as a 64-bit hash. Two different
+  IDs with the same hash would count once, which is vanishingly unlikely for order counts.
+
+Batches are appended as arrays and merged with one vectorized sort only when the
+pending data outgrows the merged data, so adding N IDs costs O(N log N) overall at 8 bytes
+per distinct ID.
+
+For very large multi-month dashboards an approximate mode counts with a HyperLogLog sketch:
+fixed memory (16 KB at the default precision) and a typical error below 1%.
+
+Classes:
+    HyperLogLog: Cardinality sketch over 64-bit hashes
+    AcumuladorPedidos: Distinct order IDs, exact or approximate
+"""
+import numpy as np
+import pandas as pd
+
+_VAZIO_INT = np.array([], dtype=np.int64)
+_VAZIO_HASH = np.array([], dtype=np.uint64)
+_INT64_MAX = np.iinfo(np.int64).max
+# Chave distinta para os tipos raros (datas etc.), separada do hash dos textos
+_CHAVE_OUTROS = "adc-pedidos-outr"
+
+
+def _misturar(inteiros):
+    """splitmix64 finalizer: spread int64 IDs over 64 bits (HyperLogLog needs uniform bits)."""
+    z = inteiros.astype(np.uint64) + np.uint64(0x9E3779B97F4A7C15)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _bits(valores):
+    """Bit length of each uint64 (0 for 0), vectorized."""
+    comprimento = np.zeros(len(valores), dtype=np.uint64)
+    for passo in (32, 16, 8, 4, 2, 1):
+        # Desloca por elemento (0 ou passo) sem mascaras booleanas
+        deslocamento = (valores >> np.uint64(passo) != 0).astype(np.uint64) * np.uint64(passo)
+        comprimento += deslocamento
+        valores = valores >> deslocamento
+    return (comprimento + (valores > 0)).astype(np.uint8)
+
+
+def _unicos(valores):
+    """Sorted unique values (sort + adjacent compare; np.unique's hash path is much slower here)."""
+    valores = np.sort(valores)
+    if len(valores) < 2:
+        return valores
+    manter = np.empty(len(valores), dtype=bool)
+    manter[0] = True
+    np.not_equal(valores[1:], valores[:-1], out=manter[1:])
+    return valores[manter]
+
+
+def _hash_texto(valores, chave=None):
+    """uint64 hash of an object array (IDs of one file are mostly distinct: no categorize pass)."""
+    if chave is None:
+        return pd.util.hash_array(valores, categorize=False)
+    return pd.util.hash_array(valores, hash_key=chave, categorize=False)
+
+
+def _de_floats(valores):
+    """Integral floats join the int64 IDs; fractional ones are hashed."""
+    valores = valores[~np.isnan(valores)]
+    inteiro = (valores == np.floor(valores)) & (np.abs(valores) < 2.0 ** 63)
+    return valores[inteiro].astype(np.int64), pd.util.hash_array(valores[~inteiro], categorize=False)
+
+
+def _separar(ids):
+    """
+    Split a batch of IDs into (int64 numeric IDs, uint64 hashes of the other IDs).
+
+    Missing values are ignored.
+    """
+    valores = np.asarray(ids)
+    tipo = valores.dtype.kind
+    if tipo == "b":
+        return valores.astype(np.int64), _VAZIO_HASH
+    if tipo == "i" or (tipo == "u" and (len(valores) == 0 or valores.max() <= _INT64_MAX)):
+        return valores.astype(np.int64), _VAZIO_HASH
+    if tipo == "f":
+        return _de_floats(valores.astype(np.float64))
+    if tipo in "US":
+        return _VAZIO_INT, _hash_texto(valores.astype(object))
+
+    valores = valores.astype(object)
+    valores = valores[~pd.isna(valores)]
+    inferido = pd.api.types.infer_dtype(valores, skipna=False)
+    if inferido == "string":
+        return _VAZIO_INT, _hash_texto(valores)
+    if inferido in ("integer", "boolean"):
+        try:
+            return valores.astype(np.int64), _VAZIO_HASH
+        except OverflowError:
+            pass  # inteiro alem de int64: tratado como "outros" abaixo
+    if inferido == "floating":
+        return _de_floats(valores.astype(np.float64))
+
+    # Mistura de tipos: separa por tipo de celula
+    e_inteiro = np.fromiter((isinstance(v, (int, np.integer, bool, np.bool_)) and -_INT64_MAX - 1 <= v <= _INT64_MAX
+                             for v in valores), dtype=bool, count=len(valores))
+    e_float = np.fromiter((isinstance(v, (float, np.floating)) for v in valores), dtype=bool, count=len(valores))
+    e_texto = np.fromiter((isinstance(v, str) for v in valores), dtype=bool, count=len(valores))
+    outros = ~(e_inteiro | e_float | e_texto)
+
+    inteiros_float, hashes_float = _de_floats(valores[e_float].astype(np.float64))
+    partes_hash = [hashes_float, _hash_texto(valores[e_texto])]
+    if outros.any():
+        rotulos = np.array([f"{type(v).__name__}:{v!r}" for v in valores[outros]], dtype=object)
+        partes_hash.append(_hash_texto(rotulos, _CHAVE_OUTROS))
+    inteiros = np.concatenate([valores[e_inteiro].astype(np.int64), inteiros_float])
+    return inteiros, np.concatenate(partes_hash).astype(np.uint64)
+
+
+class _Ordenado:
+    """Sorted unique array plus pending batches, merged lazily (amortized O(N log N))."""
+
+    def __init__(self, dtype):
+        self.base = np.array([], dtype=dtype)
+        self.pendentes = []
+        self.tamanho_pendente = 0
+
+    def adicionar(self, valores):
+        if len(valores) == 0:
+            return
+        self.pendentes.append(valores)
+        self.tamanho_pendente += len(valores)
+        # Funde so quando o pendente passa do que ja foi fundido: cada ID e reordenado O(log N) vezes
+        if self.tamanho_pendente > max(len(self.base), 1 << 16):
+            self.compactar()
+
+    def compactar(self):
+        if self.pendentes:
+            self.base = _unicos(np.concatenate([self.base] + self.pendentes))
+            self.pendentes = []
+            self.tamanho_pendente = 0
+        return self.base
+
+    def contem(self, valor):
+        base = self.compactar()
+        posicao = np.searchsorted(base, valor)
+        return bool(posicao < len(base) and base[posicao] == valor)
+
+    def nbytes(self):
+        return self.base.nbytes + sum(p.nbytes for p in self.pendentes)
+
+
+class HyperLogLog:
+    """
+    HyperLogLog cardinality sketch over 64-bit hashes.
+
+    Memory is ``2 ** precisao`` bytes; the standard error is about ``1.04 / sqrt(2 ** precisao)``
+    (0.8% at the default precision of 14).
+
+    Attributes:
+        precisao (int): Number of index bits (4-18)
+        registros (np.ndarray): uint8 registers
+    """
+
+    def __init__(self, precisao=14):
+        if not 4 <= precisao <= 18:
+            raise ValueError(f"Precisao do HyperLogLog fora de 4-18: {precisao}")
+        self.precisao = precisao
+        self.registros = np.zeros(1 << precisao, dtype=np.uint8)
+
+    def adicionar_hashes(self, hashes):
+        """Add uniformly distributed uint64 hashes."""
+        if len(hashes) == 0:
+            return
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        p = np.uint64(self.precisao)
+        indices = hashes >> (np.uint64(64) - p)
+        # Bit-guarda no fim: o posto maximo e 64 - p + 1
+        resto = (hashes << p) | (np.uint64(1) << (p - np.uint64(1)))
+        postos = (np.uint8(65) - _bits(resto)).astype(np.uint32)
+        # Ordena (indice, posto) juntos: a ultima chave de cada indice tem o maior posto
+        chaves = np.sort((indices.astype(np.uint32) << np.uint32(6)) | postos)
+        indices = chaves >> np.uint32(6)
+        ultimas = np.flatnonzero(np.append(indices[1:] != indices[:-1], True))
+        alvo = indices[ultimas]
+        self.registros[alvo] = np.maximum(self.registros[alvo], (chaves[ultimas] & np.uint32(63)).astype(np.uint8))
+
+    def combinar(self, outro):
+        """Merge another sketch of the same precision (union of the counted sets)."""
+        if outro.precisao != self.precisao:
+            raise ValueError("HyperLogLog com precisoes diferentes")
+        np.maximum(self.registros, outro.registros, out=self.registros)
+
+    def estimativa(self):
+        """Estimated number of distinct hashes added."""
+        m = float(len(self.registros))
+        alfa = 0.7213 / (1.0 + 1.079 / m)
+        estimativa = alfa * m * m / np.sum(np.ldexp(1.0, -self.registros.astype(np.int32)))
+        zeros = int(np.count_nonzero(self.registros == 0))
+        if estimativa <= 2.5 * m and zeros:
+            # Poucos elementos: contagem linear e mais precisa
+            estimativa = m * np.log(m / zeros)
+        return float(estimativa)
+
+
+class AcumuladorPedidos:
+    """
+    Distinct order IDs across files, exact (compact arrays) or approximate (HyperLogLog).
+
+    Example:
+        acumulador = AcumuladorPedidos()
+        for parcial in parciais:
+            acumulador.adicionar(parcial['pedidos'])
+        total = len(acumulador)
+
+    Attributes:
+        aproximado (bool): Count with HyperLogLog instead of keeping the IDs
+    """
+
+    def __init__(self, aproximado=False, precisao=14):
+        """
+        Args:
+            aproximado (bool): Use a HyperLogLog sketch (fixed memory, ~1% error)
+            precisao (int): HyperLogLog index bits (approximate mode only)
+        """
+        self.aproximado = aproximado
+        if aproximado:
+            self._hll = HyperLogLog(precisao)
+        else:
+            self._inteiros = _Ordenado(np.int64)
+            self._hashes = _Ordenado(np.uint64)
+
+    def adicionar(self, ids):
+        """
+        Add a batch of order IDs (array, Series or list; missing values are ignored).
+        """
+        inteiros, hashes = _separar(ids)
+        if self.aproximado:
+            self._hll.adicionar_hashes(_misturar(inteiros))
+            self._hll.adicionar_hashes(hashes)
+        else:
+            self._inteiros.adicionar(inteiros)
+            self._hashes.adicionar(hashes)
+
+    def combinar(self, outro):
+        """Add every ID counted by another accumulator of the same mode."""
+        if outro.aproximado != self.aproximado:
+            raise ValueError("Acumuladores de pedidos em modos diferentes")
+        if self.aproximado:
+            self._hll.combinar(outro._hll)
+        else:
+            self._inteiros.adicionar(outro._inteiros.compactar())
+            self._hashes.adicionar(outro._hashes.compactar())
+
+    def __len__(self):
+        if self.aproximado:
+            return int(round(self._hll.estimativa()))
+        return len(self._inteiros.compactar()) + len(self._hashes.compactar())
+
+    def __contains__(self, id_pedido):
+        if self.aproximado:
+            raise TypeError("Modo aproximado nao guarda os IDs")
+        inteiros, hashes = _separar(np.array([id_pedido], dtype=object))
+        if len(inteiros):
+            return self._inteiros.contem(inteiros[0])
+        return bool(len(hashes)) and self._hashes.contem(hashes[0])
+
+    @property
+    def memoria_bytes(self):
+        """Bytes held by the arrays (or the sketch)."""
+        if self.aproximado:
+            return self._hll.registros.nbytes
+        return self._inteiros.nbytes() + self._hashes.nbytes()
@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+"""
+ADC Stage Profiling Module
+
+Per-stage timing of a cleaning or summary run, for ``ADCLogic.perfilar``.
+
+The log lines of the pipeline say what happened but not where the time went (Excel
+parsing, numeric conversion, filters, duplicates, saving). A PerfilExecucao records, for
+each named stage, the number of calls, wall time, own time (minus nested stages), rows in
+and out and peak memory growth (Medicao). Stages with the same nesting path are summed, so
+a chunked run gives one line per stage instead of one per chunk. Optionally the whole run
+is recorded with cProfile and dumped to a file for snakeviz/pstats.
+
+Profiling is opt-in: without an active profile ADCLogic uses ETAPA_NULA, which does nothing.
+
+Classes:
+    PerfilExecucao: Records stages and builds the JSON/text report
+
+Functions:
+    medir: Stage context manager of an optional profile (ETAPA_NULA when None)
+    perfilado: Decorator measuring an ADCLogic method as a stage
+
+Constants:
+    ETAPA_NULA: No-op stage used when profiling is off
+"""
+import cProfile
+import functools
+import json
+import threading
+import time
+
+from core.medicao import Medicao
+
+
+class _Etapa:
+    """Stage being measured; the caller fills the row counts it knows."""
+
+    __slots__ = ("nome", "linhas_entrada", "linhas_saida")
+
+    def __init__(self, nome, linhas_entrada=None):
+        self.nome = nome
+        self.linhas_entrada = linhas_entrada
+        self.linhas_saida = None
+
+
+class _EtapaNula:
+    """Context manager and stage that ignores everything (profiling off)."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, nome, valor):
+        pass
+
+
+ETAPA_NULA = _EtapaNula()
+
+
+def medir(perfil, nome, linhas_entrada=None):
+    """
+    Stage ``nome`` of ``perfil``, or ETAPA_NULA when profiling is off.
+
+    Example:
+        with medir(self.perfil, "duplicatas", len(df)) as etapa:
+            df = remover(df)
+            etapa.linhas_saida = len(df)
+    """
+    return ETAPA_NULA if perfil is None else perfil.etapa(nome, linhas_entrada)
+
+
+def perfilado(nome, linhas_saida=None):
+    """
+    Decorator measuring a method as stage ``nome`` of ``self.perfil`` (when set).
+
+    Args:
+        nome (str): Stage name
+        linhas_saida (callable, optional): Rows out from the method's return value
+    """
+    def decorar(metodo):
+        @functools.wraps(metodo)
+        def medido(self, *args, **kwargs):
+            if self.perfil is None:
+                return metodo(self, *args, **kwargs)
+            with self.perfil.etapa(nome) as etapa:
+                resultado = metodo(self, *args, **kwargs)
+                if linhas_saida is not None:
+                    etapa.linhas_saida = linhas_saida(resultado)
+            return resultado
+        return medido
+    return decorar
+
+
+class _Medidor:
+    def __init__(self, perfil, etapa):
+        self.perfil = perfil
+        self.etapa = etapa
+        self.medicao = Medicao(memoria=perfil.memoria)
+
+    def __enter__(self):
+        self.caminho = self.perfil._entrar(self.etapa.nome)
+        self.medicao.__enter__()
+        return self.etapa
+
+    def __exit__(self, *exc):
+        self.medicao.__exit__(*exc)
+        self.perfil._sair(self.caminho, self.etapa, self.medicao)
+        return False
+
+
+class PerfilExecucao:
+    """
+    Per-stage timing, row counts and peak memory of a run.
+
+    Example:
+        perfil = PerfilExecucao(cprofile="limpeza.prof").iniciar()
+        with perfil.etapa("carregar_planilha") as etapa:
+            df = ler()
+            etapa.linhas_saida = len(df)
+        perfil.parar()
+        print(perfil.texto())
+
+    Attributes:
+        memoria (bool): Sample peak memory of each stage
+        cprofile (str or None): Where parar() dumps the cProfile stats
+    """
+
+    def __init__(self, memoria=True, cprofile=None):
+        """
+        Args:
+            memoria (bool): Sample peak memory of each stage (Medicao)
+            cprofile (str, optional): Record the run with cProfile and dump it here
+        """
+        self.memoria = memoria
+        self.cprofile = cprofile
+        self._etapas = {}  # caminho (tupla de nomes) -> totais, em ordem de primeira execucao
+        self._local = threading.local()
+        self._trava = threading.Lock()
+        self._inicio = None
+        self._segundos = None
+        self._profiler = None
+
+    def iniciar(self):
+        """Start the run clock (and cProfile, when requested). Returns self."""
+        self._inicio = time.perf_counter()
+        self._segundos = None
+        if self.cprofile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return self
+
+    def parar(self):
+        """Stop the clock and dump the cProfile stats, if any."""
+        if self._inicio is not None and self._segundos is None:
+            self._segundos = time.perf_counter() - self._inicio
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler.dump_stats(self.cprofile)
+            self._profiler = None
+
+    @property
+    def total(self):
+        """Seconds of the run (until parar, or until now)."""
+        if self._segundos is not None:
+            return self._segundos
+        return time.perf_counter() - self._inicio if self._inicio is not None else 0.0
+
+    def etapa(self, nome, linhas_entrada=None):
+        """
+        Measure a ``with`` block as stage ``nome`` (nested inside the active stage).
+
+        Args:
+            nome (str): Stage name
+            linhas_entrada (int, optional): Rows going in
+
+        Returns:
+            Context manager yielding the stage; set ``linhas_saida`` on it
+        """
+        return _Medidor(self, _Etapa(nome, linhas_entrada))
+
+    def _entrar(self, nome):
+        pilha = self._local.__dict__.setdefault("pilha", [])
+        caminho = (pilha[-1][0] if pilha else ()) + (nome,)
+        pilha.append((caminho, [0.0]))  # segundos das etapas filhas
+        with self._trava:
+            # Registrada na entrada: o pai vem antes dos filhos na ordem de primeira execucao
+            self._etapas.setdefault(caminho, {"chamadas": 0, "segundos": 0.0, "proprio": 0.0,
+                                              "linhas_entrada": None, "linhas_saida": None,
+                                              "pico_mb": None})
+        return caminho
+
+    def _sair(self, caminho, etapa, medicao):
+        pilha = self._local.pilha
+        _, filhos = pilha.pop()
+        if pilha:
+            pilha[-1][1][0] += medicao.segundos
+        with self._trava:
+            totais = self._etapas[caminho]
+            totais["chamadas"] += 1
+            totais["segundos"] += medicao.segundos
+            totais["proprio"] += max(medicao.segundos - filhos[0], 0.0)
+            for chave in ("linhas_entrada", "linhas_saida"):
+                valor = getattr(etapa, chave)
+                if valor is not None:
+                    totais[chave] = (totais[chave] or 0) + int(valor)
+            if medicao.pico_mb is not None:
+                totais["pico_mb"] = max(totais["pico_mb"] or 0.0, medicao.pico_mb)
+
+    def relatorio(self):
+        """
+        Build the JSON-serializable report.
+
+        Returns:
+            dict: {'total', 'cprofile', 'etapas': [{'etapa', 'caminho', 'nivel', 'chamadas',
+                   'segundos', 'proprio', 'linhas_entrada', 'linhas_saida', 'pico_mb'}]}
+                   with stages in order of first execution
+        """
+        with self._trava:
+            itens = [(caminho, dict(totais)) for caminho, totais in self._etapas.items()]
+        # Filhos logo abaixo do pai: ordena pela primeira execucao de cada nivel do caminho
+        ordem = {caminho: i for i, (caminho, _) in enumerate(itens)}
+        itens.sort(key=lambda item: [ordem[item[0][:n]] for n in range(1, len(item[0]) + 1)])
+        etapas = []
+        for caminho, totais in itens:
+            etapas.append({
+                "etapa": caminho[-1],
+                "caminho": " > ".join(caminho),
+                "nivel": len(caminho) - 1,
+                "chamadas": totais["chamadas"],
+                "segundos": round(totais["segundos"], 4),
+                "proprio": round(totais["proprio"], 4),
+                "linhas_entrada": totais["linhas_entrada"],
+                "linhas_saida": totais["linhas_saida"],
+                "pico_mb": None if totais["pico_mb"] is None else round(totais["pico_mb"], 1),
+            })
+        return {"total": round(self.total, 4), "cprofile": self.cprofile, "etapas": etapas}
+
+    def texto(self):
+        """Report as an aligned text table (nested stages indented)."""
+        dados = self.relatorio()
+        linhas = [f"[INFO] Perfil da execucao: {dados['total']:.3f}s",
+                  f"  {'etapa':<34} {'vezes':>5} {'total':>9} {'proprio':>9} {'entrada':>10} {'saida':>10} {'pico':>9}"]
+        for e in dados["etapas"]:
+            nome = ("  " * e["nivel"] + e["etapa"])[:34]
+            entrada = "-" if e["linhas_entrada"] is None else str(e["linhas_entrada"])
+            saida = "-" if e["linhas_saida"] is None else str(e["linhas_saida"])
+            pico = "-" if e["pico_mb"] is None else f"+{e['pico_mb']:.1f}MB"
+            linhas.append(f"  {nome:<34} {e['chamadas']:>5} {e['segundos']:>8.3f}s {e['proprio']:>8.3f}s "
+                          f"{entrada:>10} {saida:>10} {pico:>9}")
+        if dados["cprofile"]:
+            linhas.append(f"  cProfile salvo em {dados['cprofile']}")
+        return "\n".join(linhas)
+
+    def salvar(self, caminho):
+        """Write the report: JSON when ``caminho`` ends in .json, text otherwise."""
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            if caminho.lower().endswith(".json"):
+                json.dump(self.relatorio(), arquivo, ensure_ascii=False, indent=2)
+            else:
+                arquivo.write(self.texto() + "\n")
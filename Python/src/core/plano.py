@@ -0,0 +1,272 @@
+# -*- coding: utf-8 -*-
+"""
+ADC Cleaning Plan Module
+
+Lazy, fused execution of the row filters of a cleaning job.
+
+The filters used to run one after another, each producing a full-size DataFrame
+(drop_duplicates, dropna, a copy for the value filter, the text filter). A plan compiles
+the options once and runs them as masks over row positions:
+
+1. Row-wise filters (empty rows, value, text) run cheapest first. Each one only looks at
+   the rows still alive, and their masks are combined into one selection.
+2. Duplicate removal runs last. Identical rows always pass or fail the row-wise filters
+   together, so removing duplicates after filtering keeps exactly the rows the old order
+   kept.
+   With ``chave_duplicadas`` only the key columns are compared; the same argument holds
+   because rows with equal keys are dropped after, not before, the row-wise filters.
+3. The result is materialized once.
+
+Per-stage removal counts accumulate across runs (e.g. chunks), and ``explicar`` describes
+the plan and those counts.
+
+Classes:
+    PlanoLimpeza: Compiled row filters of a cleaning job
+"""
+import numpy as np
+
+from core.duplicadas import contar_por_chave, marcar_duplicadas, opcoes_duplicadas
+from core.filtros import descrever_regras, mascara_valor, regras_valor, resolver_coluna
+from core.perfil import medir
+
+
+class _Estagio:
+    """One row-wise filter: ``mascara(df, linhas)`` returns the rows to keep, or None to skip."""
+
+    def __init__(self, nome, descricao, mascara, mensagem):
+        self.nome = nome
+        self.descricao = descricao
+        self.mascara = mascara
+        self.mensagem = mensagem
+        self.removidas = 0
+
+
+class PlanoLimpeza:
+    """
+    Compiled row filters of a cleaning job, materialized with a single selection.
+
+    Example:
+        plano = PlanoLimpeza.compilar(opcoes, logic.busca_texto)
+        df = plano.executar(df, log_callback)
+        log_callback(plano.explicar())
+
+    Attributes:
+        estagios (list): Row-wise stages in execution order
+        remover_duplicadas (bool): Drop duplicate rows after the row-wise stages
+        chave_duplicadas (list): Key column references (names or Excel letters; empty =
+            whole row)
+        modo_duplicadas (str): 'linha' or 'hash' (see core/duplicadas.py)
+        duplicatas_removidas (int): Duplicate rows dropped so far
+        linhas_lidas (int): Rows received so far
+        linhas_mantidas (int): Rows returned so far
+        colunas_excluidas (tuple): Column indices excluded at load time (shown by explicar)
+    """
+
+    def __init__(self, estagios, remover_duplicadas=False, colunas_excluidas=(), chave_duplicadas=(),
+                 modo_duplicadas="linha", cabecalho=None):
+        self.estagios = estagios
+        self.remover_duplicadas = remover_duplicadas
+        self.colunas_excluidas = tuple(colunas_excluidas)
+        self.chave_duplicadas = list(chave_duplicadas)
+        self.modo_duplicadas = modo_duplicadas
+        self.cabecalho = cabecalho
+        self.duplicatas_removidas = 0
+        self.linhas_lidas = 0
+        self.linhas_mantidas = 0
+        self.execucoes = 0
+
+    @classmethod
+    def compilar(cls, opcoes, busca_texto=None, colunas_excluidas=(), cabecalho=None):
+        """
+        Build a plan from filter options.
+
+        Args:
+            opcoes (dict): Same options as ADCLogic.processar_limpeza (remover_duplicadas,
+                chave_duplicadas, modo_duplicadas, remover_vazias, filtro_valor, filtro_texto)
+            busca_texto (BuscaTexto, optional): Text search used by the text filter
+            colunas_excluidas (iterable): Column indices excluded at load time
+            cabecalho (list, optional): Original sheet header, so Excel letters in the value
+                filter refer to the sheet's columns even after deletions
+
+        Returns:
+            PlanoLimpeza: Plan with the row-wise stages ordered by cost
+
+        Raises:
+            ValueError: If a bound of the value filter cannot be parsed or the duplicate
+                mode is unknown
+        """
+        opcoes = opcoes or {}
+        estagios = []
+
+        # Mais baratos primeiro: notna em bloco < parse de uma coluna < varredura de texto
+        if opcoes.get('remover_vazias'):
+            estagios.append(_Estagio(
+                "vazias", "remove linhas sem nenhum valor",
+                lambda df, linhas: df.notna().any(axis=1).to_numpy() if linhas is None
+                else df.iloc[linhas].notna().any(axis=1).to_numpy(),
+                lambda n: f"  🗑️ Vazias removidas: {n}"))
+
+        filtro_val = opcoes.get('filtro_valor') or {}
+        if filtro_val.get('ativo'):
+            regras = regras_valor(filtro_val)
+            descricao = descrever_regras(regras)
+            estagios.append(_Estagio(
+                "valor", descricao,
+                lambda df, linhas: mascara_valor(df, regras, linhas, cabecalho),
+                lambda n: f"  [INFO] Removidas {n} linhas fora de {descricao}" if n else None))
+
+        filtro_txt = opcoes.get('filtro_texto') or {}
+        texto = str(filtro_txt.get('texto', '')).strip()
+        if filtro_txt.get('ativo') and texto:
+            if busca_texto is None:
+                from core.texto import BuscaTexto
+                busca_texto = BuscaTexto()
+            prefixo, indexado = filtro_txt.get('prefixo', False), filtro_txt.get('indexado', False)
+
+            def mascara_texto(df, linhas):
+                # So as linhas vivas sao varridas (visao/indice em cache do quadro sao reaproveitados)
+                return busca_texto.mascara(df, texto, prefixo=prefixo, indexado=indexado, linhas=linhas)
+
+            estagios.append(_Estagio(
+                "texto", f"{'comeca com' if prefixo else 'contem'} '{texto}'", mascara_texto,
+                lambda n: f"  🔍 Filtro texto '{texto}': {n} removidas"))
+
+        chave, modo = opcoes_duplicadas(opcoes)
+        return cls(estagios, bool(opcoes.get('remover_duplicadas')), colunas_excluidas, chave, modo, cabecalho)
+
+    def executar(self, df, log_callback=None, deduplicador=None, perfil=None):
+        """
+        Run the plan on a DataFrame (or one chunk of a sheet).
+
+        Args:
+            df (pd.DataFrame): Data to filter
+            log_callback (callable, optional): Receives one line per stage
+            deduplicador (DeduplicadorLinhas, optional): Cross-chunk duplicate tracker; only
+                rows that survive the row-wise stages are registered
+            perfil (PerfilExecucao, optional): Records each stage ('filtro <nome>',
+                'duplicatas' or 'selecao') with its rows in and out
+
+        Returns:
+            pd.DataFrame: Filtered rows (``df`` itself when nothing is removed)
+        """
+        self.execucoes += 1
+        total = len(df)
+        self.linhas_lidas += total
+        linhas = None  # None = todas as linhas vivas
+        for estagio in self.estagios:
+            vivas = total if linhas is None else len(linhas)
+            with medir(perfil, f"filtro {estagio.nome}", vivas) as etapa:
+                try:
+                    mascara = estagio.mascara(df, linhas)
+                except Exception as e:
+                    if log_callback: log_callback(f"  [WARNING] Filtro '{estagio.nome}' ignorado: {e}")
+                    mascara = None
+                if mascara is not None:
+                    linhas = np.flatnonzero(mascara) if linhas is None else linhas[mascara]
+                etapa.linhas_saida = total if linhas is None else len(linhas)
+            if mascara is None:
+                continue
+            removidas = vivas - len(linhas)
+            estagio.removidas += removidas
+            mensagem = estagio.mensagem(removidas)
+            if log_callback and mensagem: log_callback(mensagem)
+
+        # Sem remocao de duplicatas a etapa e so a materializacao das linhas selecionadas
+        nome = "duplicatas" if self.remover_duplicadas else "selecao"
+        with medir(perfil, nome, total if linhas is None else len(linhas)) as etapa:
+            resultado = self._deduplicar(df, linhas, deduplicador, log_callback)
+            etapa.linhas_saida = len(resultado)
+        self.linhas_mantidas += len(resultado)
+        return resultado
+
+    def colunas_chave(self, df, log_callback=None):
+        """
+        Labels of the duplicate key columns in ``df`` (None = whole row).
+
+        A key column that no longer exists is reported and the whole row is compared.
+        """
+        if not self.chave_duplicadas:
+            return None
+        try:
+            return [resolver_coluna(df, coluna, self.cabecalho) for coluna in self.chave_duplicadas]
+        except ValueError as e:
+            if log_callback: log_callback(f"  [WARNING] Chave de duplicatas ignorada (linha inteira comparada): {e}")
+            return None
+
+    def descrever_duplicatas(self):
+        """Text of the duplicate stage, e.g. "por B + Z (hash 64 bits)"."""
+        alvo = " + ".join(map(str, self.chave_duplicadas)) if self.chave_duplicadas else "linha inteira"
+        return f"por {alvo}" + (" (hash 64 bits)" if self.modo_duplicadas == "hash" else "")
+
+    def mensagem_duplicatas(self, removidas):
+        """Log line with the duplicates removed (the key only when one is configured)."""
+        if self.chave_duplicadas or self.modo_duplicadas != "linha":
+            return f"  🔄 Duplicatas removidas {self.descrever_duplicatas()}: {removidas}"
+        return f"  🔄 Duplicatas removidas: {removidas}"
+
+    def _deduplicar(self, df, linhas, deduplicador, log_callback):
+        """Duplicate removal and the single materialization of the selected rows."""
+        total = len(df)
+        if not self.remover_duplicadas:
+            return df if linhas is None or len(linhas) == total else df.iloc[linhas]
+
+        colunas = self.colunas_chave(df, log_callback)
+        repetidas = []
+        if deduplicador is not None:
+            selecionadas = df if linhas is None or len(linhas) == total else df.iloc[linhas]
+            antes = deduplicador.removidas
+            resultado = deduplicador.filtrar(selecionadas, colunas)
+            removidas = deduplicador.removidas - antes
+        elif colunas or linhas is None or 2 * len(linhas) > total:
+            # Sem copia do DataFrame: compara so a chave, ou a linha inteira com a maioria viva
+            chave = df[colunas] if colunas else df
+            if linhas is not None and colunas:
+                # Mesma chave nao implica mesmo destino nos filtros: so as vivas disputam
+                duplicadas = np.zeros(total, dtype=bool)
+                duplicadas[linhas] = marcar_duplicadas(chave.iloc[linhas], modo=self.modo_duplicadas)
+            else:
+                duplicadas = marcar_duplicadas(chave, modo=self.modo_duplicadas)
+            manter = ~duplicadas
+            if linhas is not None:
+                vivas = np.zeros(total, dtype=bool)
+                vivas[linhas] = True
+                manter &= vivas
+            removidas = (total if linhas is None else len(linhas)) - int(manter.sum())
+            if log_callback and removidas: repetidas = contar_por_chave(df, colunas, duplicadas)
+            resultado = df if manter.all() else df[manter]
+        else:
+            # Poucas vivas: copiar so elas e mais barato que varrer o DataFrame inteiro
+            selecionadas = df.iloc[linhas]
+            duplicadas = marcar_duplicadas(selecionadas, modo=self.modo_duplicadas)
+            removidas = int(duplicadas.sum())
+            if log_callback and removidas: repetidas = contar_por_chave(selecionadas, colunas, duplicadas)
+            resultado = selecionadas[~duplicadas] if removidas else selecionadas
+
+        self.duplicatas_removidas += removidas
+        if log_callback:
+            log_callback(self.mensagem_duplicatas(removidas))
+            for descricao, extras in repetidas:
+                log_callback(f"     {descricao}: +{extras}")
+        return resultado
+
+    def explicar(self):
+        """
+        Describe the plan and the rows removed at each stage so far.
+
+        Returns:
+            str: Multi-line description
+        """
+        linhas = [f"Plano de limpeza ({self.linhas_lidas} linhas lidas, {self.execucoes} execucao(oes)):"]
+        if self.colunas_excluidas:
+            linhas.append(f"  0. colunas      {len(self.colunas_excluidas)} excluida(s) na leitura (nao carregadas)")
+        passo = 0
+        for passo, estagio in enumerate(self.estagios, 1):
+            linhas.append(f"  {passo}. {estagio.nome:<12} {estagio.descricao:<40} -{estagio.removidas}")
+        if self.remover_duplicadas:
+            passo += 1
+            descricao = f"remove repeticoes {self.descrever_duplicatas()}"
+            linhas.append(f"  {passo}. {'duplicatas':<12} {descricao:<40} -{self.duplicatas_removidas}")
+        if passo == 0:
+            linhas.append("  (nenhum filtro de linhas)")
+        linhas.append(f"  = {self.linhas_mantidas} linhas mantidas (uma selecao por execucao)")
+        return "\n".join(linhas)
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+ADC SKU Ranking Module
+
+"Top 10 SKUs Mais Pedidos" for the dashboard, computed without keeping the sheets.
+
+Each file is reduced to one small table per SKU (order frequency, quantity, revenue) with a
+vectorized groupby, chunk by chunk when the sheet is streamed. Files are merged by summing
+those tables (their size is the number of distinct SKUs, not rows), and the final top N is
+taken with a bounded heap. Per-file top-N lists are never merged: a SKU that is 11th in
+every file can still be 1st overall.
+
+SKUs are compared case- and whitespace-insensitively ("abc 12" == "ABC12"); the label shown
+is the first spelling seen. Order frequency is the number of distinct orders containing the
+SKU, summed over files (files are assumed to hold different orders).
+
+Functions:
+    normalizar_sku: Comparison key of each SKU
+    detectar_coluna_sku: Position of the SKU column from the header or a setting
+    combinar_rankings: Sum per-file SKU tables
+    top_skus: Top N rows of a SKU table by a criterion, with a bounded heap
+
+Classes:
+    RankingSKU: Per-SKU aggregates of one file, fed chunk by chunk
+"""
+import heapq
+import re
+
+import numpy as np
+import pandas as pd
+
+from core.filtros import letra_para_indice
+
+CRITERIOS_RANKING = ("pedidos", "quantidade", "receita")
+_COLUNAS = ["sku", "pedidos", "quantidade", "receita"]
+_LETRAS = re.compile(r"^[A-Za-z]{1,3}$")
+
+
+def normalizar_sku(valores):
+    """
+    Comparison key of each SKU: text, lowercase, without any whitespace.
+
+    Args:
+        valores (array-like): SKU cells
+
+    Returns:
+        pd.Series: Keys (str dtype), missing for empty or missing cells
+    """
+    serie = pd.Series(valores, dtype=object).reset_index(drop=True)
+    ausentes = serie.isna().to_numpy()
+    chaves = serie.astype(str).str.lower().str.replace(r"\s+", "", regex=True)
+    return chaves.mask(ausentes | (chaves == "").to_numpy())
+
+
+def detectar_coluna_sku(colunas, referencia=None):
+    """
+    Position of the SKU column.
+
+    Args:
+        colunas (list): Header labels of the sheet
+        referencia (str, optional): Configured column (name or Excel letter); by default the
+            first header containing "sku" (case-insensitive)
+
+    Returns:
+        int or None: 0-based position, or None when there is no such column
+    """
+    colunas = [str(c) for c in colunas]
+    if referencia:
+        referencia = str(referencia).strip()
+        if referencia in colunas:
+            return colunas.index(referencia)
+        if _LETRAS.match(referencia):
+            indice = letra_para_indice(referencia)
+            return indice if indice < len(colunas) else None
+        return None
+    for i, nome in enumerate(colunas):
+        if "sku" in nome.lower():
+            return i
+    return None
+
+
+class RankingSKU:
+    """
+    Per-SKU order frequency, quantity and revenue of one file, fed chunk by chunk.
+
+    Example:
+        ranking = RankingSKU()
+        for bloco in blocos:
+            ranking.adicionar(bloco['sku'], bloco['pedido'], qtd, qtd * preco)
+        tabela = ranking.tabela()
+    """
+
+    def __init__(self):
+        self._somas = []
+        self._pares = []
+
+    def adicionar(self, skus, pedidos, quantidade, receita):
+        """
+        Aggregate one chunk of rows (aligned arrays).
+
+        Args:
+            skus (array-like): SKU cells
+            pedidos (array-like): Order ID cells
+            quantidade (np.ndarray): Parsed quantities
+            receita (np.ndarray): Parsed line values (quantity * unit price)
+        """
+        chaves = normalizar_sku(skus)
+        validas = chaves.notna().to_numpy()
+        if not validas.any():
+            return
+        linhas = pd.DataFrame({
+            "chave": chaves[validas].to_numpy(),
+            "sku": pd.Series(skus, dtype=object).to_numpy()[validas],
+            "pedido": pd.Series(pedidos, dtype=object).to_numpy()[validas],
+            "quantidade": np.asarray(quantidade, dtype=np.float64)[validas],
+            "receita": np.asarray(receita, dtype=np.float64)[validas],
+        })
+        grupos = linhas.groupby("chave", sort=False)
+        # Soma ignora NaN, como o nansum dos totais do resumo
+        self._somas.append(pd.DataFrame({
+            "sku": grupos["sku"].first().astype(str).str.strip(),
+            "quantidade": grupos["quantidade"].sum(),
+            "receita": grupos["receita"].sum(),
+        }))
+        # Pares distintos (SKU, pedido): a frequencia e contada no fim, entre blocos
+        self._pares.append(linhas[["chave", "pedido"]].dropna().drop_duplicates())
+
+    def tabela(self):
+        """
+        Per-SKU table of everything added.
+
+        Returns:
+            pd.DataFrame: Indexed by SKU key, columns sku, pedidos, quantidade, receita
+        """
+        if not self._somas:
+            vazia = {"sku": object, "pedidos": np.int64, "quantidade": np.float64, "receita": np.float64}
+            return pd.DataFrame({c: pd.Series(dtype=t) for c, t in vazia.items()})
+        somas = self._somas[0] if len(self._somas) == 1 else _somar(self._somas)
+        pares = pd.concat(self._pares).drop_duplicates() if len(self._pares) > 1 else self._pares[0]
+        pedidos = pares.groupby("chave", sort=False).size()
+        somas["pedidos"] = pedidos.reindex(somas.index, fill_value=0).astype(np.int64)
+        return somas[_COLUNAS]
+
+
+def _somar(tabelas):
+    """Sum SKU tables by key, keeping the first label."""
+    todas = pd.concat(tabelas)
+    grupos = todas.groupby(level=0, sort=False)
+    numericas = [c for c in todas.columns if c != "sku"]
+    resultado = grupos[numericas].sum()
+    resultado.insert(0, "sku", grupos["sku"].first())
+    return resultado
+
+
+def combinar_rankings(tabelas):
+    """
+    Sum per-file SKU tables (RankingSKU.tabela) into one.
+
+    Args:
+        tabelas (list): SKU tables (None entries are skipped)
+
+    Returns:
+        pd.DataFrame or None: Combined table, or None when no file had a SKU column
+    """
+    tabelas = [t for t in tabelas if t is not None]
+    if not tabelas:
+        return None
+    combinado = tabelas[0] if len(tabelas) == 1 else _somar(tabelas)
+    return combinado[_COLUNAS]
+
+
+def top_skus(tabela, n=10, por="pedidos"):
+    """
+    Top N SKUs by a criterion, ties broken by the other criteria and then by first appearance.
+
+    Args:
+        tabela (pd.DataFrame): SKU table
+        n (int): Number of SKUs
+        por (str): 'pedidos', 'quantidade' or 'receita'
+
+    Returns:
+        list: Dicts with sku, pedidos, quantidade, receita, best first
+    """
+    if por not in CRITERIOS_RANKING:
+        raise ValueError(f"Criterio de ranking invalido: {por} (use {', '.join(CRITERIOS_RANKING)})")
+    if tabela is None or tabela.empty:
+        return []
+    ordem = [por] + [c for c in CRITERIOS_RANKING if c != por]
+    colunas = [tabela[c].to_numpy() for c in ordem]
+    rotulos = tabela["sku"].to_numpy()
+    # Heap limitado a n: O(SKUs log n), sem ordenar a tabela inteira
+    melhores = heapq.nlargest(n, range(len(tabela)), key=lambda i: tuple(c[i] for c in colunas))
+    return [{
+        "sku": str(rotulos[i]),
+        "pedidos": int(tabela["pedidos"].iat[i]),
+        "quantidade": float(tabela["quantidade"].iat[i]),
+        "receita": float(tabela["receita"].iat[i]),
+    } for i in melhores]
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+ADC Log Channel Module
+
+Thread-safe log channel between background jobs and the log widget.
+
+Pages used to schedule one Tk ``after(0, ...)`` callback per log line: with per-chunk
+logging on big jobs the event loop fills with callbacks, the window freezes and the worker
+slows down. Here ``CanalLog`` is the log_callback: it only appends to a bounded buffer
+(oldest lines are dropped when the UI falls behind) and optionally mirrors the line to a
+rotating file. The UI drains it on a fixed interval (``drenar``) and inserts the batch in a
+single widget call.
+
+Only the standard library is imported here.
+
+Functions:
+    diretorio_padrao: Default log directory
+    arquivo_rotativo: Shared logger writing to a size-rotated file
+
+Classes:
+    CanalLog: Bounded, thread-safe log buffer drained by the UI
+"""
+import logging
+import os
+import sys
+import threading
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+NOME_ARQUIVO = "adc.log"
+
+# Um logger por arquivo, compartilhado pelas paginas
+_loggers = {}
+_trava_loggers = threading.Lock()
+
+
+def diretorio_padrao():
+    """
+    Default log directory (%LOCALAPPDATA%/ADC/logs on Windows, ~/.cache/adc/logs elsewhere).
+
+    Returns:
+        str: Directory path (not created here)
+    """
+    if sys.platform.startswith("win") and os.environ.get("LOCALAPPDATA"):
+        return os.path.join(os.environ["LOCALAPPDATA"], "ADC", "logs")
+    return os.path.join(os.path.expanduser("~"), ".cache", "adc", "logs")
+
+
+def arquivo_rotativo(caminho, max_kb=1024, backups=3):
+    """
+    Logger writing to ``caminho``, rotated when it reaches ``max_kb``.
+
+    The same logger is returned for the same path, so several channels share one file
+    handler (and its lock).
+
+    Args:
+        caminho (str): Log file path (its directory is created)
+        max_kb (int): Size that triggers rotation
+        backups (int): Rotated files kept (adc.log.1 ... adc.log.N)
+
+    Returns:
+        logging.Logger or None: None when the file cannot be opened
+    """
+    caminho = os.path.abspath(caminho)
+    with _trava_loggers:
+        if caminho in _loggers:
+            return _loggers[caminho]
+        try:
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            handler = RotatingFileHandler(caminho, maxBytes=int(max_kb) * 1024,
+                                          backupCount=int(backups), encoding="utf-8")
+        except OSError:
+            return None
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s", "%Y-%m-%d %H:%M:%S"))
+        logger = logging.getLogger(f"adc.registro.{len(_loggers)}")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False  # nao duplica no console pelo logger raiz
+        logger.addHandler(handler)
+        _loggers[caminho] = logger
+        return logger
+
+
+class CanalLog:
+    """
+    Bounded, thread-safe log buffer drained by the UI.
+
+    Example:
+        canal = CanalLog(limite=2000, arquivo=logger)
+        logic.processar_limpeza(..., log_callback=canal)  # qualquer thread
+        ...
+        widget.insert(tk.END, "\\n".join(canal.drenar()) + "\\n")  # thread da UI
+
+    Attributes:
+        limite (int): Lines kept waiting for the UI (ring buffer)
+        descartadas (int): Lines dropped because the UI did not drain in time
+    """
+
+    def __init__(self, limite=2000, arquivo=None):
+        """
+        Args:
+            limite (int): Ring buffer size
+            arquivo (logging.Logger, optional): Mirror (see arquivo_rotativo)
+        """
+        self.limite = max(1, int(limite))
+        self.arquivo = arquivo
+        self.descartadas = 0
+        self._linhas = deque(maxlen=self.limite)
+        self._trava = threading.Lock()
+
+    def __call__(self, mensagem):
+        self.publicar(mensagem)
+
+    def __len__(self):
+        with self._trava:
+            return len(self._linhas)
+
+    def publicar(self, mensagem):
+        """Queue a line (any thread) and mirror it to the file."""
+        mensagem = str(mensagem)
+        with self._trava:
+            if len(self._linhas) == self.limite:
+                self.descartadas += 1
+            self._linhas.append(mensagem)
+        if self.arquivo is not None:
+            try:
+                self.arquivo.info(mensagem)
+            except Exception:
+                pass  # disco cheio/arquivo travado nao interrompe o processamento
+
+    def drenar(self):
+        """
+        Take every queued line.
+
+        When lines were dropped since the last drain, a notice comes first.
+
+        Returns:
+            list: Lines in publication order
+        """
+        with self._trava:
+            linhas = list(self._linhas)
+            self._linhas.clear()
+            descartadas, self.descartadas = self.descartadas, 0
+        if descartadas:
+            linhas.insert(0, f"[INFO] {descartadas} mensagens antigas omitidas")
+        return linhas
@@ -0,0 +1,632 @@
+# -*- coding: utf-8 -*-
+"""
+ADC Sidecar Cache Module
+
+Persistent columnar cache of parsed sheets, so a workbook that was already parsed once
+can be reloaded by memory-mapping a Feather/Parquet file instead of running openpyxl again.
+
+Files live in a local cache directory and are named after the workbook's content hash
+and the sheet name, so renaming or copying a workbook still hits the cache and editing it
+never does. The directory is kept under a size limit by deleting the least recently used
+files.
+
+The same directory holds the dashboard partial of each workbook (unique order IDs, item
+and value sums, per-SKU table), so an unchanged file is not summarized again, and a small index of file
+stat -> content hash, so unchanged files are not even re-hashed after a restart.
+
+Round-trip is lossless for what ``pd.read_excel`` produces: typed columns are stored as
+Arrow columns, and ``object`` columns (mixed text/numbers/dates) are stored as a type tag
+plus typed payload columns, so every cell comes back with its original Python type.
+Frames that cannot be encoded this way are simply not cached.
+
+Requires ``pyarrow`` (optional dependency). Without it ``SidecarCache.disponivel`` is False.
+
+Classes:
+    SidecarCache: Content-hash keyed Feather/Parquet cache with size-bounded eviction
+"""
+import datetime
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # dependencia opcional
+    pa = None
+
+FORMATOS_SIDECAR = ("feather", "parquet")
+VERSAO_FORMATO = 1
+# Mudar quando o calculo de gerar_resumo mudar: parciais antigos deixam de ser lidos
+VERSAO_RESUMO = 2
+_ARQUIVO_HASHES = "hashes.json"
+_MAX_HASHES = 5000
+
+# Tags de tipo das celulas de colunas object
+_TAG_STR, _TAG_FLOAT, _TAG_INT, _TAG_BOOL, _TAG_NONE, _TAG_NAT = 0, 1, 2, 3, 4, 5
+_TAG_DATETIME, _TAG_TIMESTAMP, _TAG_DATE, _TAG_TIME = 6, 7, 8, 9
+
+_EPOCA = datetime.datetime(1970, 1, 1)
+_UM_MICRO = datetime.timedelta(microseconds=1)
+
+
+class _NaoSuportado(Exception):
+    """Raised when a DataFrame cannot be stored losslessly."""
+
+
+def diretorio_padrao():
+    """
+    Default cache directory (%LOCALAPPDATA%/ADC/cache on Windows, ~/.cache/adc elsewhere).
+
+    Returns:
+        str: Directory path
+    """
+    if sys.platform.startswith("win") and os.environ.get("LOCALAPPDATA"):
+        return os.path.join(os.environ["LOCALAPPDATA"], "ADC", "cache")
+    return os.path.join(os.path.expanduser("~"), ".cache", "adc")
+
+
+def _tipo_da_celula(tipo):
+    """Map a Python/NumPy cell type to its tag."""
+    if issubclass(tipo, str):
+        return _TAG_STR
+    if tipo is type(pd.NaT):
+        return _TAG_NAT
+    if issubclass(tipo, (bool, np.bool_)):
+        return _TAG_BOOL
+    if issubclass(tipo, (float, np.floating)):
+        return _TAG_FLOAT
+    if issubclass(tipo, (int, np.integer)):
+        return _TAG_INT
+    if tipo is type(None):
+        return _TAG_NONE
+    if issubclass(tipo, pd.Timestamp):
+        return _TAG_TIMESTAMP
+    if issubclass(tipo, datetime.datetime):
+        return _TAG_DATETIME
+    if issubclass(tipo, datetime.date):
+        return _TAG_DATE
+    if issubclass(tipo, datetime.time):
+        return _TAG_TIME
+    raise _NaoSuportado(f"tipo de celula nao suportado: {tipo.__name__}")
+
+
+def _codificar_nome(nome):
+    """Encode a column label as JSON-safe tagged value."""
+    if isinstance(nome, str):
+        return {"s": nome}
+    if isinstance(nome, (bool, np.bool_)):
+        return {"b": bool(nome)}
+    if isinstance(nome, (int, np.integer)):
+        return {"i": int(nome)}
+    if isinstance(nome, (float, np.floating)):
+        return {"f": repr(float(nome))}
+    if isinstance(nome, datetime.datetime) and nome.tzinfo is None:
+        return {"d": nome.isoformat()}
+    raise _NaoSuportado(f"nome de coluna nao suportado: {nome!r}")
+
+
+def _decodificar_nome(valor):
+    tipo, dado = next(iter(valor.items()))
+    if tipo == "s":
+        return dado
+    if tipo == "b":
+        return bool(dado)
+    if tipo == "i":
+        return int(dado)
+    if tipo == "f":
+        return float(dado)
+    return pd.Timestamp(dado) if tipo == "d" else dado
+
+
+def _codificar_objeto(valores):
+    """
+    Encode an object column as (tags, strings, floats, ints) Arrow arrays.
+
+    Raises:
+        _NaoSuportado: If a cell has a type that cannot be restored exactly
+    """
+    n = len(valores)
+    ids_tipos = {}
+    codigos = np.fromiter((ids_tipos.setdefault(t, len(ids_tipos)) for t in map(type, valores)),
+                          dtype=np.int32, count=n)
+    tags = np.zeros(n, dtype=np.int8)
+    textos = np.full(n, None, dtype=object)
+    floats = np.zeros(n, dtype=np.float64)
+    inteiros = np.zeros(n, dtype=np.int64)
+
+    for tipo, codigo in ids_tipos.items():
+        mascara = codigos == codigo
+        tag = _tipo_da_celula(tipo)
+        tags[mascara] = tag
+        parte = valores[mascara]
+        if tag == _TAG_STR:
+            textos[mascara] = [str(v) for v in parte] if tipo is not str else parte
+        elif tag == _TAG_FLOAT:
+            floats[mascara] = parte.astype(np.float64)
+        elif tag in (_TAG_INT, _TAG_BOOL):
+            try:
+                inteiros[mascara] = parte.astype(np.int64)
+            except OverflowError as e:
+                raise _NaoSuportado(f"inteiro fora do intervalo int64: {e}")
+        elif tag == _TAG_TIMESTAMP:
+            if any(v.tzinfo is not None for v in parte):
+                raise _NaoSuportado("datas com fuso horario")
+            inteiros[mascara] = [v.value for v in parte]
+        elif tag == _TAG_DATETIME:
+            if any(v.tzinfo is not None for v in parte):
+                raise _NaoSuportado("datas com fuso horario")
+            inteiros[mascara] = [(v - _EPOCA) // _UM_MICRO for v in parte]
+        elif tag in (_TAG_DATE, _TAG_TIME):
+            if tag == _TAG_TIME and any(v.tzinfo is not None for v in parte):
+                raise _NaoSuportado("horas com fuso horario")
+            textos[mascara] = [v.isoformat() for v in parte]
+
+    return (pa.array(tags), pa.array(textos, type=pa.string()),
+            pa.array(floats), pa.array(inteiros))
+
+
+def _decodificar_objeto(tags, textos, floats, inteiros):
+    """Rebuild an object column from the arrays written by _codificar_objeto."""
+    tags = tags.to_numpy(zero_copy_only=False)
+    textos = textos.to_numpy(zero_copy_only=False)
+    inteiros = inteiros.to_numpy(zero_copy_only=False)
+    resultado = np.empty(len(tags), dtype=object)
+
+    for tag in np.unique(tags):
+        mascara = tags == tag
+        posicoes = np.flatnonzero(mascara)
+        if tag == _TAG_STR:
+            resultado[mascara] = textos[mascara]
+        elif tag == _TAG_FLOAT:
+            resultado[mascara] = floats.to_numpy(zero_copy_only=False)[mascara]
+        elif tag == _TAG_INT:
+            resultado[mascara] = inteiros[mascara]
+        elif tag == _TAG_BOOL:
+            resultado[mascara] = inteiros[mascara].astype(bool)
+        elif tag == _TAG_NONE:
+            resultado[mascara] = None
+        elif tag == _TAG_NAT:
+            resultado[mascara] = pd.NaT
+        elif tag == _TAG_TIMESTAMP:
+            resultado[posicoes] = [pd.Timestamp(int(v)) for v in inteiros[mascara]]
+        elif tag == _TAG_DATETIME:
+            resultado[posicoes] = [_EPOCA + int(v) * _UM_MICRO for v in inteiros[mascara]]
+        elif tag == _TAG_DATE:
+            resultado[posicoes] = [datetime.date.fromisoformat(v) for v in textos[mascara]]
+        elif tag == _TAG_TIME:
+            resultado[posicoes] = [datetime.time.fromisoformat(v) for v in textos[mascara]]
+    return resultado
+
+
+def codificar_tabela(df):
+    """
+    Convert a DataFrame into an Arrow table that restores it exactly.
+
+    Args:
+        df (pd.DataFrame): Frame as returned by pd.read_excel
+
+    Returns:
+        pyarrow.Table: Table with the original labels/dtypes in the schema metadata
+
+    Raises:
+        _NaoSuportado: If the frame cannot be stored losslessly
+    """
+    indice = df.index
+    if not (isinstance(indice, pd.RangeIndex) and indice.start == 0 and indice.step == 1):
+        raise _NaoSuportado("indice diferente de RangeIndex")
+
+    arrays, nomes, colunas = [], [], []
+    for i in range(df.shape[1]):
+        serie = df.iloc[:, i]
+        info = {"nome": _codificar_nome(df.columns[i]), "dtype": str(serie.dtype)}
+        if serie.dtype == object:
+            info["modo"] = "objeto"
+            for sufixo, array in zip("tsfn", _codificar_objeto(serie.to_numpy())):
+                arrays.append(array)
+                nomes.append(f"{sufixo}{i}")
+        else:
+            info["modo"] = "direto"
+            try:
+                arrays.append(pa.Array.from_pandas(serie))
+            except (pa.ArrowException, TypeError, ValueError) as e:
+                raise _NaoSuportado(f"coluna {df.columns[i]!r}: {e}")
+            nomes.append(f"c{i}")
+        colunas.append(info)
+
+    metadados = {"versao": VERSAO_FORMATO, "linhas": len(df), "colunas": colunas}
+    tabela = pa.Table.from_arrays(arrays, names=nomes) if arrays else pa.table({})
+    return tabela.replace_schema_metadata({"adc": json.dumps(metadados)})
+
+
+def decodificar_tabela(tabela):
+    """
+    Rebuild the DataFrame stored by codificar_tabela.
+
+    Returns:
+        pd.DataFrame: Frame equal to the one that was encoded
+    """
+    metadados = json.loads(tabela.schema.metadata[b"adc"])
+    if metadados.get("versao") != VERSAO_FORMATO:
+        raise ValueError("versao de sidecar incompativel")
+
+    dados = {}
+    for i, info in enumerate(metadados["colunas"]):
+        if info["modo"] == "objeto":
+            valores = _decodificar_objeto(*(tabela.column(f"{s}{i}") for s in "tsfn"))
+            serie = pd.Series(valores, dtype=object)
+        else:
+            serie = tabela.column(f"c{i}").to_pandas()
+            if str(serie.dtype) != info["dtype"]:
+                serie = serie.astype(info["dtype"])
+        dados[i] = serie
+
+    df = pd.DataFrame(dados, index=pd.RangeIndex(metadados["linhas"]))
+    if metadados["colunas"]:
+        df.columns = pd.Index([_decodificar_nome(c["nome"]) for c in metadados["colunas"]])
+    return df
+
+
+def _ranking_para_json(tabela):
+    """Per-SKU table (core/ranking.py) as JSON lists, or None."""
+    if tabela is None:
+        return None
+    return {
+        "chave": [str(c) for c in tabela.index],
+        "sku": [str(s) for s in tabela["sku"]],
+        "pedidos": [int(p) for p in tabela["pedidos"]],
+        "quantidade": [float(q) for q in tabela["quantidade"]],
+        "receita": [float(r) for r in tabela["receita"]],
+    }
+
+
+def _ranking_de_json(dados):
+    """Inverse of _ranking_para_json."""
+    if dados is None:
+        return None
+    return pd.DataFrame({
+        "sku": pd.Series(dados["sku"], dtype=object),
+        "pedidos": np.asarray(dados["pedidos"], dtype=np.int64),
+        "quantidade": np.asarray(dados["quantidade"], dtype=np.float64),
+        "receita": np.asarray(dados["receita"], dtype=np.float64),
+    }).set_axis(pd.Index(dados["chave"], dtype=object, name="chave"))
+
+
+class SidecarCache:
+    """
+    Feather/Parquet cache of parsed sheets keyed by workbook content hash and sheet name.
+
+    Attributes:
+        ativo (bool): Cache enabled in settings and pyarrow available
+        diretorio (str): Cache directory
+        limite_bytes (int): Maximum total size of the directory
+        formato (str): "feather" (memory-mapped, default) or "parquet"
+    """
+
+    def __init__(self, diretorio=None, limite_mb=1024, formato="feather", ativo=True):
+        """
+        Args:
+            diretorio (str, optional): Cache directory (default: diretorio_padrao())
+            limite_mb (int): Size limit of the directory in MB
+            formato (str): "feather" or "parquet"
+            ativo (bool): Enable the cache (ignored when pyarrow is missing)
+        """
+        if formato not in FORMATOS_SIDECAR:
+            raise ValueError(f"Formato de sidecar invalido: {formato}. Use um de {FORMATOS_SIDECAR}")
+        self.diretorio = diretorio or diretorio_padrao()
+        self.limite_bytes = int(limite_mb * 1024 * 1024)
+        self.formato = formato
+        self.ativo = bool(ativo) and self.disponivel()
+        self._hashes = {}
+        self._hashes_carregados = False
+        self._hashes_alterados = False
+
+    @classmethod
+    def de_configuracao(cls, config):
+        """
+        Build a SidecarCache from the "cache_disco" section of settings.json.
+
+        Args:
+            config (dict): {"ativo": bool, "diretorio": str, "limite_mb": int, "formato": str}
+
+        Returns:
+            SidecarCache: Configured cache (inactive when config is empty)
+        """
+        config = config or {}
+        return cls(
+            diretorio=config.get("diretorio") or None,
+            limite_mb=config.get("limite_mb", 1024),
+            formato=config.get("formato", "feather"),
+            ativo=config.get("ativo", False),
+        )
+
+    @staticmethod
+    def disponivel():
+        """True when pyarrow is installed."""
+        return pa is not None
+
+    def hash_arquivo(self, caminho):
+        """
+        Content hash of a workbook, memoized per (path, mtime, size).
+
+        Args:
+            caminho (str): Path to the workbook
+
+        Returns:
+            str: Hex digest
+        """
+        info = os.stat(caminho)
+        chave = (os.path.abspath(caminho), info.st_mtime_ns, info.st_size)
+        if not self._hashes_carregados:
+            self._carregar_hashes()
+        if chave not in self._hashes:
+            h = hashlib.blake2b(digest_size=16)
+            with open(caminho, "rb") as f:
+                for bloco in iter(lambda: f.read(1024 * 1024), b""):
+                    h.update(bloco)
+            self._hashes[chave] = h.hexdigest()
+            self._hashes_alterados = True
+        return self._hashes[chave]
+
+    def _carregar_hashes(self):
+        """Load the persisted (path, mtime, size) -> hash index, if any."""
+        self._hashes_carregados = True
+        if not self.ativo:
+            return
+        try:
+            with open(os.path.join(self.diretorio, _ARQUIVO_HASHES), "r", encoding="utf-8") as f:
+                entradas = json.load(f)
+            for caminho, mtime, tamanho, digest in entradas:
+                self._hashes.setdefault((caminho, mtime, tamanho), digest)
+        except (OSError, ValueError, TypeError):
+            pass
+
+    def salvar_hashes(self):
+        """
+        Persist the hash index so unchanged files are not re-hashed in the next session.
+
+        Only the most recent entries are kept (one per path).
+        """
+        if not self.ativo or not self._hashes_alterados:
+            return
+        ultimos = {}
+        for (caminho, mtime, tamanho), digest in self._hashes.items():
+            ultimos[caminho] = [caminho, mtime, tamanho, digest]  # ordem de insercao: o mais novo vence
+        entradas = list(ultimos.values())[-_MAX_HASHES:]
+        os.makedirs(self.diretorio, exist_ok=True)
+        destino = os.path.join(self.diretorio, _ARQUIVO_HASHES)
+        temporario = f"{destino}.{os.getpid()}.tmp"
+        try:
+            with open(temporario, "w", encoding="utf-8") as f:
+                json.dump(entradas, f, ensure_ascii=False)
+            os.replace(temporario, destino)
+        finally:
+            self._remover(temporario)
+        self._hashes_alterados = False
+
+    def _caminho_aba(self, caminho, aba):
+        sufixo = hashlib.blake2b(str(aba).encode("utf-8"), digest_size=8).hexdigest()
+        extensao = "feather" if self.formato == "feather" else "parquet"
+        return os.path.join(self.diretorio, f"{self.hash_arquivo(caminho)}_{sufixo}.{extensao}")
+
+    def _caminho_abas(self, caminho):
+        return os.path.join(self.diretorio, f"{self.hash_arquivo(caminho)}.abas.json")
+
+    def _caminho_resumo(self, caminho, aba, coluna_sku=""):
+        # A coluna do SKU configurada muda o ranking: entra na chave do parcial
+        sufixo = hashlib.blake2b(f"resumo:{VERSAO_RESUMO}:{aba}:{coluna_sku or ''}".encode("utf-8"), digest_size=8).hexdigest()
+        return os.path.join(self.diretorio, f"{self.hash_arquivo(caminho)}_{sufixo}.resumo.feather")
+
+    @staticmethod
+    def _tocar(caminho):
+        """Update mtime so eviction treats the file as recently used."""
+        try:
+            os.utime(caminho, None)
+        except OSError:
+            pass
+
+    def ler(self, caminho, aba):
+        """
+        Load a cached sheet by memory-mapping its sidecar file.
+
+        Returns:
+            pd.DataFrame or None: Cached frame, or None on a miss (corrupt files are removed)
+        """
+        if not self.ativo:
+            return None
+        arquivo = self._caminho_aba(caminho, aba)
+        if not os.path.exists(arquivo):
+            return None
+        try:
+            if self.formato == "feather":
+                tabela = feather.read_table(arquivo, memory_map=True)
+            else:
+                tabela = pq.read_table(arquivo, memory_map=True)
+            df = decodificar_tabela(tabela)
+        except Exception:
+            self._remover(arquivo)
+            return None
+        self._tocar(arquivo)
+        return df
+
+    def gravar(self, caminho, aba, df):
+        """
+        Write a parsed sheet to the cache directory (atomic rename) and enforce the size limit.
+
+        Returns:
+            bool: True if written, False if the frame cannot be stored losslessly
+
+        Raises:
+            OSError: If the cache directory cannot be written
+        """
+        if not self.ativo:
+            return False
+        try:
+            tabela = codificar_tabela(df)
+        except _NaoSuportado:
+            return False
+
+        os.makedirs(self.diretorio, exist_ok=True)
+        destino = self._caminho_aba(caminho, aba)
+        temporario = f"{destino}.{os.getpid()}.tmp"
+        try:
+            if self.formato == "feather":
+                feather.write_feather(tabela, temporario, compression="uncompressed")
+            else:
+                pq.write_table(tabela, temporario)
+            os.replace(temporario, destino)
+        finally:
+            self._remover(temporario)
+        self.aplicar_limite(manter=[destino])
+        return True
+
+    def ler_abas(self, caminho):
+        """
+        Return the cached sheet-name list of a workbook.
+
+        Returns:
+            list or None: Sheet names, or None on a miss
+        """
+        if not self.ativo:
+            return None
+        arquivo = self._caminho_abas(caminho)
+        try:
+            with open(arquivo, "r", encoding="utf-8") as f:
+                abas = json.load(f)
+        except (OSError, ValueError):
+            return None
+        self._tocar(arquivo)
+        return abas
+
+    def gravar_abas(self, caminho, abas):
+        """Persist the sheet-name list of a workbook."""
+        if not self.ativo:
+            return
+        os.makedirs(self.diretorio, exist_ok=True)
+        with open(self._caminho_abas(caminho), "w", encoding="utf-8") as f:
+            json.dump(list(abas), f, ensure_ascii=False)
+
+    def ler_resumo(self, caminho, aba, coluna_sku=""):
+        """
+        Load the cached dashboard partial of a workbook (see multi.resumo_parcial).
+
+        Args:
+            caminho (str): Path to the workbook
+            aba (str): Sheet name used for the summary ("" = first sheet)
+            coluna_sku (str): SKU column setting the partial was computed with
+
+        Returns:
+            dict or None: {'arquivo', 'pedidos', 'total_itens', 'valor_total', 'ranking'}, or
+                None on a miss (corrupt files are removed)
+        """
+        if not self.ativo:
+            return None
+        arquivo = self._caminho_resumo(caminho, aba, coluna_sku)
+        if not os.path.exists(arquivo):
+            return None
+        try:
+            tabela = feather.read_table(arquivo, memory_map=True)
+            totais = json.loads(tabela.schema.metadata[b"adc_resumo"])
+            pedidos = decodificar_tabela(tabela).iloc[:, 0].to_numpy()
+            ranking = _ranking_de_json(totais["ranking"])
+        except Exception:
+            self._remover(arquivo)
+            return None
+        self._tocar(arquivo)
+        return {
+            "arquivo": caminho,
+            "pedidos": pedidos,
+            "total_itens": totais["total_itens"],
+            "valor_total": totais["valor_total"],
+            "ranking": ranking,
+        }
+
+    def gravar_resumo(self, caminho, aba, parcial, coluna_sku=""):
+        """
+        Persist the dashboard partial of a workbook (order IDs in Feather; sums and per-SKU
+        table, one row per distinct SKU, in metadata).
+
+        Returns:
+            bool: True if written, False if the order IDs cannot be stored losslessly
+
+        Raises:
+            OSError: If the cache directory cannot be written
+        """
+        if not self.ativo:
+            return False
+        try:
+            pedidos = np.asarray(parcial["pedidos"])
+            # dtype explicito: object continua object (pandas 3 inferiria str)
+            tabela = codificar_tabela(pd.DataFrame({"pedidos": pd.Series(pedidos, dtype=pedidos.dtype)}))
+        except _NaoSuportado:
+            return False
+        # JSON guarda o float com repr exato: a soma combinada nao muda
+        totais = {"total_itens": int(parcial["total_itens"]), "valor_total": float(parcial["valor_total"]),
+                  "ranking": _ranking_para_json(parcial.get("ranking"))}
+        tabela = tabela.replace_schema_metadata({**tabela.schema.metadata, b"adc_resumo": json.dumps(totais)})
+
+        os.makedirs(self.diretorio, exist_ok=True)
+        destino = self._caminho_resumo(caminho, aba, coluna_sku)
+        temporario = f"{destino}.{os.getpid()}.tmp"
+        try:
+            feather.write_feather(tabela, temporario, compression="uncompressed")
+            os.replace(temporario, destino)
+        finally:
+            self._remover(temporario)
+        return True
+
+    def aplicar_limite(self, manter=()):
+        """
+        Delete least recently used files until the directory fits in limite_bytes.
+
+        The hash index (hashes.json), files in ``manter`` (e.g. the sidecar just written) and
+        temporary files being written are never evicted. A file that cannot be deleted
+        (open or memory-mapped elsewhere, on Windows) still counts toward the size.
+
+        Args:
+            manter (iterable): Paths that must not be evicted
+
+        Returns:
+            int: Number of files removed
+        """
+        protegidos = {os.path.normcase(os.path.abspath(arquivo)) for arquivo in manter}
+        try:
+            entradas = [e for e in os.scandir(self.diretorio) if e.is_file() and not e.name.endswith(".tmp")]
+        except OSError:
+            return 0
+        entradas.sort(key=lambda e: e.stat().st_mtime)
+        total = sum(e.stat().st_size for e in entradas)
+        removidos = 0
+        for entrada in entradas:
+            if total <= self.limite_bytes:
+                break
+            if entrada.name == _ARQUIVO_HASHES or os.path.normcase(os.path.abspath(entrada.path)) in protegidos:
+                continue
+            tamanho = entrada.stat().st_size
+            if self._remover(entrada.path):
+                total -= tamanho
+                removidos += 1
+        return removidos
+
+    def limpar(self):
+        """Delete every cached file."""
+        try:
+            for entrada in os.scandir(self.diretorio):
+                if entrada.is_file():
+                    self._remover(entrada.path)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _remover(arquivo):
+        """Delete a file; False when it is missing or cannot be deleted."""
+        try:
+            os.remove(arquivo)
+            return True
+        except OSError:
+            return False
@@ -0,0 +1,242 @@
+# -*- coding: utf-8 -*-
+"""
+ADC Streaming Module
+
+Row-chunked reading of large .xlsx sheets in bounded memory.
+
+``pd.read_excel`` materializes every cell of the sheet before building the DataFrame. This
+module walks the sheet with openpyxl in read-only mode and yields DataFrames of at most
+``linhas_por_bloco`` rows. Cells are converted and each chunk is typed by the same pandas
+``TextParser`` used by ``read_excel``, so concatenating the chunks reproduces the full read
+(except that a column may be typed differently in different chunks, e.g. int64 in one
+and float64 in another).
+
+Classes:
+    LeitorXlsxEmBlocos: Iterable of DataFrame chunks for one sheet
+    DeduplicadorLinhas: Drop duplicate rows across chunks using a set of row digests
+
+Functions:
+    fatiar_em_blocos: Split an in-memory DataFrame into chunks of the same shape
+    digerir_linhas: 64-bit digest of each row of a DataFrame
+"""
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+from core.duplicadas import digerir_hash, normalizar_numeros
+
+EXTENSOES_STREAMING = ('.xlsx', '.xlsm')
+
+
+def _converter_celula(celula):
+    """Same conversion as pandas' openpyxl reader (None -> "", errors -> NaN, 1.0 -> 1)."""
+    valor = celula.value
+    if valor is None:
+        return ""
+    tipo = celula.data_type
+    if tipo == "e":
+        return np.nan
+    if tipo == "n":
+        inteiro = int(valor)
+        return inteiro if inteiro == valor else float(valor)
+    return valor
+
+
+def fatiar_em_blocos(df, linhas_por_bloco):
+    """
+    Split an in-memory DataFrame into consecutive row chunks.
+
+    Args:
+        df (pd.DataFrame): Frame to split
+        linhas_por_bloco (int): Rows per chunk
+
+    Yields:
+        pd.DataFrame: Row slices (an empty frame yields once, keeping the columns)
+    """
+    if len(df) == 0:
+        yield df
+        return
+    for inicio in range(0, len(df), linhas_por_bloco):
+        yield df.iloc[inicio:inicio + linhas_por_bloco]
+
+
+class LeitorXlsxEmBlocos:
+    """
+    Stream one sheet of an .xlsx file as DataFrame chunks.
+
+    Attributes:
+        caminho (str): Path to the workbook
+        aba (str): Sheet name (resolved to the first sheet when empty, once iteration starts)
+        linhas_por_bloco (int): Maximum rows per chunk
+        projecao (tuple or None): ('usar', indices) or ('excluir', indices), 0-based positions,
+            or ('cabecalho', funcao) with funcao(column names) -> indices, resolved once the
+            header row is read
+        cabecalho (pd.DataFrame or None): Zero-row frame with every column of the header,
+            available after the first chunk is produced
+        linhas_lidas (int): Data rows yielded so far
+        linhas_estimadas (int or None): Data rows according to the dimensions stored in the
+            file (progress estimate only; None when the file has none), set when iteration starts
+    """
+
+    def __init__(self, caminho, aba="", linhas_por_bloco=50_000, projecao=None):
+        if linhas_por_bloco < 1:
+            raise ValueError("linhas_por_bloco deve ser maior que zero")
+        self.caminho = caminho
+        self.aba = aba
+        self.linhas_por_bloco = int(linhas_por_bloco)
+        self.projecao = projecao
+        self.cabecalho = None
+        self.linhas_lidas = 0
+        self.linhas_estimadas = None
+        self.abas = []
+        self._largura = 0
+
+    def __iter__(self):
+        from openpyxl import load_workbook
+
+        wb = load_workbook(self.caminho, read_only=True, data_only=True, keep_links=False)
+        try:
+            self.abas = list(wb.sheetnames)
+            if not self.aba:
+                if not self.abas:
+                    raise Exception("Nao foi possivel abrir o arquivo para listar abas")
+                self.aba = self.abas[0]
+            ws = wb[self.aba]
+            # Dimensoes gravadas no arquivo nao sao confiaveis (mesmo tratamento do pandas):
+            # servem so como estimativa de progresso
+            if ws.max_row and ws.max_row > 1:
+                self.linhas_estimadas = ws.max_row - 1
+            ws.reset_dimensions()
+
+            cabecalho = None
+            bloco = []
+            pendentes = []  # Linhas vazias so entram se houver dados depois (pandas corta as do final)
+            produziu = False
+            for linha in ws.rows:
+                convertida = [_converter_celula(c) for c in linha]
+                while convertida and convertida[-1] == "":
+                    convertida.pop()
+
+                if cabecalho is None:
+                    cabecalho = convertida
+                    continue
+                if not convertida:
+                    pendentes.append(convertida)
+                    continue
+                if pendentes:
+                    bloco.extend(pendentes)
+                    pendentes = []
+                bloco.append(convertida)
+
+                if len(bloco) >= self.linhas_por_bloco:
+                    yield self._montar(cabecalho, bloco)
+                    produziu = True
+                    bloco = []
+
+            if bloco or not produziu:
+                yield self._montar(cabecalho or [], bloco)
+        finally:
+            wb.close()
+
+    def _montar(self, cabecalho, linhas):
+        """Type one chunk with pandas' TextParser, padding rows to a common width."""
+        if not cabecalho and not linhas:
+            self.cabecalho = pd.DataFrame()
+            return pd.DataFrame()
+
+        # A largura so cresce: colunas sem cabecalho que aparecem depois viram "Unnamed: N"
+        self._largura = max([self._largura, len(cabecalho)] + [len(l) for l in linhas])
+        largura = self._largura
+        vazio = [""]
+        dados = [cabecalho + (largura - len(cabecalho)) * vazio]
+        dados.extend(l + (largura - len(l)) * vazio if len(l) < largura else l for l in linhas)
+
+        if self.cabecalho is None or len(self.cabecalho.columns) < largura:
+            self.cabecalho = TextParser(dados[:1], header=0, skip_blank_lines=False).read()
+        if self.projecao is not None and self.projecao[0] == "cabecalho":
+            self.projecao = ("usar", tuple(self.projecao[1](self.cabecalho.columns)))
+
+        df = TextParser(dados, header=0, skip_blank_lines=False, usecols=self._usecols(largura)).read()
+        df.index = pd.RangeIndex(self.linhas_lidas, self.linhas_lidas + len(df))
+        self.linhas_lidas += len(df)
+        return df
+
+    def _usecols(self, largura):
+        if self.projecao is None:
+            return None
+        modo, indices = self.projecao
+        if modo == "usar":
+            return [i for i in indices if i < largura]
+        excluir = set(indices)
+        return [i for i in range(largura) if i not in excluir]
+
+
+def digerir_linhas(df):
+    """
+    Compute a 64-bit digest per row.
+
+    Values are compared the way ``drop_duplicates`` compares them: 5 and 5.0 are equal and
+    all missing values (NaN, None) are equal, even when a column has a different dtype in
+    different chunks (float32 cells are compared by their decimal text, see
+    duplicadas.normalizar_numeros).
+
+    Args:
+        df (pd.DataFrame): Chunk to digest
+
+    Returns:
+        list: One int digest per row
+    """
+    if df.shape[1] == 0:
+        return [0] * len(df)
+    df = normalizar_numeros(df)
+    objetos = df.astype(object)
+    objetos = objetos.where(df.notna(), None)
+    return [hash(linha) for linha in objetos.itertuples(index=False, name=None)]
+
+
+class DeduplicadorLinhas:
+    """
+    Remove duplicate rows across chunks, keeping the first occurrence.
+
+    Only row digests are kept between chunks, so memory grows with the number of distinct
+    rows (8 bytes plus set overhead each) and not with the rows' contents. Two different
+    rows with the same 64-bit digest would be treated as duplicates; with Python's hash
+    this is vanishingly unlikely for spreadsheet-sized inputs.
+
+    Attributes:
+        modo (str): 'linha' (digerir_linhas) or 'hash' (duplicadas.digerir_hash, vectorized)
+        removidas (int): Duplicate rows dropped so far
+    """
+
+    def __init__(self, modo="linha"):
+        self.modo = modo
+        self._vistos = set()
+        self.removidas = 0
+
+    def filtrar(self, df, colunas=None):
+        """
+        Drop rows already seen in this chunk or in previous ones.
+
+        Args:
+            df (pd.DataFrame): Chunk to filter
+            colunas (list, optional): Key column labels (default: whole row)
+
+        Returns:
+            pd.DataFrame: Chunk without duplicates
+        """
+        chave = df[colunas] if colunas else df
+        if self.modo == "hash":
+            digests = digerir_hash(chave).tolist()
+        else:
+            digests = digerir_linhas(chave)
+        vistos = self._vistos
+        manter = np.zeros(len(df), dtype=bool)
+        for i, digest in enumerate(digests):
+            if digest not in vistos:
+                vistos.add(digest)
+                manter[i] = True
+        self.removidas += int(len(df) - manter.sum())
+        return df[manter]
+
+    def __len__(self):
+        return len(self._vistos)
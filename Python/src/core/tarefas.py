@@ -0,0 +1,339 @@
+# -*- coding: utf-8 -*-
+"""
+ADC Background Job Module
+
+Cancellable background jobs with progress events, for the GUI pages.
+
+Pages used to start a raw daemon thread per action: jobs could not be stopped, two of them
+could run at once against the shared ADCLogic and progress jumped from 20 to 100. Here a
+job is a function run on a bounded pool of daemon threads (one worker by default, so jobs on
+the same ADCLogic run one after another) that receives a ContextoTarefa:
+
+- ``contexto.progresso(percentual, mensagem)`` and ``contexto.log(mensagem)`` emit events;
+  they are also cancellation checkpoints, so passing them to ADCLogic as progress_callback
+  and log_callback makes every pipeline stage and file chunk a point where the job stops.
+- ``Tarefa.cancelar()`` sets the token: a pending job never starts, a running one raises
+  TarefaCancelada at its next checkpoint. Work inside a single library call (e.g. one
+  ``read_excel``) cannot be interrupted; it stops right after. The workers are daemon
+  threads, so closing the app never waits for such a call to return.
+
+Events are plain dicts delivered on the worker thread; Tk pages forward them with
+``after()``.
+
+Classes:
+    TarefaCancelada: Raised at a checkpoint of a cancelled job
+    Cancelamento: Cancellation token
+    ContextoTarefa: What a job function receives (progress, log, checkpoints)
+    Tarefa: Handle of a submitted job
+    AgendadorTarefas: Bounded pool running jobs and publishing their events
+"""
+import itertools
+import queue
+import threading
+
+ESTADOS_FINAIS = ("concluida", "erro", "cancelada")
+# Eventos de progresso com variacao menor que isso (e mesma mensagem) sao descartados
+_PASSO_PROGRESSO = 0.5
+
+
+class TarefaCancelada(BaseException):
+    """
+    Raised at a checkpoint of a cancelled job.
+
+    Derives from BaseException (like asyncio.CancelledError) so the ``except Exception``
+    blocks of the pipeline, which turn errors into log lines or per-file results, let it
+    through.
+    """
+
+
+class Cancelamento:
+    """Cancellation token shared by a job and its handle."""
+
+    def __init__(self):
+        self._evento = threading.Event()
+
+    def cancelar(self):
+        """Request cancellation."""
+        self._evento.set()
+
+    @property
+    def cancelado(self):
+        return self._evento.is_set()
+
+    def verificar(self):
+        """Raise TarefaCancelada if cancellation was requested."""
+        if self._evento.is_set():
+            raise TarefaCancelada()
+
+
+class ContextoTarefa:
+    """
+    Progress, log and cancellation checkpoints of a running job.
+
+    Attributes:
+        tarefa (Tarefa): The job being run
+        cancelamento (Cancelamento): Its token
+    """
+
+    def __init__(self, tarefa, emitir):
+        self.tarefa = tarefa
+        self.cancelamento = tarefa.cancelamento
+        self._emitir = emitir
+
+    def verificar(self):
+        """Checkpoint: raise TarefaCancelada if the job was cancelled."""
+        self.cancelamento.verificar()
+
+    def progresso(self, percentual=None, mensagem=None):
+        """
+        Report progress (checkpoint).
+
+        Args:
+            percentual (float, optional): 0-100; None keeps the current value (e.g. a row
+                count with unknown total)
+            mensagem (str, optional): Status text
+        """
+        self.verificar()
+        tarefa = self.tarefa
+        if percentual is not None:
+            percentual = min(max(float(percentual), 0.0), 100.0)
+            if abs(percentual - tarefa.percentual) < _PASSO_PROGRESSO and mensagem in (None, tarefa.mensagem):
+                return
+            tarefa.percentual = percentual
+        elif mensagem in (None, tarefa.mensagem):
+            return
+        if mensagem is not None:
+            tarefa.mensagem = mensagem
+        self._emitir(tarefa, "progresso")
+
+    def log(self, mensagem):
+        """Emit a log line (checkpoint)."""
+        self.verificar()
+        self._emitir(self.tarefa, "log", mensagem=mensagem)
+
+    def faixa(self, inicio, fim):
+        """
+        Progress callback mapping 0-100 into [inicio, fim] of this job.
+
+        Returns:
+            callable: (percentual, mensagem=None) -> None
+        """
+        def _progresso(percentual=None, mensagem=None):
+            escalado = None if percentual is None else inicio + (fim - inicio) * min(max(percentual, 0), 100) / 100
+            self.progresso(escalado, mensagem)
+        return _progresso
+
+
+class Tarefa:
+    """
+    Handle of a submitted job.
+
+    Attributes:
+        id (int): Sequential id
+        nome (str): Label for logs/UI
+        estado (str): 'pendente', 'executando', 'concluida', 'erro' or 'cancelada'
+        percentual (float): Last reported progress (0-100)
+        mensagem (str or None): Last status text
+        resultado: Return value of the job function (estado 'concluida')
+        erro (BaseException or None): Exception raised by the job (estado 'erro')
+    """
+
+    def __init__(self, id_tarefa, nome):
+        self.id = id_tarefa
+        self.nome = nome
+        self.estado = "pendente"
+        self.percentual = 0.0
+        self.mensagem = None
+        self.resultado = None
+        self.erro = None
+        self.cancelamento = Cancelamento()
+        self._fim = threading.Event()
+        self._descartar = None  # definido pelo agendador: encerra a tarefa ainda na fila
+        self._ao_evento = None
+
+    @property
+    def terminada(self):
+        return self.estado in ESTADOS_FINAIS
+
+    def cancelar(self):
+        """Request cancellation (a pending job is dropped, a running one stops at its next checkpoint)."""
+        self.cancelamento.cancelar()
+        if self._descartar is not None:
+            self._descartar()  # so tem efeito se ainda nao comecou
+
+    def aguardar(self, timeout=None):
+        """
+        Wait for the job to finish.
+
+        Returns:
+            Job result
+
+        Raises:
+            TimeoutError: If it did not finish within ``timeout`` seconds
+            TarefaCancelada: If it was cancelled
+            Exception: The job's own error
+        """
+        if not self._fim.wait(timeout):
+            raise TimeoutError(f"Tarefa {self.nome or self.id} ainda em execucao")
+        if self.estado == "cancelada":
+            raise TarefaCancelada()
+        if self.estado == "erro":
+            raise self.erro
+        return self.resultado
+
+
+class AgendadorTarefas:
+    """
+    Run jobs on a bounded pool of daemon threads and publish their events.
+
+    The workers are daemon threads: the interpreter exits without waiting for a job stuck
+    in a long library call (e.g. after the window is closed during a load).
+
+    Each event is a dict with 'tarefa' (id), 'nome', 'tipo' ('inicio', 'progresso', 'log',
+    'concluida', 'erro' or 'cancelada'), 'percentual' and 'mensagem', plus 'resultado' or
+    'erro' on the final event.
+
+    Example:
+        agendador = AgendadorTarefas()
+        tarefa = agendador.submeter(lambda ctx: logic.processar_limpeza(
+            caminho, aba, indices, opcoes, ctx.log, progress_callback=ctx.progresso),
+            nome="limpeza", ao_evento=lambda ev: pagina.after(0, pagina.on_evento, ev))
+        ...
+        tarefa.cancelar()
+    """
+
+    def __init__(self, max_workers=1):
+        """
+        Args:
+            max_workers (int): Jobs running at the same time (1 = one after another)
+        """
+        self.max_workers = max(1, int(max_workers))
+        self._fila = None
+        self._workers = []
+        self._ids = itertools.count(1)
+        self._assinantes = []
+        self._ativas = {}
+        self._trava = threading.Lock()
+
+    def inscrever(self, callback):
+        """Receive the events of every job (called on the worker thread)."""
+        with self._trava:
+            self._assinantes.append(callback)
+
+    def desinscrever(self, callback):
+        with self._trava:
+            if callback in self._assinantes:
+                self._assinantes.remove(callback)
+
+    def submeter(self, funcao, *args, nome="", ao_evento=None, **kwargs):
+        """
+        Queue a job.
+
+        Args:
+            funcao (callable): Called as funcao(contexto, *args, **kwargs) on a worker thread
+            nome (str): Label for events
+            ao_evento (callable, optional): Receives the events of this job only
+
+        Returns:
+            Tarefa: Handle (cancel, wait, state)
+        """
+        tarefa = Tarefa(next(self._ids), nome)
+        tarefa._ao_evento = ao_evento
+        tarefa._descartar = lambda: self._finalizar(tarefa, "cancelada", so_pendente=True)
+        with self._trava:
+            if self._fila is None:
+                # Threads criadas so no primeiro uso
+                self._fila = queue.SimpleQueue()
+                self._workers = [threading.Thread(target=self._laco, args=(self._fila,),
+                                                  name=f"adc-tarefa_{i}", daemon=True)
+                                 for i in range(self.max_workers)]
+                for worker in self._workers:
+                    worker.start()
+            self._ativas[tarefa.id] = tarefa
+            self._fila.put((tarefa, funcao, args, kwargs))
+        return tarefa
+
+    def _laco(self, fila):
+        while True:
+            item = fila.get()
+            if item is None:  # encerrar()
+                return
+            self._executar(*item)
+
+    def tarefas_ativas(self):
+        """Jobs not finished yet, in submission order."""
+        with self._trava:
+            return [t for _, t in sorted(self._ativas.items())]
+
+    def cancelar_todas(self):
+        """Cancel every pending or running job."""
+        for tarefa in self.tarefas_ativas():
+            tarefa.cancelar()
+
+    def encerrar(self, cancelar=True, aguardar=False):
+        """
+        Stop the workers once the queued jobs are done (cancelling them by default).
+
+        A later submeter() starts new workers.
+
+        Args:
+            cancelar (bool): Cancel pending and running jobs
+            aguardar (bool): Block until the workers have stopped
+        """
+        if cancelar:
+            self.cancelar_todas()
+        with self._trava:
+            fila, self._fila = self._fila, None
+            workers, self._workers = self._workers, []
+        if fila is None:
+            return
+        for _ in workers:
+            fila.put(None)
+        if aguardar:
+            for worker in workers:
+                worker.join()
+
+    def _emitir(self, tarefa, tipo, **extras):
+        evento = {"tarefa": tarefa.id, "nome": tarefa.nome, "tipo": tipo,
+                  "percentual": tarefa.percentual, "mensagem": tarefa.mensagem}
+        evento.update(extras)
+        with self._trava:
+            ouvintes = list(self._assinantes)
+        if tarefa._ao_evento is not None:
+            ouvintes.append(tarefa._ao_evento)
+        for ouvinte in ouvintes:
+            try:
+                ouvinte(evento)
+            except Exception:
+                pass  # um ouvinte com erro (ex: janela fechada) nao derruba a tarefa
+
+    def _executar(self, tarefa, funcao, args, kwargs):
+        with self._trava:
+            if tarefa.terminada:  # cancelada na fila
+                return
+            if not tarefa.cancelamento.cancelado:
+                tarefa.estado = "executando"
+        if tarefa.estado != "executando":
+            self._finalizar(tarefa, "cancelada")
+            return
+        self._emitir(tarefa, "inicio")
+        try:
+            resultado = funcao(ContextoTarefa(tarefa, self._emitir), *args, **kwargs)
+        except TarefaCancelada:
+            self._finalizar(tarefa, "cancelada")
+        except Exception as e:
+            tarefa.erro = e
+            self._finalizar(tarefa, "erro", erro=e)
+        else:
+            tarefa.resultado = resultado
+            tarefa.percentual = 100.0
+            self._finalizar(tarefa, "concluida", resultado=resultado)
+
+    def _finalizar(self, tarefa, estado, so_pendente=False, **extras):
+        with self._trava:
+            if tarefa.terminada or (so_pendente and tarefa.estado != "pendente"):
+                return
+            tarefa.estado = estado
+            self._ativas.pop(tarefa.id, None)
+        self._emitir(tarefa, estado, **extras)
+        tarefa._fim.set()
@@ -0,0 +1,402 @@
+# -*- coding: utf-8 -*-
+"""
+ADC Text Search Module
+
+Case-insensitive literal search across all text columns of a DataFrame.
+
+The previous filter converted every text column with ``astype(str)`` and ran a regex
+``str.contains`` on each one. Here the text columns are joined once per row into a single
+lowercase string (the "view"), and a search is one literal substring scan over that single
+column (Arrow compute kernels when pyarrow is installed). The view is cached per DataFrame,
+so filtering the same frame again only pays for the scan.
+
+For a frame searched over and over (operators typing SKU fragments), ``IndiceTexto`` maps
+each distinct cell text to its rows, so substring and prefix queries only scan the distinct
+values instead of every cell.
+
+Classes:
+    IndiceTexto: Inverted index from distinct cell texts to rows
+    BuscaTexto: Cached lowercase views and indexes, and the fused search
+
+Functions:
+    colunas_texto: Positions of the text columns (object, string or text categories)
+    normalizar_texto: Lowercasing applied to both the view and the query
+"""
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:  # dependencia opcional
+    pa = None
+
+# Separador entre colunas na visao: nunca digitado, entao um termo nao casa entre duas celulas
+SEPARADOR = "\x1f"
+
+# Linhas usadas na impressao digital do conteudo (quadros menores entram inteiros)
+_LINHAS_IMPRESSAO = 2048
+
+
+def normalizar_texto(texto):
+    """Lowercase a query the same way the view is lowercased."""
+    return str(texto).lower()
+
+
+def colunas_texto(df):
+    """
+    Return the positions of the text columns.
+
+    Object columns, string columns (pandas' "str"/"string" dtypes) and categorical columns
+    with text categories (core/tipos.py) count as text.
+
+    Args:
+        df (pd.DataFrame): Frame to inspect
+
+    Returns:
+        list: 0-based column positions
+    """
+    return [i for i, dtype in enumerate(df.dtypes) if _eh_texto(dtype)
+            or (isinstance(dtype, pd.CategoricalDtype) and _eh_texto(dtype.categories.dtype))]
+
+
+def _eh_texto(dtype):
+    return dtype == object or isinstance(dtype, pd.StringDtype)
+
+
+def _como_texto(serie):
+    """Cell text as ``astype(str)`` gives it, with missing values as empty strings."""
+    if pd.api.types.infer_dtype(serie, skipna=True) in ("string", "empty"):
+        return serie.to_numpy(dtype=object, na_value="")
+    return serie.astype(object).astype(str).where(serie.notna(), "").to_numpy(dtype=object)
+
+
+def _coluna_arrow(serie):
+    """Text column as a pyarrow large_string array without nulls."""
+    tipo = pa.large_string()
+    try:
+        if serie.dtype == object:
+            valores = pa.array(serie.to_numpy(), type=tipo, from_pandas=True)
+        else:
+            valores = pa.array(serie.array).cast(tipo)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Coluna mista (numeros e textos): converte celula a celula
+        valores = pa.array(_como_texto(serie), type=tipo)
+    return pc.fill_null(valores, "")
+
+
+def _montar_visao(df, posicoes):
+    """One lowercase string per row with the text columns joined by SEPARADOR."""
+    if pa is not None:
+        colunas = [_coluna_arrow(df.iloc[:, i]) for i in posicoes]
+        return pc.utf8_lower(pc.binary_join_element_wise(*colunas, pa.scalar(SEPARADOR, pa.large_string())))
+    partes = [_como_texto(df.iloc[:, i]) for i in posicoes]
+    return pd.Series([SEPARADOR.join(linha) for linha in zip(*partes)], dtype=object).str.lower()
+
+
+def _buscar(visao, termo):
+    """Boolean mask of the view's rows containing ``termo`` (literal)."""
+    if pa is not None:
+        return pc.match_substring(visao, termo).to_numpy(zero_copy_only=False)
+    return visao.str.contains(termo, regex=False).to_numpy(dtype=bool)
+
+
+def _tomar(visao, linhas):
+    """Rows ``linhas`` (positions) of a view."""
+    if pa is not None:
+        return visao.take(pa.array(linhas, type=pa.int64()))
+    return visao.iloc[linhas]
+
+
+def _impressao(df, posicoes):
+    """
+    Content fingerprint of the text columns: a hash of every row on frames up to
+    _LINHAS_IMPRESSAO rows, of evenly spaced rows (first and last included) on larger ones.
+    """
+    n = len(df)
+    linhas = slice(None) if n <= _LINHAS_IMPRESSAO else np.linspace(0, n - 1, _LINHAS_IMPRESSAO).astype(np.int64)
+    amostra = df.iloc[linhas, posicoes]
+    try:
+        digests = pd.util.hash_pandas_object(amostra, index=False).to_numpy()
+    except TypeError:
+        # Celulas nao hashaveis pelo pandas (listas, dicts...): texto de cada celula
+        digests = pd.util.hash_pandas_object(amostra.astype(str), index=False).to_numpy()
+    return hash(digests.tobytes())
+
+
+def _assinatura(df, posicoes):
+    """
+    State of the frame as seen by the view: shape, column labels, the identity of each text
+    column's data and a content fingerprint (_impressao). Replacing, adding or dropping
+    columns or rows changes it, and so do in-place cell edits on fingerprinted rows.
+    """
+    dados = []
+    for i in posicoes:
+        valores = df.iloc[:, i].array
+        bruto = getattr(valores, "_ndarray", None)
+        # Colunas numpy: o wrapper muda a cada acesso, o buffer nao
+        dados.append(bruto.__array_interface__["data"][0] if bruto is not None else id(valores))
+    return (df.shape, tuple(df.columns), tuple(dados), _impressao(df, posicoes))
+
+
+def _descartar(visoes, chave, referencia):
+    """Weakref callback: drop the entry only if it still belongs to the collected frame."""
+    entrada = visoes.get(chave)
+    if entrada is not None and entrada[0] is referencia:
+        del visoes[chave]
+
+
+def _textos_unicos(unicos):
+    """Lowercase text of the distinct values returned by pd.factorize."""
+    serie = pd.Series(np.asarray(unicos, dtype=object), dtype=object)
+    return _como_texto(serie).astype(str) if len(serie) else np.empty(0, dtype=object)
+
+
+class IndiceTexto:
+    """
+    Inverted index from the distinct lowercase cell texts of a DataFrame to row numbers.
+
+    Each text column is dictionary-encoded (``pd.factorize``), the distinct values of all
+    columns are lowercased and merged into one sorted vocabulary, and the rows holding each
+    vocabulary entry are stored contiguously (CSR layout: ``inicios`` and ``linhas``).
+    A query only scans the vocabulary, usually far smaller than the sheet: a substring
+    query tests each distinct text once, a prefix query is a binary search. The matching
+    rows are then gathered from the posting lists.
+
+    Matches are per cell, like the full scan: a term never spans two columns.
+
+    Attributes:
+        vocabulario (np.ndarray): Distinct non-empty lowercase cell texts, sorted
+        inicios (np.ndarray): Start of each entry's rows in ``linhas`` (len(vocabulario) + 1)
+        linhas (np.ndarray): Row positions (int32), grouped by vocabulary entry
+        total_linhas (int): Rows of the indexed frame
+    """
+
+    def __init__(self, df, posicoes=None):
+        """
+        Args:
+            df (pd.DataFrame): Frame to index
+            posicoes (list, optional): Text column positions (default: colunas_texto(df))
+        """
+        posicoes = colunas_texto(df) if posicoes is None else posicoes
+        n = len(df)
+        self.total_linhas = n
+
+        # Codigos por coluna -> codigos no vocabulario global (minusculo)
+        codigos_colunas, textos = [], []
+        deslocamento = 0
+        for i in posicoes:
+            codigos, unicos = pd.factorize(df.iloc[:, i])
+            codigos_colunas.append(np.where(codigos >= 0, codigos + deslocamento, -1))
+            textos.append(_textos_unicos(unicos))
+            deslocamento += len(unicos)
+        textos = np.concatenate(textos).astype(object) if textos else np.empty(0, dtype=object)
+        minusculos = pd.Series(textos, dtype=object).str.lower().to_numpy(dtype=object)
+
+        vocabulario, global_ = np.unique(minusculos, return_inverse=True) if len(minusculos) else (
+            np.empty(0, dtype=object), np.empty(0, dtype=np.int64))
+        # Texto vazio nunca casa: sai do vocabulario
+        vazio = np.searchsorted(vocabulario, "") if len(vocabulario) else 0
+        tem_vazio = vazio < len(vocabulario) and vocabulario[vazio] == ""
+        if tem_vazio:
+            vocabulario = np.delete(vocabulario, vazio)
+            global_ = np.where(global_ == vazio, -1, global_ - (global_ > vazio))
+        self.vocabulario = vocabulario
+
+        if codigos_colunas:
+            celulas = np.concatenate(codigos_colunas)
+            celulas = np.where(celulas >= 0, global_[np.maximum(celulas, 0)], -1)
+        else:
+            celulas = np.empty(0, dtype=np.int64)
+        validas = np.flatnonzero(celulas >= 0)
+        ordem = validas[np.argsort(celulas[validas], kind="stable")]
+        self.linhas = (ordem % max(n, 1)).astype(np.int32)
+        contagem = np.bincount(celulas[validas], minlength=len(vocabulario))
+        self.inicios = np.concatenate(([0], np.cumsum(contagem))).astype(np.int64)
+        self._vocabulario_arrow = pa.array(vocabulario, type=pa.large_string()) if pa is not None else None
+
+    def termos(self, texto, prefixo=False):
+        """
+        Vocabulary entries matching a query.
+
+        Args:
+            texto (str): Query (lowercased here)
+            prefixo (bool): Match cells starting with ``texto`` instead of containing it
+
+        Returns:
+            np.ndarray: Indices into ``vocabulario``
+        """
+        termo = normalizar_texto(texto)
+        if prefixo:
+            inicio = np.searchsorted(self.vocabulario, termo, side="left")
+            fim = np.searchsorted(self.vocabulario, termo + "\U0010ffff", side="left")
+            return np.arange(inicio, fim)
+        if self._vocabulario_arrow is not None:
+            casou = pc.match_substring(self._vocabulario_arrow, termo)
+            return np.flatnonzero(casou.to_numpy(zero_copy_only=False))
+        return np.flatnonzero([termo in v for v in self.vocabulario])
+
+    def buscar(self, texto, prefixo=False):
+        """
+        Rows where any indexed cell contains (or starts with) ``texto``.
+
+        Args:
+            texto (str): Query, case-insensitive and literal
+            prefixo (bool): Prefix query instead of substring
+
+        Returns:
+            np.ndarray: Boolean mask by row position
+        """
+        ids = self.termos(texto, prefixo)
+        mascara = np.zeros(self.total_linhas, dtype=bool)
+        if len(ids) == 0:
+            return mascara
+        inicios = self.inicios[ids]
+        tamanhos = self.inicios[ids + 1] - inicios
+        # Concatena as faixas [inicio, fim) das listas de linhas sem laco em Python
+        deslocamentos = np.repeat(inicios - np.concatenate(([0], np.cumsum(tamanhos)[:-1])), tamanhos)
+        mascara[self.linhas[deslocamentos + np.arange(tamanhos.sum())]] = True
+        return mascara
+
+    def __len__(self):
+        return len(self.vocabulario)
+
+
+class BuscaTexto:
+    """
+    Fused case-insensitive literal search with a cache of lowercase views and indexes.
+
+    Views (full scan) and inverted indexes (IndiceTexto, built on demand) are kept for the
+    ``capacidade`` most recently searched frames and dropped as soon as their frame is
+    garbage collected. Both are rebuilt when the frame changes: rows, columns, a replaced
+    column, or cell edits made in place (``df.loc[i, c] = ...``), caught by a content
+    fingerprint of the text columns. On frames above _LINHAS_IMPRESSAO rows the
+    fingerprint samples evenly spaced rows; after bulk in-place edits there, calling
+    ``invalidar(df)`` is still the sure way.
+
+    Attributes:
+        capacidade (int): Frames whose views/indexes are kept
+        hits (int): Searches served by a cached view or index
+        misses (int): Views and indexes built
+    """
+
+    def __init__(self, capacidade=4):
+        self.capacidade = capacidade
+        self._visoes = OrderedDict()  # id(df) -> (weakref, assinatura, {"visao": ..., "indice": ...})
+        self.hits = 0
+        self.misses = 0
+
+    def _obter(self, df, tipo, montar):
+        """Cached ``tipo`` artifact of ``df``, built with ``montar(df, posicoes)`` on a miss."""
+        posicoes = colunas_texto(df)
+        if not posicoes:
+            return None
+
+        chave = id(df)
+        assinatura = _assinatura(df, posicoes)
+        entrada = self._visoes.get(chave)
+        if entrada is None or entrada[0]() is not df or entrada[1] != assinatura:
+            visoes = self._visoes
+            referencia = weakref.ref(df, lambda ref, chave=chave: _descartar(visoes, chave, ref))
+            entrada = (referencia, assinatura, {})
+            if self.capacidade > 0:
+                visoes[chave] = entrada
+                while len(visoes) > self.capacidade:
+                    visoes.popitem(last=False)
+        if chave in self._visoes:
+            self._visoes.move_to_end(chave)
+
+        artefatos = entrada[2]
+        if tipo in artefatos:
+            self.hits += 1
+        else:
+            self.misses += 1
+            artefatos[tipo] = montar(df, posicoes)
+        return artefatos[tipo]
+
+    def _em_cache(self, df, tipo):
+        """True when the ``tipo`` artifact of ``df`` is cached and still matches the frame."""
+        entrada = self._visoes.get(id(df))
+        return (entrada is not None and entrada[0]() is df and tipo in entrada[2]
+                and entrada[1] == _assinatura(df, colunas_texto(df)))
+
+    def visao(self, df):
+        """
+        Return the lowercase view of ``df`` (cached).
+
+        Args:
+            df (pd.DataFrame): Frame to search
+
+        Returns:
+            pyarrow.Array, pd.Series or None: One string per row (positional), None without
+            text columns
+        """
+        return self._obter(df, "visao", _montar_visao)
+
+    def indice(self, df):
+        """
+        Return the inverted index of ``df`` (cached), building it on first use.
+
+        Args:
+            df (pd.DataFrame): Frame to index
+
+        Returns:
+            IndiceTexto or None: None without text columns
+        """
+        return self._obter(df, "indice", IndiceTexto)
+
+    def mascara(self, df, texto, prefixo=False, indexado=False, linhas=None):
+        """
+        Rows where any text column contains ``texto`` (literal, case-insensitive).
+
+        Args:
+            df (pd.DataFrame): Frame to search
+            texto (str): Substring to find (regex characters have no special meaning)
+            prefixo (bool): Match cells starting with ``texto`` (always uses the index)
+            indexado (bool): Answer from the inverted index instead of scanning the view;
+                worth it when the same frame is searched many times
+            linhas (np.ndarray, optional): Row positions to search (e.g. the rows left by
+                earlier filters). A cached view or index of ``df`` is reused and only these
+                rows are scanned; otherwise the view or index is built for these rows
+                alone and not cached
+
+        Returns:
+            np.ndarray or None: Boolean mask by position (over ``linhas`` when given), None
+            without text columns
+        """
+        tipo = "indice" if prefixo or indexado else "visao"
+        if linhas is not None and not self._em_cache(df, tipo):
+            # Sem artefato do quadro inteiro: monta so para as linhas vivas
+            posicoes = colunas_texto(df)
+            if not posicoes:
+                return None
+            self.misses += 1
+            parcial = df.iloc[linhas]
+            if tipo == "indice":
+                return IndiceTexto(parcial, posicoes).buscar(texto, prefixo)
+            return _buscar(_montar_visao(parcial, posicoes), normalizar_texto(texto).replace(SEPARADOR, ""))
+
+        if tipo == "indice":
+            indice = self.indice(df)
+            if indice is None:
+                return None
+            mascara = indice.buscar(texto, prefixo)
+            return mascara if linhas is None else mascara[linhas]
+        visao = self.visao(df)
+        if visao is None:
+            return None
+        termo = normalizar_texto(texto).replace(SEPARADOR, "")
+        return _buscar(visao if linhas is None else _tomar(visao, linhas), termo)
+
+    def invalidar(self, df=None):
+        """Drop the view and index of ``df`` (all of them when None)."""
+        if df is None:
+            self._visoes.clear()
+        else:
+            self._visoes.pop(id(df), None)
+
+    def __len__(self):
+        return len(self._visoes)
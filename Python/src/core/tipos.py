@@ -0,0 +1,363 @@
+# -*- coding: utf-8 -*-
+"""
+ADC Column Type Optimization Module
+
+Compact dtypes for a freshly loaded sheet, before the cleaning filters run.
+
+``pd.read_excel`` leaves most columns as text (str/object): SKU codes, marketplace names,
+status fields and numbers typed as "R$ 1.234,56". Text columns with few distinct values
+(status, marketplace, UF...) become ``category`` (one small code per row), integer columns
+are downcast to the smallest integer type, and columns hinted as numeric are parsed with
+the BR/US rules of core/numeric.py into int32/float32 (float64 when a value would not
+survive float32). The optimizer reports the memory saved.
+
+Hints come from the preset ("tipos_colunas": {"Z": "inteiro", "AA": "decimal"}), keyed by
+column name or Excel letter of the original sheet:
+    categoria: Always ``category``
+    texto: Left untouched (never turned into category)
+    inteiro: Parsed number, integer dtype (float when there are empty or fractional cells)
+    decimal: Parsed number, float32 when every value round-trips, else float64
+
+A hinted numeric column is only converted when every filled cell is a number or looks like
+one ("1.234,56", "R$ 10", "-3"); codes with leading zeros ("00123") and free text ("N/A")
+keep the column as text, so no cell is silently turned into 0.
+
+Dtypes are decided once, on the first frame an optimizer sees, and later frames (chunks of
+the same sheet) get the same dtypes. A chunk whose values do not fit the chosen dtype (an
+int8 column meeting 300, a float32 column meeting a value float32 cannot hold) keeps those
+values as float64 (int64 for whole integers) instead of losing precision; duplicate digests
+normalize numeric dtypes (duplicadas.normalizar_numeros), so rows still match across chunks.
+
+Classes:
+    OtimizadorTipos: Chooses and applies the dtypes, summing the savings across chunks
+
+Functions:
+    parece_numerico: Whether every filled cell of a column is a number or numeric-looking text
+    restaurar_categorias: Re-encode columns that pd.concat turned back into text
+
+Constants:
+    TIPOS_COLUNA: Accepted hints
+"""
+import re
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_integer_dtype, is_numeric_dtype, is_bool_dtype
+
+from core.filtros import resolver_coluna
+from core.numeric import FORMATOS_NUMERICOS, ampliar_float32, converter_serie_numerica, detectar_formato_numerico
+
+TIPOS_COLUNA = ("categoria", "texto", "inteiro", "decimal")
+
+# Numero como texto: "R$" opcional, sinal, milhar opcional, sem zeros a esquerda ("00123" e codigo)
+_PADROES_NUMERO = {
+    "br": re.compile(r"^\s*(?:R\$\s*)?-?(?:0|[1-9]\d{0,2}(?:\.\d{3})+|[1-9]\d*)(?:,\d+)?\s*$"),
+    "us": re.compile(r"^\s*(?:R\$\s*)?-?(?:0|[1-9]\d{0,2}(?:,\d{3})+|[1-9]\d*)(?:\.\d+)?\s*$"),
+}
+
+# float32 guarda inteiros exatos ate 2**24
+_LIMITE_INTEIRO_FLOAT32 = 2 ** 24
+
+
+def _eh_texto(dtype):
+    return dtype == object or isinstance(dtype, pd.StringDtype)
+
+
+def parece_numerico(serie, formato="br"):
+    """
+    Whether every filled cell of ``serie`` is a number or numeric-looking text.
+
+    Only distinct values are tested, so repeated cells cost nothing.
+
+    Args:
+        serie (pd.Series): Column to inspect
+        formato (str): "br" or "us" (see core/numeric.py)
+
+    Returns:
+        bool: False for empty columns and for any free-text cell
+    """
+    if is_numeric_dtype(serie.dtype) and not is_bool_dtype(serie.dtype):
+        return serie.notna().any()
+    if not _eh_texto(serie.dtype):
+        return False
+    unicos = pd.unique(serie.dropna().to_numpy(dtype=object))
+    if len(unicos) == 0:
+        return False
+    padrao = _PADROES_NUMERO[formato]
+    for valor in unicos:
+        if isinstance(valor, str):
+            if not padrao.match(valor):
+                return False
+        elif isinstance(valor, (bool, np.bool_)) or not isinstance(valor, (int, float, np.integer, np.floating)):
+            return False
+    return True
+
+
+def _menor_inteiro(valores):
+    """Integer array in the smallest dtype that holds every value."""
+    return pd.to_numeric(pd.Series(valores), downcast="integer").to_numpy()
+
+
+def _como_float(valores):
+    """float32 when every value survives the round trip through its shortest text, else float64."""
+    compacto = valores.astype(np.float32)
+    with np.errstate(over="ignore", invalid="ignore"):
+        if np.array_equal(ampliar_float32(compacto), valores, equal_nan=True):
+            return compacto
+    return valores
+
+
+def _numero(serie, tipo, formato):
+    """Parsed column (numpy array) for a numeric hint; empty cells stay NaN."""
+    valores = converter_serie_numerica(serie, formato)
+    valores[serie.isna().to_numpy()] = np.nan
+    preenchidos = valores[~np.isnan(valores)]
+    inteiros = len(preenchidos) and np.array_equal(preenchidos, np.trunc(preenchidos))
+    if tipo == "inteiro" and inteiros:
+        if len(preenchidos) == len(valores):
+            return _menor_inteiro(valores.astype(np.int64))
+        if np.abs(preenchidos).max() <= _LIMITE_INTEIRO_FLOAT32:
+            return valores.astype(np.float32)  # celulas vazias: sem inteiro nativo com NaN
+    return _como_float(valores)
+
+
+def _ajustar(valores, dtype):
+    """
+    ``valores`` (float64, NaN = empty) in ``dtype`` when lossless, else the nearest wider dtype.
+
+    Returns:
+        np.ndarray: Values in ``dtype``, int64 or float64
+    """
+    if dtype.kind in "iu":
+        preenchidos = valores[~np.isnan(valores)]
+        if len(preenchidos) == len(valores) and np.array_equal(preenchidos, np.trunc(preenchidos)):
+            limites = np.iinfo(dtype)
+            if len(valores) == 0 or (preenchidos.min() >= limites.min and preenchidos.max() <= limites.max):
+                return valores.astype(dtype)
+            if np.abs(preenchidos).max() < 2 ** 53:
+                return valores.astype(np.int64)
+        elif (len(preenchidos) and np.array_equal(preenchidos, np.trunc(preenchidos))
+              and np.abs(preenchidos).max() <= _LIMITE_INTEIRO_FLOAT32):
+            return valores.astype(np.float32)  # celulas vazias, como em _numero
+        return valores
+    if dtype == np.float32:
+        return _como_float(valores)
+    return valores
+
+
+def restaurar_categorias(df, referencia):
+    """
+    Re-encode as ``category`` the columns that are categorical in ``referencia``.
+
+    ``pd.concat`` of chunks whose categories differ falls back to text; this restores the
+    compact storage after joining the chunks of one sheet.
+
+    Args:
+        df (pd.DataFrame): Joined frame
+        referencia (pd.DataFrame): A chunk with the optimized dtypes
+
+    Returns:
+        pd.DataFrame: ``df`` (a shallow copy when a column changes)
+    """
+    colunas = [c for c in referencia.columns
+               if isinstance(referencia[c].dtype, pd.CategoricalDtype) and c in df.columns
+               and not isinstance(df[c].dtype, pd.CategoricalDtype)]
+    if not colunas:
+        return df
+    df = df.copy(deep=False)
+    for coluna in colunas:
+        df[coluna] = df[coluna].astype("category")
+    return df
+
+
+class OtimizadorTipos:
+    """
+    Choose and apply compact dtypes, summing the memory saved over every frame processed.
+
+    Example:
+        otimizador = OtimizadorTipos({"Z": "inteiro", "AA": "decimal"}, cabecalho)
+        df = otimizador.otimizar(df)
+        log_callback(otimizador.resumo())
+
+    Attributes:
+        bytes_antes (int): Memory of the converted columns before the stage
+        bytes_depois (int): Memory of the same columns after it
+        colunas (dict): Column label -> dtype applied (last frame that converted it)
+        ignoradas (dict): Hinted column -> reason it was kept as is
+        plano (dict or None): Column label -> dtype decided on the first frame (None before it)
+        alargadas (dict): Column label -> planned dtype some later frame did not fit
+    """
+
+    def __init__(self, dicas=None, cabecalho=None, max_categorias=0.5, minimo_linhas=1000,
+                 inferir_numeros=False, formato="br"):
+        """
+        Args:
+            dicas (dict, optional): Column name or Excel letter -> one of TIPOS_COLUNA
+            cabecalho (list, optional): Original sheet header, for Excel letters
+            max_categorias (float): Text columns become category when distinct values are at
+                most this fraction of the filled cells
+            minimo_linhas (int): Smaller frames only get the hinted conversions
+            inferir_numeros (bool): Also parse unhinted numeric-looking text columns ("decimal")
+            formato (str): Number format of text cells ("br", "us" or "auto" per column)
+
+        Raises:
+            ValueError: If a hint or the number format is unknown
+        """
+        dicas = dict(dicas or {})
+        invalidas = {coluna: tipo for coluna, tipo in dicas.items() if tipo not in TIPOS_COLUNA}
+        if invalidas:
+            raise ValueError(f"Tipos de coluna invalidos: {invalidas} (use {', '.join(TIPOS_COLUNA)})")
+        if formato not in FORMATOS_NUMERICOS:
+            raise ValueError(f"Formato numerico invalido: {formato}. Use um de {FORMATOS_NUMERICOS}")
+        self.dicas = dicas
+        self.cabecalho = cabecalho
+        self.max_categorias = float(max_categorias)
+        self.minimo_linhas = int(minimo_linhas)
+        self.inferir_numeros = bool(inferir_numeros)
+        self.formato = formato
+        self.bytes_antes = 0
+        self.bytes_depois = 0
+        self.colunas = {}
+        self.ignoradas = {}
+        self.plano = None
+        self.alargadas = {}
+
+    @classmethod
+    def de_configuracao(cls, configuracao, dicas=None, cabecalho=None):
+        """
+        Build from the "tipos" section of settings.json and a preset's "tipos_colunas".
+
+        Returns:
+            OtimizadorTipos or None: None when the section has "ativo": false
+        """
+        configuracao = configuracao or {}
+        if not configuracao.get("ativo", True):
+            return None
+        return cls(dicas, cabecalho,
+                   max_categorias=configuracao.get("max_categorias", 0.5),
+                   minimo_linhas=configuracao.get("minimo_linhas", 1000),
+                   inferir_numeros=configuracao.get("inferir_numeros", False),
+                   formato=configuracao.get("formato_numerico", "br"))
+
+    def _resolver_dicas(self, df):
+        resolvidas = {}
+        for referencia, tipo in self.dicas.items():
+            try:
+                resolvidas[resolver_coluna(df, referencia, self.cabecalho)] = tipo
+            except ValueError as e:
+                self.ignoradas[referencia] = str(e)
+        return resolvidas
+
+    def _formato(self, serie):
+        return detectar_formato_numerico(serie) if self.formato == "auto" else self.formato
+
+    def _categoria(self, serie):
+        """Whether an unhinted text column is worth a category."""
+        preenchidas = int(serie.notna().sum())
+        return preenchidas > 0 and serie.nunique() <= self.max_categorias * preenchidas
+
+    def _converter(self, serie, tipo):
+        """New values for ``serie`` (or None to keep it) and the name of the dtype applied."""
+        if tipo == "categoria":
+            if isinstance(serie.dtype, pd.CategoricalDtype):
+                return None, None
+            return serie.astype("category"), "category"
+        if tipo in ("inteiro", "decimal"):
+            formato = self._formato(serie)
+            if not parece_numerico(serie, formato):
+                self.ignoradas[serie.name] = "valores nao numericos"
+                return None, None
+            valores = _numero(serie, tipo, formato)
+            return (None, None) if valores.dtype == serie.dtype else (valores, str(valores.dtype))
+        if tipo == "auto":
+            if is_integer_dtype(serie.dtype) and serie.dtype.kind in "iu":
+                valores = _menor_inteiro(serie.to_numpy())
+                return (None, None) if valores.dtype == serie.dtype else (valores, str(valores.dtype))
+            if _eh_texto(serie.dtype):
+                if self.inferir_numeros and parece_numerico(serie, self._formato(serie)):
+                    return self._converter(serie, "decimal")
+                if self._categoria(serie):
+                    return serie.astype("category"), "category"
+        return None, None
+
+    def _numeros(self, serie):
+        """float64 values of a column (NaN = empty), or None when a cell is not numeric."""
+        if not is_numeric_dtype(serie.dtype) or is_bool_dtype(serie.dtype):
+            formato = self._formato(serie)
+            if not parece_numerico(serie, formato):
+                return None
+        else:
+            formato = "br"
+        valores = converter_serie_numerica(serie, formato)
+        valores[serie.isna().to_numpy()] = np.nan
+        return valores
+
+    def _conformar(self, serie, alvo):
+        """New values giving ``serie`` the planned dtype ``alvo`` (or None to keep it)."""
+        if serie.dtype == alvo:
+            return None
+        if alvo == "category":
+            return serie.astype("category")
+        valores = self._numeros(serie)
+        if valores is None:
+            self.ignoradas[serie.name] = "valores nao numericos em parte dos blocos"
+            return None
+        valores = _ajustar(valores, np.dtype(alvo))
+        if valores.dtype != alvo:
+            self.alargadas[serie.name] = alvo
+        return valores
+
+    def otimizar(self, df):
+        """
+        Return ``df`` with compact dtypes (``df`` itself is never modified).
+
+        The first call decides the dtypes (``plano``); later calls apply the same ones.
+
+        Args:
+            df (pd.DataFrame): Loaded sheet or chunk
+
+        Returns:
+            pd.DataFrame: Shallow copy with the converted columns, or ``df`` when none changed
+        """
+        novos = {}
+        if self.plano is None:
+            dicas = self._resolver_dicas(df)
+            automatico = len(df) >= self.minimo_linhas
+            for posicao, coluna in enumerate(df.columns):
+                tipo = dicas.get(coluna, "auto")
+                if tipo == "texto" or (tipo == "auto" and not automatico):
+                    continue
+                valores, nome = self._converter(df.iloc[:, posicao], tipo)
+                if valores is not None:
+                    novos[posicao] = (valores, nome)
+            self.plano = {df.columns[posicao]: nome for posicao, (_, nome) in novos.items()}
+        else:
+            for posicao, coluna in enumerate(df.columns):
+                if coluna in self.plano:
+                    valores = self._conformar(df.iloc[:, posicao], self.plano[coluna])
+                    if valores is not None:
+                        novos[posicao] = (valores, str(valores.dtype))
+        self.colunas.update({df.columns[posicao]: nome for posicao, (_, nome) in novos.items()})
+        if not novos:
+            return df
+
+        posicoes = list(novos)
+        self.bytes_antes += int(df.iloc[:, posicoes].memory_usage(index=False, deep=True).sum())
+        resultado = df.copy(deep=False)
+        for posicao, (valores, _) in novos.items():
+            resultado.isetitem(posicao, valores)
+        self.bytes_depois += int(resultado.iloc[:, posicoes].memory_usage(index=False, deep=True).sum())
+        return resultado
+
+    def resumo(self):
+        """Log line with the converted columns and the memory saved."""
+        if not self.colunas and not self.bytes_antes:
+            return "[INFO] Tipos de colunas mantidos (nenhuma coluna compactada)"
+        contagem = {}
+        for nome in self.colunas.values():
+            contagem[nome] = contagem.get(nome, 0) + 1
+        tipos = ", ".join(f"{n} {nome}" for nome, n in sorted(contagem.items()))
+        antes, depois = self.bytes_antes / 1024 ** 2, self.bytes_depois / 1024 ** 2
+        economia = 100 * (1 - self.bytes_depois / self.bytes_antes) if self.bytes_antes else 0.0
+        return (f"[OK] Tipos otimizados: {len(self.colunas)} colunas ({tipos}), "
+                f"{antes:.1f} MB -> {depois:.1f} MB (-{economia:.0f}%)")
@@ -1,19 +1,39 @@
+import importlib
+import sys
+import threading
 import tkinter as tk
 from tkinter import ttk
 from gui.styles import ThemeConfig
-from gui.pages.cleaner import CleanerPage
-from gui.pages.dashboard import DashboardPage
-from gui.pages.config import ConfigPage
-from core.cleaner import ADCLogic
+from core.tarefas import AgendadorTarefas
+
+# Paginas importadas e montadas so na primeira visita: chave -> (modulo, classe)
+PAGINAS = {
+    "limpeza": ("gui.pages.cleaner", "CleanerPage"),
+    "resumo": ("gui.pages.dashboard", "DashboardPage"),
+    "config": ("gui.pages.config", "ConfigPage"),
+}
 
 class MainWindow:
-    def __init__(self, root):
+    def __init__(self, root, tempo_inicio=None, relatorio_inicio=None):
+        """
+        Build the window shell; pandas, the core and the pages load after it is shown.
+
+        Args:
+            root (tk.Tk): Root window
+            tempo_inicio (TempoInicio, optional): Startup timer (main.py --tempo-inicio)
+            relatorio_inicio (str, optional): Where to save the startup report
+        """
         self.root = root
         self.root.title("ADC v2.5 Pro")
         self.root.geometry("1000x850")
         
-        # Inicializa lógica central (compartilhada)
-        self.logic = ADCLogic()
+        # Lógica central (compartilhada): criada quando o núcleo terminar de carregar
+        self.logic = None
+        self.tempo_inicio = tempo_inicio
+        self.relatorio_inicio = relatorio_inicio
+        # Tarefas de fundo das páginas: uma por vez sobre a mesma ADCLogic, canceláveis
+        self.agendador = AgendadorTarefas(max_workers=1)
+        self.root.protocol("WM_DELETE_WINDOW", self.fechar)
         
         # Aplica estilos
         ThemeConfig.apply_styles(self.root)
@@ -21,11 +41,51 @@ class MainWindow:
         
         # Estado
         self.pagina_atual = None
+        self.pagina_pendente = "limpeza"
         self.pages = {}
         self.is_fullscreen = False
 
         self.criar_layout()
-        self.navegar("limpeza")
+        self.atualizar_status("⏳ Carregando...")
+        # A janela aparece primeiro; pandas e o núcleo carregam em segundo plano
+        self.root.after_idle(self._janela_visivel)
+
+    def _marcar(self, etapa):
+        if self.tempo_inicio:
+            self.tempo_inicio.etapa(etapa)
+
+    def _janela_visivel(self):
+        self._marcar("janela visivel")
+        threading.Thread(target=self._carregar_nucleo, daemon=True).start()
+
+    def _carregar_nucleo(self):
+        """Import the core (pandas, numpy) and the first page module off the UI thread."""
+        try:
+            import core.cleaner  # noqa: F401 (o import e o custo; ADCLogic e criado na UI)
+            importlib.import_module(PAGINAS[self.pagina_pendente][0])
+            erro = None
+        except Exception as e:
+            erro = str(e)
+        self.root.after(0, lambda: self._nucleo_pronto(erro))
+
+    def _nucleo_pronto(self, erro):
+        if erro:
+            self.atualizar_status(f"❌ Erro ao carregar: {erro}")
+            return
+        from core.cleaner import ADCLogic
+        self.logic = ADCLogic()
+        self._marcar("nucleo carregado")
+        pagina, self.pagina_pendente = self.pagina_pendente, None
+        self.navegar(pagina)
+
+    def fechar(self):
+        """Cancel background jobs, stop the Dashboard worker processes and close the window."""
+        self.agendador.encerrar(cancelar=True)
+        # So se o Dashboard ja carregou o modulo (nao importa pandas ao fechar)
+        multi = sys.modules.get("core.multi")
+        if multi is not None:
+            multi.encerrar_workers()
+        self.root.destroy()
 
     def criar_layout(self):
         # Sidebar
@@ -38,7 +98,6 @@ class MainWindow:
         self.main_content.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         self.montar_sidebar()
-        self.montar_paginas()
         self.montar_barra_inferior()
 
     def montar_sidebar(self):
@@ -68,15 +127,17 @@ class MainWindow:
         btn.pack(fill=tk.X, padx=10, pady=5)
         return btn
 
-    def montar_paginas(self):
-        # Instancia as páginas passando o logic compartilhado
-        self.pages["limpeza"] = CleanerPage(self.main_content, self.logic, self.atualizar_status)
-        self.pages["resumo"] = DashboardPage(self.main_content, self.logic, self.atualizar_status)
-        self.pages["config"] = ConfigPage(self.main_content, self.logic, self.atualizar_status)
-        
-        # Configurar callback de preset update se necessário
-        # Ex: Quando config mudar algo, limpar cache ou avisar outras abas. 
-        # Por enquanto, eles leem self.logic.presets que é atualizado.
+    def _pagina(self, pagina_key):
+        """Page instance, imported and built on first visit."""
+        if pagina_key not in self.pages:
+            modulo, classe = PAGINAS[pagina_key]
+            # Instancia a página passando o logic compartilhado
+            # (as páginas leem self.logic.presets, que é atualizado pela config)
+            page = getattr(importlib.import_module(modulo), classe)(self.main_content, self.logic, self.atualizar_status,
+                                                                   agendador=self.agendador)
+            page.set_ui_controllers(self.progress_bar, self.status_label, self.progress_frame)
+            self.pages[pagina_key] = page
+        return self.pages[pagina_key]
 
     def montar_barra_inferior(self):
         self.progress_frame = ttk.Frame(self.main_content)
@@ -90,12 +151,13 @@ class MainWindow:
         
         self.status_label = tk.Label(self.root, text="✨ Sistema Pronto", bg=self.colors["mantle"], fg=self.colors["subtext"], font=("Segoe UI", 9), anchor=tk.W, padx=15, pady=5)
         self.status_label.pack(side=tk.BOTTOM, fill=tk.X)
-
-        # Injeta dependências de UI nas pages
-        for page in self.pages.values():
-            page.set_ui_controllers(self.progress_bar, self.status_label, self.progress_frame)
+        # Dependências de UI são injetadas em cada página ao montá-la (_pagina)
 
     def navegar(self, pagina_key):
+        if self.logic is None:
+            # Núcleo ainda carregando: abre esta página quando ficar pronto
+            self.pagina_pendente = pagina_key
+            return
         if self.pagina_atual == pagina_key: return
 
         # Hide all
@@ -106,7 +168,7 @@ class MainWindow:
         self.root.after(50, lambda: self._animar_entrada(pagina_key))
         
     def _animar_entrada(self, pagina_key):
-        page = self.pages[pagina_key]
+        page = self._pagina(pagina_key)
         page.pack(fill=tk.BOTH, expand=True)
         self.pagina_atual = pagina_key
         
@@ -119,12 +181,33 @@ class MainWindow:
             "config": "⚙️ Configurações de Sistema"
         }
         self.atualizar_status(msgs.get(pagina_key, ""))
+        if self.tempo_inicio:
+            self._concluir_inicio()
+
+    def _concluir_inicio(self):
+        """First page on screen: stop timing and report (stderr and/or relatorio_inicio)."""
+        tempo, self.tempo_inicio = self.tempo_inicio, None
+        tempo.etapa("primeira pagina")
+        tempo.remover()
+        if sys.stderr:  # executavel sem console nao tem stderr
+            print(tempo.texto(), file=sys.stderr)
+        if self.relatorio_inicio:
+            try:
+                tempo.salvar(self.relatorio_inicio)
+            except OSError as e:
+                if sys.stderr:
+                    print(f"[WARNING] Relatorio de inicio nao salvo: {e}", file=sys.stderr)
+        self.atualizar_status(f"✨ Sistema Pronto em {tempo.total:.2f}s")
 
     def toggle_fullscreen(self):
         self.is_fullscreen = not self.is_fullscreen
         self.root.attributes("-fullscreen", self.is_fullscreen)
         if not self.is_fullscreen:
             self.root.geometry("1000x850")
+        # Paginas com graficos trocam o tamanho da imagem (redesenho a partir do cache)
+        for page in self.pages.values():
+            if hasattr(page, "on_fullscreen"):
+                page.on_fullscreen(self.is_fullscreen)
 
     def atualizar_status(self, text):
         self.status_label.config(text=text)
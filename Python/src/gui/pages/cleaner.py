@@ -1,14 +1,18 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
 import os
-import threading
 from datetime import datetime
 from gui.styles import ThemeConfig
+from core.lote import opcoes_do_preset
+from core.tarefas import AgendadorTarefas
+from core.registro import CanalLog, arquivo_rotativo, diretorio_padrao, NOME_ARQUIVO
 
 class CleanerPage(ttk.Frame):
-    def __init__(self, parent, logic, status_callback):
+    def __init__(self, parent, logic, status_callback, agendador=None):
         super().__init__(parent)
         self.logic = logic
+        # Agendador compartilhado pela janela (tarefas na mesma ADCLogic rodam em fila)
+        self.agendador = agendador or AgendadorTarefas()
         self.status_callback = status_callback
         self.colors = ThemeConfig.get_colors()
         
@@ -26,11 +30,22 @@ class CleanerPage(ttk.Frame):
         
         self.remover_duplicadas = tk.BooleanVar(value=True)
         self.remover_vazias = tk.BooleanVar(value=True)
+        self.preset_atual = {}  # chave/modo de duplicatas do preset selecionado
         
-        self.processando = False
+        self.tarefa = None  # processamento em andamento (core.tarefas.Tarefa)
         self.df_resultado = None
 
+        # Diario: as threads so enfileiram; a UI insere em lote a cada intervalo_ms
+        self.config_log = self.logic.registro
+        arquivo = None
+        if self.config_log.get("arquivo"):
+            diretorio = self.config_log.get("diretorio") or diretorio_padrao()
+            arquivo = arquivo_rotativo(os.path.join(diretorio, NOME_ARQUIVO),
+                                       self.config_log.get("max_kb", 1024), self.config_log.get("backups", 3))
+        self.canal_log = CanalLog(limite=self.config_log.get("max_linhas", 2000), arquivo=arquivo)
+
         self._setup_ui()
+        self.after(int(self.config_log.get("intervalo_ms", 100)), self._drenar_log)
 
     def set_ui_controllers(self, progress_bar, lbl_status, progress_frame):
         self.progress_bar = progress_bar
@@ -93,6 +108,8 @@ class CleanerPage(ttk.Frame):
         action_frame.pack(fill=tk.X, pady=10)
         self.btn_processar = ttk.Button(action_frame, text="🚀  INICIAR PROCESSAMENTO", command=self.iniciar_processamento, style="Accent.TButton")
         self.btn_processar.pack(side=tk.RIGHT)
+        self.btn_cancelar = ttk.Button(action_frame, text="⛔  Cancelar", command=self.cancelar_processamento, state="disabled")
+        self.btn_cancelar.pack(side=tk.RIGHT, padx=(0, 10))
 
         # Output (Hidden)
         self.output_frame = ttk.Frame(file_card, style="Card.TFrame", padding=(0, 20, 0, 0))
@@ -123,12 +140,22 @@ class CleanerPage(ttk.Frame):
         return widget
 
     def log(self, msg):
-        def _u():
-            self.log_widget.insert(tk.END, msg + "\n")
+        # Qualquer thread: so enfileira (sem um after() por mensagem)
+        self.canal_log.publicar(msg)
+
+    def _drenar_log(self):
+        linhas = self.canal_log.drenar()
+        if linhas:
+            self.log_widget.insert(tk.END, "\n".join(linhas) + "\n")
+            # Anel: mantem so as ultimas max_linhas no widget
+            excesso = int(self.log_widget.index("end-1c").split(".")[0]) - 1 - int(self.config_log.get("max_linhas", 2000))
+            if excesso > 0:
+                self.log_widget.delete("1.0", f"{excesso + 1}.0")
             self.log_widget.see(tk.END)
-        self.after(0, _u)
+        self.after(int(self.config_log.get("intervalo_ms", 100)), self._drenar_log)
         
     def limpar_log(self):
+        self.canal_log.drenar()  # descarta o que ainda nao foi exibido
         self.log_widget.delete(1.0, tk.END)
 
     def selecionar_arquivo_entrada(self):
@@ -145,9 +172,11 @@ class CleanerPage(ttk.Frame):
 
     def aplicar_preset(self, event=None):
         nome = self.nome_preset.get()
+        self.preset_atual = {}
         if nome == "Personalizado": return
         for p in self.logic.presets:
             if p["nome"] == nome:
+                self.preset_atual = p
                 self.indices_entry.delete(0, tk.END)
                 self.indices_entry.insert(0, p.get("colunas_deletar", ""))
 
@@ -162,7 +191,7 @@ class CleanerPage(ttk.Frame):
         self.after(0, _u)
 
     def iniciar_processamento(self):
-        if self.processando: return
+        if self.tarefa is not None and not self.tarefa.terminada: return
         if not self.caminho_entrada.get():
              messagebox.showerror("Erro", "Selecione o arquivo!")
              return
@@ -170,67 +199,77 @@ class CleanerPage(ttk.Frame):
         if not self.aba_selecionada.get():
             messagebox.showerror("Erro", "Selecione a aba da planilha!")
             return
-             
-        self.processando = True
-        self.btn_processar.config(state="disabled")
-        threading.Thread(target=self._processar_thread, daemon=True).start()
 
-    def _processar_thread(self):
+        # Parse indices
         try:
-            self.limpar_log()
-            self.log("INICIANDO PROCESSAMENTO...")
-            
-            caminho = self.caminho_entrada.get()
-            indices_str = self.indices_entry.get()
-            
-            # Parse indices
-            try:
-                indices = [int(i.strip()) - 1 for i in indices_str.split(",") if i.strip()]
-            except ValueError:
-                raise ValueError("Índices inválidos. Use números separados por vírgula.")
-
-            opcoes = {
-                "remover_duplicadas": self.remover_duplicadas.get(),
-                "remover_vazias": self.remover_vazias.get()
-            }
-
-            self.set_progress(20, "Lendo arquivo...")
-            df = self.logic.processar_limpeza(
-                caminho, 
-                self.aba_selecionada.get(), 
-                indices, 
-                opcoes, 
-                log_callback=self.log
-            )
-            
-            self.df_resultado = df
-            
+            indices = [int(i.strip()) - 1 for i in self.indices_entry.get().split(",") if i.strip()]
+        except ValueError:
+            messagebox.showerror("Erro", "Índices inválidos. Use números separados por vírgula.")
+            return
+
+        # Variaveis Tk lidas aqui (thread principal); a tarefa so recebe valores prontos
+        caminho = self.caminho_entrada.get()
+        aba = self.aba_selecionada.get()
+        opcoes = opcoes_do_preset(self.preset_atual, self.remover_duplicadas.get(), self.remover_vazias.get())
+
+        self.limpar_log()
+        self.log("INICIANDO PROCESSAMENTO...")
+        self.df_resultado = None
+        self.btn_processar.config(state="disabled")
+        self.btn_cancelar.config(state="normal")
+        self.tarefa = self.agendador.submeter(
+            lambda ctx: self.logic.processar_limpeza(caminho, aba, indices, opcoes, log_callback=ctx.log,
+                                                     progress_callback=ctx.progresso),
+            nome="limpeza", ao_evento=self._encaminhar_evento)
+
+    def cancelar_processamento(self):
+        if self.tarefa is not None and not self.tarefa.terminada:
+            self.tarefa.cancelar()
+            self.btn_cancelar.config(state="disabled")
+            self.set_progress(self.tarefa.percentual, "Cancelando...")
+
+    def _encaminhar_evento(self, evento):
+        # Thread da tarefa: logs vao direto para o canal; o resto (ja limitado) via after
+        if evento["tipo"] == "log":
+            self.log(evento["mensagem"])
+        else:
+            self.after(0, self._on_evento, evento)
+
+    def _on_evento(self, evento):
+        # Thread principal (via after)
+        tipo = evento["tipo"]
+        if tipo == "progresso":
+            self.set_progress(evento["percentual"], evento["mensagem"])
+        elif tipo == "concluida":
+            self.df_resultado = evento["resultado"]
             self.set_progress(100, "Concluído!")
             self.log("✅ Concluído com sucesso!")
-            
-            self.after(0, lambda: [
-                self.output_frame.pack(fill=tk.X, pady=5),
-                self.btn_salvar.pack(fill=tk.X, pady=5)
-            ])
-            
-        except Exception as e:
-            self.log(f"[ERROR] Erro: {e}")
+            self.output_frame.pack(fill=tk.X, pady=5)
+            self.btn_salvar.pack(fill=tk.X, pady=5)
+        elif tipo == "erro":
+            self.log(f"[ERROR] Erro: {evento['erro']}")
             self.set_progress(0, "Erro")
-        finally:
-            self.processando = False
-            self.after(0, lambda: self.btn_processar.config(state="normal"))
+        elif tipo == "cancelada":
+            self.log("[WARNING] Processamento cancelado.")
+            self.set_progress(0, "Cancelado")
+        if tipo in ("concluida", "erro", "cancelada"):
+            self.btn_processar.config(state="normal")
+            self.btn_cancelar.config(state="disabled")
 
     def salvar_resultado(self):
         if self.df_resultado is None: return
         
         if not self.caminho_saida.get():
-             path = filedialog.asksaveasfilename(defaultextension=".xlsx", filetypes=[("Excel", "*.xlsx")])
+             path = filedialog.asksaveasfilename(
+                 defaultextension=".xlsx",
+                 filetypes=[("Excel", "*.xlsx"), ("CSV (;)", "*.csv"), ("Parquet", "*.parquet")]
+             )
              if path: self.caminho_saida.set(path)
         
         if self.caminho_saida.get():
             try:
-                self.logic.salvar_planilha(self.df_resultado, self.caminho_saida.get())
+                caminho = self.logic.salvar_planilha(self.df_resultado, self.caminho_saida.get(), log_callback=self.log)
                 messagebox.showinfo("Sucesso", "Arquivo salvo!")
-                self.log(f"💾 Salvo em: {self.caminho_saida.get()}")
+                self.log(f"💾 Salvo em: {caminho}")
             except Exception as e:
                 messagebox.showerror("Erro", str(e))
@@ -3,9 +3,10 @@ from tkinter import ttk, simpledialog, messagebox
 from gui.styles import ThemeConfig
 
 class ConfigPage(ttk.Frame):
-    def __init__(self, parent, logic, status_callback):
+    def __init__(self, parent, logic, status_callback, agendador=None):
         super().__init__(parent)
         self.logic = logic
+        self.agendador = agendador  # sem tarefas de fundo nesta pagina
         self.status_callback = status_callback
         self.colors = ThemeConfig.get_colors()
         self._setup_ui()
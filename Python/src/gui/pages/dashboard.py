@@ -1,19 +1,33 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import threading
+import os
+import base64
 from gui.styles import ThemeConfig
-# Para gráficos se quiser implementar depois: import matplotlib.pyplot as plt
+from core.graficos import CacheGraficos, RenderizadorGraficos, dados_graficos, impressao_digital, renderizar_png, disponivel
+from core.tarefas import AgendadorTarefas
 
 class DashboardPage(ttk.Frame):
-    def __init__(self, parent, logic, status_callback):
+    def __init__(self, parent, logic, status_callback, agendador=None):
         super().__init__(parent)
         self.logic = logic
+        self.agendador = agendador or AgendadorTarefas()
+        self.tarefa = None  # calculo em andamento (core.tarefas.Tarefa)
         self.status_callback = status_callback
         self.colors = ThemeConfig.get_colors()
         
         self.arquivos_selecionados = []  # Lista de arquivos para processar
         
         self.lbl_stats = {} # refs para labels de numeros
+        self.progress_bar = None
+        self.lbl_status = None
+        
+        # Graficos: PNG renderizado fora da thread da UI, em cache pela impressao digital dos dados
+        self.cache_graficos = CacheGraficos()
+        self.renderizador = RenderizadorGraficos(self.cache_graficos)  # uma thread, so o pedido mais recente
+        self._dados_graficos = None
+        self._modo_grafico = "normal"
+        self._chave_grafico = None
+        self._fotos = {}  # PhotoImage por chave (so na thread da UI)
         
         self._setup_ui()
 
@@ -21,8 +35,24 @@ class DashboardPage(ttk.Frame):
         self.progress_bar = progress_bar
         self.lbl_status = lbl_status
 
+    def set_progress(self, val, text=None):
+        def _u():
+            if not self.progress_bar: return
+            if val < 0 or val >= 100: self.progress_bar.pack_forget()
+            else:
+                if not self.progress_bar.winfo_viewable(): self.progress_bar.pack(fill=tk.X)
+                self.progress_bar['value'] = val
+            if text and self.lbl_status: self.lbl_status.config(text=text)
+        self.after(0, _u)
+
     def on_show(self):
-        pass
+        # Volta para a pagina: reexibe do cache (sem replotar)
+        self._desenhar_graficos()
+
+    def on_fullscreen(self, ativo):
+        """Called by MainWindow.toggle_fullscreen: switch the chart size, from cache when possible."""
+        self._modo_grafico = "tela_cheia" if ativo else "normal"
+        self._desenhar_graficos()
 
     def _setup_ui(self):
         # Header
@@ -52,8 +82,25 @@ class DashboardPage(ttk.Frame):
         self.lbl_stats['pedidos'] = self._criar_card_stat(stats, "PEDIDOS", "0")
         self.lbl_stats['valor'] = self._criar_card_stat(stats, "VALOR TOTAL", "R$ 0,00")
 
+        # Top SKUs
+        top = ttk.Frame(self, style="Card.TFrame", padding=15)
+        top.pack(fill=tk.X, pady=(0, 20))
+        ttk.Label(top, text="TOP SKUS MAIS PEDIDOS", style="StatDesc.TLabel").pack(anchor="w")
+        self.lbl_top_skus = ttk.Label(top, text="-", justify=tk.LEFT, font=("Consolas", 10),
+                                      foreground=self.colors["text"], background=self.colors["surface0"])
+        self.lbl_top_skus.pack(anchor="w", pady=(5, 0))
+
+        # Graficos (imagem pronta vinda da thread de renderizacao)
+        self.lbl_grafico = tk.Label(self, text="", bg=self.colors["base"], fg=self.colors["subtext"])
+        self.lbl_grafico.pack(fill=tk.X, pady=(0, 20))
+
         # Action
-        ttk.Button(self, text="📊 GERAR DASHBOARD", command=self.gerar_dashboard, style="Accent.TButton").pack(fill=tk.X)
+        acoes = ttk.Frame(self)
+        acoes.pack(fill=tk.X)
+        self.btn_cancelar = ttk.Button(acoes, text="⛔ Cancelar", command=self.cancelar_dashboard, state="disabled")
+        self.btn_cancelar.pack(side=tk.RIGHT, padx=(10, 0))
+        self.btn_gerar = ttk.Button(acoes, text="📊 GERAR DASHBOARD", command=self.gerar_dashboard, style="Accent.TButton")
+        self.btn_gerar.pack(side=tk.LEFT, fill=tk.X, expand=True)
         
         # Log (Simples)
         self.log_label = ttk.Label(self, text="Aguardando...", foreground=self.colors["subtext"])
@@ -72,6 +119,65 @@ class DashboardPage(ttk.Frame):
         lbl.pack()
         return lbl
 
+    def _desenhar_graficos(self):
+        """
+        Show the charts of the last result for the current window mode.
+
+        Cached images are shown immediately; otherwise the PNG is rendered with Agg on the
+        page's RenderizadorGraficos (one worker thread; a newer request replaces one still
+        waiting) and only the finished image is handed to Tk via after(). The other window
+        mode is rendered right after, so toggling fullscreen hits the cache.
+        """
+        if self._dados_graficos is None:
+            return
+        if not disponivel():
+            self.lbl_grafico.config(image="", text="Gráficos indisponíveis (matplotlib não instalado)")
+            return
+        dados, modo, tema = self._dados_graficos, self._modo_grafico, self.colors
+        chave = impressao_digital(dados, modo, tema)
+        self._chave_grafico = chave
+        if chave in self._fotos or chave in self.cache_graficos:
+            self._mostrar_grafico(chave, self.cache_graficos.obter(chave))
+            return
+
+        outro = "normal" if modo == "tela_cheia" else "tela_cheia"
+
+        def _falhou(e):
+            mensagem = f"Erro ao gerar gráficos: {e}"
+            self.after(0, lambda: chave == self._chave_grafico and self.lbl_grafico.config(image="", text=mensagem))
+
+        # Pre-aquece o outro modo (tela cheia/normal), a menos que chegue um pedido mais novo
+        self.renderizador.pedir(
+            chave, lambda: renderizar_png(dados, modo, tema),
+            ao_concluir=lambda png: self.after(0, lambda: self._mostrar_grafico(chave, png)),
+            ao_falhar=_falhou,
+            aquecer=[(impressao_digital(dados, outro, tema), lambda: renderizar_png(dados, outro, tema))])
+
+    def _limpar_graficos(self):
+        self._dados_graficos = None
+        self._chave_grafico = None
+        self.lbl_grafico.config(image="", text="")
+
+    def _mostrar_grafico(self, chave, png):
+        """Display a rendered image (UI thread); stale results are ignored."""
+        if chave != self._chave_grafico:
+            return
+        foto = self._fotos.get(chave)
+        if foto is None:
+            foto = tk.PhotoImage(data=base64.b64encode(png).decode("ascii"), format="png")
+            self._fotos[chave] = foto
+        self.lbl_grafico.config(image=foto, text="")
+
+    @staticmethod
+    def _texto_top_skus(ranking):
+        """One line per SKU: position, label, orders, items and revenue."""
+        if not ranking:
+            return "Nenhuma coluna de SKU encontrada"
+        return "\n".join(
+            f"{i:>2}. {item['sku'][:30]:<30} {item['pedidos']:>7} pedidos {item['quantidade']:>10g} itens   R$ {item['receita']:,.2f}"
+            for i, item in enumerate(ranking, 1)
+        )
+
     def selecionar_arquivos(self):
         """
         Open file dialog to select one or more Excel files.
@@ -110,74 +216,104 @@ class DashboardPage(ttk.Frame):
             self.log_label.config(text="Selecione pelo menos um arquivo primeiro!", foreground=self.colors["red"])
             return
         
+        if self.tarefa is not None and not self.tarefa.terminada:
+            return
+        
         self.log_label.config(text="Calculando...", foreground=self.colors["subtext"])
+        self.btn_gerar.config(state="disabled")
+        self.btn_cancelar.config(state="normal")
         self.update_idletasks()
         
-        threading.Thread(target=self._calc_thread, daemon=True).start()
+        self.tarefa = self.agendador.submeter(self._calc_thread, list(self.arquivos_selecionados), nome="dashboard",
+                                              ao_evento=lambda evento: self.after(0, self._on_evento, evento))
+
+    def cancelar_dashboard(self):
+        if self.tarefa is not None and not self.tarefa.terminada:
+            self.tarefa.cancelar()
+            self.btn_cancelar.config(state="disabled")
+            self.log_label.config(text="Cancelando...", foreground=self.colors["subtext"])
 
-    def _calc_thread(self):
+    def _on_evento(self, evento):
+        # Thread principal (via after); resultado e erro ja atualizam a tela em _calc_thread
+        tipo = evento["tipo"]
+        if tipo in ("concluida", "erro", "cancelada"):
+            # Botoes primeiro: um erro ao estilizar a tela nao pode travar a pagina
+            self.btn_gerar.config(state="normal")
+            self.btn_cancelar.config(state="disabled")
+        if tipo == "cancelada":
+            self.set_progress(-1, "Cancelado")
+            self.log_label.config(text="Cancelado.", foreground=self.colors["peach"])
+
+    def _calc_thread(self, ctx, arquivos):
         """
-        Background thread for calculating dashboard statistics.
-        Handles both successful results and error cases.
-        Processes multiple files and combines results:
-        - Unique order IDs across all files (no duplicates)
+        Background job (AgendadorTarefas) calculating dashboard statistics.
+        Handles both successful results and error cases; cancelling stops it after the
+        file being read (the files not started yet are dropped).
+        Processes multiple files in parallel (process pool) and combines results; files
+        unchanged since the last run reuse their cached partial (gerar_resumo_multi):
+        - Unique order IDs across all files (compact AcumuladorPedidos, no duplicates)
         - Sum of items from all files
         - Sum of values from all files
+        - Top SKUs by order frequency (per-file SKU tables summed, then top N)
         """
         try:
-            # Combined results
-            pedidos_unicos = set()  # Set para garantir IDs unicos
-            total_itens = 0
-            total_valor = 0.0
-            erros = []
-            
-            # Process each file
-            for idx, arquivo in enumerate(self.arquivos_selecionados, 1):
-                try:
-                    # Use empty string to auto-load first sheet
-                    res = self.logic.gerar_resumo(arquivo, "")
-                    
-                    if 'erro' in res:
-                        erros.append(f"{arquivo}: {res['erro']}")
-                    else:
-                        # Get unique order IDs from this file
-                        df = res.get('df')
-                        if df is not None:
-                            # Column B (index 1) contains order IDs
-                            ids_deste_arquivo = set(df.iloc[:, 1].dropna().unique())
-                            pedidos_unicos.update(ids_deste_arquivo)
-                        
-                        # Sum items and values
-                        total_itens += res.get('total_itens', 0)
-                        total_valor += res.get('valor_total', 0.0)
-                        
-                except Exception as e:
-                    erros.append(f"{arquivo}: {str(e)}")
+            total_arquivos = len(arquivos)
+
+            def _progresso(concluidos, total, parcial):
+                ctx.verificar()  # ponto de cancelamento entre arquivos
+                nome = os.path.basename(parcial['arquivo'])
+                self.after(0, lambda: self.log_label.config(
+                    text=f"Processando... {concluidos}/{total} ({nome})",
+                    foreground=self.colors["subtext"]
+                ))
+                self.set_progress(concluidos * 100 / total, f"Dashboard: {concluidos}/{total} arquivo(s)")
+
+            self.set_progress(0, f"Dashboard: 0/{total_arquivos} arquivo(s)")
+            # Use empty string to auto-load first sheet
+            res = self.logic.gerar_resumo_multi(arquivos, aba="", progress_callback=_progresso)
+
+            total_pedidos = res['total_pedidos']
+            # Contagem estimada (HyperLogLog) aparece com "~"
+            texto_pedidos = f"~{total_pedidos}" if res['pedidos'].aproximado else str(total_pedidos)
+            total_itens = res['total_itens']
+            total_valor = res['valor_total']
+            erros = res['erros']
+            reaproveitados = res.get('reaproveitados', 0)
+            sufixo_cache = f" ({reaproveitados} do cache)" if reaproveitados else ""
+            texto_top = self._texto_top_skus(res.get('ranking'))
+            dados = dados_graficos(res)
             
             # Update UI
             def _u():
-                if erros and not pedidos_unicos:
+                if erros and not total_pedidos:
                     # All files failed
                     self.log_label.config(text=f"Erro: {erros[0]}", foreground=self.colors["red"])
                     self.lbl_stats['itens'].config(text="0")
                     self.lbl_stats['pedidos'].config(text="0")
                     self.lbl_stats['valor'].config(text="R$ 0,00")
+                    self.lbl_top_skus.config(text="-")
+                    self._limpar_graficos()
                 else:
                     # Success (at least some files processed)
                     self.lbl_stats['itens'].config(text=str(total_itens))
-                    self.lbl_stats['pedidos'].config(text=str(len(pedidos_unicos)))
+                    self.lbl_stats['pedidos'].config(text=texto_pedidos)
                     self.lbl_stats['valor'].config(text=f"R$ {total_valor:,.2f}")
+                    self.lbl_top_skus.config(text=texto_top)
+                    if dados != self._dados_graficos:
+                        self._fotos.clear()  # PhotoImages dos dados anteriores
+                    self._dados_graficos = dados
+                    self._desenhar_graficos()
                     
                     if erros:
                         self.log_label.config(
                             text=f"✓ Processado com {len(erros)} erro(s). Ver console.", 
-                            foreground=self.colors["yellow"]
+                            foreground=self.colors["peach"]
                         )
                         for erro in erros:
                             print(f"[WARNING] {erro}")
                     else:
                         self.log_label.config(
-                            text=f"✓ {len(self.arquivos_selecionados)} arquivo(s) processado(s) com sucesso!", 
+                            text=f"✓ {total_arquivos} arquivo(s) processado(s) com sucesso!{sufixo_cache}", 
                             foreground=self.colors["green"]
                         )
                 
@@ -185,10 +321,13 @@ class DashboardPage(ttk.Frame):
         except Exception as e:
             # Capture exception message before creating closure
             error_message = str(e)
+            self.set_progress(-1, "Erro")
             def _err():
                 self.log_label.config(text=f"Erro: {error_message}", foreground=self.colors["red"])
                 # Reset stats to zero
                 self.lbl_stats['itens'].config(text="0")
                 self.lbl_stats['pedidos'].config(text="0")
                 self.lbl_stats['valor'].config(text="R$ 0,00")
+                self.lbl_top_skus.config(text="-")
+                self._limpar_graficos()
             self.after(0, _err)
@@ -1,7 +1,9 @@
 import sys
 import os
-import tkinter as tk
-from gui.main_window import MainWindow
+import argparse
+
+# Medicao de inicio: so a biblioteca padrao antes de qualquer import pesado
+from core.inicio import TempoInicio
 
 # Configuração para High DPI
 try:
@@ -10,16 +12,39 @@ try:
 except:
     pass
 
+
+def _argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="ADC - Advanced Data Cleaner")
+    parser.add_argument("--tempo-inicio", nargs="?", const="", default=None, metavar="ARQUIVO",
+                        help="Report startup stages and import times (stderr; also saved to "
+                             "ARQUIVO, JSON if it ends in .json)")
+    # parse_known_args: ignora argumentos extras (ex: os do multiprocessing no executavel)
+    return parser.parse_known_args(argv)[0]
+
+
 if __name__ == "__main__":
+    args = _argumentos()
+    tempo_inicio = TempoInicio().instalar() if args.tempo_inicio is not None else None
+
+    # Necessario para o pool de processos do dashboard no executavel (PyInstaller);
+    # antes da GUI, para os processos worker nao importarem tkinter
+    import multiprocessing
+    multiprocessing.freeze_support()
+
+    import tkinter as tk
+    from gui.main_window import MainWindow
+
     # Garante que imports funcionem
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
     
     root = tk.Tk()
+    if tempo_inicio:
+        tempo_inicio.etapa("tkinter + Tk()")
     
     # ícone (se existir)
     # try:
     #     root.iconbitmap("assets/icon.ico")
     # except: pass
     
-    app = MainWindow(root)
+    app = MainWindow(root, tempo_inicio, args.tempo_inicio or None)
     root.mainloop()
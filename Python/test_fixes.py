@@ -5,12 +5,29 @@ Tests encoding handling, empty sheet names, and DataFrame size validation.
 """
 import sys
 import os
+import numpy as np
 import pandas as pd
 import unittest
 import time
+import shutil
+import tempfile
 
 sys.path.append(os.path.join(os.getcwd(), 'src'))
 from core.cleaner import ADCLogic
+from core.numeric import converter_serie_numerica, detectar_formato_numerico
+from core.cache import WorkbookCache
+from core.sidecar import SidecarCache
+from core.streaming import DeduplicadorLinhas
+from core.pedidos import AcumuladorPedidos
+from core.ranking import RankingSKU, normalizar_sku, combinar_rankings, top_skus
+from core import graficos
+
+def nova_logica(**kwargs):
+    """ADCLogic with the disk cache off, so tests never touch the user's cache directory."""
+    logic = ADCLogic(**kwargs)
+    logic.cache_disco = SidecarCache(ativo=False)
+    return logic
+
 
 class TestBugFixes(unittest.TestCase):
     """Test suite for ADC bug fixes and edge cases."""
@@ -52,7 +69,7 @@ class TestBugFixes(unittest.TestCase):
 
     def test_empty_aba_loads_first_sheet(self):
         """Test that empty sheet name ('') loads the first available sheet."""
-        logic = ADCLogic()
+        logic = nova_logica()
         print("\n[TEST] Testing empty aba loading...")
         
         # aba="" should automatically load Sheet1
@@ -63,7 +80,7 @@ class TestBugFixes(unittest.TestCase):
 
     def test_gerar_resumo_small_df(self):
         """Test that gerar_resumo handles small DataFrames gracefully."""
-        logic = ADCLogic()
+        logic = nova_logica()
         print("\n[TEST] Testing gerar_resumo with small dataframe...")
         
         # Sheet1 has only 1 column, should trigger error in result
@@ -74,7 +91,7 @@ class TestBugFixes(unittest.TestCase):
 
     def test_gerar_resumo_large_df(self):
         """Test that gerar_resumo processes large DataFrames correctly."""
-        logic = ADCLogic()
+        logic = nova_logica()
         print("\n[TEST] Testing gerar_resumo with large dataframe...")
         
         # Create a DataFrame with 30 columns (more than required 27)
@@ -96,6 +113,1429 @@ class TestBugFixes(unittest.TestCase):
             # Ensure file is closed before cleanup
             time.sleep(0.1)
 
+class TestWorkbookCache(unittest.TestCase):
+    """Workbook cache: parse once, invalidate on change, LRU eviction."""
+
+    FILE_NAME = "test_cache.xlsx"
+
+    def setUp(self):
+        with pd.ExcelWriter(self.FILE_NAME, engine='openpyxl') as writer:
+            pd.DataFrame({'A': [1, 2, 3]}).to_excel(writer, sheet_name='Sheet1', index=False)
+
+    def tearDown(self):
+        if os.path.exists(self.FILE_NAME):
+            os.remove(self.FILE_NAME)
+
+    def test_select_then_process_parses_once(self):
+        """listar_abas + carregar_planilha twice hits the cache after the first parse."""
+        logic = nova_logica()
+        self.assertEqual(logic.listar_abas(self.FILE_NAME), ['Sheet1'])
+        df1 = logic.carregar_planilha(self.FILE_NAME, aba="")
+        df1['extra'] = 0  # mutacao do chamador nao pode vazar para o cache
+        df2 = logic.carregar_planilha(self.FILE_NAME, aba="Sheet1")
+
+        stats = logic.cache_excel.estatisticas()
+        self.assertEqual(stats["hits"], 2)
+        self.assertNotIn('extra', df2.columns)
+
+    def test_modified_file_is_reloaded(self):
+        """A new mtime/size invalidates the cached sheet."""
+        logic = nova_logica()
+        logic.carregar_planilha(self.FILE_NAME, aba="Sheet1")
+        with pd.ExcelWriter(self.FILE_NAME, engine='openpyxl') as writer:
+            pd.DataFrame({'A': [1, 2, 3, 4, 5, 6]}).to_excel(writer, sheet_name='Sheet1', index=False)
+        os.utime(self.FILE_NAME, ns=(time.time_ns(), time.time_ns() + 10**9))
+
+        df = logic.carregar_planilha(self.FILE_NAME, aba="Sheet1")
+        self.assertEqual(len(df), 6)
+        # Apenas a versao nova: lista de abas + Sheet1
+        self.assertEqual(len(logic.cache_excel), 2)
+
+    def test_lru_eviction(self):
+        """Entries above the memory budget are evicted least-recently-used first."""
+        cache = WorkbookCache(limite_bytes=4000)
+        df = pd.DataFrame({'A': np.arange(200)})  # ~1.7 KB
+        cache.guardar(self.FILE_NAME, 'a', df)
+        cache.guardar(self.FILE_NAME, 'b', df)
+        cache.obter(self.FILE_NAME, 'a')
+        cache.guardar(self.FILE_NAME, 'c', df)
+
+        self.assertIsNotNone(cache.obter(self.FILE_NAME, 'a'))
+        self.assertIsNone(cache.obter(self.FILE_NAME, 'b'))
+        self.assertEqual(cache.evictions, 1)
+
+
+class TestEngineFallback(unittest.TestCase):
+    """Single-open loading path and per-extension engine memory."""
+
+    FILE_NAME = "test_disfarcado.xls"  # conteudo .xlsx com extensao .xls (comum em exports)
+
+    def setUp(self):
+        with pd.ExcelWriter(self.FILE_NAME, engine='openpyxl') as writer:
+            pd.DataFrame({'A': [1, 2]}).to_excel(writer, sheet_name='Dados', index=False)
+
+    def tearDown(self):
+        if os.path.exists(self.FILE_NAME):
+            os.remove(self.FILE_NAME)
+
+    def test_working_engine_is_remembered(self):
+        """After a fallback, the engine that worked is tried first for the extension."""
+        logic = nova_logica(limite_cache_mb=0)
+        df = logic.carregar_planilha(self.FILE_NAME, aba="")
+        self.assertEqual(list(df.columns), ['A'])
+        # openpyxl recusa a extensao .xls; o engine automatico (None) detecta pelo conteudo
+        self.assertIn('.xls', logic.engines_preferidos)
+        self.assertIsNone(logic._ordem_engines(self.FILE_NAME)[0])
+
+
+@unittest.skipUnless(SidecarCache.disponivel(), "pyarrow nao instalado")
+class TestSidecarCache(unittest.TestCase):
+    """Persistent Feather sidecar: lossless round-trip and reuse across sessions."""
+
+    FILE_NAME = "test_sidecar.xlsx"
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        df = pd.DataFrame({
+            'Pedido': [101, 102, 102],
+            'Preco': ['R$ 1.200,50', 15, None],
+            'Data': pd.to_datetime(['2026-01-01', '2026-01-02', '2026-01-03']),
+        })
+        with pd.ExcelWriter(self.FILE_NAME, engine='openpyxl') as writer:
+            df.to_excel(writer, sheet_name='Vendas', index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+        if os.path.exists(self.FILE_NAME):
+            os.remove(self.FILE_NAME)
+
+    def _logic(self):
+        logic = nova_logica()
+        logic.cache_disco = SidecarCache(diretorio=self.diretorio, ativo=True)
+        return logic
+
+    def test_second_session_reads_sidecar(self):
+        """A new ADCLogic (empty memory cache) loads the sheet from the sidecar, identically."""
+        original = self._logic().carregar_planilha(self.FILE_NAME, aba="")
+
+        logs = []
+        recarregado = self._logic().carregar_planilha(self.FILE_NAME, aba="", log_callback=logs.append)
+
+        self.assertTrue(any("cache em disco" in m for m in logs), logs)
+        pd.testing.assert_frame_equal(original, recarregado)
+        self.assertEqual([type(v) for v in original['Preco']], [type(v) for v in recarregado['Preco']])
+
+    def test_size_limit_evicts_files(self):
+        """Files beyond limite_bytes are removed, oldest first."""
+        logic = self._logic()
+        logic.carregar_planilha(self.FILE_NAME, aba="Vendas")
+        logic.cache_disco.limite_bytes = 0
+        logic.cache_disco.aplicar_limite()
+        self.assertEqual(os.listdir(self.diretorio), [])
+
+    def test_eviction_keeps_index_and_file_being_written(self):
+        """hashes.json and the sidecar just written survive eviction; older sidecars go first."""
+        cache = SidecarCache(diretorio=self.diretorio, ativo=True)
+        cache.hash_arquivo(self.FILE_NAME)
+        cache.salvar_hashes()
+        df = pd.DataFrame({"a": range(1000)})
+        cache.gravar(self.FILE_NAME, "Antiga", df)
+        antigo = cache._caminho_aba(self.FILE_NAME, "Antiga")
+        os.utime(antigo, (1, 1))
+        os.utime(os.path.join(self.diretorio, "hashes.json"), (0, 0))  # o mais antigo de todos
+
+        cache.limite_bytes = 0
+        self.assertTrue(cache.gravar(self.FILE_NAME, "Nova", df))
+        self.assertEqual(sorted(os.listdir(self.diretorio)),
+                         sorted(["hashes.json", os.path.basename(cache._caminho_aba(self.FILE_NAME, "Nova"))]))
+        pd.testing.assert_frame_equal(cache.ler(self.FILE_NAME, "Nova"), df)
+        self.assertEqual(cache.aplicar_limite(), 1)  # fora da gravacao so o indice fica
+        self.assertEqual(os.listdir(self.diretorio), ["hashes.json"])
+
+
+class TestResumoMulti(unittest.TestCase):
+    """Parallel multi-file summary must match the sequential per-file path exactly."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.diretorio = tempfile.mkdtemp()
+        cls.arquivos = []
+        rng = np.random.default_rng(7)
+        for n in range(3):
+            df = pd.DataFrame({f"col_{i}": range(20) for i in range(27)})
+            df["col_1"] = rng.integers(0, 12, 20)  # IDs repetidos entre arquivos
+            df["col_25"] = rng.integers(1, 5, 20)
+            df["col_26"] = [f"R$ {v:.2f}".replace(".", ",") for v in rng.uniform(1, 300, 20)]
+            caminho = os.path.join(cls.diretorio, f"multi_{n}.xlsx")
+            df.to_excel(caminho, index=False)
+            cls.arquivos.append(caminho)
+        # Arquivo com colunas insuficientes -> erro parcial, sem derrubar o lote
+        cls.arquivos.append(os.path.join(cls.diretorio, "estreito.xlsx"))
+        pd.DataFrame({"A": [1, 2]}).to_excel(cls.arquivos[-1], index=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.diretorio, ignore_errors=True)
+
+    def _sequencial(self):
+        logic = nova_logica()
+        pedidos, itens, valor, erros = set(), 0, 0.0, 0
+        for arquivo in self.arquivos:
+            res = logic.gerar_resumo(arquivo, "", manter_df=True)
+            if 'erro' in res:
+                erros += 1
+                continue
+            pedidos.update(res['df'].iloc[:, 1].dropna().unique())
+            itens += res['total_itens']
+            valor += res['valor_total']
+        return pedidos, itens, valor, erros
+
+    def test_parallel_matches_sequential(self):
+        """Process pool totals equal the sequential loop, bit for bit."""
+        pedidos, itens, valor, erros = self._sequencial()
+        progresso = []
+        res = nova_logica().gerar_resumo_multi(
+            self.arquivos, workers=2, progress_callback=lambda c, t, p: progresso.append((c, t)))
+
+        self.assertEqual(len(res['pedidos']), len(pedidos))
+        self.assertTrue(all(p in res['pedidos'] for p in pedidos))
+        self.assertEqual(res['total_pedidos'], len(pedidos))
+        self.assertEqual(res['total_itens'], itens)
+        self.assertEqual(res['valor_total'], valor)
+        self.assertEqual(len(res['erros']), erros)
+        self.assertEqual(res['arquivos_ok'], len(self.arquivos) - erros)
+        self.assertEqual([p['arquivo'] for p in res['parciais']], self.arquivos)
+        self.assertEqual(progresso, [(i, len(self.arquivos)) for i in range(1, len(self.arquivos) + 1)])
+
+    def test_single_worker_runs_in_process(self):
+        """workers=1 uses the caller's instance (and its workbook cache)."""
+        logic = nova_logica()
+        res = logic.gerar_resumo_multi(self.arquivos[:2], workers=1)
+        self.assertEqual(res['arquivos_ok'], 2)
+        self.assertGreater(len(logic.cache_excel), 0)
+
+    def test_incremental_reuses_unchanged_files(self):
+        """Unchanged files come from the stored partials; an edited file is summarized again."""
+        diretorio = tempfile.mkdtemp()
+        try:
+            arquivos = [shutil.copy(a, diretorio) for a in self.arquivos]
+
+            def nova_sessao():
+                logic = ADCLogic()
+                logic.cache_disco = SidecarCache(diretorio=os.path.join(diretorio, "cache"))
+                return logic
+
+            primeiro = nova_sessao().gerar_resumo_multi(arquivos, workers=1)
+            self.assertEqual(primeiro['reaproveitados'], 0)
+
+            # Nova sessao: hashes vem do indice salvo, parciais do disco
+            logic = nova_sessao()
+            segundo = logic.gerar_resumo_multi(arquivos, workers=1)
+            self.assertEqual(segundo['reaproveitados'], 3)  # o arquivo com erro e recalculado
+            self.assertFalse(logic.cache_disco._hashes_alterados)
+            for chave in ('total_pedidos', 'total_itens', 'valor_total', 'erros'):
+                self.assertEqual(segundo[chave], primeiro[chave])
+
+            pd.DataFrame({f"col_{i}": [99] * 5 for i in range(27)}).to_excel(arquivos[1], index=False)
+            terceiro = nova_sessao().gerar_resumo_multi(arquivos, workers=1)
+            self.assertEqual(terceiro['reaproveitados'], 2)
+            self.assertFalse(terceiro['parciais'][1].get('em_cache'))
+            self.assertIn(99, terceiro['pedidos'])
+        finally:
+            shutil.rmtree(diretorio, ignore_errors=True)
+
+
+class TestAcumuladorPedidos(unittest.TestCase):
+    """Compact distinct-order counting must agree with a Python set."""
+
+    def test_exact_matches_set_semantics(self):
+        """Mixed ID types count like a set: 1 == 1.0 == True, "1" is another order."""
+        lotes = [np.array([1, 2, 3]), np.array([1.0, 2.5, np.nan]),
+                 np.array(["1", "a", "a", None], dtype=object),
+                 np.array([True, 7, "b", 2.5, pd.Timestamp("2024-01-01"), 2 ** 70], dtype=object),
+                 pd.array(["a", "z"], dtype="str")]
+        esperado = set()
+        acumulador = AcumuladorPedidos()
+        for lote in lotes:
+            esperado.update(v for v in np.asarray(lote) if not pd.isna(v))
+            acumulador.adicionar(lote)
+        self.assertEqual(len(acumulador), len(esperado))
+        self.assertTrue(all(v in acumulador for v in esperado))
+        self.assertNotIn("zz", acumulador)
+
+        # Lotes grandes: fusao preguicosa + combinar
+        rng = np.random.default_rng(3)
+        lotes = [rng.integers(0, 500_000, 100_000) for _ in range(6)]
+        outro = AcumuladorPedidos()
+        for lote in lotes[3:]:
+            outro.adicionar(lote)
+        acumulador = AcumuladorPedidos()
+        for lote in lotes[:3]:
+            acumulador.adicionar(lote)
+        acumulador.combinar(outro)
+        self.assertEqual(len(acumulador), len(set(np.concatenate(lotes).tolist())))
+
+    def test_approximate_mode(self):
+        """HyperLogLog stays within a few percent and counts small sets exactly."""
+        pequeno = AcumuladorPedidos(aproximado=True)
+        pequeno.adicionar(np.arange(10))
+        self.assertEqual(len(pequeno), 10)
+
+        grande = AcumuladorPedidos(aproximado=True)
+        for inicio in range(0, 1_000_000, 250_000):
+            grande.adicionar(np.arange(inicio, inicio + 300_000))
+            grande.adicionar(np.array([f"PED-{i}" for i in range(inicio, inicio + 1000)], dtype=object))
+        self.assertLess(abs(len(grande) - 1_054_000) / 1_054_000, 0.03)
+        with self.assertRaises(TypeError):
+            5 in grande
+
+
+class TestRankingSKU(unittest.TestCase):
+    """Top SKUs: normalized keys, exact cross-file merge, chunked equals whole."""
+
+    def test_normalization_and_cross_file_merge(self):
+        """"abc 12" == "ABC12"; a SKU that is never 1st per file can win overall."""
+        self.assertEqual(list(normalizar_sku(["abc 12", " ABC12", "", None]).isna()), [False, False, True, True])
+        self.assertEqual(normalizar_sku(["abc 12"])[0], normalizar_sku(["ABC\t12 "])[0])
+
+        tabelas = []
+        for arquivo in range(3):
+            ranking = RankingSKU()
+            # "X" tem 2 pedidos por arquivo; o lider de cada arquivo tem 3, mas so aparece nele
+            skus = [f"L{arquivo}"] * 3 + ["x", "X "]
+            pedidos = [f"{arquivo}-1", f"{arquivo}-2", f"{arquivo}-3", f"{arquivo}-1", f"{arquivo}-2"]
+            ranking.adicionar(skus, pedidos, np.ones(5), np.full(5, 10.0))
+            tabelas.append(ranking.tabela())
+            self.assertEqual(top_skus(tabelas[-1], 1)[0]["sku"], f"L{arquivo}")
+        topo = top_skus(combinar_rankings(tabelas), 2)
+        self.assertEqual(topo[0], {"sku": "x", "pedidos": 6, "quantidade": 6.0, "receita": 60.0})
+        self.assertEqual(topo[1]["sku"], "L0")  # empate: primeira aparicao
+        self.assertEqual(top_skus(combinar_rankings(tabelas), 1, por="receita")[0]["sku"], "x")
+        self.assertIsNone(combinar_rankings([None]))
+        with self.assertRaises(ValueError):
+            top_skus(tabelas[0], por="preco")
+
+    def test_summary_ranking_chunked_and_multi(self):
+        """gerar_resumo ranks by the "SKU" header, the same in chunks; multi merges files."""
+        diretorio = tempfile.mkdtemp()
+        try:
+            rng = np.random.default_rng(11)
+            arquivos = []
+            for n in range(2):
+                df = pd.DataFrame({f"col_{i}": range(60) for i in range(27)})
+                df = df.rename(columns={"col_5": "SKU Produto"})
+                df["col_1"] = rng.integers(0, 20, 60)
+                df["SKU Produto"] = rng.choice(["ab 1", "AB1", "c2", "d3", None], 60)
+                df["col_25"] = rng.integers(1, 4, 60)
+                df["col_26"] = [f"R$ {v:.2f}".replace(".", ",") for v in rng.uniform(1, 50, 60)]
+                arquivos.append(os.path.join(diretorio, f"ranking_{n}.xlsx"))
+                df.to_excel(arquivos[-1], index=False)
+
+            inteiro = nova_logica().gerar_resumo(arquivos[0], "", linhas_por_bloco=0)["ranking"]
+            em_blocos = nova_logica().gerar_resumo(arquivos[0], "", linhas_por_bloco=7)["ranking"]
+            pd.testing.assert_frame_equal(em_blocos.sort_index(), inteiro.sort_index())
+
+            df = pd.read_excel(arquivos[0])
+            df["chave"] = normalizar_sku(df["SKU Produto"]).to_numpy()
+            self.assertEqual(int(inteiro.loc["ab1", "pedidos"]), df.loc[df["chave"] == "ab1", "col_1"].nunique())
+            self.assertEqual(float(inteiro.loc["ab1", "quantidade"]), float(df.loc[df["chave"] == "ab1", "col_25"].sum()))
+
+            res = nova_logica().gerar_resumo_multi(arquivos, workers=1, top_n=2)
+            esperado = top_skus(combinar_rankings([p["ranking"] for p in res["parciais"]]), 2)
+            self.assertEqual(res["ranking"], esperado)
+            self.assertEqual(len(res["ranking"]), 2)
+            self.assertIsNone(nova_logica().gerar_resumo(arquivos[0], "", ranking=False)["ranking"])
+
+            # Parciais no cache de disco guardam a tabela por SKU
+            for _ in range(2):
+                logic = nova_logica()
+                logic.cache_disco = SidecarCache(diretorio=os.path.join(diretorio, "cache"))
+                do_cache = logic.gerar_resumo_multi(arquivos, workers=1, top_n=2)
+            self.assertEqual(do_cache["reaproveitados"], 2)
+            self.assertEqual(do_cache["ranking"], esperado)
+        finally:
+            shutil.rmtree(diretorio, ignore_errors=True)
+
+
+class TestGraficos(unittest.TestCase):
+    """Dashboard charts: cached by data fingerprint, rendered with Agg off the UI thread."""
+
+    RESULTADO = {
+        "ranking": [{"sku": "AB1", "pedidos": 9, "quantidade": 12.0, "receita": 90.0}],
+        "parciais": [{"arquivo": os.path.join("x", "jan.xlsx"), "valor_total": 10.5},
+                     {"arquivo": "fev.xlsx", "erro": "falhou"}],
+    }
+
+    def test_cache_by_fingerprint(self):
+        """Same data/mode/theme reuse one image; any change is a new key; LRU evicts."""
+        dados = graficos.dados_graficos(self.RESULTADO)
+        self.assertEqual(dados, {"top_skus": [("AB1", 9)], "arquivos": [("jan.xlsx", 10.5)]})
+        chave = graficos.impressao_digital(dados, "normal", {"base": "#000"})
+        self.assertEqual(chave, graficos.impressao_digital(graficos.dados_graficos(self.RESULTADO), "normal", {"base": "#000"}))
+        self.assertNotEqual(chave, graficos.impressao_digital(dados, "tela_cheia", {"base": "#000"}))
+        self.assertNotEqual(chave, graficos.impressao_digital({**dados, "top_skus": [("AB1", 8)]}, "normal", {"base": "#000"}))
+
+        cache = graficos.CacheGraficos(limite=2)
+        chamadas = []
+        for _ in range(3):
+            self.assertEqual(cache.obter_ou_renderizar(chave, lambda: chamadas.append(1) or b"png"), b"png")
+        self.assertEqual((len(chamadas), cache.renderizados), (1, 1))
+        cache.guardar("b", b"2")
+        cache.obter(chave)  # chave vira a mais recente
+        cache.guardar("c", b"3")
+        self.assertIn(chave, cache)
+        self.assertNotIn("b", cache)
+
+    @unittest.skipUnless(graficos.disponivel(), "matplotlib nao instalado")
+    def test_render_png_in_thread(self):
+        """Agg rendering works from a worker thread and returns a PNG."""
+        import threading
+        dados = graficos.dados_graficos(self.RESULTADO)
+        saida = {}
+        thread = threading.Thread(target=lambda: saida.update(png=graficos.renderizar_png(dados, "normal")))
+        thread.start()
+        thread.join()
+        self.assertTrue(saida["png"].startswith(b"\x89PNG"))
+        self.assertTrue(graficos.renderizar_png({"top_skus": [], "arquivos": []}).startswith(b"\x89PNG"))
+
+    def test_single_worker_drops_superseded_requests(self):
+        """One render thread; requests replaced while waiting, and stale warm-ups, are never drawn."""
+        import threading
+        cache = graficos.CacheGraficos()
+        renderizador = graficos.RenderizadorGraficos(cache)
+        liberar, desenhados, threads, mostrados = threading.Event(), [], set(), []
+
+        def render(nome, esperar=False):
+            def _render():
+                threads.add(threading.current_thread().name)
+                if esperar:
+                    liberar.wait(5)
+                desenhados.append(nome)
+                return nome.encode()
+            return _render
+
+        renderizador.pedir("a", render("a", esperar=True), mostrados.append, aquecer=[("a2", render("a2"))])
+        while not threads:
+            time.sleep(0.01)  # "a" em desenho
+        for nome in ("b", "c", "d"):
+            renderizador.pedir(nome, render(nome), mostrados.append)
+        liberar.set()
+        self.assertTrue(renderizador.aguardar(5))
+
+        self.assertEqual(desenhados, ["a", "d"])  # b e c substituidos; aquecimento de a pulado
+        self.assertEqual(mostrados, [b"a", b"d"])
+        self.assertEqual((renderizador.descartados, cache.renderizados, len(threads)), (2, 2, 1))
+
+        renderizador.pedir("d", render("d"), mostrados.append, aquecer=[("e", render("e"))])
+        self.assertTrue(renderizador.aguardar(5))
+        self.assertEqual(desenhados, ["a", "d", "e"])  # "d" veio do cache; "e" aquecido
+        self.assertEqual(len(threads), 1)
+
+        erros = []
+        renderizador.pedir("f", lambda: 1 / 0, ao_falhar=erros.append)
+        self.assertTrue(renderizador.aguardar(5))
+        self.assertIsInstance(erros[0], ZeroDivisionError)
+
+
+class TestTempoInicio(unittest.TestCase):
+    """Startup timing: own import time per package; the window module imports nothing heavy."""
+
+    def test_import_breakdown(self):
+        """A package's time excludes the packages it imports; __import__ is restored."""
+        import builtins
+        diretorio = tempfile.mkdtemp()
+        original = builtins.__import__
+        try:
+            with open(os.path.join(diretorio, "adc_lento_filho.py"), "w") as f:
+                f.write("import time\ntime.sleep(0.2)\n")
+            with open(os.path.join(diretorio, "adc_lento_pai.py"), "w") as f:
+                f.write("import time\nimport adc_lento_filho\ntime.sleep(0.1)\n")
+            sys.path.insert(0, diretorio)
+            from core.inicio import TempoInicio
+            tempo = TempoInicio().instalar()
+            import adc_lento_pai  # noqa: F401
+            tempo.etapa("pai")
+            tempo.remover()
+            self.assertIs(builtins.__import__, original)
+            self.assertAlmostEqual(tempo.pacotes["adc_lento_filho"], 0.2, delta=0.08)
+            self.assertAlmostEqual(tempo.pacotes["adc_lento_pai"], 0.1, delta=0.08)
+            relatorio = tempo.relatorio()
+            self.assertEqual(relatorio["imports"][0]["pacote"], "adc_lento_filho")
+            self.assertEqual(relatorio["etapas"][0]["etapa"], "pai")
+            self.assertIn("adc_lento_pai", tempo.texto())
+        finally:
+            builtins.__import__ = original
+            sys.path.remove(diretorio)
+            for modulo in ("adc_lento_pai", "adc_lento_filho"):
+                sys.modules.pop(modulo, None)
+            shutil.rmtree(diretorio, ignore_errors=True)
+
+    def test_janela_sem_imports_pesados(self):
+        """Importing the main window does not load pandas, the core or the pages."""
+        import subprocess
+        codigo = ("import sys; sys.path.insert(0, 'src'); import gui.main_window; "
+                  "print([m for m in ('pandas', 'numpy', 'core.cleaner', 'gui.pages.cleaner') if m in sys.modules])")
+        saida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True)
+        self.assertEqual(saida.stdout.strip(), "[]")
+
+
+class TestAgendadorTarefas(unittest.TestCase):
+    """Background jobs: progress events, cancellation before and during a run, errors."""
+
+    FILE_NAME = "test_tarefas.xlsx"
+
+    @classmethod
+    def setUpClass(cls):
+        df = pd.DataFrame({f"col_{i}": range(i, i + 100) for i in range(4)})
+        df.to_excel(cls.FILE_NAME, index=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.exists(cls.FILE_NAME):
+            os.remove(cls.FILE_NAME)
+
+    def setUp(self):
+        from core.tarefas import AgendadorTarefas
+        self.agendador = AgendadorTarefas()
+        self.eventos = []
+        self.agendador.inscrever(self.eventos.append)
+
+    def tearDown(self):
+        self.agendador.encerrar(aguardar=True)
+
+    def test_progress_and_result(self):
+        """Events arrive in order; tiny progress steps are dropped; the result is kept."""
+        def trabalho(ctx, n):
+            for i in range(n + 1):
+                ctx.progresso(i * 100 / n, "contando")
+            ctx.log("fim")
+            return n
+
+        tarefa = self.agendador.submeter(trabalho, 1000, nome="contagem")
+        self.assertEqual(tarefa.aguardar(timeout=5), 1000)
+        tipos = [e["tipo"] for e in self.eventos]
+        self.assertEqual(tipos[0], "inicio")
+        self.assertEqual(tipos[-2:], ["log", "concluida"])
+        self.assertLessEqual(tipos.count("progresso"), 201)
+        self.assertEqual(tarefa.estado, "concluida")
+        self.assertEqual(self.eventos[-1]["percentual"], 100.0)
+        self.assertEqual(self.agendador.tarefas_ativas(), [])
+
+    def test_cancel_pending_and_running(self):
+        """A running job stops at its next checkpoint; a queued one never starts."""
+        from core.tarefas import TarefaCancelada
+        import threading
+        comecou = threading.Event()
+        executadas = []
+
+        def longa(ctx):
+            comecou.set()
+            while True:
+                ctx.verificar()
+                time.sleep(0.01)
+
+        primeira = self.agendador.submeter(longa, nome="longa")
+        segunda = self.agendador.submeter(lambda ctx: executadas.append(1), nome="fila")
+        self.assertTrue(comecou.wait(5))
+        segunda.cancelar()
+        primeira.cancelar()
+        with self.assertRaises(TarefaCancelada):
+            primeira.aguardar(timeout=5)
+        with self.assertRaises(TarefaCancelada):
+            segunda.aguardar(timeout=5)
+        self.assertEqual((primeira.estado, segunda.estado), ("cancelada", "cancelada"))
+        self.assertEqual(executadas, [])
+
+    def test_cancel_chunked_cleaning(self):
+        """processar_limpeza in chunks stops between chunks when the job is cancelled."""
+        from core.tarefas import TarefaCancelada
+        logic = nova_logica()
+        percentuais = []
+
+        def limpeza(ctx):
+            def progresso(percentual, mensagem=None):
+                percentuais.append(percentual)
+                if len(percentuais) == 3:
+                    ctx.tarefa.cancelar()
+                ctx.progresso(percentual, mensagem)
+            return logic.processar_limpeza(self.FILE_NAME, "", [], {}, ctx.log,
+                                           linhas_por_bloco=10, progress_callback=progresso)
+
+        tarefa = self.agendador.submeter(limpeza)
+        with self.assertRaises(TarefaCancelada):
+            tarefa.aguardar(timeout=10)
+        self.assertEqual(len(percentuais), 3)
+        self.assertEqual(percentuais[:2], [2, 5])
+
+    def test_cleaning_progress_reaches_end(self):
+        """Chunk progress grows with the rows read (estimated from the sheet dimension)."""
+        percentuais = []
+        df = nova_logica().processar_limpeza(self.FILE_NAME, "", [], {}, linhas_por_bloco=25,
+                                             progress_callback=lambda p, m=None: percentuais.append(p))
+        self.assertEqual(len(df), 100)
+        blocos = [p for p in percentuais if p is not None][2:-1]
+        self.assertEqual(len(blocos), 4)
+        self.assertEqual(blocos, sorted(blocos))
+        self.assertAlmostEqual(blocos[-1], 95.0)
+
+    def test_error_state(self):
+        """An exception in the job becomes the 'erro' state and is re-raised by aguardar."""
+        def falha(ctx):
+            raise ValueError("planilha invalida")
+
+        tarefa = self.agendador.submeter(falha)
+        with self.assertRaises(ValueError):
+            tarefa.aguardar(timeout=5)
+        self.assertEqual(tarefa.estado, "erro")
+        self.assertEqual(self.eventos[-1]["tipo"], "erro")
+
+    def test_exit_does_not_wait_for_running_job(self):
+        """Closing the app (encerrar + encerrar_workers) exits at once, even mid-call or mid-file."""
+        import subprocess
+        codigo = """
+import sys, threading, time
+sys.path.insert(0, 'src')
+import core.multi as multi
+from core.tarefas import AgendadorTarefas
+
+def lento(*args, **kwargs):
+    time.sleep(30)
+
+multi.resumo_parcial = lento
+comecou = threading.Event()
+agendador = AgendadorTarefas()
+agendador.submeter(lambda ctx: (comecou.set(), time.sleep(30)))  # sem ponto de cancelamento
+if sys.argv[1] == 'pool':
+    agendador = AgendadorTarefas()
+    agendador.submeter(lambda ctx: multi._executar_resumos(['a', 'b'], 2, '', None, None))
+comecou.wait(5)
+time.sleep(1)  # arquivos em leitura nos processos worker
+agendador.encerrar(cancelar=True)
+multi.encerrar_workers()
+"""
+        for modo in ("thread", "pool"):
+            inicio = time.perf_counter()
+            subprocess.run([sys.executable, "-c", codigo, modo], capture_output=True, timeout=60, check=True)
+            self.assertLess(time.perf_counter() - inicio, 10, modo)
+
+
+class TestCanalLog(unittest.TestCase):
+    """Log channel: batched drain, bounded buffer, rotating file mirror."""
+
+    def test_drain_in_order_from_threads(self):
+        """Lines from several threads all arrive, each thread's in order, in one drain."""
+        import threading
+        from core.registro import CanalLog
+        canal = CanalLog(limite=10_000)
+        threads = [threading.Thread(target=lambda t=t: [canal(f"{t}:{i}") for i in range(1000)]) for t in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        linhas = canal.drenar()
+        self.assertEqual(len(linhas), 4000)
+        for t in range(4):
+            self.assertEqual([l for l in linhas if l.startswith(f"{t}:")], [f"{t}:{i}" for i in range(1000)])
+        self.assertEqual(canal.drenar(), [])
+
+    def test_ring_buffer_drops_oldest(self):
+        """Beyond the limit the oldest lines go, and the next drain says how many."""
+        from core.registro import CanalLog
+        canal = CanalLog(limite=3)
+        for i in range(10):
+            canal.publicar(f"linha {i}")
+        self.assertEqual(canal.drenar(), ["[INFO] 7 mensagens antigas omitidas", "linha 7", "linha 8", "linha 9"])
+        canal.publicar("nova")
+        self.assertEqual(canal.drenar(), ["nova"])
+
+    def test_rotating_file(self):
+        """Every line reaches the file, which rotates at the size limit."""
+        from core.registro import CanalLog, arquivo_rotativo
+        diretorio = tempfile.mkdtemp()
+        try:
+            caminho = os.path.join(diretorio, "sub", "adc.log")
+            arquivo = arquivo_rotativo(caminho, max_kb=1, backups=2)
+            self.assertIs(arquivo_rotativo(caminho), arquivo)
+            canal = CanalLog(limite=5, arquivo=arquivo)
+            for i in range(100):
+                canal.publicar(f"[INFO] bloco {i:03d} processado")
+            for handler in arquivo.handlers:
+                handler.flush()
+            self.assertTrue(os.path.exists(caminho + ".1"))
+            self.assertFalse(os.path.exists(caminho + ".3"))
+            with open(caminho, encoding="utf-8") as f:
+                self.assertIn("bloco 099", f.read().splitlines()[-1])
+        finally:
+            for handler in list(arquivo.handlers):
+                handler.close()
+            shutil.rmtree(diretorio, ignore_errors=True)
+
+
+class TestPerfilExecucao(unittest.TestCase):
+    """Stage profiling: nested stages, summed chunks, rows in/out, JSON and cProfile output."""
+
+    FILE_NAME = "test_perfil.xlsx"
+
+    @classmethod
+    def setUpClass(cls):
+        df = pd.DataFrame({f"col_{i}": [i % 3] * 60 for i in range(28)})
+        df["col_1"] = list(range(30)) * 2  # 30 linhas duplicadas
+        df.to_excel(cls.FILE_NAME, index=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.exists(cls.FILE_NAME):
+            os.remove(cls.FILE_NAME)
+
+    def test_stages_of_cleaning(self):
+        """Load, filter and duplicate stages nest under processar_limpeza with their rows."""
+        logic = nova_logica()
+        logs = []
+        opcoes = {"remover_duplicadas": True, "remover_vazias": True}
+        with logic.perfilar(logs.append) as perfil:
+            df = logic.processar_limpeza(self.FILE_NAME, "", [], opcoes, linhas_por_bloco=0)
+        self.assertIsNone(logic.perfil)
+        etapas = {e["caminho"]: e for e in perfil.relatorio()["etapas"]}
+        self.assertEqual(list(etapas)[0], "processar_limpeza")
+        self.assertEqual(etapas["processar_limpeza > carregar_planilha"]["linhas_saida"], 60)
+        duplicatas = etapas["processar_limpeza > duplicatas"]
+        self.assertEqual((duplicatas["linhas_entrada"], duplicatas["linhas_saida"]), (60, len(df)))
+        self.assertEqual(etapas["processar_limpeza"]["linhas_saida"], 30)
+        raiz = etapas["processar_limpeza"]
+        self.assertLessEqual(raiz["proprio"], raiz["segundos"])
+        self.assertIn("Perfil da execucao", logs[-1])
+
+    def test_chunks_summed_and_files_written(self):
+        """Chunked summary: one line per stage with summed calls; report and cProfile saved."""
+        import json
+        import pstats
+        diretorio = tempfile.mkdtemp()
+        try:
+            logic = nova_logica()
+            relatorio, estatisticas = os.path.join(diretorio, "perfil.json"), os.path.join(diretorio, "run.prof")
+            with logic.perfilar(caminho=relatorio, cprofile=estatisticas, memoria=False):
+                logic.gerar_resumo(self.FILE_NAME, "", linhas_por_bloco=20)
+            with open(relatorio, encoding="utf-8") as f:
+                dados = json.load(f)
+            etapas = {e["caminho"]: e for e in dados["etapas"]}
+            self.assertEqual(etapas["gerar_resumo > conversao_numerica"]["chamadas"], 3)
+            self.assertEqual(etapas["gerar_resumo > conversao_numerica"]["linhas_entrada"], 60)
+            self.assertEqual(etapas["gerar_resumo"]["linhas_saida"], 30)
+            self.assertGreater(pstats.Stats(estatisticas).total_calls, 0)
+        finally:
+            shutil.rmtree(diretorio, ignore_errors=True)
+
+    def test_off_by_default(self):
+        """Without perfilar nothing is recorded and the no-op stage accepts row counts."""
+        from core.perfil import ETAPA_NULA, medir
+        with medir(None, "qualquer", 10) as etapa:
+            etapa.linhas_saida = 5
+        self.assertIs(etapa, ETAPA_NULA)
+        self.assertIsNone(nova_logica().perfil)
+
+
+class TestPlanilhasSinteticas(unittest.TestCase):
+    """Benchmark workbook generator: export layout and totals the summary must reproduce."""
+
+    def test_generated_workbook_matches_summary(self):
+        """40 columns, repeated order IDs, duplicates; gerar_resumo gives the expected totals."""
+        sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+        try:
+            from planilhas_sinteticas import gerar_itens_mais_vendidos, salvar_planilha_sintetica
+        finally:
+            sys.path.pop(0)
+        df, esperado = gerar_itens_mais_vendidos(800, seed=7)
+        self.assertEqual(df.shape, (800, 40))
+        self.assertLess(esperado["total_pedidos"], 800)
+        self.assertLess(esperado["linhas_unicas"], 800)
+        self.assertTrue(df.iloc[:, 26].dropna().astype(str).str.startswith("R$ ").any())
+        diretorio = tempfile.mkdtemp()
+        try:
+            caminho = salvar_planilha_sintetica(df, os.path.join(diretorio, "itens.xlsx"))
+            resumo = nova_logica().gerar_resumo(caminho, "")
+            self.assertEqual(resumo["total_pedidos"], esperado["total_pedidos"])
+            self.assertEqual(resumo["total_itens"], esperado["total_itens"])
+            self.assertAlmostEqual(resumo["valor_total"], esperado["valor_total"], places=4)
+            limpo = nova_logica().processar_limpeza(caminho, "", [], {"remover_duplicadas": True, "remover_vazias": True})
+            self.assertEqual(len(limpo), esperado["linhas_unicas"])
+        finally:
+            shutil.rmtree(diretorio, ignore_errors=True)
+
+
+class TestOtimizacaoTipos(unittest.TestCase):
+    """Post-load dtypes: categories, integer downcast and hinted BR/US numbers, values unchanged."""
+
+    def setUp(self):
+        n = 2000
+        self.df = pd.DataFrame({
+            "status": ["Pago", "Enviado", "Entregue", None] * (n // 4),
+            "pedido": [f"PED-{i}" for i in range(n)],
+            "estoque": np.arange(n, dtype=np.int64),
+            "qtd": ["1", "2", 3, None] * (n // 4),
+            "preco": ["R$ 1.234,56", "0,1", 7.5, "R$ 99.999,99"] * (n // 4),
+            "codigo": ["00123", "00456", "00789", "01000"] * (n // 4),
+        })
+
+    def test_categories_and_downcast(self):
+        """Low-cardinality text becomes category, ints shrink, the loaded frame is untouched."""
+        mensagens = []
+        otimizado = nova_logica().otimizar_tipos(self.df, log_callback=mensagens.append)
+        self.assertIsInstance(otimizado["status"].dtype, pd.CategoricalDtype)
+        self.assertNotIsInstance(otimizado["pedido"].dtype, pd.CategoricalDtype)
+        self.assertEqual(otimizado["estoque"].dtype, np.int16)
+        self.assertEqual(self.df["estoque"].dtype, np.int64)
+        self.assertNotIsInstance(self.df["status"].dtype, pd.CategoricalDtype)
+        pd.testing.assert_series_equal(otimizado["status"].astype(self.df["status"].dtype), self.df["status"])
+        self.assertTrue(any("Tipos otimizados" in m and "MB" in m for m in mensagens))
+        self.assertLess(otimizado.memory_usage(deep=True).sum(), self.df.memory_usage(deep=True).sum())
+
+    def test_hints_parse_numbers_by_letter(self):
+        """Hinted columns (Excel letters) are parsed BR-style; float32 is written back exactly."""
+        mensagens = []
+        otimizado = nova_logica().otimizar_tipos(
+            self.df, {"D": "inteiro", "E": "decimal", "F": "inteiro", "A": "texto"}, mensagens.append)
+        self.assertEqual(otimizado["qtd"].dtype, np.float32)  # celulas vazias
+        self.assertEqual(otimizado["qtd"].iloc[:3].tolist(), [1.0, 2.0, 3.0])
+        self.assertEqual(otimizado["preco"].dtype, np.float32)
+        esperado = converter_serie_numerica(self.df["preco"])
+        np.testing.assert_array_equal(converter_serie_numerica(otimizado["preco"]), esperado)
+        # Codigos com zero a esquerda continuam texto; "texto" nao vira categoria
+        self.assertEqual(otimizado["codigo"].tolist(), self.df["codigo"].tolist())
+        self.assertTrue(any("'codigo'" in m and "[WARNING]" in m for m in mensagens))
+        self.assertNotIsInstance(otimizado["status"].dtype, pd.CategoricalDtype)
+        with self.assertRaises(ValueError):
+            nova_logica().otimizar_tipos(self.df, {"E": "moeda"})
+
+        diretorio = tempfile.mkdtemp()
+        try:
+            caminho = nova_logica().salvar_planilha(otimizado, os.path.join(diretorio, "saida.xlsx"))
+            lido = pd.read_excel(caminho)
+            self.assertEqual(lido["preco"].iloc[:4].tolist(), [1234.56, 0.1, 7.5, 99999.99])
+        finally:
+            shutil.rmtree(diretorio, ignore_errors=True)
+
+    def test_chunked_cleaning_matches_whole_sheet(self):
+        """A duplicate split across chunks is removed even when a chunk needs a wider dtype."""
+        df = pd.DataFrame({"loja": ["x", "y", "x", "w"],
+                           "preco": ["0,1", "2", "0,1", "R$ 123.456.789,12"],  # ultimo nao cabe em float32
+                           "qtd": ["1", "2", "1", None]})                       # vazio so no 2o bloco
+        diretorio = tempfile.mkdtemp()
+        try:
+            caminho = os.path.join(diretorio, "blocos.xlsx")
+            df.to_excel(caminho, index=False)
+            for dicas in ({"B": "decimal"}, {"C": "inteiro"}):
+                for modo in ("linha", "hash"):
+                    opcoes = {"remover_duplicadas": True, "modo_duplicadas": modo, "tipos_colunas": dicas}
+                    inteira = nova_logica().processar_limpeza(caminho, "", [], opcoes, linhas_por_bloco=0)
+                    em_blocos = nova_logica().processar_limpeza(caminho, "", [], opcoes, linhas_por_bloco=2)
+                    self.assertEqual(len(inteira), 3)
+                    pd.testing.assert_frame_equal(em_blocos, inteira, check_dtype=False)
+        finally:
+            shutil.rmtree(diretorio, ignore_errors=True)
+
+    def test_later_frames_follow_first_plan(self):
+        """Dtypes are decided on the first frame; later frames reuse them or widen losslessly."""
+        from core.tipos import OtimizadorTipos
+        otimizador = OtimizadorTipos({"A": "decimal", "B": "inteiro"})
+        primeiro = otimizador.otimizar(pd.DataFrame({"a": ["1,5", "2"], "b": ["1", "2"]}))
+        self.assertEqual((primeiro["a"].dtype, primeiro["b"].dtype), (np.float32, np.int8))
+        segundo = otimizador.otimizar(pd.DataFrame({"a": ["3,25", "4"], "b": ["300", "4"]}))
+        self.assertEqual(segundo["a"].dtype, np.float32)
+        self.assertEqual(segundo["b"].tolist(), [300, 4])
+        self.assertEqual(otimizador.alargadas, {"b": "int8"})
+
+    def test_filters_on_optimized_frame(self):
+        """Text search sees category columns; duplicates and the summary parser agree."""
+        logic = nova_logica()
+        otimizado = logic.otimizar_tipos(self.df, {"E": "decimal"})
+        self.assertEqual(len(logic.filtro_por_texto(otimizado, "enviado")), 500)
+        self.assertEqual(len(logic.filtro_por_texto(otimizado, "entr", prefixo=True)), 500)
+        original = logic.aplicar_filtros_adicionais(self.df, {"remover_duplicadas": True,
+                                                             "chave_duplicadas": ["status", "codigo"]})
+        compacto = logic.aplicar_filtros_adicionais(otimizado, {"remover_duplicadas": True,
+                                                               "chave_duplicadas": ["status", "codigo"]})
+        self.assertEqual(list(original.index), list(compacto.index))
+        logic.tipos["ativo"] = False
+        self.assertIs(logic.otimizar_tipos(self.df), self.df)
+
+
+class TestResumoEnxuto(unittest.TestCase):
+    """Lean gerar_resumo: same aggregates, no added columns, frame only on request."""
+
+    FILE_NAME = "test_resumo_enxuto.xlsx"
+
+    @classmethod
+    def setUpClass(cls):
+        df = pd.DataFrame({f"col_{i}": range(6) for i in range(27)})
+        df["col_1"] = [10, 10, 11, None, 12, 12]
+        df["col_25"] = ["2", "1,5", "", "abc", 3, "R$ 4"]
+        df["col_26"] = ["R$ 1.200,50", "0,1", "7", "3", "0,2", None]
+        df.to_excel(cls.FILE_NAME, index=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.exists(cls.FILE_NAME):
+            os.remove(cls.FILE_NAME)
+
+    def test_lean_matches_full_frame(self):
+        """Default mode returns compact IDs and the same totals as the full-frame mode."""
+        logic = nova_logica()
+        enxuto = logic.gerar_resumo(self.FILE_NAME, "")
+        completo = logic.gerar_resumo(self.FILE_NAME, "", manter_df=True)
+
+        self.assertNotIn("df", enxuto)
+        self.assertIsInstance(enxuto["pedidos"], np.ndarray)
+        self.assertEqual(sorted(enxuto["pedidos"]), [10, 11, 12])
+        self.assertEqual(enxuto["total_pedidos"], completo["df"].iloc[:, 1].nunique())
+        self.assertEqual(enxuto["total_itens"], int(completo["df"]["qty_clean"].sum()))
+        self.assertEqual(enxuto["valor_total"], completo["df"]["valor_linha"].sum())
+        self.assertIn("valor_linha", completo["df"].columns)
+
+    def test_lean_does_not_mutate_cached_frame(self):
+        """The cached sheet keeps its original columns after a summary."""
+        logic = nova_logica()
+        logic.gerar_resumo(self.FILE_NAME, "")
+        df = logic.carregar_planilha(self.FILE_NAME, "")
+        self.assertEqual(df.shape[1], 27)
+
+
+class TestColumnProjection(unittest.TestCase):
+    """Projected loads parse only the needed columns and match full loads."""
+
+    FILE_NAME = "test_projecao.xlsx"
+
+    @classmethod
+    def setUpClass(cls):
+        df = pd.DataFrame({f"col_{i}": [i, i + 1, i + 2] for i in range(30)})
+        df["col_1"] = [7, 8, 7]
+        df["col_25"] = ["1", "2", "3"]
+        df["col_26"] = ["R$ 1,50", "2", "0,25"]
+        df = df.rename(columns={"col_4": "col_3"})  # nome duplicado no cabecalho
+        df.to_excel(cls.FILE_NAME, index=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.exists(cls.FILE_NAME):
+            os.remove(cls.FILE_NAME)
+
+    def test_projection_matches_full_load(self):
+        """colunas/excluir_colunas give the same frame as loading everything and slicing."""
+        completo = nova_logica().carregar_planilha(self.FILE_NAME, "Sheet1")
+        usar = nova_logica().carregar_planilha(self.FILE_NAME, "Sheet1", colunas=[26, 1, 25, 99])
+        pd.testing.assert_frame_equal(usar, completo.iloc[:, [1, 25, 26]])
+
+        excluir = [0, 3, 4, 29]
+        manter = [i for i in range(30) if i not in excluir]
+        sem = nova_logica().carregar_planilha(self.FILE_NAME, "Sheet1", excluir_colunas=excluir)
+        pd.testing.assert_frame_equal(sem, completo.iloc[:, manter])
+
+    def test_projection_served_from_full_cache(self):
+        """A cached full sheet serves projected loads without reopening the file."""
+        logic = nova_logica()
+        completo = logic.carregar_planilha(self.FILE_NAME, "Sheet1")
+        misses = logic.cache_excel.misses
+        usar = logic.carregar_planilha(self.FILE_NAME, "Sheet1", colunas=[1, 25, 26])
+        pd.testing.assert_frame_equal(usar, completo.iloc[:, [1, 25, 26]])
+        self.assertEqual(logic.cache_excel.hits, 1)
+        self.assertEqual(logic.cache_excel.misses, misses + 1)  # so a chave da projecao
+
+    def test_summary_and_cleaning_use_projection(self):
+        """gerar_resumo and processar_limpeza give the same results as before projection."""
+        logic = nova_logica()
+        enxuto = logic.gerar_resumo(self.FILE_NAME, "")
+        completo = logic.gerar_resumo(self.FILE_NAME, "", manter_df=True)
+        self.assertEqual(enxuto["total_pedidos"], 2)
+        self.assertEqual(enxuto["total_itens"], completo["total_itens"])
+        self.assertEqual(enxuto["valor_total"], completo["valor_total"])
+
+        df = nova_logica().processar_limpeza(self.FILE_NAME, "Sheet1", [0, 4, 29])
+        esperado = completo["df"].iloc[:, :30].drop(columns=["col_0", "col_3.1", "col_29"])
+        pd.testing.assert_frame_equal(df, esperado.drop_duplicates().dropna(how='all'))
+        with self.assertRaises(ValueError):
+            nova_logica().processar_limpeza(self.FILE_NAME, "Sheet1", [30])
+
+    def test_header_of_first_sheet_opens_once(self):
+        """ler_cabecalho with aba="" takes the first sheet from the handle it parses."""
+        from unittest.mock import patch
+        import openpyxl
+        original = openpyxl.load_workbook
+        aberturas = []
+        with patch.object(openpyxl, "load_workbook", lambda *a, **k: aberturas.append(1) or original(*a, **k)):
+            cabecalho = nova_logica().ler_cabecalho(self.FILE_NAME, "")
+        self.assertEqual((cabecalho.shape, len(aberturas)), ((0, 30), 1))
+
+    def test_summary_opens_workbook_once(self):
+        """Cold summary (named sheet, first sheet, chunks) and header reads open the file once."""
+        from unittest.mock import patch
+        import openpyxl
+        diretorio = tempfile.mkdtemp()
+        try:
+            caminho = os.path.join(diretorio, "sku.xlsx")
+            df = pd.DataFrame({f"col_{i}": range(6) for i in range(30)})
+            df["col_1"] = [1, 1, 2, 3, 3, 3]
+            df["Codigo SKU"] = ["a", "a", "b", "c", "c", "c"]  # depois de AA: so o cabecalho diz onde
+            df.to_excel(caminho, sheet_name="Vendas", index=False)
+
+            original = openpyxl.load_workbook
+            aberturas = []
+            with patch.object(openpyxl, "load_workbook", lambda *a, **k: aberturas.append(1) or original(*a, **k)):
+                for aba, blocos in (("Vendas", 0), ("", 0), ("", 4)):
+                    aberturas.clear()
+                    logic = nova_logica()
+                    resumo = logic.gerar_resumo(caminho, aba, linhas_por_bloco=blocos)
+                    self.assertEqual(len(aberturas), 1, (aba, blocos))
+                    self.assertEqual(resumo["total_pedidos"], 3)
+                    self.assertEqual(list(resumo["ranking"]["pedidos"]), [1, 1, 1])
+
+                    aberturas.clear()
+                    self.assertEqual(list(logic.ler_cabecalho(caminho, aba).columns), list(df.columns))
+                    self.assertEqual(len(aberturas), 0)  # cabecalho ja em cache
+
+        finally:
+            shutil.rmtree(diretorio, ignore_errors=True)
+
+
+class TestChunkedReading(unittest.TestCase):
+    """Streaming reader: chunked loads, summary and cleaning match the whole-sheet path."""
+
+    FILE_NAME = "test_blocos.xlsx"
+
+    @classmethod
+    def setUpClass(cls):
+        rng = np.random.default_rng(3)
+        df = pd.DataFrame({f"col_{i}": rng.integers(0, 3, 120) for i in range(28)})
+        df["col_1"] = rng.integers(0, 40, 120)
+        df["col_25"] = [str(v) for v in rng.integers(1, 5, 120)]
+        df["col_26"] = [f"R$ {v:.2f}".replace(".", ",") for v in rng.uniform(1, 50, 120)]
+        df.loc[60, :] = None  # linha vazia no meio
+        df.to_excel(cls.FILE_NAME, index=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.exists(cls.FILE_NAME):
+            os.remove(cls.FILE_NAME)
+
+    def test_chunks_concat_to_full_sheet(self):
+        """Chunks have at most N rows and concatenate to the full read."""
+        completo = nova_logica().carregar_planilha(self.FILE_NAME, "")
+        blocos = list(nova_logica().carregar_planilha(self.FILE_NAME, "", linhas_por_bloco=25))
+        self.assertEqual([len(b) for b in blocos], [25, 25, 25, 25, 20])
+        pd.testing.assert_frame_equal(pd.concat(blocos), completo, check_dtype=False)
+
+    def test_chunked_summary_matches(self):
+        """gerar_resumo in chunks gives the same counts and (float-rounded) value."""
+        inteiro = nova_logica().gerar_resumo(self.FILE_NAME, "", linhas_por_bloco=0)
+        em_blocos = nova_logica().gerar_resumo(self.FILE_NAME, "", linhas_por_bloco=7)
+        self.assertEqual(em_blocos["total_pedidos"], inteiro["total_pedidos"])
+        self.assertEqual(sorted(em_blocos["pedidos"]), sorted(inteiro["pedidos"]))
+        self.assertEqual(em_blocos["total_itens"], inteiro["total_itens"])
+        self.assertAlmostEqual(em_blocos["valor_total"], inteiro["valor_total"], places=6)
+
+    def test_chunked_cleaning_dedupes_across_chunks(self):
+        """Cleaning in chunks removes duplicates that fall in different chunks."""
+        opcoes = {"remover_duplicadas": True, "remover_vazias": True}
+        indices = list(range(2, 28))  # sobram col_0 e col_1 -> muitas duplicatas
+        inteiro = nova_logica().processar_limpeza(self.FILE_NAME, "", indices, opcoes, linhas_por_bloco=0)
+        logs = []
+        em_blocos = nova_logica().processar_limpeza(self.FILE_NAME, "", indices, opcoes, logs.append, linhas_por_bloco=10)
+        pd.testing.assert_frame_equal(em_blocos, inteiro, check_dtype=False)
+        self.assertTrue(any("Duplicatas removidas" in l for l in logs))
+
+    def test_row_digest_treats_missing_and_numeric_types_alike(self):
+        """5 and 5.0, NaN and None are duplicates across chunks of different dtypes."""
+        deduplicador = DeduplicadorLinhas()
+        primeiro = deduplicador.filtrar(pd.DataFrame({"a": [5, 5, 6], "b": ["x", "x", None]}))
+        segundo = deduplicador.filtrar(pd.DataFrame({"a": [5.0, 6.0, 7.0], "b": ["x", np.nan, "y"]}))
+        self.assertEqual(len(primeiro), 2)
+        self.assertEqual(list(segundo["a"]), [7.0])
+        self.assertEqual(deduplicador.removidas, 3)
+
+
+class TestSalvarPlanilha(unittest.TestCase):
+    """Streaming .xlsx writer and CSV/Parquet output."""
+
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp()
+        self.df = pd.DataFrame({
+            "pedido": [1, 2, 3],
+            "valor": [1.5, np.nan, 3.25],
+            "texto": ["a", None, "c"],
+            "data": pd.to_datetime(["2026-01-01", None, "2026-01-03"]),
+        })
+
+    def tearDown(self):
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def test_streaming_xlsx_matches_to_excel(self):
+        """Write-only output reads back exactly like df.to_excel output."""
+        logic = nova_logica()
+        streaming = logic.salvar_planilha(self.df, os.path.join(self.diretorio, "stream"))
+        legado = logic.salvar_planilha(self.df, os.path.join(self.diretorio, "legado.xlsx"), streaming=False)
+        self.assertTrue(streaming.endswith("stream.xlsx"))
+        pd.testing.assert_frame_equal(pd.read_excel(streaming), pd.read_excel(legado))
+
+    def test_xlsx_has_dimension_for_read_only_open(self):
+        """Saved sheets declare their range, so read_only opens know the size without a scan."""
+        from openpyxl import load_workbook
+        logic = nova_logica()
+        largo = pd.DataFrame({f"c{i}": range(30) for i in range(28)})
+        casos = [(largo, 31, 28, "A1:AB31"), (iter([self.df.iloc[:2], self.df.iloc[2:]]), 4, 4, "A1:D4")]
+        for n, (dados, linhas, colunas, ref) in enumerate(casos):
+            caminho = logic.salvar_planilha(dados, os.path.join(self.diretorio, f"dim{n}.xlsx"))
+            wb = load_workbook(caminho, read_only=True)
+            ws = wb.active
+            self.assertEqual((ws.max_row, ws.max_column, ws.calculate_dimension()), (linhas, colunas, ref))
+            wb.close()
+        pd.testing.assert_frame_equal(pd.read_excel(os.path.join(self.diretorio, "dim0.xlsx")), largo)
+
+    def test_chunks_and_formats(self):
+        """Chunk iterables are accepted; CSV/Parquet follow the extension; time is logged."""
+        logic = nova_logica()
+        logs = []
+        blocos = [self.df.iloc[:2], self.df.iloc[2:]]
+        xlsx = logic.salvar_planilha(iter(blocos), os.path.join(self.diretorio, "blocos.xlsx"), log_callback=logs.append)
+        csv = logic.salvar_planilha(self.df, os.path.join(self.diretorio, "saida.csv"))
+        pd.testing.assert_frame_equal(pd.read_excel(xlsx), pd.read_excel(logic.salvar_planilha(self.df, xlsx + "2.xlsx")))
+        lido = pd.read_csv(csv, sep=";", decimal=",", encoding="utf-8-sig")
+        self.assertEqual(list(lido["valor"].fillna(0)), [1.5, 0, 3.25])
+        self.assertTrue(any("3 linhas salvas em XLSX" in l for l in logs))
+
+        parquet = logic.salvar_planilha(self.df, os.path.join(self.diretorio, "saida"), formato="parquet")
+        self.assertTrue(parquet.endswith(".parquet"))
+        pd.testing.assert_frame_equal(pd.read_parquet(parquet), self.df, check_dtype=False)
+        self.assertEqual(os.listdir(self.diretorio).count("saida.parquet"), 1)
+        self.assertFalse([f for f in os.listdir(self.diretorio) if f.endswith(".tmp")])
+
+
+class TestLote(unittest.TestCase):
+    """Headless batch runner (core/lote.py and src/cli.py)."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.diretorio = tempfile.mkdtemp()
+        rng = np.random.default_rng(3)
+        for n in range(2):
+            df = pd.DataFrame({f"col_{i}": range(15) for i in range(27)})
+            df["col_1"] = rng.integers(0, 8, 15)
+            df["col_25"] = rng.integers(1, 5, 15)
+            df["col_26"] = [f"R$ {v:.2f}".replace(".", ",") for v in rng.uniform(1, 300, 15)]
+            pd.concat([df, df.head(2)]).to_excel(os.path.join(cls.diretorio, f"lote_{n}.xlsx"), index=False)
+        pd.DataFrame({"A": [1, 2]}).to_excel(os.path.join(cls.diretorio, "estreito.xlsx"), index=False)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.diretorio, ignore_errors=True)
+
+    def test_limpeza_em_lote(self):
+        """Each output equals processar_limpeza; failures are isolated and reported."""
+        from core.lote import executar_lote, expandir_arquivos, montar_relatorio
+        from datetime import datetime
+        caminhos = expandir_arquivos([os.path.join(self.diretorio, "*.xlsx")])
+        saida = os.path.join(self.diretorio, "saida")
+        os.makedirs(saida)
+        tarefa = {"modo": "limpeza", "aba": "", "indices_deletar": [2, 4], "diretorio_saida": saida,
+                  "opcoes": {"remover_duplicadas": True, "remover_vazias": True}, "formato": "csv"}
+        resultados = executar_lote(caminhos, tarefa, workers=2, logic=nova_logica())
+
+        self.assertEqual([r["arquivo"] for r in resultados], caminhos)
+        erros = [r for r in resultados if r["status"] == "erro"]
+        self.assertEqual([os.path.basename(r["arquivo"]) for r in erros], ["estreito.xlsx"])
+        logic = nova_logica()
+        for r in resultados:
+            if r["status"] != "ok":
+                continue
+            esperado = logic.processar_limpeza(r["arquivo"], "", [2, 4], tarefa["opcoes"])
+            lido = pd.read_csv(r["saida"], sep=";", decimal=",", encoding="utf-8-sig")
+            self.assertEqual(r["linhas"], len(esperado))
+            self.assertEqual(list(lido.columns), list(esperado.columns))
+            self.assertGreaterEqual(r["segundos"], 0)
+
+        relatorio = montar_relatorio(resultados, tarefa, "teste", datetime.now(), 1.0, 2)
+        self.assertEqual(relatorio["totais"]["erros"], 1)
+        self.assertEqual(relatorio["totais"]["linhas"], 30)
+
+    def test_resumo_em_lote(self):
+        """Batch summary totals equal gerar_resumo_multi."""
+        from core.lote import executar_lote, montar_relatorio
+        from datetime import datetime
+        caminhos = [os.path.join(self.diretorio, f"lote_{n}.xlsx") for n in range(2)]
+        tarefa = {"modo": "resumo", "aba": ""}
+        resultados = executar_lote(caminhos, tarefa, workers=1, logic=nova_logica())
+        totais = montar_relatorio(resultados, tarefa, "teste", datetime.now(), 1.0, 1)["totais"]
+        esperado = nova_logica().gerar_resumo_multi(caminhos, workers=1)
+        self.assertEqual(totais["total_pedidos"], esperado["total_pedidos"])
+        self.assertEqual(totais["total_itens"], esperado["total_itens"])
+        self.assertEqual(totais["valor_total"], esperado["valor_total"])
+
+    def test_cli_sem_gui(self):
+        """The CLI exits 2 on configuration errors and never imports tkinter."""
+        import subprocess
+        import cli
+        self.assertEqual(cli.main(["--preset", "__inexistente__", self.diretorio]), 2)
+        codigo = ("import sys; sys.path.insert(0, 'src'); import cli; "
+                  "print(any(m in sys.modules for m in ('tkinter', 'matplotlib')))")
+        saida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True)
+        self.assertEqual(saida.stdout.strip(), "False")
+
+
+class TestFiltroTexto(unittest.TestCase):
+    """Fused literal text search with a cached lowercase view."""
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "sku": ["ABC-1.5", "abc-105", None, "Xyz"],
+            "misto": pd.Series([1.5, "Tênis AZUL", None, "b"], dtype=object),
+            "qtd": [1, 2, 3, 4],
+        })
+
+    def test_literal_case_insensitive(self):
+        """Regex characters are literal, case is ignored, numbers in text columns match."""
+        logic = nova_logica()
+        self.assertEqual(list(logic.filtro_por_texto(self.df, "c-1.5").index), [0])
+        self.assertEqual(list(logic.filtro_por_texto(self.df, "azul").index), [1])
+        self.assertEqual(list(logic.filtro_por_texto(self.df, "1.5").index), [0])
+        self.assertEqual(len(logic.filtro_por_texto(self.df, "nan")), 0)  # vazias nunca casam
+        self.assertEqual(len(logic.filtro_por_texto(self.df[["qtd"]], "1")), 4)  # sem colunas de texto
+
+    def test_view_is_cached_and_invalidated(self):
+        """Repeated searches reuse the view; replacing a column rebuilds it."""
+        logic = nova_logica()
+        busca = logic.busca_texto
+        logic.filtro_por_texto(self.df, "abc")
+        logic.filtro_por_texto(self.df, "xyz")
+        self.assertEqual((busca.hits, busca.misses), (1, 1))
+
+        self.df["sku"] = ["novo", "novo", "novo", "novo"]
+        self.assertEqual(len(logic.filtro_por_texto(self.df, "novo")), 4)
+        self.assertEqual(busca.misses, 2)
+
+    def test_in_place_edits_rebuild_view_and_index(self):
+        """Cell edits made in place are caught by the content fingerprint, no invalidar() needed."""
+        logic = nova_logica()
+        self.assertEqual(list(logic.filtro_por_texto(self.df, "xyz").index), [3])
+        self.assertEqual(list(logic.filtro_por_texto(self.df, "xyz", indexado=True).index), [3])
+        self.df.loc[0, "sku"] = "XYZ-0"
+        self.df.iloc[3, 1] = "verde"
+        self.assertEqual(list(logic.filtro_por_texto(self.df, "xyz").index), [0, 3])
+        self.assertEqual(list(logic.filtro_por_texto(self.df, "xyz", indexado=True).index), [0, 3])
+        self.assertEqual(list(logic.filtro_por_texto(self.df, "verde", prefixo=True).index), [3])
+
+        grande = pd.DataFrame({"sku": [f"SKU-{i}" for i in range(10_000)]})
+        self.assertEqual(len(logic.filtro_por_texto(grande, "sku-9999")), 1)
+        grande.loc[len(grande) - 1, "sku"] = "outro"  # ultima linha sempre entra na amostra
+        self.assertEqual(len(logic.filtro_por_texto(grande, "sku-9999")), 0)
+
+    def test_inverted_index_matches_scan(self):
+        """Indexed substring/prefix queries equal the full scan and follow frame changes."""
+        logic = nova_logica()
+        for termo in ["abc", "1.5", "C-1", "azul", "zzz", "ê"]:
+            pd.testing.assert_frame_equal(logic.filtro_por_texto(self.df, termo, indexado=True),
+                                          logic.filtro_por_texto(self.df, termo))
+        self.assertEqual(list(logic.filtro_por_texto(self.df, "ABC", prefixo=True).index), [0, 1])
+        self.assertEqual(list(logic.filtro_por_texto(self.df, "BC", prefixo=True).index), [])
+        self.assertEqual(len(logic.busca_texto.indice(self.df)), 6)  # textos distintos nao vazios
+
+        menor = self.df.iloc[:2]
+        self.assertEqual(list(logic.filtro_por_texto(menor, "xyz", indexado=True).index), [])
+        self.df.loc[len(self.df)] = ["ABCD", "z", 5]
+        self.assertEqual(list(logic.filtro_por_texto(self.df, "abc", prefixo=True).index), [0, 1, 4])
+
+
+class TestPlanoLimpeza(unittest.TestCase):
+    """Lazy fused cleaning plan must keep exactly the rows of the eager step-by-step filters."""
+
+    def test_plan_matches_eager_filters(self):
+        """Reordered, fused filters keep the same rows, in the same order, and explain counts."""
+        rng = np.random.default_rng(11)
+        df = pd.DataFrame({
+            "sku": rng.choice(["ab", "Cd", None], 300),
+            "preco": [f"R$ {v:.2f}".replace(".", ",") for v in rng.uniform(0, 50, 300)],
+            "qtd": rng.choice([1.0, np.nan], 300),
+        })
+        df.iloc[::9] = np.nan
+        df = pd.concat([df, df.iloc[:40]], ignore_index=True)
+        opcoes = {"remover_duplicadas": True, "remover_vazias": True,
+                  "filtro_valor": {"ativo": True, "minimo": 10, "coluna": "preco"},
+                  "filtro_texto": {"ativo": True, "texto": "cd"}}
+
+        esperado = df.drop_duplicates().dropna(how='all')
+        esperado = esperado[converter_serie_numerica(esperado["preco"], preservar_nan=True) >= 10]
+        esperado = esperado[esperado["sku"].str.contains("cd", case=False, na=False)]
+
+        logic = nova_logica()
+        plano = logic.planejar_limpeza(opcoes, [3])
+        pd.testing.assert_frame_equal(plano.executar(df), esperado)
+        explicacao = plano.explicar()
+        self.assertEqual([e.nome for e in plano.estagios], ["vazias", "valor", "texto"])
+        self.assertEqual(sum(e.removidas for e in plano.estagios) + plano.duplicatas_removidas,
+                         len(df) - len(esperado))
+        self.assertIn("duplicatas", explicacao)
+        self.assertIn(f"= {len(esperado)} linhas mantidas", explicacao)
+
+    def test_missing_value_column_is_skipped(self):
+        """A value filter on a missing column is skipped with a warning, as before."""
+        logs = []
+        df = pd.DataFrame({"a": [1, 1, 2]})
+        resultado = nova_logica().aplicar_filtros_adicionais(
+            df, {"remover_duplicadas": True, "filtro_valor": {"ativo": True, "minimo": 5, "coluna": "x"}}, logs.append)
+        self.assertEqual(list(resultado["a"]), [1, 2])
+        self.assertTrue(any("[WARNING]" in l for l in logs))
+
+
+    def test_text_stage_scans_only_surviving_rows(self):
+        """The text matcher receives only the rows left by the cheaper stages."""
+        from unittest.mock import patch
+        import core.texto as texto
+        df = pd.DataFrame({
+            "sku": ["A-1", None, "A-2", "B-1", "A-3", "A-4"],
+            "valor": [10, None, 1, 10, 10, 10],
+        })
+        opcoes = {"remover_vazias": True,
+                  "filtro_valor": {"ativo": True, "coluna": "B", "minimo": 5},
+                  "filtro_texto": {"ativo": True, "texto": "a-"}}
+        esperado = [0, 4, 5]
+        vistas = []
+        buscar, montar = texto._buscar, texto.IndiceTexto
+
+        def espiao_buscar(visao, termo):
+            vistas.append(len(visao))
+            return buscar(visao, termo)
+
+        def espiao_indice(parcial, posicoes=None):
+            vistas.append(len(parcial))
+            return montar(parcial, posicoes)
+
+        with patch.object(texto, "_buscar", espiao_buscar), patch.object(texto, "IndiceTexto", espiao_indice):
+            for extra in ({}, {"indexado": True}, {"prefixo": True}):
+                opcoes["filtro_texto"].update(extra)
+                logic = nova_logica()
+                resultado = logic.planejar_limpeza(opcoes).executar(df)
+                self.assertEqual(list(resultado.index), esperado)
+                self.assertEqual(vistas, [4])  # vazia e valor 1 ja sairam
+                self.assertEqual(len(logic.busca_texto), 0)  # visao parcial nao vai para o cache
+                vistas.clear()
+
+            # Visao do quadro inteiro em cache: reaproveitada, mas so as vivas sao varridas
+            logic = nova_logica()
+            busca = logic.busca_texto
+            busca.visao(df)
+            opcoes["filtro_texto"] = {"ativo": True, "texto": "a-"}
+            resultado = logic.planejar_limpeza(opcoes).executar(df)
+            self.assertEqual(list(resultado.index), esperado)
+            self.assertEqual((vistas, busca.hits, busca.misses), ([4], 1, 1))
+
+
+class TestFiltroValor(unittest.TestCase):
+    """Mask-only value filter: ranges, several columns and Excel letters."""
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "sku": ["a", "b", "c", "d", "e"],
+            "preco": ["R$ 5,00", "R$ 1.200,50", "-", "10", 30.0],
+            "qtd": [1, 5, 3, None, 8],
+        })
+
+    def test_min_matches_previous_behavior(self):
+        """filtro_por_valor_minimo keeps the same rows as the copy-based implementation."""
+        logic = nova_logica()
+        esperado = self.df[converter_serie_numerica(self.df["preco"], preservar_nan=True) >= 10]
+        pd.testing.assert_frame_equal(logic.filtro_por_valor_minimo(self.df, 10, "preco"), esperado)
+
+    def test_ranges_columns_and_letters(self):
+        """Inclusive min/max, AND across columns, letters resolved against the original header."""
+        logic = nova_logica()
+        self.assertEqual(list(logic.filtro_por_valor(self.df, "B", minimo=5, maximo=30)["sku"]), ["a", "d", "e"])
+        self.assertEqual(list(logic.filtro_por_valor(self.df, ["preco", "C"], minimo="1", maximo=10)["sku"]), ["a"])
+        regras = [{"coluna": "preco", "maximo": 100}, {"coluna": "qtd", "minimo": 2}]
+        # "-" vale 0 (como limpar_valor), entao "c" passa em preco <= 100
+        self.assertEqual(list(logic.filtro_por_valor(self.df, regras)["sku"]), ["c", "e"])
+
+        # Coluna A excluida na leitura: "C" continua sendo qtd
+        sem_sku = self.df.drop(columns="sku")
+        cabecalho = list(self.df.columns)
+        self.assertEqual(len(logic.filtro_por_valor(sem_sku, "C", minimo=5, cabecalho=cabecalho)), 2)
+        logs = []
+        self.assertIs(logic.filtro_por_valor(sem_sku, "A", minimo=1, log_callback=logs.append, cabecalho=cabecalho), sem_sku)
+        self.assertTrue(any("excluida" in l for l in logs))
+
+
+class TestDuplicadasChave(unittest.TestCase):
+    """Duplicate removal by key columns and by 64-bit row digests."""
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            "pedido": [1, 1, 2, 2, 3, 1],
+            "sku": ["A", "A", "B", "C", "D", "A"],
+            "valor": ["10", "0", "5", "5", "7", "10"],
+        })
+
+    def test_key_after_filters_and_counts(self):
+        """Equal keys keep the first row that survives the filters; the log lists repeated keys."""
+        logic = nova_logica()
+        logs = []
+        opcoes = {"remover_duplicadas": True, "chave_duplicadas": "A, B",
+                  "filtro_valor": {"ativo": True, "coluna": "valor", "minimo": 1}}
+        # Letras resolvidas pelo cabecalho original: A=pedido, B=sku
+        plano = logic.planejar_limpeza(opcoes, cabecalho=list(self.df.columns))
+        resultado = plano.executar(self.df, logs.append)
+        self.assertEqual(resultado.index.tolist(), [0, 2, 3, 4])
+        self.assertIn("  🔄 Duplicatas removidas por A + B: 1", logs)
+        self.assertIn("     pedido=1, sku=A: +1", logs)
+        self.assertIn("por A + B", plano.explicar())
+
+    def test_hash_mode_matches_values(self):
+        """Hash mode drops the same rows as comparing values, in memory and across chunks."""
+        logic = nova_logica()
+        esperado = logic.aplicar_filtros_adicionais(self.df, {"remover_duplicadas": True})
+        obtido = logic.aplicar_filtros_adicionais(self.df, {"remover_duplicadas": True, "modo_duplicadas": "hash"})
+        pd.testing.assert_frame_equal(obtido, esperado)
+
+        plano = logic.planejar_limpeza({"remover_duplicadas": True, "chave_duplicadas": ["pedido"], "modo_duplicadas": "hash"})
+        deduplicador = DeduplicadorLinhas(plano.modo_duplicadas)
+        partes = [plano.executar(self.df.iloc[i:i + 2], deduplicador=deduplicador) for i in range(0, 6, 2)]
+        self.assertEqual(pd.concat(partes).index.tolist(), [0, 2, 4])
+        self.assertEqual(deduplicador.removidas, 3)
+
+        with self.assertRaises(ValueError):
+            logic.planejar_limpeza({"modo_duplicadas": "md5"})
+
+
+class TestNumericParsing(unittest.TestCase):
+    """Vectorized numeric parsing must match the scalar helpers exactly."""
+
+    AMOSTRA = [
+        'R$ 1.200,50', '1.200,50', '1200.50', '', '  ', 'abc', 'N/A', '-', 'R$\xa0-3,5',
+        '1_000', 'inf', 'nan', '1e5', '+7', '12,', '.5', 'R$', '1.2.3,4', '- 5', '5\x005',
+        '12345678901234567890', None, float('nan'), pd.NaT, 5, 2.5, True, -0.0,
+    ]
+
+    def _assert_igual(self, obtido, esperado):
+        esperado = esperado.to_numpy(dtype=float)
+        self.assertTrue(np.array_equal(obtido, esperado, equal_nan=True), f"{obtido} != {esperado}")
+
+    def test_matches_clean_numeric(self):
+        """Default mode matches Series.apply(clean_numeric)."""
+        serie = pd.Series(self.AMOSTRA, dtype=object)
+        self._assert_igual(converter_serie_numerica(serie), serie.apply(ADCLogic.clean_numeric))
+
+    def test_matches_limpar_valor(self):
+        """preservar_nan mode matches Series.apply(limpar_valor), including float NaN."""
+        serie = pd.Series(self.AMOSTRA, dtype=object)
+        self._assert_igual(converter_serie_numerica(serie, preservar_nan=True), serie.apply(ADCLogic.limpar_valor))
+
+    def test_numeric_column_fast_path(self):
+        """Numeric dtype columns are converted without touching strings."""
+        serie = pd.Series([1.5, np.nan, 3.0])
+        self._assert_igual(converter_serie_numerica(serie), serie.apply(ADCLogic.clean_numeric))
+
+    def test_auto_format_detection(self):
+        """'auto' picks US formatting when the column clearly uses dot decimals."""
+        serie = pd.Series(['1,200.50', '3.25', '10.1'], dtype=object)
+        self.assertEqual(detectar_formato_numerico(serie), "us")
+        self.assertEqual(list(converter_serie_numerica(serie, formato="auto")), [1200.5, 3.25, 10.1])
+        self.assertEqual(detectar_formato_numerico(pd.Series(['R$ 1.200,50'])), "br")
+
+
 if __name__ == '__main__':
     # Run tests with verbose output
     unittest.main(verbosity=2)